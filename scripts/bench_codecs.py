@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк кодеков событий: encode/decode ops/s на payload'ах из events_topics.
+
+Базовая линия — текущий путь json.dumps(ensure_ascii=False, default=str) / json.loads;
+сравниваются все кодеки utils.codec, доступные в окружении. orjson и msgpack объявлены
+в requirements.txt, но необязательны: без них замеряются только доступные кодеки
+(json падает обратно на stdlib, msgpack пропускается).
+
+    python scripts/bench_codecs.py [--n 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+from crypto_ai_bot.core.application.events_topics import ORDER_EXECUTED, build_order_event, build_trade_event
+from crypto_ai_bot.utils.codec import available_codecs, get_codec
+
+
+def _payloads() -> dict[str, dict[str, Any]]:
+    _, order = build_order_event(
+        ORDER_EXECUTED, "BTC/USDT", "123456789", "cab-1", "buy", "market",
+        Decimal("0.00123"), Decimal("64123.45"), "closed", Decimal("0.00123"), "trace-1",
+    )
+    _, trade = build_trade_event(
+        "trade.completed", "BTC/USDT", "t-1", "123456789", "buy",
+        Decimal("0.00123"), Decimal("64123.45"), Decimal("0.0789"), "USDT", "trace-1",
+    )
+    raw = {
+        "symbol": "BTC/USDT",
+        "ts": datetime.now(UTC),
+        "amount": Decimal("0.00123"),
+        "price": Decimal("64123.45"),
+        "fees": [Decimal("0.01")] * 4,
+        "meta": {"strategy": "ema_cross", "score": 0.73, "tags": ["mtf", "regime"]},
+    }
+    return {"order(str)": dict(order), "trade(str)": dict(trade), "raw(Decimal/datetime)": raw}
+
+
+def _rate(fn: Callable[[], Any], n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--n", type=int, default=20_000, help="итераций на замер")
+    args = ap.parse_args()
+
+    baseline = (
+        "json.dumps(default=str)",
+        lambda obj: json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8"),
+        json.loads,
+    )
+    candidates = [baseline] + [
+        (name, get_codec(name).dumps, get_codec(name).loads) for name in available_codecs()
+    ]
+
+    print(f"{'payload':<24}{'codec':<26}{'bytes':>7}{'enc ops/s':>13}{'dec ops/s':>13}{'enc x':>7}{'dec x':>7}")
+    for label, payload in _payloads().items():
+        base_enc = base_dec = 0.0
+        for name, dumps, loads in candidates:
+            data = dumps(payload)
+            enc = _rate(lambda dumps=dumps, payload=payload: dumps(payload), args.n)
+            dec = _rate(lambda loads=loads, data=data: loads(data), args.n)
+            if not base_enc:
+                base_enc, base_dec = enc, dec
+            print(
+                f"{label:<24}{name:<26}{len(data):>7}{enc:>13,.0f}{dec:>13,.0f}"
+                f"{enc / base_enc:>7.2f}{dec / base_dec:>7.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
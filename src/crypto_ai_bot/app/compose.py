@@ -6,16 +6,19 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any
 
 from crypto_ai_bot.core.application.orchestrator import Orchestrator
 from crypto_ai_bot.core.application.protective_exits import ProtectiveExits
 from crypto_ai_bot.core.application.monitoring.health_checker import HealthChecker
+from crypto_ai_bot.core.application.risk_windows import attach_risk_windows, hydrate_risk_windows
 from crypto_ai_bot.core.domain.risk.manager import RiskManager, RiskConfig
+from crypto_ai_bot.core.domain.risk.windows import RiskWindows
 from crypto_ai_bot.core.infrastructure.brokers.factory import make_broker
 from crypto_ai_bot.core.infrastructure.events.bus import AsyncEventBus
-from crypto_ai_bot.core.infrastructure.storage.facade import StorageFacade
-from crypto_ai_bot.core.infrastructure.storage.sqlite_adapter import SQLiteAdapter
+from crypto_ai_bot.core.infrastructure.events.conflation import parse_policies
+from crypto_ai_bot.core.infrastructure.market_data.hub import MarketDataHub
+from crypto_ai_bot.core.infrastructure.storage.async_facade import AsyncStorageFacade
 from crypto_ai_bot.core.infrastructure.safety.dead_mans_switch import DeadMansSwitch
 from crypto_ai_bot.core.infrastructure.safety.instance_lock import InstanceLock
 from crypto_ai_bot.core.infrastructure.settings import get_settings
@@ -31,7 +34,7 @@ class AppContainer:
     Holds all initialized components.
     """
     settings: Any
-    storage: StorageFacade
+    storage: AsyncStorageFacade
     broker: Any
     bus: AsyncEventBus
     risk: RiskManager
@@ -40,12 +43,17 @@ class AppContainer:
     dms: DeadMansSwitch
     instance_lock: InstanceLock
     orchestrators: dict[str, Orchestrator]
+    market_hub: MarketDataHub | None = None
     
     async def start(self) -> None:
         """Start all components"""
         # Start event bus
         await self.bus.start()
         
+        # Start shared market data poller before its consumers
+        if self.market_hub is not None:
+            await self.market_hub.start()
+
         # Start protective exits
         await self.exits.start()
         
@@ -78,8 +86,13 @@ class AppContainer:
         await self.exits.stop()
         await self.health.stop()
         await self.dms.stop()
+        if self.market_hub is not None:
+            await self.market_hub.stop()
         await self.bus.stop()
         
+        # Flush queued writes and close DB connections
+        await self.storage.close()
+
         # Release instance lock
         self.instance_lock.release()
 
@@ -88,13 +101,20 @@ class ComponentFactory:
     """Factory for creating application components"""
     
     @staticmethod
-    def create_storage(settings: Any) -> StorageFacade:
-        """Create storage facade with SQLite backend"""
+    def create_storage(settings: Any) -> AsyncStorageFacade:
+        """Create async storage facade (writer thread + trading and reporting read-only pools) with SQLite backend"""
         db_path = getattr(settings, "DB_PATH", "./data/trader.sqlite3")
+        technical = getattr(settings, "technical", None)
         logger.info(f"Initializing SQLite storage at {db_path}")
         
-        adapter = SQLiteAdapter(db_path)
-        return StorageFacade(adapter)
+        return AsyncStorageFacade.open(
+            db_path,
+            read_pool_size=int(getattr(technical, "DB_READ_POOL_SIZE", 2)),
+            report_pool_size=int(getattr(technical, "DB_REPORT_POOL_SIZE", 1)),
+            group_commit_ms=float(getattr(technical, "DB_GROUP_COMMIT_MS", 5.0)),
+            group_commit_rows=int(getattr(technical, "DB_GROUP_COMMIT_ROWS", 256)),
+            backup_retention_days=int(getattr(technical, "BACKUP_RETENTION_DAYS", 30)),
+        )
     
     @staticmethod
     def create_broker(settings: Any) -> Any:
@@ -105,6 +125,14 @@ class ComponentFactory:
         logger.info(f"Creating {mode} broker for {exchange}")
         return make_broker(mode=mode, exchange=exchange, settings=settings)
     
+    @staticmethod
+    def create_market_hub(settings: Any, broker: Any, symbols: list[str]) -> MarketDataHub:
+        """Create one ticker/balance poller shared by all orchestrators"""
+        intervals = getattr(settings, "intervals", None)
+        interval = getattr(intervals, "MARKET_HUB", 2)
+        logger.info(f"Creating market data hub for {len(symbols)} symbols, interval {interval}s")
+        return MarketDataHub(broker, symbols, interval_sec=interval)
+
     @staticmethod
     def create_event_bus(settings: Any) -> AsyncEventBus:
         """Create event bus (in-memory or Redis)"""
@@ -114,38 +142,59 @@ class ComponentFactory:
             # TODO: Implement Redis bus
             logger.info("Redis event bus not yet implemented, using in-memory")
         
-        # In-memory bus with deduplication
-        return AsyncEventBus(
+        # In-memory bus with deduplication; subscribers get their own queues,
+        # so slow handlers (Telegram, retries) never delay the publisher.
+        # A full queue applies backpressure (block); only the listed state/telemetry
+        # topics may drop their oldest events.
+        technical = getattr(settings, "technical", None)
+        bus = AsyncEventBus(
             enable_dedupe=True,
             topic_concurrency=64,
             max_attempts=3,
-            backoff_base_ms=250
+            backoff_base_ms=250,
+            delivery=getattr(technical, "EVENT_BUS_DELIVERY", "queue"),
+            queue_size=int(getattr(technical, "EVENT_BUS_QUEUE_SIZE", 1000)),
+            overflow=getattr(technical, "EVENT_BUS_OVERFLOW", "block"),
+            lossy_topics=str(getattr(technical, "EVENT_BUS_LOSSY_TOPICS", "")).split(","),
         )
+        # State topics are republished every reconcile/health tick; deliver only real changes
+        for topic, mode, window_ms in parse_policies(getattr(technical, "EVENT_BUS_CONFLATE", "")):
+            bus.conflate(topic, mode, window_ms=window_ms)
+        return bus
     
     @staticmethod
-    async def create_risk_manager(settings: Any, broker: Any) -> RiskManager:
-        """Create risk manager with spread provider"""
-        
-        # Create spread provider function
-        async def spread_provider(symbol: str) -> Optional[float]:
-            try:
-                ticker = await broker.fetch_ticker(symbol)
-                bid = float(ticker.get("bid", 0))
-                ask = float(ticker.get("ask", 0))
-                if bid > 0 and ask > 0:
-                    return ((ask - bid) / ((ask + bid) / 2)) * 100
-            except Exception as e:
-                logger.debug(f"Failed to get spread for {symbol}: {e}")
-            return None
-        
-        # Create risk config from settings
-        config = RiskConfig.from_settings(settings, spread_provider=spread_provider)
-        return RiskManager(config)
+    async def create_risk_windows(
+        storage: AsyncStorageFacade,
+        bus: AsyncEventBus,
+        symbols: list[str],
+        market_hub: MarketDataHub | None = None
+    ) -> RiskWindows:
+        """
+        Create in-memory order/turnover windows for risk budgets.
+        Hydrated from 1m trade rollups of the last 24h, then kept current by ORDER_EXECUTED.
+        Market orders without cost/price in the event are valued at the hub's last price.
+        """
+        windows = RiskWindows()
+        hub = market_hub
+
+        def last_price(symbol: str) -> Any:
+            ticker = hub.ticker(symbol) if hub is not None else None
+            return ticker.get("last") if isinstance(ticker, dict) else getattr(ticker, "last", None)
+
+        attach_risk_windows(windows, bus, last_price=last_price)
+        await hydrate_risk_windows(windows, storage, symbols)
+        return windows
+
+    @staticmethod
+    async def create_risk_manager(settings: Any, windows: RiskWindows | None = None) -> RiskManager:
+        """Create risk manager from settings"""
+        config = RiskConfig.from_settings(settings)
+        return RiskManager(config, windows)
     
     @staticmethod
     def create_protective_exits(
         broker: Any,
-        storage: StorageFacade,
+        storage: AsyncStorageFacade,
         bus: AsyncEventBus,
         settings: Any
     ) -> ProtectiveExits:
@@ -159,7 +208,7 @@ class ComponentFactory:
     
     @staticmethod
     def create_health_checker(
-        storage: StorageFacade,
+        storage: AsyncStorageFacade,
         broker: Any,
         bus: AsyncEventBus,
         settings: Any
@@ -207,7 +256,7 @@ class OrchestratorFactory:
     @staticmethod
     def create_orchestrators(
         settings: Any,
-        storage: StorageFacade,
+        storage: AsyncStorageFacade,
         broker: Any,
         bus: AsyncEventBus,
         risk: RiskManager,
@@ -252,8 +301,18 @@ async def compose() -> AppContainer:
     broker = ComponentFactory.create_broker(settings)
     bus = ComponentFactory.create_event_bus(settings)
     
+    # One batched ticker/balance poller for all symbols; components read
+    # through the hub's broker view instead of polling per symbol
+    market_hub = ComponentFactory.create_market_hub(
+        settings, broker, OrchestratorFactory.parse_symbols(settings)
+    )
+    broker = market_hub.broker_view()
+
     # Create application components
-    risk = ComponentFactory.create_risk_manager(settings, storage)
+    risk_windows = await ComponentFactory.create_risk_windows(
+        storage, bus, OrchestratorFactory.parse_symbols(settings), market_hub
+    )
+    risk = await ComponentFactory.create_risk_manager(settings, risk_windows)
     exits = ComponentFactory.create_protective_exits(broker, storage, bus, settings)
     health = ComponentFactory.create_health_checker(storage, broker, bus, settings)
     dms = ComponentFactory.create_dead_mans_switch(bus, broker, settings)
@@ -279,7 +338,8 @@ async def compose() -> AppContainer:
         health=health,
         dms=dms,
         instance_lock=instance_lock,
-        orchestrators=orchestrators
+        orchestrators=orchestrators,
+        market_hub=market_hub
     )
     
     logger.info("Dependency injection composition completed")
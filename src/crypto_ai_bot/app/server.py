@@ -77,6 +77,10 @@ async def _startup() -> None:
     await container.bus.start()
     await container.health.start()
 
+    # Общий поллер тикеров/балансов — до его потребителей (exits, оркестраторы)
+    if container.market_hub is not None:
+        await container.market_hub.start()
+
     # DMS — если включен
     if getattr(container.settings, "DMS_ENABLED", False):
         try:
@@ -124,9 +128,16 @@ async def _shutdown() -> None:
         await container.health.stop()
     with contextlib.suppress(Exception):
         await container.dms.stop()
+    if container.market_hub is not None:
+        with contextlib.suppress(Exception):
+            await container.market_hub.stop()
     with contextlib.suppress(Exception):
         await container.bus.stop()
 
+    # Дописать очередь group-commit и закрыть соединения: поток writer'а — daemon
+    with contextlib.suppress(Exception):
+        await container.storage.close()
+
     # Лок на инстанс
     with contextlib.suppress(Exception):
         container.instance_lock.release()
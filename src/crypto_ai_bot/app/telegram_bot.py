@@ -8,15 +8,17 @@ from __future__ import annotations
 
 import asyncio
 import html
+import inspect
 import os
 import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any, Optional, Protocol
+from datetime import UTC, datetime, timezone
+from typing import Any, Protocol
 
 from crypto_ai_bot.utils.http_client import aget
 from crypto_ai_bot.utils.logging import get_logger
 from crypto_ai_bot.utils.symbols import canonical
+from crypto_ai_bot.utils.time import utc_day_bounds_ms
 from crypto_ai_bot.utils.trace import generate_trace_id
 
 _log = get_logger(__name__)
@@ -189,6 +191,16 @@ class TelegramAPI:
 
 # ============== Command Handlers ==============
 
+async def _today_rollup(storage: Any, symbol: str | None) -> Any:
+    """Today's (UTC) trade_rollups summary for symbol (None = all symbols), if storage has rollups."""
+    rollups = getattr(storage, "rollups", None)
+    if rollups is None or not hasattr(rollups, "get_totals"):
+        return None
+    start, end = utc_day_bounds_ms()
+    result = rollups.get_totals(symbol, start, end + 1)
+    return await result if inspect.isawaitable(result) else result
+
+
 class CommandHandler:
     """Handle bot commands."""
 
@@ -236,8 +248,9 @@ class CommandHandler:
         return getattr(self.container, "broker", None)
 
     def get_storage(self) -> Any:
-        """Get storage facade."""
-        return getattr(self.container, "storage", None)
+        """Get storage for reports (read-only reporting pool when the facade has one)."""
+        storage = getattr(self.container, "storage", None)
+        return getattr(storage, "reporting", storage)
 
     async def handle_help(self, chat_id: int, trace_id: str) -> None:
         """Show help message."""
@@ -336,19 +349,25 @@ class CommandHandler:
                 await self.api.send_message(chat_id, "❌ Trades repository not available", trace_id=trace_id)
                 return
 
-            # Today's trades
-            today = datetime.now(timezone.utc).date()
-            trades = (
-                trades_repo.get_by_date_range(start_date=today, end_date=today, symbol=symbol)
-                if hasattr(trades_repo, "get_by_date_range")
-                else []
-            )
+            rollup = await _today_rollup(storage, symbol)
+            if rollup is not None:
+                today_pnl = float(rollup.realized_quote)
+                total_trades = rollup.count
+                wins, losses = rollup.wins, rollup.losses
+            else:
+                # Today's trades
+                today = datetime.now(UTC).date()
+                trades = (
+                    trades_repo.get_by_date_range(start_date=today, end_date=today, symbol=symbol)
+                    if hasattr(trades_repo, "get_by_date_range")
+                    else []
+                )
 
-            # Calculate PnL
-            today_pnl = sum(float(t.get("pnl", 0) or 0) for t in trades)
-            total_trades = len(trades)
-            wins = sum(1 for t in trades if float(t.get("pnl", 0) or 0) > 0)
-            losses = sum(1 for t in trades if float(t.get("pnl", 0) or 0) < 0)
+                # Calculate PnL
+                today_pnl = sum(float(t.get("pnl", 0) or 0) for t in trades)
+                total_trades = len(trades)
+                wins = sum(1 for t in trades if float(t.get("pnl", 0) or 0) > 0)
+                losses = sum(1 for t in trades if float(t.get("pnl", 0) or 0) < 0)
 
             lines = [f"<b>💰 PnL Report {html.escape(symbol)}</b>"]
             today_emoji = "📈" if today_pnl >= 0 else "📉"
@@ -514,7 +533,16 @@ class CommandHandler:
             lines = [f"<b>📅 Today's Summary</b>", f"<i>{today.isoformat()}</i>\n"]
 
             trades_repo = getattr(storage, "trades", None)
-            if trades_repo and hasattr(trades_repo, "get_by_date_range"):
+            rollup = await _today_rollup(storage, None)
+            if rollup is not None:
+                pnl_emoji = "📈" if rollup.realized_quote >= 0 else "📉"
+                lines.append(f"{pnl_emoji} PnL: {float(rollup.realized_quote):+.2f} USDT")
+                lines.append(f"📊 Trades: {rollup.count} (W:{rollup.wins}/L:{rollup.losses})")
+                if rollup.count > 0:
+                    lines.append(f"🎯 Win rate: {rollup.wins / rollup.count * 100:.1f}%")
+                if rollup.turnover_quote > 0:
+                    lines.append(f"💎 Volume: {float(rollup.turnover_quote):.2f} USDT")
+            elif trades_repo and hasattr(trades_repo, "get_by_date_range"):
                 trades = trades_repo.get_by_date_range(start_date=today, end_date=today)
 
                 total_trades = len(trades)
@@ -497,6 +497,49 @@ class DatabaseMaintenance:
         print(f"✅ Restored DB from: {backup_file}")
         print(f"   Target: {self.config.db_path}")
 
+    def rebuild_lots(self, symbol: str | None = None, *, check_only: bool = False) -> bool:
+        """Verify (and unless check_only, rebuild) the FIFO lot ledger from the trades table."""
+        from crypto_ai_bot.core.infrastructure.storage.migrations.runner import run_migrations
+        from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository
+        from crypto_ai_bot.core.infrastructure.storage.repositories.rollups import RollupsRepository
+        from crypto_ai_bot.utils.time import now_ms
+
+        conn = self._connect()
+
+        try:
+            # таблицы книги лотов создаёт миграция V0015 — на старой БД догоняем схему
+            run_migrations(
+                conn,
+                now_ms=now_ms(),
+                db_path=str(self.config.db_path),
+                backup_retention_days=self.config.retention_days,
+            )
+            lots = LotsRepository(conn)
+            mismatches = lots.verify(symbol)
+
+            _log.info(
+                "lots_verify_completed",
+                extra={"symbol": symbol, "mismatches": len(mismatches), "trace_id": self._trace_id},
+            )
+
+            for sym, reason in sorted(mismatches.items()):
+                print(f"⚠️  {sym}: {reason}")
+
+            if check_only:
+                if not mismatches:
+                    print("✅ Lot ledger matches full FIFO replay")
+                return not mismatches
+
+            rebuilt = lots.rebuild(symbol)
+            # realized в корзинах trade_rollups считается по той же книге — пересобираем вместе
+            RollupsRepository(conn).rebuild(symbol)
+            _log.info("lots_rebuilt", extra={"symbols": len(rebuilt), "trace_id": self._trace_id})
+            print(f"✅ Lot ledger rebuilt for {len(rebuilt)} symbol(s)")
+            return True
+
+        finally:
+            conn.close()
+
 
 # ============== CLI Commands ==============
 
@@ -631,6 +674,18 @@ def cmd_restore(args: argparse.Namespace, config: MaintenanceConfig) -> int:
         return 1
 
 
+def cmd_rebuild_lots(args: argparse.Namespace, config: MaintenanceConfig) -> int:
+    """Execute rebuild-lots command."""
+    maintenance = DatabaseMaintenance(config)
+
+    try:
+        ok = maintenance.rebuild_lots(symbol=args.symbol, check_only=args.check)
+    except Exception as e:
+        print(f"❌ Lot ledger rebuild failed: {e}", file=sys.stderr)
+        return 1
+    return 0 if ok else 1
+
+
 # ============== Main Entry Point ==============
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -667,6 +722,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     restore_parser = subparsers.add_parser("restore", help="Restore from backup")
     restore_parser.add_argument("backup", help="Backup file to restore (.sqlite3 or .sqlite3.gz)")
 
+    # Rebuild-lots command
+    lots_parser = subparsers.add_parser("rebuild-lots", help="Verify/rebuild FIFO lot ledger from trades")
+    lots_parser.add_argument("--symbol", help="Only this symbol (default: all symbols in trades)")
+    lots_parser.add_argument("--check", action="store_true", help="Only compare with full replay, do not write")
+
     return parser.parse_args(argv)
 
 
@@ -681,7 +741,7 @@ def main(argv: list[str] | None = None) -> int:
         config = MaintenanceConfig(settings)
 
         # Validate only for commands that require live DB
-        if args.command in {"backup", "vacuum", "integrity", "restore"}:
+        if args.command in {"backup", "vacuum", "integrity", "restore", "rebuild-lots"}:
             config.validate()
 
         # Execute command
@@ -692,6 +752,7 @@ def main(argv: list[str] | None = None) -> int:
             "integrity": cmd_integrity,
             "list": cmd_list,
             "restore": cmd_restore,
+            "rebuild-lots": cmd_rebuild_lots,
         }
 
         command_func = commands.get(args.command)
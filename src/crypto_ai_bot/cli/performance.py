@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import inspect
 import json
 import sys
 from datetime import datetime, timedelta, timezone
@@ -138,7 +139,8 @@ class PerformanceReporter:
 
     def __init__(self, container: Any):
         self.container = container
-        self.storage = container.storage
+        # reports read from the reporting pool: never queue behind trading reads/writes
+        self.storage = getattr(container.storage, "reporting", container.storage)
         self.broker = container.broker
         self.settings = container.settings
 
@@ -198,8 +200,41 @@ class PerformanceReporter:
         try:
             # Trades for inclusive date range (storage typically expects date objects)
             trades_repo = getattr(self.storage, "trades", None)
+            rollups_repo = getattr(self.storage, "rollups", None)
             trades = []
-            if trades_repo and hasattr(trades_repo, "get_by_date_range"):
+            start_ms = int(start_date.timestamp() * 1000)
+            end_ms = int(end_date.timestamp() * 1000) + 1  # end inclusive
+            if rollups_repo is not None and hasattr(rollups_repo, "get_totals"):
+                # everything from trade_rollups buckets: O(buckets), not O(trades)
+                rollup = rollups_repo.get_totals(symbol, start_ms, end_ms)
+                if inspect.isawaitable(rollup):
+                    rollup = await rollup
+                metrics.trades_count = rollup.count
+                metrics.turnover = rollup.turnover_quote
+                metrics.fees_paid = rollup.fees_quote
+                metrics.realized_pnl = rollup.realized_quote
+                metrics.wins = rollup.wins
+                metrics.losses = rollup.losses
+                if rollup.wins > 0:
+                    metrics.avg_win = rollup.gross_profit_quote / rollup.wins
+                if rollup.losses > 0:
+                    metrics.avg_loss = -rollup.gross_loss_quote / rollup.losses
+            elif trades_repo and hasattr(trades_repo, "get_totals"):
+                # same trade_rollups buckets via the trades repository (dict shape)
+                totals = trades_repo.get_totals(symbol, start_ms, end_ms)
+                if inspect.isawaitable(totals):
+                    totals = await totals
+                metrics.trades_count = int(totals["count"])
+                metrics.turnover = totals["turnover_quote"]
+                metrics.fees_paid = totals["fees_quote"]
+                metrics.realized_pnl = totals["realized_pnl"]
+                metrics.wins = int(totals["wins"])
+                metrics.losses = int(totals["losses"])
+                if metrics.wins > 0:
+                    metrics.avg_win = totals["gross_profit_quote"] / metrics.wins
+                if metrics.losses > 0:
+                    metrics.avg_loss = -totals["gross_loss_quote"] / metrics.losses
+            elif trades_repo and hasattr(trades_repo, "get_by_date_range"):
                 # end_date inclusive (clip to date end)
                 trades = trades_repo.get_by_date_range(
                     symbol=symbol,
@@ -223,7 +258,8 @@ class PerformanceReporter:
                 price = dec(str(t.get("price", 0) or 0))
                 metrics.turnover += amount * price
 
-            metrics.trades_count = len(trades)
+            if trades:
+                metrics.trades_count = len(trades)
 
             # Unrealized PnL from broker position (object or dict)
             if hasattr(self.broker, "fetch_position"):
@@ -252,11 +288,11 @@ class PerformanceReporter:
                         metrics.unrealized_pnl = (current_price - entry_price) * amount
 
             # Average win/loss
-            if metrics.wins > 0:
+            if trades and metrics.wins > 0:
                 wins_sum = sum(dec(str(t.get("pnl", 0) or 0)) for t in trades if (t.get("pnl", 0) or 0) > 0)
                 metrics.avg_win = wins_sum / metrics.wins
 
-            if metrics.losses > 0:
+            if trades and metrics.losses > 0:
                 losses_sum = sum(abs(dec(str(t.get("pnl", 0) or 0))) for t in trades if (t.get("pnl", 0) or 0) < 0)
                 metrics.avg_loss = losses_sum / metrics.losses
 
@@ -118,6 +118,8 @@ DECISION_EVALUATED: Final[str] = "decision.evaluated"
 
 RECONCILIATION_STARTED: Final[str] = "reconciliation.started"
 RECONCILIATION_COMPLETED: Final[str] = "reconciliation.completed"
+BALANCES_UPDATED: Final[str] = "balances.updated"
+POSITIONS_UPDATED: Final[str] = POSITION_UPDATED  # position reconciler publishes to the position topic
 RECONCILE_POSITION_MISMATCH: Final[str] = "reconcile.position.mismatch"
 RECONCILE_BALANCE_MISMATCH: Final[str] = "reconcile.balance.mismatch"
 RECONCILE_ORDER_PHANTOM: Final[str] = "reconcile.order.phantom"
@@ -189,6 +191,8 @@ class OrderPayload(BaseEventPayload):
     price: Optional[str]  # Decimal as string
     status: str
     filled: Optional[str]  # Decimal as string
+    cost: str | None  # quote turnover of the fill, Decimal as string
+    average: str | None  # average fill price, Decimal as string
 
 
 class TradePayload(BaseEventPayload):
@@ -290,7 +294,9 @@ def build_order_event(
     price: Optional[Decimal],
     status: str,
     filled: Optional[Decimal],
-    trace_id: str
+    trace_id: str,
+    cost: Decimal | None = None,
+    average: Decimal | None = None,
 ) -> tuple[str, OrderPayload]:
     """Build order event with proper typing"""
     return topic, OrderPayload(
@@ -304,7 +310,9 @@ def build_order_event(
         amount=str(amount),
         price=str(price) if price else None,
         status=status,
-        filled=str(filled) if filled else None
+        filled=str(filled) if filled else None,
+        cost=str(cost) if cost else None,
+        average=str(average) if average else None,
     )
 
 
@@ -16,6 +16,7 @@ from enum import Enum
 from typing import Any, AsyncIterator, Optional, Protocol, runtime_checkable
 from typing import Callable, Awaitable
 
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
 from crypto_ai_bot.utils.decimal import dec
 
 
@@ -228,6 +229,33 @@ class BrokerPort(Protocol):
         ...
 
 
+# ============= MARKET DATA PORT =============
+
+@runtime_checkable
+class MarketDataPort(Protocol):
+    """
+    Read-side market data (cached view over the exchange).
+    Implementations: CCXTMarketData (REST polling), StreamingMarketData (watch_* push)
+    """
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "15m",
+        limit: int = 100
+    ) -> OHLCVFrame:
+        """Get OHLCV candles as a columnar frame (oldest first)"""
+        ...
+
+    async def get_ticker(self, symbol: str) -> TickerDTO | None:
+        """Get current ticker"""
+        ...
+
+    async def get_orderbook(self, symbol: str, limit: int = 20) -> dict[str, Any]:
+        """Get order book ({"bids": [...], "asks": [...]})"""
+        ...
+
+
 # ============= STORAGE PORTS (SEPARATED) =============
 
 @runtime_checkable
@@ -795,6 +823,7 @@ __all__ = [
     
     # Main Ports
     "BrokerPort",
+    "MarketDataPort",
     "StoragePort",
     "EventBusPort",
     "MacroDataPort",
@@ -4,6 +4,7 @@ import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
+import inspect
 from typing import Any, Mapping, Optional
 
 from crypto_ai_bot.core.application import events_topics as EVT
@@ -182,7 +183,7 @@ class ProtectiveExits:
 
     async def _evaluate_once(self, symbol: str) -> dict[str, Any] | None:
         """Выполнить оценку условий выхода один раз для symbol."""
-        pos = self._get_position(symbol)
+        pos = await self._get_position(symbol)
         if not pos:
             return {"status": "no_position", "all_closed": True}
 
@@ -299,23 +300,22 @@ class ProtectiveExits:
 
     # ---------- side-effects ----------
 
-    def _get_position(self, symbol: str) -> Optional[PositionDTO | Any]:
+    async def _get_position(self, symbol: str) -> PositionDTO | Any | None:
         """
         Унифицированный доступ к позиции из storage:
-        допускаются методы: get_position(symbol) или positions.get(symbol)
+        допускаются методы: get_position(symbol), positions.get_position(symbol) или positions.get(symbol);
+        репозиторий может быть синхронным или async (AsyncStorageFacade)
         """
-        # метод get_position()
-        if hasattr(self._storage, "get_position"):
+        repo = getattr(self._storage, "positions", None)
+        for owner, name in ((self._storage, "get_position"), (repo, "get_position"), (repo, "get")):
+            fn = getattr(owner, name, None) if owner is not None else None
+            if not callable(fn):
+                continue
             try:
-                return self._storage.get_position(symbol)  # type: ignore[no-any-return]
+                res = fn(symbol)
+                return await res if inspect.isawaitable(res) else res
             except Exception:
-                pass
-        # словарь positions
-        if hasattr(self._storage, "positions"):
-            try:
-                return getattr(self._storage, "positions").get(symbol)  # type: ignore[attr-defined]
-            except Exception:
-                pass
+                continue
         return None
 
     async def _sell(self, symbol: str, qty: Decimal, *, reason: str) -> bool:
@@ -33,6 +33,11 @@ def _iter_items(x: Any) -> list[Any]:
     return [x]
 
 
+async def _resolve(x: Any) -> Any:
+    """Репозиторий может быть sync или async: дожидаемся результата, если он awaitable."""
+    return await x if inspect.isawaitable(x) else x
+
+
 def _field(obj: Any, *names: str) -> Any:
     """
     Достаёт поле из dict/объекта по списку возможных имён.
@@ -168,7 +173,7 @@ class OrdersReconciler:
             )
 
             try:
-                local = self._fetch_local_open(symbol)
+                local = await self._fetch_local_open(symbol)
                 remote = await self._fetch_remote_open(symbol)
             except Exception as exc:
                 _log.error(
@@ -254,7 +259,7 @@ class OrdersReconciler:
             ]
         )
 
-    def _fetch_local_open(self, symbol: str) -> list[dict]:
+    async def _fetch_local_open(self, symbol: str) -> list[dict]:
         """
         Получает локальные открытые ордера из storage.
 
@@ -294,7 +299,7 @@ class OrdersReconciler:
                     # Если не смогли определить — пробуем обе формы
                     needs_symbol = True
 
-                items = method(symbol) if needs_symbol else method()
+                items = await _resolve(method(symbol) if needs_symbol else method())
                 normalized = [_normalize_order(x) for x in _iter_items(items)]
                 # Если метод «общий» (all/all_open), подфильтруем по символу/статусу
                 if method_name in ("all", "all_open"):
@@ -308,7 +313,7 @@ class OrdersReconciler:
             except TypeError:
                 # Вторая попытка — без аргумента (или наоборот — с аргументом)
                 try:
-                    items = method()
+                    items = await _resolve(method())
                     normalized = [_normalize_order(x) for x in _iter_items(items)]
                     if method_name in ("all", "all_open"):
                         normalized = [
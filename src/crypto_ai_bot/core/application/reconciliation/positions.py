@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
+import inspect
 from typing import Any, Optional, Mapping
 
 from crypto_ai_bot.core.application.ports import BrokerPort, EventBusPort, StoragePort
@@ -179,7 +180,7 @@ class PositionsReconciler:
             return {"ok": False, "symbol": symbol, "position_found": False, "price_updated": False, "reason": "no_valid_price"}
 
         # Получаем локальную позицию
-        position = self._get_local_position(symbol)
+        position = await self._get_local_position(symbol)
         if not position:
             return {"ok": True, "symbol": symbol, "position_found": False, "price_updated": False, "reason": "no_position"}
 
@@ -196,7 +197,7 @@ class PositionsReconciler:
         unrealized_pnl = (last_price - avg_entry) * base_qty
 
         # Обновляем last_price в позиции (без изменения количества)
-        updated = self._update_position_last_price(symbol, last_price)
+        updated = await self._update_position_last_price(symbol, last_price)
         if not updated:
             _log.debug("position_update_skipped", extra={"symbol": symbol, "trace_id": trace_id})
 
@@ -254,10 +255,11 @@ class PositionsReconciler:
 
         return dec("0")
 
-    def _get_local_position(self, symbol: str) -> Any:
-        """Получает локальную позицию из storage."""
+    async def _get_local_position(self, symbol: str) -> Any:
+        """Получает локальную позицию из storage (sync- или async-репозиторий)."""
         try:
-            return self.storage.positions.get_position(symbol)
+            res = self.storage.positions.get_position(symbol)
+            return await res if inspect.isawaitable(res) else res
         except Exception as exc:
             _log.warning("get_position_failed", extra={"symbol": symbol, "error": str(exc)})
             return None
@@ -279,7 +281,7 @@ class PositionsReconciler:
                 return dec(str(position.get(name, "0")))
         return dec("0")
 
-    def _update_position_last_price(self, symbol: str, last_price: Decimal) -> bool:
+    async def _update_position_last_price(self, symbol: str, last_price: Decimal) -> bool:
         """
         Обновляет last_price позиции без изменения количества.
         Стараемся использовать apply_trade(..., base_amount=0), иначе — специализированные методы.
@@ -290,7 +292,7 @@ class PositionsReconciler:
 
         # 1) Предпочтительно — apply_trade с нулевым количеством (не меняет объём)
         try:
-            repo.apply_trade(
+            res = repo.apply_trade(
                 symbol=symbol,
                 side="buy",  # фиктивный side
                 base_amount=dec("0"),
@@ -298,6 +300,8 @@ class PositionsReconciler:
                 fee_quote=dec("0"),
                 last_price=last_price,
             )
+            if inspect.isawaitable(res):
+                await res
             return True
         except Exception:
             pass
@@ -307,7 +311,9 @@ class PositionsReconciler:
             fn = getattr(repo, name, None)
             if callable(fn):
                 try:
-                    fn(symbol, last_price)  # type: ignore[misc]
+                    res = fn(symbol, last_price)  # type: ignore[misc]
+                    if inspect.isawaitable(res):
+                        await res
                     return True
                 except Exception:
                     continue
@@ -0,0 +1,87 @@
+"""
+Wiring of in-memory risk windows (core.domain.risk.windows) to storage and the event bus.
+
+- hydrate_risk_windows: на старте заполняет окна минутными корзинами trade_rollups за 24ч;
+- attach_risk_windows: дальше окна обновляются событием ORDER_EXECUTED.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from crypto_ai_bot.core.application import events_topics as evt
+from crypto_ai_bot.core.domain.risk.windows import RiskWindows
+from crypto_ai_bot.utils.decimal import dec
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.time import now_ms
+
+_log = get_logger("risk_windows")
+
+_HYDRATE_SPAN_MS = 86_400_000 + 60_000  # сутки + корзина края окна
+
+# symbol -> последняя цена (или None); для market-ордеров без цены исполнения
+LastPrice = Callable[[str], Any]
+
+
+def _turnover(symbol: str, payload: Any, last_price: LastPrice | None) -> Decimal:
+    """Оборот исполнения: cost, иначе filled * (average | price | последняя цена)."""
+    cost = dec(payload.get("cost"))
+    if cost > 0:
+        return cost
+    qty = dec(payload.get("filled") or payload.get("amount"))
+    price = dec(payload.get("average")) or dec(payload.get("price"))
+    if price <= 0 and last_price is not None:
+        try:
+            price = dec(last_price(symbol))
+        except Exception:  # noqa: BLE001
+            _log.warning("risk_windows_last_price_failed", extra={"symbol": symbol}, exc_info=True)
+    if price <= 0:
+        # нечем оценить: ордер учитывается в счётчике, но не в обороте
+        _log.warning("risk_windows_turnover_unknown", extra={"symbol": symbol})
+    return qty * price
+
+
+async def hydrate_risk_windows(
+    windows: RiskWindows,
+    storage: Any,
+    symbols: list[str],
+    *,
+    now: int | None = None,
+) -> list[str]:
+    """Гидрирует окна символов из storage.rollups; возвращает символы, которые удалось загрузить."""
+    ts = now_ms() if now is None else int(now)
+    hydrated: list[str] = []
+    for symbol in symbols:
+        try:
+            buckets = await storage.rollups.list_buckets(symbol, "1m", ts - _HYDRATE_SPAN_MS, ts + 1)
+        except Exception:  # noqa: BLE001
+            # без гидрации правила символа продолжают читать хранилище
+            _log.warning("risk_windows_hydrate_failed", extra={"symbol": symbol}, exc_info=True)
+            continue
+        windows.hydrate(symbol, buckets)
+        hydrated.append(symbol)
+    _log.info("risk_windows_hydrated", extra={"symbols": len(hydrated)})
+    return hydrated
+
+
+def attach_risk_windows(windows: RiskWindows, bus: Any, *, last_price: LastPrice | None = None) -> None:
+    """Подписывает окна на ORDER_EXECUTED; last_price — оценка оборота market-ордеров без цены."""
+
+    async def on_order_executed(event: Any) -> None:
+        payload = getattr(event, "payload", event)
+        symbol = payload.get("symbol")
+        if not symbol:
+            return
+        turnover = _turnover(symbol, payload, last_price)
+        windows.record(symbol, turnover, ts_ms=getattr(event, "ts_ms", 0) or None)
+
+    try:
+        # дешёвая in-memory запись: без очереди, чтобы следующая проверка риска уже видела ордер
+        bus.subscribe(evt.ORDER_EXECUTED, on_order_executed, delivery="inline")
+    except TypeError:  # шина без режимов доставки
+        bus.subscribe(evt.ORDER_EXECUTED, on_order_executed)
+
+
+__all__ = ["attach_risk_windows", "hydrate_risk_windows"]
@@ -343,12 +343,15 @@ class ExecuteTrade:
         amount: Decimal,
         trace_id: str
     ) -> RiskCheckResult:
-        """Check risk rules"""
-        return self._risk_manager.check_trade(
+        """Check risk rules (inputs fetched concurrently, first BLOCK short-circuits)"""
+        return await self._risk_manager.assess(
             symbol=symbol,
             side=side.value,
             amount=amount,
-            trace_id=trace_id
+            trace_id=trace_id,
+            trades_repo=getattr(self._storage, "trades", None),
+            positions_repo=getattr(self._storage, "positions", None),
+            broker=self._broker,
         )
     
     async def _execute_with_retries(
@@ -482,9 +485,12 @@ class ExecuteTrade:
             price=order.price,
             status=order.status.value,
             filled=order.filled,
-            trace_id=trace_id
+            trace_id=trace_id,
+            cost=dec((order.info or {}).get("cost")),
+            average=dec((order.info or {}).get("average")),
         )
-        await self._event_bus.publish(topic, payload, trace_id)
+        # the order is already placed: a bus failure is logged, not raised into the trade flow
+        await self._publish_event(topic, dict(payload), trace_id)
         
         # Trade completed
         await self._publish_event(
@@ -6,14 +6,21 @@ All rules return structured results that application layer can use.
 """
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, Protocol, runtime_checkable
+from typing import Any, Optional, Protocol, runtime_checkable
 
+from crypto_ai_bot.core.domain.risk.planner import RulePlanner
+from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot, build_snapshot, snapshot_sources
+from crypto_ai_bot.core.domain.risk.windows import RiskWindows
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import observe
 
 _log = get_logger(__name__)
 
@@ -131,6 +138,10 @@ class TradesRepository(Protocol):
         """Get daily turnover in quote currency"""
         ...
     
+    def turnover_quote_last_minutes(self, symbol: str, minutes: int) -> Decimal:
+        """Get turnover in quote currency for last N minutes"""
+        ...
+
     def get_loss_streak(self, symbol: str) -> int:
         """Get current loss streak"""
         ...
@@ -228,11 +239,25 @@ class RiskConfig:
 class BaseRiskRule:
     """Base class for risk rules"""
     
+    # RiskSnapshot fields the rule reads (RiskManager.assess fetches only these)
+    sources: tuple[str, ...] = ()
+    # counters come from RiskWindows when the symbol is tracked
+    windowed: bool = False
+
+    def needs(self, symbol: str, windows: RiskWindows | None = None) -> tuple[str, ...]:
+        """Snapshot fields needed to check this symbol"""
+        if self.windowed and windows is not None and windows.tracks(symbol):
+            return ()
+        return self.sources
+
     def check(
         self,
         symbol: str,
         trades_repo: Optional[TradesRepository] = None,
         positions_repo: Optional[PositionsRepository] = None,
+        *,
+        windows: RiskWindows | None = None,
+        snapshot: RiskSnapshot | None = None,
         **kwargs
     ) -> RiskCheckResult:
         """Check if rule is violated"""
@@ -244,15 +269,31 @@ class BaseRiskRule:
 class LossStreakRule(BaseRiskRule):
     """Block trading after N consecutive losses"""
     
+    sources = ("loss_streak",)
+
     def __init__(self, limit: int):
         self.limit = limit
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            streak = trades_repo.get_loss_streak(symbol)
+            if snapshot is not None:
+                streak = snapshot.loss_streak
+            elif trades_repo:
+                streak = trades_repo.get_loss_streak(symbol)
+            else:
+                streak = None
+            if streak is None:
+                return RiskCheckResult.allow()
             if streak >= self.limit:
                 return RiskCheckResult.block(
                     rule=RiskRuleType.LOSS_STREAK,
@@ -269,15 +310,31 @@ class LossStreakRule(BaseRiskRule):
 class MaxDrawdownRule(BaseRiskRule):
     """Block trading when drawdown exceeds limit"""
     
+    sources = ("drawdown_pct",)
+
     def __init__(self, max_pct: Decimal):
         self.max_pct = max_pct
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.max_pct <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.max_pct <= 0:
             return RiskCheckResult.allow()
         
         try:
-            drawdown = trades_repo.calculate_drawdown_pct(symbol)
+            if snapshot is not None:
+                drawdown = snapshot.drawdown_pct
+            elif trades_repo:
+                drawdown = trades_repo.calculate_drawdown_pct(symbol)
+            else:
+                drawdown = None
+            if drawdown is None:
+                return RiskCheckResult.allow()
             if drawdown >= self.max_pct:
                 return RiskCheckResult.block(
                     rule=RiskRuleType.MAX_DRAWDOWN,
@@ -294,15 +351,31 @@ class MaxDrawdownRule(BaseRiskRule):
 class DailyLossRule(BaseRiskRule):
     """Block trading when daily loss exceeds limit"""
     
+    sources = ("daily_pnl",)
+
     def __init__(self, limit_quote: Decimal):
         self.limit = limit_quote
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            daily_pnl = trades_repo.get_daily_pnl(symbol)
+            if snapshot is not None:
+                daily_pnl = snapshot.daily_pnl
+            elif trades_repo:
+                daily_pnl = trades_repo.get_daily_pnl(symbol)
+            else:
+                daily_pnl = None
+            if daily_pnl is None:
+                return RiskCheckResult.allow()
             if daily_pnl < -self.limit:
                 return RiskCheckResult.block(
                     rule=RiskRuleType.DAILY_LOSS,
@@ -319,15 +392,35 @@ class DailyLossRule(BaseRiskRule):
 class BudgetOrdersRule(BaseRiskRule):
     """Block trading when daily order count exceeds limit"""
     
+    sources = ("orders_24h",)
+    windowed = True
+
     def __init__(self, limit: int):
         self.limit = limit
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        windows: RiskWindows | None = None,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            count = trades_repo.count_orders_last_minutes(symbol, 1440)  # 24 hours
+            if windows is not None and windows.tracks(symbol):
+                count = windows.orders_last_24h(symbol)
+            elif snapshot is not None:
+                count = snapshot.orders_24h
+            elif trades_repo:
+                count = trades_repo.count_orders_last_minutes(symbol, 1440)  # 24 hours
+            else:
+                return RiskCheckResult.allow()
+            if count is None:
+                return RiskCheckResult.allow()
             if count >= self.limit:
                 return RiskCheckResult.block(
                     rule=RiskRuleType.BUDGET_ORDERS,
@@ -344,15 +437,35 @@ class BudgetOrdersRule(BaseRiskRule):
 class BudgetTurnoverRule(BaseRiskRule):
     """Block trading when daily turnover exceeds limit"""
     
+    sources = ("turnover_today",)
+    windowed = True
+
     def __init__(self, limit_quote: Decimal):
         self.limit = limit_quote
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        windows: RiskWindows | None = None,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            turnover = trades_repo.daily_turnover_quote(symbol)
+            if windows is not None and windows.tracks(symbol):
+                turnover = windows.turnover_today(symbol)
+            elif snapshot is not None:
+                turnover = snapshot.turnover_today
+            elif trades_repo:
+                turnover = trades_repo.daily_turnover_quote(symbol)
+            else:
+                return RiskCheckResult.allow()
+            if turnover is None:
+                return RiskCheckResult.allow()
             if turnover >= self.limit:
                 return RiskCheckResult.block(
                     rule=RiskRuleType.BUDGET_TURNOVER,
@@ -371,17 +484,32 @@ class BudgetTurnoverRule(BaseRiskRule):
 class CooldownRule(BaseRiskRule):
     """Enforce cooldown period between trades"""
     
+    sources = ("trades_today",)
+
     def __init__(self, cooldown_seconds: int):
         self.cooldown = cooldown_seconds
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.cooldown <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.cooldown <= 0:
             return RiskCheckResult.allow()
         
         try:
-            last_trade_time = trades_repo.get_last_trade_time(symbol)
+            if snapshot is not None:
+                last_trade_time = snapshot.last_trade_time
+            elif trades_repo:
+                last_trade_time = trades_repo.get_last_trade_time(symbol)
+            else:
+                last_trade_time = None
             if last_trade_time:
-                elapsed = (datetime.utcnow() - last_trade_time).total_seconds()
+                now = datetime.now(last_trade_time.tzinfo) if last_trade_time.tzinfo else datetime.utcnow()
+                elapsed = (now - last_trade_time).total_seconds()
                 if elapsed < self.cooldown:
                     remaining = self.cooldown - elapsed
                     return RiskCheckResult.reduce(
@@ -399,16 +527,25 @@ class CooldownRule(BaseRiskRule):
 class SpreadCapRule(BaseRiskRule):
     """Reduce position when spread is too high"""
     
+    sources = ("ticker",)
+
     def __init__(self, max_spread_pct: Decimal, spread_provider: Optional[callable] = None):
         self.max_spread = max_spread_pct
         self.spread_provider = spread_provider
     
-    def check(self, symbol: str, **kwargs) -> RiskCheckResult:
-        if not self.spread_provider or self.max_spread <= 0:
+    def check(self, symbol: str, *, snapshot: RiskSnapshot | None = None, **kwargs) -> RiskCheckResult:
+        if self.max_spread <= 0:
             return RiskCheckResult.allow()
         
         try:
-            current_spread = self.spread_provider(symbol)
+            if snapshot is not None:
+                current_spread = snapshot.spread_pct
+            elif self.spread_provider:
+                current_spread = self.spread_provider(symbol)
+            else:
+                current_spread = None
+            if current_spread is None:
+                return RiskCheckResult.allow()
             if current_spread > self.max_spread:
                 # Reduce position size proportionally
                 reduction = min(dec("75"), (current_spread / self.max_spread - 1) * 100)
@@ -427,25 +564,39 @@ class SpreadCapRule(BaseRiskRule):
 class CorrelationRule(BaseRiskRule):
     """Warn about correlated positions"""
     
+    sources = ("open_positions",)
+
     def __init__(self, groups: list[list[str]]):
         self.groups = groups
     
+    def needs(self, symbol: str, windows: RiskWindows | None = None) -> tuple[str, ...]:
+        return self.sources if any(symbol in group for group in self.groups) else ()
+
     def check(
         self,
         symbol: str,
         positions_repo: Optional[PositionsRepository] = None,
+        *,
+        snapshot: RiskSnapshot | None = None,
         **kwargs
     ) -> RiskCheckResult:
-        if not positions_repo or not self.groups:
+        if not self.groups:
             return RiskCheckResult.allow()
         
+        if snapshot is not None:
+            has_open_position = snapshot.open_symbols.__contains__
+        elif positions_repo is not None:
+            has_open_position = positions_repo.has_open_position
+        else:
+            return RiskCheckResult.allow()
+
         try:
             # Find which group this symbol belongs to
             for group in self.groups:
                 if symbol in group:
                     # Check if any other symbol in group has position
                     for other_symbol in group:
-                        if other_symbol != symbol and positions_repo.has_open_position(other_symbol):
+                        if other_symbol != symbol and has_open_position(other_symbol):
                             return RiskCheckResult.warn(
                                 rule=RiskRuleType.CORRELATION,
                                 reason=f"Correlated position exists: {other_symbol}",
@@ -462,15 +613,35 @@ class CorrelationRule(BaseRiskRule):
 class Orders5MinuteRule(BaseRiskRule):
     """Monitor order frequency"""
     
+    sources = ("orders_5m",)
+    windowed = True
+
     def __init__(self, limit: int):
         self.limit = limit
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        windows: RiskWindows | None = None,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            count = trades_repo.count_orders_last_minutes(symbol, 5)
+            if windows is not None and windows.tracks(symbol):
+                count = windows.orders_last_5m(symbol)
+            elif snapshot is not None:
+                count = snapshot.orders_5m
+            elif trades_repo:
+                count = trades_repo.count_orders_last_minutes(symbol, 5)
+            else:
+                return RiskCheckResult.allow()
+            if count is None:
+                return RiskCheckResult.allow()
             if count >= self.limit:
                 return RiskCheckResult.warn(
                     rule=RiskRuleType.ORDERS_5M,
@@ -486,17 +657,41 @@ class Orders5MinuteRule(BaseRiskRule):
 class Turnover5MinuteRule(BaseRiskRule):
     """Monitor turnover rate"""
     
+    sources = ("turnover_5m",)
+    windowed = True
+
     def __init__(self, limit_quote: Decimal):
         self.limit = limit_quote
     
-    def check(self, symbol: str, trades_repo: Optional[TradesRepository] = None, **kwargs) -> RiskCheckResult:
-        if not trades_repo or self.limit <= 0:
+    def check(
+        self,
+        symbol: str,
+        trades_repo: TradesRepository | None = None,
+        *,
+        windows: RiskWindows | None = None,
+        snapshot: RiskSnapshot | None = None,
+        **kwargs
+    ) -> RiskCheckResult:
+        if self.limit <= 0:
             return RiskCheckResult.allow()
         
         try:
-            # This would need a method to get 5-minute turnover
-            # For now, just return allow
-            pass
+            if windows is not None and windows.tracks(symbol):
+                turnover = windows.turnover_last_5m(symbol)
+            elif snapshot is not None:
+                turnover = snapshot.turnover_5m
+            elif trades_repo:
+                turnover = trades_repo.turnover_quote_last_minutes(symbol, 5)
+            else:
+                return RiskCheckResult.allow()
+            if turnover is None:
+                return RiskCheckResult.allow()
+            if turnover >= self.limit:
+                return RiskCheckResult.warn(
+                    rule=RiskRuleType.TURNOVER_5M,
+                    reason=f"High turnover: {turnover} in 5min",
+                    turnover=turnover
+                )
         except Exception as e:
             _log.error(f"5min turnover check failed: {e}")
         
@@ -509,10 +704,16 @@ class RiskManager:
     """
     Aggregates all risk rules and evaluates trading decisions.
     Pure domain logic - no side effects, returns structured results.
+
+    Order/turnover budgets of hydrated symbols are read from in-memory
+    sliding windows (see risk.windows); other symbols fall back to trades_repo.
+    Rule order adapts to observed cost and block rate (see risk.planner).
     """
     
-    def __init__(self, config: RiskConfig):
+    def __init__(self, config: RiskConfig, windows: RiskWindows | None = None):
         self.config = config
+        self.windows = windows if windows is not None else RiskWindows()
+        self.planner = RulePlanner()
         
         # Critical rules (BLOCK)
         self.critical_rules = [
@@ -536,57 +737,61 @@ class RiskManager:
             Turnover5MinuteRule(config.max_turnover_5m_quote),
         ]
     
-    def check_trade(
+    def _run_rule(
         self,
+        rule: BaseRiskRule,
         symbol: str,
-        side: str,
-        amount: Decimal,
-        trace_id: str,
-        trades_repo: Optional[TradesRepository] = None,
-        positions_repo: Optional[PositionsRepository] = None,
-        spread_provider: Optional[Callable[[str], Decimal]] = None
+        started: float | None = None,
+        trades_repo: TradesRepository | None = None,
+        positions_repo: PositionsRepository | None = None,
+        snapshot: RiskSnapshot | None = None
     ) -> RiskCheckResult:
         """
-        Check if trade is allowed according to all risk rules.
-        
-        Returns structured result with action to take.
-        Application layer decides how to handle the result.
+        Run one rule, record its evaluation time and feed the planner.
+        `started` - when the rule began waiting for its inputs (planner cost includes the wait).
         """
-        
-        # Check critical rules first (can BLOCK)
-        for rule in self.critical_rules:
+        t0 = time.perf_counter()
+        result: RiskCheckResult | None = None
+        try:
             result = rule.check(
                 symbol=symbol,
                 trades_repo=trades_repo,
-                positions_repo=positions_repo
+                positions_repo=positions_repo,
+                windows=self.windows,
+                snapshot=snapshot
             )
-            if result.action == RiskAction.BLOCK:
-                _log.warning(
-                    f"Trade blocked by {result.triggered_rule}",
-                    extra={
-                        "trace_id": trace_id,
-                        "symbol": symbol,
-                        "reason": result.reason,
-                        "rule": result.triggered_rule.value if result.triggered_rule else None
-                    }
-                )
-                return result
-        
-        # Check soft rules (can REDUCE)
+            return result
+        finally:
+            t1 = time.perf_counter()
+            observe("risk_rule_eval_ms", (t1 - t0) * 1000.0, {"rule": type(rule).__name__})
+            blocked = result is not None and result.action == RiskAction.BLOCK
+            self.planner.record(rule, (t1 - (t0 if started is None else started)) * 1000.0, blocked)
+
+    def _blocked(self, result: RiskCheckResult, symbol: str, trace_id: str) -> RiskCheckResult:
+        _log.warning(
+            f"Trade blocked by {result.triggered_rule}",
+            extra={
+                "trace_id": trace_id,
+                "symbol": symbol,
+                "reason": result.reason,
+                "rule": result.triggered_rule.value if result.triggered_rule else None
+            }
+        )
+        return result
+
+    def _conclude(
+        self,
+        soft_results: Iterable[RiskCheckResult],
+        monitoring_results: Iterable[RiskCheckResult],
+        symbol: str,
+        trace_id: str
+    ) -> RiskCheckResult:
+        """Combine results of non-blocking rules (monitoring results are consumed only without a reduction)"""
+        # Soft rules (can REDUCE)
         reduction_pct = dec("0")
         soft_warnings = []
         
-        for rule in self.soft_rules:
-            if isinstance(rule, SpreadCapRule) and spread_provider:
-                # Pass custom spread provider if available
-                rule.spread_provider = spread_provider
-            
-            result = rule.check(
-                symbol=symbol,
-                trades_repo=trades_repo,
-                positions_repo=positions_repo
-            )
-            
+        for result in soft_results:
             if result.action == RiskAction.REDUCE:
                 # Accumulate reductions
                 rule_reduction = dec(result.metadata.get("reduction_pct", "0"))
@@ -601,13 +806,8 @@ class RiskManager:
                 reduction_pct=reduction_pct
             )
         
-        # Check monitoring rules (WARN only)
-        for rule in self.monitoring_rules:
-            result = rule.check(
-                symbol=symbol,
-                trades_repo=trades_repo,
-                positions_repo=positions_repo
-            )
+        # Monitoring rules (WARN only)
+        for result in monitoring_results:
             if result.action == RiskAction.WARN:
                 _log.info(
                     f"Risk warning: {result.reason}",
@@ -618,27 +818,203 @@ class RiskManager:
         # All checks passed
         return RiskCheckResult.allow()
     
+    def check_trade(
+        self,
+        symbol: str,
+        side: str,
+        amount: Decimal,
+        trace_id: str,
+        trades_repo: TradesRepository | None = None,
+        positions_repo: PositionsRepository | None = None,
+        spread_provider: Callable[[str], Decimal] | None = None,
+        snapshot: RiskSnapshot | None = None
+    ) -> RiskCheckResult:
+        """
+        Check if trade is allowed according to all risk rules.
+
+        With a snapshot, rules read only the snapshot (and in-memory windows);
+        repos and spread_provider are ignored.
+        Critical rules run in planner order (cheapest likely block first).
+        Returns structured result with action to take.
+        Application layer decides how to handle the result.
+        """
+        if snapshot is not None:
+            trades_repo = positions_repo = None
+
+        # Check critical rules first (can BLOCK)
+        for rule in self.planner.order(self.critical_rules):
+            result = self._run_rule(
+                rule, symbol, trades_repo=trades_repo, positions_repo=positions_repo, snapshot=snapshot
+            )
+            if result.action == RiskAction.BLOCK:
+                return self._blocked(result, symbol, trace_id)
+
+        if spread_provider:
+            for rule in self.soft_rules:
+                if isinstance(rule, SpreadCapRule):
+                    # Pass custom spread provider if available
+                    rule.spread_provider = spread_provider
+
+        return self._conclude(
+            [
+                self._run_rule(rule, symbol, trades_repo=trades_repo, positions_repo=positions_repo, snapshot=snapshot)
+                for rule in self.soft_rules
+            ],
+            (
+                self._run_rule(rule, symbol, trades_repo=trades_repo, positions_repo=positions_repo, snapshot=snapshot)
+                for rule in self.monitoring_rules
+            ),
+            symbol,
+            trace_id
+        )
+
+    async def assess(
+        self,
+        symbol: str,
+        side: str,
+        amount: Decimal,
+        trace_id: str,
+        trades_repo: Any = None,
+        positions_repo: Any = None,
+        broker: Any = None,
+        is_closing: bool = False
+    ) -> RiskCheckResult:
+        """
+        Async check_trade with planned I/O (repos/broker may be sync or async).
+
+        Critical rules decide first: those that need no fetch (windows-backed
+        budgets) run in planner order, the rest run concurrently, each awaiting
+        only its own snapshot fields. The first BLOCK cancels the critical rules
+        still in flight, so a blocked trade costs the cheapest blocking rule.
+        Soft and monitoring rules run only for a trade that passed, all to
+        completion. A snapshot field is fetched once and shared by all rules.
+        """
+        t0 = time.perf_counter()
+        factories = snapshot_sources(
+            symbol,
+            trades_repo=trades_repo,
+            positions_repo=positions_repo,
+            broker=broker,
+            related_symbols=self.related_symbols(symbol)
+        )
+        rules = [*self.critical_rules, *self.soft_rules, *self.monitoring_rules]
+        advisory = [*self.soft_rules, *self.monitoring_rules]
+        needs = {id(rule): [k for k in rule.needs(symbol, self.windows) if k in factories] for rule in rules}
+        fetches: dict[str, asyncio.Future[Any]] = {}
+        results: dict[int, RiskCheckResult] = {}
+
+        def snapshot_of(values: dict[str, Any], errors: list[str]) -> RiskSnapshot:
+            return build_snapshot(symbol, values, side=side, amount=amount, is_closing=is_closing, errors=errors)
+
+        async def evaluate(rule: BaseRiskRule) -> RiskCheckResult:
+            started = time.perf_counter()
+            values: dict[str, Any] = {}
+            errors: list[str] = []
+            for key in needs[id(rule)]:
+                if key not in fetches:
+                    fetches[key] = asyncio.ensure_future(factories[key]())
+                try:
+                    # shield: cancelling one rule must not cancel a fetch other rules await
+                    values[key] = await asyncio.shield(fetches[key])
+                except Exception as e:  # noqa: BLE001
+                    errors.append(key)
+                    _log.warning(f"Risk source {key} failed: {e}", extra={"trace_id": trace_id, "symbol": symbol})
+            result = self._run_rule(rule, symbol, started=started, snapshot=snapshot_of(values, errors))
+            observe("risk_rule_latency_ms", (time.perf_counter() - started) * 1000.0, {"rule": type(rule).__name__})
+            results[id(rule)] = result
+            return result
+
+        def is_block(result: RiskCheckResult) -> bool:
+            return result.action == RiskAction.BLOCK
+
+        block, deferred = self._run_unfetched(symbol, needs, results, snapshot_of({}, []))
+        try:
+            if block is None and deferred:
+                planned: tuple[RiskCheckResult | None, list[RiskCheckResult]]
+                planned = await self.planner.run(deferred, evaluate, is_block)
+                block = planned[0]
+            if block is None:
+                # soft/monitoring rules never short-circuit: evaluate all of them
+                await asyncio.gather(*(evaluate(rule) for rule in advisory))
+        finally:
+            for fut in fetches.values():
+                if not fut.done():
+                    fut.cancel()
+
+        outcome = self._outcome(block, results, symbol, trace_id)
+        observe("risk_assess_ms", (time.perf_counter() - t0) * 1000.0, {"action": outcome.action.value})
+        return outcome
+
+    def _run_unfetched(
+        self,
+        symbol: str,
+        needs: dict[int, list[str]],
+        results: dict[int, RiskCheckResult],
+        snapshot: RiskSnapshot
+    ) -> tuple[RiskCheckResult | None, list[BaseRiskRule]]:
+        """Critical rules without fetches, in planner order, up to the first BLOCK; returns the rest."""
+        deferred = []
+        for rule in self.planner.order(self.critical_rules):
+            if needs[id(rule)]:
+                deferred.append(rule)
+                continue
+            result = results[id(rule)] = self._run_rule(rule, symbol, snapshot=snapshot)
+            if result.action == RiskAction.BLOCK:
+                return result, deferred
+        return None, deferred
+
+    def _outcome(
+        self,
+        block: RiskCheckResult | None,
+        results: dict[int, RiskCheckResult],
+        symbol: str,
+        trace_id: str
+    ) -> RiskCheckResult:
+        if block is not None:
+            return self._blocked(block, symbol, trace_id)
+        return self._conclude(
+            [results[id(rule)] for rule in self.soft_rules],
+            [results[id(rule)] for rule in self.monitoring_rules],
+            symbol,
+            trace_id
+        )
+
+    def evaluate(self, snapshot: RiskSnapshot, trace_id: str) -> RiskCheckResult:
+        """Evaluate all rules against one pre-fetched snapshot (pure CPU, no I/O)"""
+        return self.check_trade(
+            symbol=snapshot.symbol,
+            side=snapshot.side,
+            amount=snapshot.amount,
+            trace_id=trace_id,
+            snapshot=snapshot
+        )
+
     def can_execute(
         self,
         symbol: str,
         trades_repo: Optional[TradesRepository] = None,
-        positions_repo: Optional[PositionsRepository] = None
+        positions_repo: PositionsRepository | None = None,
+        snapshot: RiskSnapshot | None = None
     ) -> bool:
         """
         Quick check if trade can be executed.
         Returns bool for backward compatibility.
         """
+        if snapshot is not None:
+            trades_repo = positions_repo = None
         # Only check critical rules for quick decision
         for rule in self.critical_rules:
-            result = rule.check(
-                symbol=symbol,
-                trades_repo=trades_repo,
-                positions_repo=positions_repo
+            result = self._run_rule(
+                rule, symbol, trades_repo=trades_repo, positions_repo=positions_repo, snapshot=snapshot
             )
             if result.action == RiskAction.BLOCK:
                 return False
         return True
 
+    def related_symbols(self, symbol: str) -> list[str]:
+        """Symbols whose positions the correlation rule needs for this symbol"""
+        return sorted({s for group in self.config.correlation_groups if symbol in group for s in group})
+
 
 # ============= EXPORT =============
 
@@ -648,6 +1024,9 @@ __all__ = [
     "RiskCheckResult",
     "RiskAction",
     "RiskRuleType",
+    "RiskSnapshot",
+    "RiskWindows",
+    "RulePlanner",
     "TradesRepository",
     "PositionsRepository",
 ]
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Risk evaluation planner - cost-ordered, short-circuiting rule execution.
+Планировщик оценки риск-правил.
+
+Порядок правил — по наблюдаемой стоимости и вероятности блокировки: для цепочки
+«первый BLOCK завершает решение» ожидаемое время минимально при сортировке по
+cost / P(block). Статистика — EWMA задержки и сглаженная (Лаплас) частота BLOCK.
+
+run() запускает независимые правила конкурентно и отменяет все незавершённые,
+как только пришёл первый BLOCK: заблокированная сделка отклоняется за время
+самого быстрого блокирующего правила. Отменённое правило не дало исхода, но
+проработало не меньше времени до отмены: эта оценка снизу идёт в его стоимость,
+иначе медленные правила, которые всегда отменяются, навсегда остаются «бесплатными».
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+
+
+@dataclass
+class RuleStats:
+    """Наблюдения по одному правилу."""
+
+    cost_ms: float = 0.0
+    runs: int = 0
+    blocks: int = 0
+
+    @property
+    def block_probability(self) -> float:
+        return (self.blocks + 1) / (self.runs + 2)
+
+    @property
+    def rank(self) -> float:
+        # правило без наблюдений стоит «как все» — стабильная сортировка сохраняет заявленный порядок
+        return self.cost_ms / self.block_probability
+
+
+class RulePlanner:
+    """Порядок и исполнение правил; ключ статистики — имя класса правила."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = float(alpha)
+        self._stats: dict[str, RuleStats] = {}
+
+    @staticmethod
+    def name(rule: Any) -> str:
+        return type(rule).__name__
+
+    def stats(self, rule: Any) -> RuleStats:
+        return self._stats.setdefault(self.name(rule), RuleStats())
+
+    def record(self, rule: Any, cost_ms: float, blocked: bool) -> None:
+        st = self.stats(rule)
+        st.cost_ms = (
+            float(cost_ms) if st.runs == 0 else st.cost_ms + self.alpha * (float(cost_ms) - st.cost_ms)
+        )
+        st.runs += 1
+        st.blocks += 1 if blocked else 0
+
+    def record_cancelled(self, rule: Any, elapsed_ms: float) -> None:
+        """Правило отменено через elapsed_ms: исход неизвестен, стоимость — не меньше elapsed_ms."""
+        st = self.stats(rule)
+        st.cost_ms = max(st.cost_ms, float(elapsed_ms))
+
+    def order(self, rules: Iterable[Any]) -> list[Any]:
+        """Правила в порядке возрастания cost / P(block)."""
+        return sorted(rules, key=lambda rule: self.stats(rule).rank)
+
+    async def run(
+        self,
+        rules: Iterable[Any],
+        evaluate: Callable[[Any], Awaitable[R]],
+        is_block: Callable[[R], bool],
+    ) -> tuple[R | None, list[R]]:
+        """
+        Конкурентно оценивает правила (задачи стартуют в порядке order()).
+        Возвращает (первый BLOCK либо None, результаты завершившихся правил);
+        после BLOCK остальные задачи отменяются (с записью record_cancelled).
+        """
+        ordered = self.order(rules)
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(evaluate(rule)) for rule in ordered]
+        results: list[R] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if is_block(result):
+                    return result, results
+                results.append(result)
+            return None, results
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            for rule, task in zip(ordered, tasks, strict=False):
+                if not task.done():
+                    task.cancel()
+                    self.record_cancelled(rule, elapsed_ms)
+
+
+__all__ = ["RulePlanner", "RuleStats"]
@@ -6,13 +6,17 @@ Prevents overtrading and emotional decisions by requiring cooldown period.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Optional, Callable, Awaitable, Iterable, Tuple, Dict
+from typing import TYPE_CHECKING, Any, Optional
 
 from crypto_ai_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot
+
 _log = get_logger(__name__)
 
 
@@ -213,8 +217,8 @@ class CooldownRule:
             config: Rule configuration
         """
         self.config = config
-        self._consecutive_trades: Dict[str, int] = {}
-        self._last_progressive_reset: Dict[str, datetime] = {}
+        self._consecutive_trades: dict[str, int] = {}
+        self._last_progressive_reset: dict[str, datetime] = {}
 
     async def check(
         self,
@@ -243,7 +247,27 @@ class CooldownRule:
 
         # Last trade (time + outcome)
         last_trade_info = await self._get_last_trade_info(symbol, trades_repo)
+        return self._decide(symbol, last_trade_info, is_closing)
+
+    def evaluate(self, snapshot: RiskSnapshot) -> RuleCheckResult:
+        """Pure evaluation over a pre-fetched RiskSnapshot: last trade from today's trades."""
+        if not self.config.is_enabled():
+            return self._create_disabled_result()
+
+        if snapshot.is_closing and self.config.allow_closes_during_cooldown:
+            return self._create_allowed_close_result()
+
+        last_trade = snapshot.last_trade
+        last_trade_info = self._extract_trade_info(last_trade) if last_trade is not None else None
+        return self._decide(snapshot.symbol, last_trade_info, snapshot.is_closing)
 
+    def _decide(
+        self,
+        symbol: str,
+        last_trade_info: tuple[datetime, str] | None,
+        is_closing: bool,
+    ) -> RuleCheckResult:
+        """Compare time since the last trade with the required cooldown."""
         if last_trade_info is None:
             # No previous trades — allow
             return self._create_result(
@@ -302,7 +326,7 @@ class CooldownRule:
         self,
         symbol: str,
         trades_repo: Any
-    ) -> Optional[Tuple[datetime, str]]:
+    ) -> tuple[datetime, str] | None:
         """Get information about the last trade (tolerant to repo shape)."""
         # 1) get_last_trade(symbol)
         if hasattr(trades_repo, "get_last_trade"):
@@ -348,7 +372,7 @@ class CooldownRule:
 
     def _extract_trade_time(self, trade: Any) -> Optional[datetime]:
         """Extract timestamp from trade record."""
-        for field in ["timestamp", "ts", "time", "created_at", "executed_at"]:
+        for field in ["timestamp", "ts_ms", "ts", "time", "created_at", "executed_at"]:
             val = _get(trade, field, None)
             if val is not None:
                 dt = _parse_trade_time(val)
@@ -356,7 +380,7 @@ class CooldownRule:
                     return dt
         return None
 
-    def _extract_trade_info(self, trade: Any) -> Tuple[datetime, str]:
+    def _extract_trade_info(self, trade: Any) -> tuple[datetime, str]:
         """Extract time and outcome from trade (win/loss/breakeven/error/unknown)."""
         trade_time = self._extract_trade_time(trade) or datetime.now(timezone.utc)
 
@@ -6,15 +6,19 @@ Prevents holding correlated positions that amplify risk.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Optional, Callable, Awaitable, Iterable, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Optional
 
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot
+
 _log = get_logger(__name__)
 
 
@@ -247,13 +251,38 @@ class CorrelationManager:
 
         # Open positions (symbol → {"size": Decimal, "value": Decimal})
         open_positions = await self._get_open_positions(positions_repo)
+        return self._decide(symbol, open_positions, position_size, account_balance)
+
+    def evaluate(self, snapshot: RiskSnapshot) -> RuleCheckResult:
+        """Pure evaluation over a pre-fetched RiskSnapshot (no repository access)."""
+        if not self.config.is_enabled():
+            return self._create_disabled_result(snapshot.symbol)
+
+        if snapshot.is_closing and self.config.allow_closes:
+            return self._create_allowed_close_result(snapshot.symbol)
+
+        return self._decide(
+            snapshot.symbol,
+            self._positions_from_items(snapshot.open_positions),
+            position_size=snapshot.amount_quote or None,
+            account_balance=snapshot.balance_quote,
+        )
+
+    def _decide(
+        self,
+        symbol: str,
+        open_positions: dict[str, dict[str, Decimal]],
+        position_size: Decimal | None,
+        account_balance: Decimal | None,
+    ) -> RuleCheckResult:
+        """Apply group/exposure policy to the open positions."""
         norm_symbol = _norm_symbol(symbol)
 
         # Group for the target symbol
         group = self.config.find_group(norm_symbol)
 
         # Calculate metrics
-        metrics = await self._calculate_metrics(
+        metrics = self._calculate_metrics(
             symbol=norm_symbol,
             group=group,
             open_positions=open_positions,
@@ -272,13 +301,7 @@ class CorrelationManager:
 
         # For other groups, enforce max positions
         if group and metrics.correlated_positions:
-            # Determine effective max positions for this group
-            max_positions = group.max_positions
-            # Safety: if someone configured 0 for non-ANTI, treat as 1
-            if max_positions < 0:
-                max_positions = 0
-            if group.correlation_type != CorrelationType.ANTI and max_positions == 0:
-                max_positions = 1
+            max_positions = self._max_positions(group)
 
             # Count open positions in group (excluding the prospective one)
             already_open = len(metrics.correlated_positions)
@@ -322,9 +345,18 @@ class CorrelationManager:
             group=group,
         )
 
+    @staticmethod
+    def _max_positions(group: CorrelationGroup) -> int:
+        """Effective max positions for a group."""
+        max_positions = max(group.max_positions, 0)
+        # Safety: if someone configured 0 for non-ANTI, treat as 1
+        if group.correlation_type != CorrelationType.ANTI and max_positions == 0:
+            max_positions = 1
+        return max_positions
+
     # ---------- internals ----------
 
-    async def _get_open_positions(self, positions_repo: Any) -> Dict[str, Dict[str, Decimal]]:
+    async def _get_open_positions(self, positions_repo: Any) -> dict[str, dict[str, Decimal]]:
         """Get open positions from repository (sync/async tolerant)."""
         items = None
 
@@ -338,7 +370,11 @@ class CorrelationManager:
                 except Exception:
                     continue
 
-        positions: Dict[str, Dict[str, Decimal]] = {}
+        return self._positions_from_items(items)
+
+    def _positions_from_items(self, items: Any) -> dict[str, dict[str, Decimal]]:
+        """Normalize position records (dicts or objects) to symbol → {"size", "value"}."""
+        positions: dict[str, dict[str, Decimal]] = {}
         if not items:
             return positions
 
@@ -363,11 +399,11 @@ class CorrelationManager:
 
         return positions
 
-    async def _calculate_metrics(
+    def _calculate_metrics(
         self,
         symbol: str,
         group: Optional[CorrelationGroup],
-        open_positions: Dict[str, Dict[str, Decimal]],
+        open_positions: dict[str, dict[str, Decimal]],
         position_size: Optional[Decimal],
         account_balance: Optional[Decimal],
     ) -> CorrelationMetrics:
@@ -6,15 +6,19 @@ Blocks trading when daily realized PnL reaches configured threshold.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Optional, Callable, Awaitable, Iterable
+from typing import TYPE_CHECKING, Any, Optional
 
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot
+
 _log = get_logger(__name__)
 
 
@@ -229,7 +233,35 @@ class DailyLossRule:
             position=position,
             current_price=current_price,
         )
+        return self._decide(metrics)
+
+    def evaluate(self, snapshot: RiskSnapshot) -> RuleCheckResult:
+        """
+        Pure evaluation over a pre-fetched RiskSnapshot (no repository access, no cache).
+
+        The snapshot carries trades of the current UTC day; with a reset hour the
+        period is cut to trades after the reset.
+        """
+        if not self.config.is_enabled():
+            return self._create_disabled_result()
+
+        if snapshot.is_closing and self.config.allow_closes_after_limit:
+            return self._create_allowed_close_result()
+
+        period_start, period_end = self._get_period_boundaries()
+        start_ms = int(period_start.timestamp() * 1000)
+        trades = [t for t in snapshot.trades_today if int(_get(t, "ts_ms", start_ms) or start_ms) >= start_ms]
+        metrics = self._metrics_from_trades(
+            trades,
+            position=snapshot.position,
+            current_price=snapshot.last_price or None,
+            period_start=period_start,
+            period_end=period_end,
+        )
+        return self._decide(metrics)
 
+    def _decide(self, metrics: DailyLossMetrics) -> RuleCheckResult:
+        """Compare daily PnL metrics against the configured thresholds."""
         # Choose realized or total PnL for comparison
         pnl_to_check = metrics.total_pnl if self.config.include_unrealized else metrics.realized_pnl
 
@@ -290,6 +322,25 @@ class DailyLossRule:
             end=period_end,
         )
 
+        metrics = self._metrics_from_trades(
+            trades,
+            position=position,
+            current_price=current_price,
+            period_start=period_start,
+            period_end=period_end,
+        )
+        self._cached_metrics = metrics
+        return metrics
+
+    def _metrics_from_trades(
+        self,
+        trades: list[dict[str, Any]],
+        position: Any | None,
+        current_price: Decimal | None,
+        period_start: datetime,
+        period_end: datetime,
+    ) -> DailyLossMetrics:
+        """Daily PnL metrics from the period's trades (pure)."""
         # Realized PnL/fees accumulation
         realized_pnl = dec("0")
         fees_paid = dec("0")
@@ -322,7 +373,7 @@ class DailyLossRule:
         if self.config.include_unrealized and position is not None and current_price:
             unrealized_pnl = self._calculate_unrealized_pnl(position, current_price)
 
-        metrics = DailyLossMetrics(
+        return DailyLossMetrics(
             realized_pnl=realized_pnl,
             unrealized_pnl=unrealized_pnl,
             total_pnl=realized_pnl + unrealized_pnl,
@@ -335,9 +386,6 @@ class DailyLossRule:
             period_end=period_end,
         )
 
-        self._cached_metrics = metrics
-        return metrics
-
     def _normalize_reset_hour(self, hour: Optional[int]) -> Optional[int]:
         """Clamp reset hour to [0, 23] if provided."""
         if hour is None:
@@ -6,16 +6,20 @@ Calculates equity curve from realized PnL using FIFO with fees.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Optional, Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Optional
 
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 from crypto_ai_bot.utils.pnl import FIFOCalculator  # use the shared calculator
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot
+
 _log = get_logger(__name__)
 
 
@@ -213,7 +217,35 @@ class MaxDrawdownRule:
             position=position,
             current_price=current_price,
         )
+        return self._decide(metrics)
+
+    def evaluate(self, snapshot: RiskSnapshot) -> RuleCheckResult:
+        """
+        Pure evaluation over a pre-fetched RiskSnapshot (no repository access).
+
+        The snapshot carries today's trades only, so lookback_hours is not applied here.
+        """
+        if not self.config.is_enabled():
+            return self._create_result(
+                action=RuleAction.ALLOW,
+                severity=RuleSeverity.INFO,
+                reason="Rule disabled",
+                current_equity=dec("0"),
+                peak_equity=dec("0"),
+                drawdown_pct=0.0,
+                trades_count=0,
+            )
+
+        metrics = self._drawdown_from_trades(
+            symbol=snapshot.symbol,
+            trades=list(snapshot.trades_today),
+            position=snapshot.position,
+            current_price=snapshot.last_price or None,
+        )
+        return self._decide(metrics)
 
+    def _decide(self, metrics: DrawdownMetrics) -> RuleCheckResult:
+        """Compare drawdown metrics against the configured thresholds."""
         # Check thresholds
         max_dd = float(self.config.max_drawdown_pct)
         warning_dd = float(self.config.get_warning_level())
@@ -256,7 +288,16 @@ class MaxDrawdownRule:
         """Calculate current drawdown metrics."""
         # Get trades based on lookback period
         trades = await self._get_trades(symbol, trades_repo)
+        return self._drawdown_from_trades(symbol, trades, position, current_price)
 
+    def _drawdown_from_trades(
+        self,
+        symbol: str,
+        trades: list[dict[str, Any]],
+        position: Any | None = None,
+        current_price: Decimal | None = None
+    ) -> DrawdownMetrics:
+        """Drawdown metrics from a trade list (pure apart from the peak cache)."""
         if not trades:
             # No trades - no drawdown
             return DrawdownMetrics(
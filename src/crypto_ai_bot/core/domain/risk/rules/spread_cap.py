@@ -6,15 +6,19 @@ Prevents trading when spread is too wide, protecting from slippage.
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Awaitable, Callable, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot
+
 _log = get_logger(__name__)
 
 
@@ -226,7 +230,32 @@ class SpreadCapRule:
 
         # Get current spread
         metrics = await self._get_spread_metrics(symbol, broker)
+        return self._decide(symbol, metrics, is_entry)
+
+    def evaluate(self, snapshot: RiskSnapshot) -> RuleCheckResult:
+        """
+        Pure evaluation over a pre-fetched RiskSnapshot: spread from the snapshot ticker
+        (the provider is not called). Closing trades are checked against the exit limit.
+        """
+        if not self.config.is_enabled():
+            return self._create_disabled_result(snapshot.symbol)
+
+        bid, ask, mid = snapshot.bid, snapshot.ask, snapshot.mid_price
+        spread_pct = float(snapshot.spread_pct) if snapshot.spread_pct is not None else None
+        metrics = SpreadMetrics(
+            bid=bid if bid > 0 else None,
+            ask=ask if ask > 0 else None,
+            spread_absolute=(ask - bid) if mid > 0 else None,
+            spread_pct=spread_pct,
+            spread_bps=(spread_pct * 100.0) if spread_pct is not None else None,
+            mid_price=mid if mid > 0 else None,
+            calculation_time=snapshot.taken_at,
+            is_volatile=self._check_volatility(),
+        )
+        return self._decide(snapshot.symbol, metrics, is_entry=not snapshot.is_closing)
 
+    def _decide(self, symbol: str, metrics: SpreadMetrics, is_entry: bool) -> RuleCheckResult:
+        """Compare spread metrics against the limits for the operation."""
         if metrics.spread_pct is None:
             # No spread data available (e.g., ABSOLUTE from provider but no mid/ticker)
             return self._create_no_data_result(symbol, metrics)
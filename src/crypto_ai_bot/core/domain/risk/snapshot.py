@@ -0,0 +1,329 @@
+"""
+Risk snapshot - all inputs of one risk decision, fetched once.
+Снимок состояния для одного решения: позиции, сделки за сегодня, тикер, баланс.
+
+gather_risk_snapshot() собирает источники конкурентно (asyncio.gather); дальше правила
+оценивают его как чистые функции (RiskManager.evaluate, Rule.evaluate) без повторных чтений.
+Источники duck-typed, sync или async — как и у правил в risk/rules.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from decimal import Decimal
+from functools import partial
+from typing import Any
+
+from crypto_ai_bot.utils.decimal import ZERO, dec
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import observe
+
+_log = get_logger(__name__)
+
+
+def _get(obj: Any, name: str, default: Any = None) -> Any:
+    """Tolerant attribute/key getter."""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _trade_ts_ms(trade: Any) -> int:
+    for name in ("ts_ms", "timestamp", "ts"):
+        value = _get(trade, name)
+        if isinstance(value, (int, float)):
+            return int(value if value > 1e10 else value * 1000)
+        if isinstance(value, datetime):
+            return int(value.timestamp() * 1000)
+    return 0
+
+
+@dataclass(frozen=True)
+class RiskSnapshot:
+    """Неизменяемый снимок входных данных риск-решения."""
+
+    symbol: str
+    side: str = "buy"
+    amount: Decimal = dec("0")
+    is_closing: bool = False
+    taken_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    position: Any = None
+    open_positions: tuple[Any, ...] = ()
+    trades_today: tuple[Any, ...] = ()  # хронологически (старые -> новые)
+    ticker: Any = None
+    balance: Any = None
+
+    # агрегаты хранилища (None — источник не поддерживает/не ответил)
+    daily_pnl: Decimal | None = None
+    loss_streak: int | None = None
+    drawdown_pct: Decimal | None = None
+
+    # счётчики бюджетов (нужны, только если символ не отслеживается RiskWindows)
+    orders_24h: int | None = None
+    orders_5m: int | None = None
+    turnover_today: Decimal | None = None
+    turnover_5m: Decimal | None = None
+
+    errors: tuple[str, ...] = ()
+    gather_ms: float = 0.0
+
+    # ---------- derived views ----------
+    @property
+    def bid(self) -> Decimal:
+        return dec(_get(self.ticker, "bid"))
+
+    @property
+    def ask(self) -> Decimal:
+        return dec(_get(self.ticker, "ask"))
+
+    @property
+    def mid_price(self) -> Decimal:
+        bid, ask = self.bid, self.ask
+        return (bid + ask) / 2 if bid > 0 and ask > 0 else dec("0")
+
+    @property
+    def last_price(self) -> Decimal:
+        last = dec(_get(self.ticker, "last"))
+        return last if last > 0 else self.mid_price
+
+    @property
+    def spread_pct(self) -> Decimal | None:
+        mid = self.mid_price
+        if mid <= 0:
+            return None
+        return (self.ask - self.bid) / mid * 100
+
+    @property
+    def amount_quote(self) -> Decimal:
+        """Размер заявки в quote: buy — amount уже в quote, sell — amount в base по last_price."""
+        return self.amount if self.side == "buy" else self.amount * self.last_price
+
+    @property
+    def balance_quote(self) -> Decimal | None:
+        """Свободный баланс в quote (CcxtBroker: free_quote; dict/BalanceDTO по валюте — free)."""
+        if self.balance is None:
+            return None
+        if _get(self.balance, "free_quote") is not None:
+            return dec(_get(self.balance, "free_quote"))
+        quote = self.symbol.split("/", 1)[-1]
+        account = _get(self.balance, quote)
+        return dec(_get(account, "free")) if account is not None else None
+
+    @property
+    def open_symbols(self) -> frozenset[str]:
+        """Символы с ненулевой позицией."""
+        out: set[str] = set()
+        for p in self.open_positions:
+            sym = _get(p, "symbol")
+            qty = _get(p, "base_qty", _get(p, "amount", _get(p, "size", 0)))
+            if sym and dec(qty) > 0:
+                out.add(str(sym))
+        return frozenset(out)
+
+    @property
+    def last_trade(self) -> Any:
+        """Последняя сделка символа за сегодня, либо None."""
+        return self.trades_today[-1] if self.trades_today else None
+
+    @property
+    def last_trade_time(self) -> datetime | None:
+        trade = self.last_trade
+        if trade is None:
+            return None
+        ts = _trade_ts_ms(trade)
+        return datetime.fromtimestamp(ts / 1000, tz=UTC) if ts else None
+
+
+def _as_dict(row: Any) -> Any:
+    """sqlite3.Row и подобные -> dict (правила читают сделки через .get)."""
+    if not isinstance(row, dict) and hasattr(row, "keys"):
+        return dict(row)
+    return row
+
+
+async def _resolve(fn: Any, *args: Any) -> Any:
+    res = fn(*args)
+    if hasattr(res, "__await__"):
+        return await res
+    return res
+
+
+async def _fetch_balance(broker: Any, symbol: str) -> Any:
+    try:
+        return await _resolve(broker.fetch_balance, symbol)
+    except TypeError:
+        return await _resolve(broker.fetch_balance)
+
+
+async def _fetch_open_positions(positions_repo: Any, symbols: list[str]) -> Any:
+    if symbols and hasattr(positions_repo, "get_positions_many"):
+        many = await _resolve(positions_repo.get_positions_many, symbols)
+        return list(many.values()) if isinstance(many, dict) else many
+    for meth in ("list_open", "list", "get_all_positions"):
+        if hasattr(positions_repo, meth):
+            return await _resolve(getattr(positions_repo, meth))
+    return ()
+
+
+# ключ снимка -> (метод trades_repo, доп. аргументы)
+_TRADES_SOURCES: dict[str, tuple[str, tuple[Any, ...]]] = {
+    "trades_today": ("list_today", ()),
+    "daily_pnl": ("get_daily_pnl", ()),
+    "loss_streak": ("get_loss_streak", ()),
+    "drawdown_pct": ("calculate_drawdown_pct", ()),
+    "orders_24h": ("count_orders_last_minutes", (1440,)),
+    "orders_5m": ("count_orders_last_minutes", (5,)),
+    "turnover_today": ("daily_turnover_quote", ()),
+    "turnover_5m": ("turnover_quote_last_minutes", (5,)),
+}
+
+_INT_FIELDS = ("loss_streak", "orders_24h", "orders_5m")
+_DEC_FIELDS = ("daily_pnl", "drawdown_pct", "turnover_today", "turnover_5m")
+
+
+def snapshot_sources(
+    symbol: str,
+    *,
+    trades_repo: Any = None,
+    positions_repo: Any = None,
+    broker: Any = None,
+    related_symbols: Iterable[str] = (),
+) -> dict[str, Callable[[], Awaitable[Any]]]:
+    """
+    Фабрики источников снимка: ключ поля -> корутина-фабрика (запрос стартует только при вызове).
+    Есть только те ключи, которые поддерживают переданные репозитории/брокер.
+    """
+    sources: dict[str, Callable[[], Awaitable[Any]]] = {}
+    if positions_repo is not None:
+        if hasattr(positions_repo, "get_position"):
+            sources["position"] = partial(_resolve, positions_repo.get_position, symbol)
+        sources["open_positions"] = partial(
+            _fetch_open_positions, positions_repo, sorted({symbol, *related_symbols})
+        )
+    if trades_repo is not None:
+        for key, (meth, args) in _TRADES_SOURCES.items():
+            if hasattr(trades_repo, meth):
+                sources[key] = partial(_resolve, getattr(trades_repo, meth), symbol, *args)
+    if broker is not None:
+        if hasattr(broker, "fetch_ticker"):
+            sources["ticker"] = partial(_resolve, broker.fetch_ticker, symbol)
+        if hasattr(broker, "fetch_balance"):
+            sources["balance"] = partial(_fetch_balance, broker, symbol)
+    return sources
+
+
+def build_snapshot(
+    symbol: str,
+    values: dict[str, Any],
+    *,
+    side: str = "buy",
+    amount: Decimal = ZERO,
+    is_closing: bool = False,
+    errors: Iterable[str] = (),
+    gather_ms: float = 0.0,
+) -> RiskSnapshot:
+    """Собирает RiskSnapshot из сырых значений источников (нормализация типов и порядка сделок)."""
+    fields: dict[str, Any] = {
+        "position": values.get("position"),
+        "open_positions": tuple(values.get("open_positions") or ()),
+        "trades_today": tuple(
+            sorted((_as_dict(t) for t in values.get("trades_today") or ()), key=_trade_ts_ms)
+        ),
+        "ticker": values.get("ticker"),
+        "balance": values.get("balance"),
+    }
+    for key in _INT_FIELDS:
+        fields[key] = int(values[key]) if values.get(key) is not None else None
+    for key in _DEC_FIELDS:
+        fields[key] = dec(values[key]) if values.get(key) is not None else None
+    return RiskSnapshot(
+        symbol=symbol,
+        side=str(side).lower(),
+        amount=dec(amount),
+        is_closing=is_closing,
+        errors=tuple(errors),
+        gather_ms=gather_ms,
+        **fields,
+    )
+
+
+async def gather_risk_snapshot(
+    symbol: str,
+    *,
+    side: str = "buy",
+    amount: Decimal = ZERO,
+    is_closing: bool = False,
+    trades_repo: Any = None,
+    positions_repo: Any = None,
+    broker: Any = None,
+    related_symbols: Iterable[str] = (),
+    only: Iterable[str] | None = None,
+) -> RiskSnapshot:
+    """
+    Конкурентно собирает снимок. Сбой/отсутствие источника не прерывает решение:
+    поле остаётся пустым, имя источника попадает в `errors`.
+    related_symbols — символы, чьи позиции нужны правилу корреляции;
+    only — ограничить набор полей (по умолчанию все доступные).
+    """
+    sources = snapshot_sources(
+        symbol,
+        trades_repo=trades_repo,
+        positions_repo=positions_repo,
+        broker=broker,
+        related_symbols=related_symbols,
+    )
+    if only is not None:
+        wanted = set(only)
+        sources = {k: v for k, v in sources.items() if k in wanted}
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(factory() for factory in sources.values()), return_exceptions=True)
+    gather_ms = (time.perf_counter() - t0) * 1000.0
+    observe("risk_snapshot_gather_ms", gather_ms, {"sources": str(len(sources))})
+
+    values: dict[str, Any] = {}
+    errors: list[str] = []
+    for key, res in zip(sources, results, strict=False):
+        if isinstance(res, BaseException):
+            errors.append(key)
+            _log.warning(
+                "risk_snapshot_source_failed", extra={"symbol": symbol, "source": key, "error": str(res)}
+            )
+            continue
+        values[key] = res
+
+    return build_snapshot(
+        symbol,
+        values,
+        side=side,
+        amount=amount,
+        is_closing=is_closing,
+        errors=errors,
+        gather_ms=gather_ms,
+    )
+
+
+def evaluate_rules(snapshot: RiskSnapshot, rules: Iterable[Any]) -> dict[str, Any]:
+    """
+    Прогоняет rule.evaluate(snapshot) для standalone-правил (risk/rules) с замером
+    времени каждого (гистограмма risk_rule_eval_ms{rule}). Ключ — rule.name или имя класса.
+    """
+    results: dict[str, Any] = {}
+    for rule in rules:
+        name = str(getattr(rule, "name", "") or type(rule).__name__)
+        t0 = time.perf_counter()
+        try:
+            results[name] = rule.evaluate(snapshot)
+        finally:
+            observe("risk_rule_eval_ms", (time.perf_counter() - t0) * 1000.0, {"rule": name})
+    return results
+
+
+__all__ = ["RiskSnapshot", "build_snapshot", "evaluate_rules", "gather_risk_snapshot", "snapshot_sources"]
@@ -0,0 +1,146 @@
+"""
+Sliding-window risk counters.
+Скользящие окна счётчиков ордеров и оборота по символам (in-memory).
+
+Риск-правила (Orders5Minute/Turnover5Minute/BudgetOrders/BudgetTurnover) читают суммы за O(1)
+вместо SQL-запроса на каждый check_trade. Окна гидрируются из хранилища на старте
+(минутные корзины trade_rollups) и дальше обновляются событием ORDER_EXECUTED.
+Чистая логика: никакого I/O, время передаётся явно (по умолчанию utils.time.now_ms).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from crypto_ai_bot.utils.time import now_ms
+
+_ZERO = Decimal("0")
+_MINUTE_MS = 60_000
+_DAY_MS = 86_400_000
+
+
+class SlidingWindow:
+    """
+    Кольцо корзин фиксированной ширины с текущими суммами.
+
+    Окно `window_ms` покрывает корзину, в которую попадает `now - window_ms`, и все
+    последующие (как trade_rollups.get_totals: разрешение — одна корзина, с запасом).
+    Запись и чтение — O(1) амортизированно: истёкшие корзины вычитаются из сумм при сдвиге.
+    """
+
+    __slots__ = ("bucket_ms", "_ids", "_counts", "_turnover", "_head", "count", "turnover")
+
+    def __init__(self, window_ms: int, bucket_ms: int = _MINUTE_MS) -> None:
+        self.bucket_ms = int(bucket_ms)
+        size = -(-int(window_ms) // self.bucket_ms) + 1
+        self._ids: list[int] = [-1] * size
+        self._counts: list[int] = [0] * size
+        self._turnover: list[Decimal] = [_ZERO] * size
+        self._head = -1  # номер самой свежей корзины
+        self.count = 0
+        self.turnover = _ZERO
+
+    def _advance(self, bucket: int) -> None:
+        if bucket <= self._head:
+            return
+        size = len(self._ids)
+        first = max(self._head + 1, bucket - size + 1)
+        for b in range(first, bucket + 1):
+            i = b % size
+            if self._ids[i] >= 0:
+                self.count -= self._counts[i]
+                self.turnover -= self._turnover[i]
+            self._ids[i] = b
+            self._counts[i] = 0
+            self._turnover[i] = _ZERO
+        self._head = bucket
+
+    def add(self, ts_ms: int, count: int = 1, turnover: Decimal = _ZERO) -> None:
+        bucket = int(ts_ms) // self.bucket_ms
+        self._advance(bucket)
+        i = bucket % len(self._ids)
+        if self._ids[i] != bucket:
+            return  # старше окна — уже не влияет на суммы
+        self._counts[i] += count
+        self._turnover[i] += turnover
+        self.count += count
+        self.turnover += turnover
+
+    def totals(self, ts_ms: int) -> tuple[int, Decimal]:
+        self._advance(int(ts_ms) // self.bucket_ms)
+        return self.count, self.turnover
+
+
+@dataclass
+class SymbolWindows:
+    """Окна одного символа: 5 минут, скользящие 24 часа и текущие UTC-сутки."""
+
+    last_5m: SlidingWindow = field(default_factory=lambda: SlidingWindow(5 * _MINUTE_MS))
+    last_24h: SlidingWindow = field(default_factory=lambda: SlidingWindow(_DAY_MS))
+    day: int = -1
+    day_count: int = 0
+    day_turnover: Decimal = _ZERO
+
+    def add(self, ts_ms: int, count: int, turnover: Decimal) -> None:
+        self.last_5m.add(ts_ms, count, turnover)
+        self.last_24h.add(ts_ms, count, turnover)
+        day = ts_ms // _DAY_MS
+        if day > self.day:
+            self.day, self.day_count, self.day_turnover = day, 0, _ZERO
+        if day == self.day:
+            self.day_count += count
+            self.day_turnover += turnover
+
+    def today(self, ts_ms: int) -> tuple[int, Decimal]:
+        if ts_ms // _DAY_MS != self.day:
+            return 0, _ZERO
+        return self.day_count, self.day_turnover
+
+
+class RiskWindows:
+    """
+    Реестр скользящих окон по символам.
+
+    Символ считается «отслеживаемым» после hydrate(); до этого правила читают хранилище.
+    """
+
+    def __init__(self) -> None:
+        self._symbols: dict[str, SymbolWindows] = {}
+
+    def tracks(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def hydrate(
+        self,
+        symbol: str,
+        buckets: Iterable[tuple[int, int, Decimal]],
+    ) -> None:
+        """Заменяет окна символа данными хранилища: (bucket_start_ms, count, turnover_quote)."""
+        windows = SymbolWindows()
+        for ts_ms, count, turnover in sorted(buckets, key=lambda b: b[0]):
+            windows.add(int(ts_ms), int(count), Decimal(turnover))
+        self._symbols[symbol] = windows
+
+    def record(self, symbol: str, turnover: Decimal = _ZERO, *, ts_ms: int | None = None) -> None:
+        """Учитывает исполненный ордер (только для отслеживаемых символов)."""
+        windows = self._symbols.get(symbol)
+        if windows is not None:
+            windows.add(now_ms() if ts_ms is None else int(ts_ms), 1, turnover)
+
+    # ---------- reads (O(1)) ----------
+    def orders_last_5m(self, symbol: str, *, ts_ms: int | None = None) -> int:
+        return self._symbols[symbol].last_5m.totals(now_ms() if ts_ms is None else ts_ms)[0]
+
+    def turnover_last_5m(self, symbol: str, *, ts_ms: int | None = None) -> Decimal:
+        return self._symbols[symbol].last_5m.totals(now_ms() if ts_ms is None else ts_ms)[1]
+
+    def orders_last_24h(self, symbol: str, *, ts_ms: int | None = None) -> int:
+        return self._symbols[symbol].last_24h.totals(now_ms() if ts_ms is None else ts_ms)[0]
+
+    def turnover_today(self, symbol: str, *, ts_ms: int | None = None) -> Decimal:
+        return self._symbols[symbol].today(now_ms() if ts_ms is None else ts_ms)[1]
+
+
+__all__ = ["RiskWindows", "SlidingWindow", "SymbolWindows"]
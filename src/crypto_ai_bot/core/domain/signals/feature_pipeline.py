@@ -7,15 +7,19 @@ Used by trading strategies for signal generation.
 from __future__ import annotations
 
 import math
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.signals.indicator_engine import IncrementalIndicatorEngine
+
 _log = get_logger(__name__)
 
 
@@ -28,6 +32,13 @@ def _to_utc_ts_ms(dt: datetime) -> int:
     return int(dt.timestamp() * 1000)
 
 
+def _as_candles(data: Iterable[Candle]) -> Sequence[Candle]:
+    """Columnar frames are used as-is (rows are lazy views); other iterables are listed."""
+    if isinstance(data, OHLCVFrame):
+        return data
+    return list(data or [])
+
+
 # -------- data types --------
 
 @dataclass(frozen=True)
@@ -71,6 +82,25 @@ class Candle:
         return float(self.volume)
 
 
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    """Last values of the standard indicator set for one timeframe (None = not enough data)"""
+    close: float
+    ema20: float | None = None
+    ema50: float | None = None
+    sma200: float | None = None
+    rsi14: float | None = None
+    macd: float | None = None
+    macd_signal: float | None = None
+    macd_hist: float | None = None
+    atr14: float | None = None
+    bb_upper: float | None = None
+    bb_middle: float | None = None
+    bb_lower: float | None = None
+    stoch_k: float | None = None
+    stoch_d: float | None = None
+
+
 # -------- indicators --------
 
 class TechnicalIndicators:
@@ -359,11 +389,43 @@ class FeaturePipeline:
     Main feature extraction pipeline.
 
     Extracts technical indicators from multiple timeframes.
+
+    With an `IncrementalIndicatorEngine` and a `symbol`, indicator state is kept
+    per (symbol, timeframe) and only new candles are processed; otherwise every
+    call recomputes the indicators over the full candle history, either with the
+    pure-Python `TechnicalIndicators` ("scalar") or with NumPy ("numpy").
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        engine: IncrementalIndicatorEngine | None = None,
+        backend: str = "scalar",
+    ):
         """Initialize pipeline"""
+        backend = str(backend or "scalar").lower()
+        if backend not in ("scalar", "numpy"):
+            raise ValueError(f"Unknown indicator backend: {backend}")
+        if backend == "numpy":
+            from crypto_ai_bot.core.domain.signals.indicators_vectorized import HAS_NUMPY
+
+            if not HAS_NUMPY:
+                _log.warning("indicator_backend_fallback", extra={"requested": "numpy", "using": "scalar"})
+                backend = "scalar"
+
         self.indicators = TechnicalIndicators()
+        self.engine = engine
+        self.backend = backend
+
+    @classmethod
+    def from_settings(cls, settings: object) -> FeaturePipeline:
+        """Build pipeline with the backend from `settings.technical.INDICATOR_BACKEND`"""
+        technical = getattr(settings, "technical", None)
+        backend = str(getattr(technical, "INDICATOR_BACKEND", "scalar") or "scalar").lower()
+        if backend == "incremental":
+            from crypto_ai_bot.core.domain.signals.indicator_engine import IncrementalIndicatorEngine
+
+            return cls(engine=IncrementalIndicatorEngine())
+        return cls(backend=backend)
 
     def extract_features(
         self,
@@ -372,6 +434,8 @@ class FeaturePipeline:
         ohlcv_4h: Optional[Iterable[Candle]] = None,
         ohlcv_1d: Optional[Iterable[Candle]] = None,
         ohlcv_1w: Optional[Iterable[Candle]] = None,
+        *,
+        symbol: str | None = None,
     ) -> dict[str, float]:
         """
         Extract features from multi-timeframe OHLCV data.
@@ -382,6 +446,7 @@ class FeaturePipeline:
             ohlcv_4h: 4-hour candles (optional)
             ohlcv_1d: Daily candles (optional)
             ohlcv_1w: Weekly candles (optional)
+            symbol: Trading pair; enables incremental updates when an engine is set
 
         Returns:
             Dictionary of features for ML/strategy use
@@ -389,30 +454,30 @@ class FeaturePipeline:
         features: dict[str, float] = {}
 
         # Process main timeframe (15m)
-        candles_15m = list(ohlcv_15m or [])
+        candles_15m = _as_candles(ohlcv_15m)
         if candles_15m:
-            features.update(self._extract_timeframe_features(candles_15m, "15m"))
+            features.update(self._extract_timeframe_features(candles_15m, "15m", symbol))
 
         # Process higher timeframes for trend confirmation
         if ohlcv_1h:
-            candles_1h = list(ohlcv_1h)
+            candles_1h = _as_candles(ohlcv_1h)
             if candles_1h:
-                features.update(self._extract_timeframe_features(candles_1h, "1h"))
+                features.update(self._extract_timeframe_features(candles_1h, "1h", symbol))
 
         if ohlcv_4h:
-            candles_4h = list(ohlcv_4h)
+            candles_4h = _as_candles(ohlcv_4h)
             if candles_4h:
-                features.update(self._extract_timeframe_features(candles_4h, "4h"))
+                features.update(self._extract_timeframe_features(candles_4h, "4h", symbol))
 
         if ohlcv_1d:
-            candles_1d = list(ohlcv_1d)
+            candles_1d = _as_candles(ohlcv_1d)
             if candles_1d:
-                features.update(self._extract_timeframe_features(candles_1d, "1d"))
+                features.update(self._extract_timeframe_features(candles_1d, "1d", symbol))
 
         if ohlcv_1w:
-            candles_1w = list(ohlcv_1w)
+            candles_1w = _as_candles(ohlcv_1w)
             if candles_1w:
-                features.update(self._extract_timeframe_features(candles_1w, "1w"))
+                features.update(self._extract_timeframe_features(candles_1w, "1w", symbol))
 
         # Add cross-timeframe features
         features.update(self._extract_cross_timeframe_features(features))
@@ -421,57 +486,102 @@ class FeaturePipeline:
 
     def _extract_timeframe_features(
         self,
-        candles: list[Candle],
-        timeframe: str
+        candles: Sequence[Candle],
+        timeframe: str,
+        symbol: str | None = None,
     ) -> dict[str, float]:
         """Extract features for a single timeframe"""
         if not candles:
             return {}
 
-        close_prices = [c.c for c in candles]
+        if self.engine is not None and symbol:
+            snap = self.engine.update(symbol, timeframe, candles)
+        elif self.backend == "numpy":
+            snap = self._vector_snapshot(candles)
+        else:
+            snap = self._scalar_snapshot(candles)
+        if snap is None:
+            return {}
+        return self._features_from_snapshot(snap, timeframe)
+
+    def _scalar_snapshot(self, candles: Sequence[Candle]) -> IndicatorSnapshot:
+        """Full recomputation of the indicator set over `candles`."""
+        close_prices = candles.closes() if isinstance(candles, OHLCVFrame) else [c.c for c in candles]
+
+        macd, signal, histogram = self.indicators.macd(close_prices)
+        bb_upper, bb_middle, bb_lower = self.indicators.bollinger_bands(close_prices)
+        stoch_k, stoch_d = self.indicators.stochastic(candles)
+
+        return IndicatorSnapshot(
+            close=float(close_prices[-1]),
+            ema20=self.indicators.ema(close_prices, 20),
+            ema50=self.indicators.ema(close_prices, 50),
+            sma200=self.indicators.sma(close_prices, 200),
+            rsi14=self.indicators.rsi(close_prices, 14),
+            macd=macd,
+            macd_signal=signal,
+            macd_hist=histogram,
+            atr14=self.indicators.atr(candles, 14),
+            bb_upper=bb_upper,
+            bb_middle=bb_middle,
+            bb_lower=bb_lower,
+            stoch_k=stoch_k,
+            stoch_d=stoch_d,
+        )
+
+    @staticmethod
+    def _vector_snapshot(candles: Sequence[Candle]) -> IndicatorSnapshot | None:
+        """Full recomputation on float64 columns (NumPy backend)."""
+        from crypto_ai_bot.core.domain.signals.indicators_vectorized import (
+            VectorizedIndicators,
+            candles_to_columns,
+        )
+
+        return VectorizedIndicators.snapshot(*candles_to_columns(candles))
+
+    @staticmethod
+    def _features_from_snapshot(snap: IndicatorSnapshot, timeframe: str) -> dict[str, float]:
+        """Map indicator values to feature keys (with neutral fallbacks)."""
         feats: dict[str, float] = {}
 
         # Price features
-        feats[f"close_{timeframe}"] = float(close_prices[-1]) if close_prices else 0.0
+        last_price = float(snap.close)
+        feats[f"close_{timeframe}"] = last_price
 
         # Moving averages
-        ema20 = self.indicators.ema(close_prices, 20)
-        ema50 = self.indicators.ema(close_prices, 50)
-        sma200 = self.indicators.sma(close_prices, 200)
-
-        last_price = float(close_prices[-1]) if close_prices else 0.0
+        ema20, ema50, sma200 = snap.ema20, snap.ema50, snap.sma200
         feats[f"ema20_{timeframe}"] = float(ema20) if ema20 is not None else last_price
         feats[f"ema50_{timeframe}"] = float(ema50) if ema50 is not None else last_price
         feats[f"sma200_{timeframe}"] = float(sma200) if sma200 is not None else last_price
 
         # Momentum indicators
-        rsi = self.indicators.rsi(close_prices, 14)
+        rsi = snap.rsi14
         feats[f"rsi14_{timeframe}"] = float(rsi) if rsi is not None else 50.0
 
         # MACD
-        macd, signal, histogram = self.indicators.macd(close_prices)
+        macd, signal, histogram = snap.macd, snap.macd_signal, snap.macd_hist
         feats[f"macd_{timeframe}"] = float(macd) if macd is not None else 0.0
         feats[f"macd_signal_{timeframe}"] = float(signal) if signal is not None else 0.0
         feats[f"macd_hist_{timeframe}"] = float(histogram) if histogram is not None else 0.0
 
         # Volatility
-        atr = self.indicators.atr(candles, 14)
+        atr = snap.atr14
         feats[f"atr14_{timeframe}"] = float(atr) if atr is not None else 0.0
 
         # Bollinger Bands
-        bb_upper, bb_middle, bb_lower = self.indicators.bollinger_bands(close_prices)
+        bb_upper, bb_middle, bb_lower = snap.bb_upper, snap.bb_middle, snap.bb_lower
         feats[f"bb_upper_{timeframe}"] = float(bb_upper) if bb_upper is not None else last_price
         feats[f"bb_middle_{timeframe}"] = float(bb_middle) if bb_middle is not None else last_price
         feats[f"bb_lower_{timeframe}"] = float(bb_lower) if bb_lower is not None else last_price
 
         # Stochastic
-        stoch_k, stoch_d = self.indicators.stochastic(candles)
+        stoch_k, stoch_d = snap.stoch_k, snap.stoch_d
         feats[f"stoch_k_{timeframe}"] = float(stoch_k) if stoch_k is not None else 50.0
         feats[f"stoch_d_{timeframe}"] = float(stoch_d) if stoch_d is not None else 50.0
 
         # Price position relative to bands/MAs
         if bb_upper is not None and bb_lower is not None and bb_upper != bb_lower:
-            bb_position = (float(close_prices[-1]) - bb_lower) / (bb_upper - bb_lower)
+            bb_position = (last_price - bb_lower) / (bb_upper - bb_lower)
             feats[f"bb_position_{timeframe}"] = max(0.0, min(1.0, float(bb_position)))
 
         # Trend strength
@@ -545,6 +655,7 @@ def last_features(
 # Export
 __all__ = [
     "Candle",
+    "IndicatorSnapshot",
     "TechnicalIndicators",
     "FeaturePipeline",
     "last_features",
@@ -0,0 +1,424 @@
+"""
+Incremental indicator engine.
+
+Keeps per-(symbol, timeframe) indicator state so that every new closed candle
+costs O(1) instead of recomputing the full history. A still-forming last candle
+is evaluated provisionally (peek) without committing state, so the next fetch
+simply replaces it.
+
+Fed from scratch with the same candles, the engine reproduces
+`TechnicalIndicators` (up to float rounding of the rolling SMA sum). Over a long-running stream the EMA/Wilder based
+values carry the whole history, while a full recompute only sees the fetched
+window, so the two converge but are not bit-identical.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import Sequence
+
+from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle, IndicatorSnapshot
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.time import now_ms as _now_ms
+
+_log = get_logger(__name__)
+
+
+_TF_MS: dict[str, int] = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+    "1w": 7 * 24 * 60 * 60_000,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Candle duration in milliseconds (0 for unknown timeframes)."""
+    return _TF_MS.get(str(timeframe), 0)
+
+
+# -------- primitives --------
+
+
+class _Ema:
+    """SMA-seeded EMA; `peek` returns the value as if `x` were pushed."""
+
+    __slots__ = ("n", "k", "count", "seed_sum", "value")
+
+    def __init__(self, period: int):
+        self.n = int(period)
+        self.k = 2.0 / (self.n + 1.0)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: float | None = None
+
+    def push(self, x: float) -> None:
+        self.count += 1
+        if self.value is None:
+            self.seed_sum += x
+            if self.count == self.n:
+                self.value = self.seed_sum / self.n
+        else:
+            self.value = (x - self.value) * self.k + self.value
+
+    def peek(self, x: float) -> float | None:
+        if self.value is None:
+            return (self.seed_sum + x) / self.n if self.count + 1 == self.n else None
+        return (x - self.value) * self.k + self.value
+
+
+class _Wilder:
+    """Wilder smoothing seeded with the mean of the first `period` inputs."""
+
+    __slots__ = ("n", "count", "seed_sum", "value")
+
+    def __init__(self, period: int):
+        self.n = int(period)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: float | None = None
+
+    def push(self, x: float) -> None:
+        self.count += 1
+        if self.value is None:
+            self.seed_sum += x
+            if self.count == self.n:
+                self.value = self.seed_sum / self.n
+        else:
+            self.value = (self.value * (self.n - 1) + x) / self.n
+
+    def peek(self, x: float) -> float | None:
+        if self.value is None:
+            return (self.seed_sum + x) / self.n if self.count + 1 == self.n else None
+        return (self.value * (self.n - 1) + x) / self.n
+
+
+class _Sma:
+    """Rolling mean with a running sum (resynced once per window to bound drift)."""
+
+    __slots__ = ("n", "win", "total", "since_resync")
+
+    def __init__(self, period: int):
+        self.n = int(period)
+        self.win: deque[float] = deque(maxlen=self.n)
+        self.total = 0.0
+        self.since_resync = 0
+
+    def push(self, x: float) -> None:
+        if len(self.win) == self.n:
+            self.total -= self.win[0]
+        self.win.append(x)
+        self.total += x
+        self.since_resync += 1
+        if self.since_resync >= self.n:
+            self.total = sum(self.win)
+            self.since_resync = 0
+
+    @property
+    def value(self) -> float | None:
+        return self.total / self.n if len(self.win) == self.n else None
+
+    def peek(self, x: float) -> float | None:
+        if len(self.win) + 1 < self.n:
+            return None
+        total = self.total + x - (self.win[0] if len(self.win) == self.n else 0.0)
+        return total / self.n
+
+
+def _rsi_from(avg_gain: float | None, avg_loss: float | None) -> float | None:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    rs = avg_gain / avg_loss
+    return float(100.0 - (100.0 / (1.0 + rs)))
+
+
+def _bollinger(window: Sequence[float], num_std: float) -> tuple[float, float, float]:
+    n = len(window)
+    mean = sum(window) / n
+    var = sum((x - mean) ** 2 for x in window) / n
+    std = math.sqrt(var)
+    return mean + num_std * std, mean, mean - num_std * std
+
+
+def _stoch_k(highs: Sequence[float], lows: Sequence[float], close: float) -> float:
+    hi = max(highs)
+    lo = min(lows)
+    if hi == lo:
+        return 50.0
+    return 100.0 * (close - lo) / (hi - lo)
+
+
+# -------- per-stream state --------
+
+
+class _IndicatorState:
+    """Committed indicator state for one (symbol, timeframe) stream."""
+
+    def __init__(self) -> None:
+        self.last_ts_ms: int | None = None
+        self.count = 0
+        self.close: float | None = None
+
+        self.ema20 = _Ema(20)
+        self.ema50 = _Ema(50)
+        self.sma200 = _Sma(200)
+
+        self.rsi_gain = _Wilder(14)
+        self.rsi_loss = _Wilder(14)
+        self.atr = _Wilder(14)
+
+        # MACD 12/26/9
+        self.macd_fast = _Ema(12)
+        self.macd_slow = _Ema(26)
+        self.macd_signal = _Ema(9)
+        self.macd_last: float | None = None
+        self._macd_min_len = 26 + 9
+
+        # Bollinger 20/2
+        self.bb_window: deque[float] = deque(maxlen=20)
+        self.bb_std = 2.0
+
+        # Stochastic 14/3
+        self.st_k = 14
+        self.st_d = 3
+        self.st_highs: deque[float] = deque(maxlen=self.st_k)
+        self.st_lows: deque[float] = deque(maxlen=self.st_k)
+        self.st_kvals: deque[float] = deque(maxlen=self.st_d)
+
+    # ---- commit ----
+
+    def push(self, candle: Candle) -> None:
+        c, h, lo = candle.c, candle.h, candle.l
+
+        self.ema20.push(c)
+        self.ema50.push(c)
+        self.sma200.push(c)
+
+        if self.close is not None:
+            prev = self.close
+            diff = c - prev
+            self.rsi_gain.push(max(0.0, diff))
+            self.rsi_loss.push(max(0.0, -diff))
+            self.atr.push(max(h - lo, abs(h - prev), abs(prev - lo)))
+
+        self.macd_fast.push(c)
+        self.macd_slow.push(c)
+        if self.macd_fast.value is not None and self.macd_slow.value is not None:
+            self.macd_last = self.macd_fast.value - self.macd_slow.value
+            self.macd_signal.push(self.macd_last)
+
+        self.bb_window.append(c)
+
+        self.st_highs.append(h)
+        self.st_lows.append(lo)
+        if self.count + 1 >= self.st_k:
+            self.st_kvals.append(_stoch_k(self.st_highs, self.st_lows, c))
+
+        self.close = c
+        self.count += 1
+        self.last_ts_ms = candle.t_ms
+
+    # ---- read ----
+
+    def snapshot(self) -> IndicatorSnapshot | None:
+        if self.close is None:
+            return None
+        n = self.count
+
+        macd = signal = hist = None
+        if n >= self._macd_min_len and self.macd_signal.value is not None and self.macd_last is not None:
+            macd, signal = self.macd_last, self.macd_signal.value
+            hist = macd - signal
+
+        bb_u = bb_m = bb_l = None
+        if len(self.bb_window) == self.bb_window.maxlen:
+            bb_u, bb_m, bb_l = _bollinger(self.bb_window, self.bb_std)
+
+        st_k = st_d = None
+        if n >= self.st_k + self.st_d:
+            st_k = self.st_kvals[-1]
+            st_d = sum(self.st_kvals) / self.st_d
+
+        return IndicatorSnapshot(
+            close=self.close,
+            ema20=self.ema20.value,
+            ema50=self.ema50.value,
+            sma200=self.sma200.value,
+            rsi14=_rsi_from(self.rsi_gain.value, self.rsi_loss.value),
+            macd=macd,
+            macd_signal=signal,
+            macd_hist=hist,
+            atr14=self.atr.value,
+            bb_upper=bb_u,
+            bb_middle=bb_m,
+            bb_lower=bb_l,
+            stoch_k=st_k,
+            stoch_d=st_d,
+        )
+
+    def preview(self, candle: Candle) -> IndicatorSnapshot:
+        """Indicators as if `candle` were appended, without mutating state."""
+        c, h, lo = candle.c, candle.h, candle.l
+        n = self.count + 1
+
+        rsi = atr = None
+        if self.close is not None:
+            prev = self.close
+            diff = c - prev
+            rsi = _rsi_from(self.rsi_gain.peek(max(0.0, diff)), self.rsi_loss.peek(max(0.0, -diff)))
+            atr = self.atr.peek(max(h - lo, abs(h - prev), abs(prev - lo)))
+
+        macd = signal = hist = None
+        fast, slow = self.macd_fast.peek(c), self.macd_slow.peek(c)
+        if n >= self._macd_min_len and fast is not None and slow is not None:
+            m = fast - slow
+            s = self.macd_signal.peek(m)
+            if s is not None:
+                macd, signal, hist = m, s, m - s
+
+        bb_u = bb_m = bb_l = None
+        maxlen = self.bb_window.maxlen or 0
+        if len(self.bb_window) + 1 >= maxlen:
+            window = list(self.bb_window)[-(maxlen - 1) :] if maxlen > 1 else []
+            window.append(c)
+            bb_u, bb_m, bb_l = _bollinger(window, self.bb_std)
+
+        st_k = st_d = None
+        if n >= self.st_k + self.st_d:
+            highs = list(self.st_highs)[1:] if len(self.st_highs) == self.st_k else list(self.st_highs)
+            lows = list(self.st_lows)[1:] if len(self.st_lows) == self.st_k else list(self.st_lows)
+            highs.append(h)
+            lows.append(lo)
+            k_val = _stoch_k(highs, lows, c)
+            kvals = list(self.st_kvals)[1:] + [k_val]
+            st_k, st_d = k_val, sum(kvals) / self.st_d
+
+        return IndicatorSnapshot(
+            close=c,
+            ema20=self.ema20.peek(c),
+            ema50=self.ema50.peek(c),
+            sma200=self.sma200.peek(c),
+            rsi14=rsi,
+            macd=macd,
+            macd_signal=signal,
+            macd_hist=hist,
+            atr14=atr,
+            bb_upper=bb_u,
+            bb_middle=bb_m,
+            bb_lower=bb_l,
+            stoch_k=st_k,
+            stoch_d=st_d,
+        )
+
+
+# -------- engine --------
+
+
+class IncrementalIndicatorEngine:
+    """
+    Indicator state per (symbol, timeframe).
+
+    `update()` accepts the candle list as returned by market data (oldest first):
+    closed candles newer than the committed state are pushed one by one, and a
+    still-forming last candle is only previewed. When the new list does not
+    connect to the committed state (gap, history rewrite, different timeframe
+    alignment) the stream is rebuilt from the given candles.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[tuple[str, str], _IndicatorState] = {}
+
+    def update(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: Sequence[Candle],
+        *,
+        now_ms: int | None = None,
+    ) -> IndicatorSnapshot | None:
+        """
+        Sync state with `candles` and return the latest indicator values.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe ("15m", "1h", ...)
+            candles: Candles ordered oldest first
+            now_ms: Current time override (tests / backtests)
+
+        Returns:
+            Indicator snapshot for the last candle or None if no candles
+        """
+        if not candles:
+            return None
+
+        key = (symbol, timeframe)
+        tf_ms = timeframe_to_ms(timeframe)
+        now = _now_ms() if now_ms is None else int(now_ms)
+
+        last = candles[-1]
+        forming = tf_ms > 0 and last.t_ms + tf_ms > now
+        closed = candles[:-1] if forming else candles
+
+        state = self._states.get(key)
+        start = self._resume_index(state, closed, tf_ms) if state is not None else None
+        if state is None or start is None:
+            if state is not None:
+                _log.debug("indicator_state_rebuild", extra={"symbol": symbol, "timeframe": timeframe})
+            state = _IndicatorState()
+            start = 0
+            self._states[key] = state
+
+        for i in range(start, len(closed)):
+            state.push(closed[i])
+
+        if forming and (state.last_ts_ms is None or last.t_ms > state.last_ts_ms):
+            return state.preview(last)
+        return state.snapshot()
+
+    @staticmethod
+    def _resume_index(state: _IndicatorState, closed: Sequence[Candle], tf_ms: int) -> int | None:
+        """Index of the first closed candle to push, or None if a rebuild is needed."""
+        last_ts = state.last_ts_ms
+        if last_ts is None:
+            return None
+        if not closed:
+            return 0
+
+        # Walk back from the tail: cost is proportional to the number of new candles
+        i = len(closed)
+        while i > 0 and closed[i - 1].t_ms > last_ts:
+            i -= 1
+        if i == len(closed):
+            # nothing new; the list must not predate committed state
+            return i if closed[-1].t_ms == last_ts else None
+        if i > 0:
+            return i if closed[i - 1].t_ms == last_ts else None
+        # every candle is new: accept only a contiguous continuation
+        if tf_ms > 0 and closed[0].t_ms == last_ts + tf_ms:
+            return 0
+        return None
+
+    def reset(self, symbol: str | None = None, timeframe: str | None = None) -> None:
+        """Drop state for a symbol/timeframe (or everything)."""
+        if symbol is None and timeframe is None:
+            self._states.clear()
+            return
+        for key in list(self._states):
+            if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                del self._states[key]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+__all__ = [
+    "IncrementalIndicatorEngine",
+    "timeframe_to_ms",
+]
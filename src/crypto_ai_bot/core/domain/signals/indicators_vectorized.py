@@ -0,0 +1,257 @@
+"""
+NumPy-vectorized indicator backend.
+
+Computes the same indicator set as `TechnicalIndicators` from columnar float64
+arrays (high/low/close). Recursive filters (EMA, Wilder) are evaluated with a
+blocked closed form: inside a block of `_BLOCK` points the recursion
+y[i] = a*y[i-1] + k*x[i] becomes a cumulative sum, so the Python-level loop
+runs once per block rather than once per candle.
+
+NumPy is optional: `HAS_NUMPY` tells whether the backend can be used.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle, IndicatorSnapshot
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+
+try:  # optional dependency
+    import numpy as np  # type: ignore
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+
+_BLOCK = 64
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise RuntimeError("numpy is required for the vectorized indicator backend")
+
+
+def candles_to_columns(candles: Sequence[Candle]) -> tuple[Any, Any, Any]:
+    """Contiguous float64 (high, low, close) columns; zero-copy for `OHLCVFrame`."""
+    _require_numpy()
+    if isinstance(candles, OHLCVFrame):
+        return (
+            np.frombuffer(candles.high, dtype=np.float64),
+            np.frombuffer(candles.low, dtype=np.float64),
+            np.frombuffer(candles.close, dtype=np.float64),
+        )
+    n = len(candles)
+    high = np.fromiter((c.h for c in candles), dtype=np.float64, count=n)
+    low = np.fromiter((c.l for c in candles), dtype=np.float64, count=n)
+    close = np.fromiter((c.c for c in candles), dtype=np.float64, count=n)
+    return high, low, close
+
+
+# -------- recursive filters --------
+
+
+def _linear_recursion(x: Any, a: float, k: float, init: float) -> Any:
+    """y[i] = a*y[i-1] + k*x[i] with y[-1] = init, evaluated block by block."""
+    out = np.empty_like(x)
+    if a == 0.0:
+        np.multiply(x, k, out=out)
+        return out
+    prev = init
+    powers = a ** np.arange(_BLOCK, dtype=np.float64)
+    for start in range(0, len(x), _BLOCK):
+        blk = x[start : start + _BLOCK]
+        pw = powers[: len(blk)]
+        # y_i = a^i * (a*prev + k * sum_{j<=i} x_j / a^j)
+        y = pw * (a * prev + k * np.cumsum(blk / pw))
+        out[start : start + len(blk)] = y
+        prev = float(y[-1])
+    return out
+
+
+def _seeded_series(x: Any, period: int, k: float) -> Any:
+    """SMA-seeded smoothing series aligned to `x` (NaN before the seed point)."""
+    n = int(period)
+    out = np.full(len(x), np.nan, dtype=np.float64)
+    if n <= 0 or len(x) < n:
+        return out
+    seed = float(np.sum(x[:n])) / n
+    out[n - 1] = seed
+    if len(x) > n:
+        out[n:] = _linear_recursion(x[n:], 1.0 - k, k, seed)
+    return out
+
+
+def ema_series(x: Any, period: int) -> Any:
+    """EMA series (SMA seed), NaN-padded like `TechnicalIndicators._ema_series`."""
+    return _seeded_series(x, period, 2.0 / (int(period) + 1.0))
+
+
+def wilder_series(x: Any, period: int) -> Any:
+    """Wilder smoothing series (mean seed over the first `period` points)."""
+    return _seeded_series(x, period, 1.0 / int(period))
+
+
+def _last(series: Any) -> float | None:
+    if len(series) == 0:
+        return None
+    v = float(series[-1])
+    return None if math.isnan(v) else v
+
+
+# -------- indicators --------
+
+
+class VectorizedIndicators:
+    """Vectorized counterparts of `TechnicalIndicators` over float64 columns."""
+
+    @staticmethod
+    def ema(close: Any, period: int) -> float | None:
+        return _last(ema_series(close, period))
+
+    @staticmethod
+    def sma(close: Any, period: int) -> float | None:
+        n = int(period)
+        if n <= 0 or len(close) < n:
+            return None
+        return float(np.sum(close[-n:])) / n
+
+    @staticmethod
+    def rsi(close: Any, period: int = 14) -> float | None:
+        n = int(period)
+        if n <= 0 or len(close) <= n:
+            return None
+        diff = np.diff(close)
+        avg_gain = _last(wilder_series(np.maximum(diff, 0.0), n))
+        avg_loss = _last(wilder_series(np.maximum(-diff, 0.0), n))
+        if avg_gain is None or avg_loss is None:
+            return None
+        if avg_loss == 0:
+            return 50.0 if avg_gain == 0 else 100.0
+        rs = avg_gain / avg_loss
+        return float(100.0 - (100.0 / (1.0 + rs)))
+
+    @staticmethod
+    def atr(high: Any, low: Any, close: Any, period: int = 14) -> float | None:
+        n = int(period)
+        if n <= 0 or len(close) < n + 1:
+            return None
+        prev = close[:-1]
+        h, lo = high[1:], low[1:]
+        tr = np.maximum(h - lo, np.maximum(np.abs(h - prev), np.abs(prev - lo)))
+        return _last(wilder_series(tr, n))
+
+    @staticmethod
+    def macd(
+        close: Any,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+    ) -> tuple[float | None, float | None, float | None]:
+        if slow <= 0 or fast <= 0 or signal <= 0:
+            return None, None, None
+        if len(close) < slow + signal:
+            return None, None, None
+        macd_line = ema_series(close, fast) - ema_series(close, slow)
+        macd_line = macd_line[~np.isnan(macd_line)]
+        if len(macd_line) < signal:
+            return None, None, None
+        sig = _last(ema_series(macd_line, signal))
+        if sig is None:
+            return None, None, None
+        m = float(macd_line[-1])
+        return m, sig, m - sig
+
+    @staticmethod
+    def bollinger_bands(
+        close: Any,
+        period: int = 20,
+        num_std: float = 2.0,
+    ) -> tuple[float | None, float | None, float | None]:
+        n = int(period)
+        if n <= 0 or len(close) < n:
+            return None, None, None
+        window = close[-n:]
+        mean = float(np.sum(window)) / n
+        std = math.sqrt(float(np.sum((window - mean) ** 2)) / n)
+        return mean + num_std * std, mean, mean - num_std * std
+
+    @staticmethod
+    def stochastic(
+        high: Any,
+        low: Any,
+        close: Any,
+        k_period: int = 14,
+        d_period: int = 3,
+    ) -> tuple[float | None, float | None]:
+        k = int(k_period)
+        d = int(d_period)
+        if k <= 0 or d <= 0 or len(close) < k + d:
+            return None, None
+        # only the last d %K points are needed for the snapshot
+        span = k + d - 1
+        hi = np.lib.stride_tricks.sliding_window_view(high[-span:], k).max(axis=1)
+        lo = np.lib.stride_tricks.sliding_window_view(low[-span:], k).min(axis=1)
+        c = close[-d:]
+        rng = hi - lo
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k_vals = np.where(rng == 0, 50.0, 100.0 * (c - lo) / rng)
+        return float(k_vals[-1]), float(np.sum(k_vals)) / d
+
+    # ------- batch -------
+
+    @classmethod
+    def snapshot(cls, high: Any, low: Any, close: Any) -> IndicatorSnapshot | None:
+        """All standard indicators for one columnar OHLCV block."""
+        _require_numpy()
+        if len(close) == 0:
+            return None
+        high = np.ascontiguousarray(high, dtype=np.float64)
+        low = np.ascontiguousarray(low, dtype=np.float64)
+        close = np.ascontiguousarray(close, dtype=np.float64)
+
+        macd, signal, hist = cls.macd(close)
+        bb_u, bb_m, bb_l = cls.bollinger_bands(close)
+        st_k, st_d = cls.stochastic(high, low, close)
+        return IndicatorSnapshot(
+            close=float(close[-1]),
+            ema20=cls.ema(close, 20),
+            ema50=cls.ema(close, 50),
+            sma200=cls.sma(close, 200),
+            rsi14=cls.rsi(close, 14),
+            macd=macd,
+            macd_signal=signal,
+            macd_hist=hist,
+            atr14=cls.atr(high, low, close, 14),
+            bb_upper=bb_u,
+            bb_middle=bb_m,
+            bb_lower=bb_l,
+            stoch_k=st_k,
+            stoch_d=st_d,
+        )
+
+    @classmethod
+    def snapshot_many(
+        cls, blocks: Mapping[str, tuple[Any, Any, Any]] | Iterable[tuple[str, tuple[Any, Any, Any]]]
+    ) -> dict[str, IndicatorSnapshot]:
+        """Snapshots for several timeframes at once: {timeframe: (high, low, close)}."""
+        items = blocks.items() if isinstance(blocks, Mapping) else blocks
+        out: dict[str, IndicatorSnapshot] = {}
+        for tf, (high, low, close) in items:
+            snap = cls.snapshot(high, low, close)
+            if snap is not None:
+                out[tf] = snap
+        return out
+
+
+__all__ = [
+    "HAS_NUMPY",
+    "VectorizedIndicators",
+    "candles_to_columns",
+    "ema_series",
+    "wilder_series",
+]
@@ -0,0 +1,303 @@
+"""
+Columnar OHLCV container.
+
+`OHLCVFrame` stores candles as six typed arrays (int64 timestamps in ms,
+float64 open/high/low/close/volume) instead of a list of frozen `Candle`
+dataclasses with five `Decimal` fields each:
+
+- ~48 bytes per candle instead of ~700 (dataclass + datetime + 5 Decimals);
+- parsing exchange rows is a plain float conversion, no `dec(str(x))`;
+- slicing with step 1 shares the underlying arrays (zero-copy);
+- columns are exposed as memoryviews, so NumPy can wrap them without copying.
+
+Rows are materialized lazily as `CandleView` objects that behave both like a
+`Candle` (`.c`, `.h`, `.t_ms`, `.close`, ...) and like a CCXT row tuple
+`(ts_ms, open, high, low, close, volume)`, so existing consumers keep working.
+
+Frames are immutable: the arrays are never modified after construction.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, overload
+
+if TYPE_CHECKING:
+    from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle
+
+
+def _to_dec(x: float) -> Decimal:
+    # shortest repr -> Decimal, same values the old per-row parser produced
+    return Decimal(repr(x))
+
+
+class CandleView:
+    """Lazy row of an `OHLCVFrame` (Candle-compatible, also unpacks as a CCXT row)."""
+
+    __slots__ = ("_frame", "_i")
+
+    def __init__(self, frame: OHLCVFrame, index: int):
+        self._frame = frame
+        self._i = index  # absolute index in the frame arrays
+
+    # ---- float accessors (Candle API) ----
+
+    @property
+    def t_ms(self) -> int:
+        return self._frame._ts[self._i]
+
+    @property
+    def o(self) -> float:
+        return self._frame._o[self._i]
+
+    @property
+    def h(self) -> float:
+        return self._frame._h[self._i]
+
+    @property
+    def l(self) -> float:  # noqa: E743 - имя поля Candle
+        return self._frame._l[self._i]
+
+    @property
+    def c(self) -> float:
+        return self._frame._c[self._i]
+
+    @property
+    def v(self) -> float:
+        return self._frame._v[self._i]
+
+    # ---- Decimal / datetime accessors (Candle fields, built on access) ----
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.t_ms / 1000.0, tz=UTC)
+
+    @property
+    def open(self) -> Decimal:
+        return _to_dec(self.o)
+
+    @property
+    def high(self) -> Decimal:
+        return _to_dec(self.h)
+
+    @property
+    def low(self) -> Decimal:
+        return _to_dec(self.l)
+
+    @property
+    def close(self) -> Decimal:
+        return _to_dec(self.c)
+
+    @property
+    def volume(self) -> Decimal:
+        return _to_dec(self.v)
+
+    # ---- row tuple protocol ----
+
+    def as_tuple(self) -> tuple[int, float, float, float, float, float]:
+        f, i = self._frame, self._i
+        return (f._ts[i], f._o[i], f._h[i], f._l[i], f._c[i], f._v[i])
+
+    def __len__(self) -> int:
+        return 6
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.as_tuple())
+
+    def __getitem__(self, key: int | slice) -> Any:
+        return self.as_tuple()[key]
+
+    def to_candle(self) -> Candle:
+        from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle
+
+        return Candle(
+            timestamp=self.timestamp,
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+        )
+
+    def __repr__(self) -> str:
+        return f"CandleView{self.as_tuple()!r}"
+
+
+class OHLCVFrame:
+    """Immutable columnar OHLCV block (oldest candle first)."""
+
+    __slots__ = ("_ts", "_o", "_h", "_l", "_c", "_v", "_start", "_stop")
+
+    def __init__(
+        self,
+        ts: array | None = None,
+        open_: array | None = None,
+        high: array | None = None,
+        low: array | None = None,
+        close: array | None = None,
+        volume: array | None = None,
+        *,
+        start: int = 0,
+        stop: int | None = None,
+    ):
+        self._ts = ts if ts is not None else array("q")
+        self._o = open_ if open_ is not None else array("d")
+        self._h = high if high is not None else array("d")
+        self._l = low if low is not None else array("d")
+        self._c = close if close is not None else array("d")
+        self._v = volume if volume is not None else array("d")
+        n = len(self._ts)
+        if any(len(col) != n for col in (self._o, self._h, self._l, self._c, self._v)):
+            raise ValueError("OHLCV columns must have equal length")
+        self._start = int(start)
+        self._stop = n if stop is None else int(stop)
+
+    # ---- constructors ----
+
+    @classmethod
+    def empty(cls) -> OHLCVFrame:
+        return cls()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> OHLCVFrame:
+        """Build from CCXT rows `[ts_ms, open, high, low, close, volume]`; malformed rows are skipped."""
+        ts, o, h, lo, c, v = array("q"), array("d"), array("d"), array("d"), array("d"), array("d")
+        for row in rows or ():
+            if not row or len(row) < 6:
+                continue
+            try:
+                t = int(row[0])
+                ro, rh, rl, rc = float(row[1]), float(row[2]), float(row[3]), float(row[4])
+                rv = float(row[5]) if row[5] is not None else 0.0
+            except (TypeError, ValueError):
+                continue
+            ts.append(t)
+            o.append(ro)
+            h.append(rh)
+            lo.append(rl)
+            c.append(rc)
+            v.append(rv)
+        return cls(ts, o, h, lo, c, v)
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Any]) -> OHLCVFrame:
+        """Build from `Candle`-like objects (`t_ms`, `o`, `h`, `l`, `c`, `v`)."""
+        if isinstance(candles, OHLCVFrame):
+            return candles
+        return cls.from_rows((x.t_ms, x.o, x.h, x.l, x.c, x.v) for x in candles)
+
+    # ---- sequence protocol ----
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __bool__(self) -> bool:
+        return self._stop > self._start
+
+    @overload
+    def __getitem__(self, key: int) -> CandleView: ...
+    @overload
+    def __getitem__(self, key: slice) -> OHLCVFrame: ...
+    def __getitem__(self, key: int | slice) -> CandleView | OHLCVFrame:
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step == 1:
+                stop = max(start, stop)
+                return OHLCVFrame(
+                    self._ts,
+                    self._o,
+                    self._h,
+                    self._l,
+                    self._c,
+                    self._v,
+                    start=self._start + start,
+                    stop=self._start + stop,
+                )
+            sl = slice(self._start + start, self._start + stop, step)
+            return OHLCVFrame(self._ts[sl], self._o[sl], self._h[sl], self._l[sl], self._c[sl], self._v[sl])
+        i = int(key)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("OHLCVFrame index out of range")
+        return CandleView(self, self._start + i)
+
+    def __iter__(self) -> Iterator[CandleView]:
+        for i in range(self._start, self._stop):
+            yield CandleView(self, i)
+
+    def __repr__(self) -> str:
+        return f"OHLCVFrame(len={len(self)}, first_ts={self.first_ts_ms}, last_ts={self.last_ts_ms})"
+
+    # ---- columns (zero-copy memoryviews) ----
+
+    def _col(self, arr: array) -> memoryview:
+        return memoryview(arr)[self._start : self._stop]
+
+    @property
+    def timestamps(self) -> memoryview:
+        return self._col(self._ts)
+
+    @property
+    def open(self) -> memoryview:
+        return self._col(self._o)
+
+    @property
+    def high(self) -> memoryview:
+        return self._col(self._h)
+
+    @property
+    def low(self) -> memoryview:
+        return self._col(self._l)
+
+    @property
+    def close(self) -> memoryview:
+        return self._col(self._c)
+
+    @property
+    def volume(self) -> memoryview:
+        return self._col(self._v)
+
+    def closes(self) -> list[float]:
+        return self._c[self._start : self._stop].tolist()
+
+    @property
+    def first_ts_ms(self) -> int | None:
+        return self._ts[self._start] if self else None
+
+    @property
+    def last_ts_ms(self) -> int | None:
+        return self._ts[self._stop - 1] if self else None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes referenced by this frame's rows (8 per value)."""
+        return len(self) * 6 * 8
+
+    # ---- conversions ----
+
+    def to_rows(self) -> list[tuple[int, float, float, float, float, float]]:
+        return list(
+            zip(
+                self.timestamps.tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+                strict=False,
+            )
+        )
+
+    def to_candles(self) -> list[Candle]:
+        return [row.to_candle() for row in self]
+
+
+__all__ = [
+    "CandleView",
+    "OHLCVFrame",
+]
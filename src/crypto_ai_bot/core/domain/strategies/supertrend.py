@@ -11,18 +11,17 @@ from .base import BaseStrategy, Decision, MarketData, StrategyContext
 def _atr(ohlcv: Sequence[tuple[Any, ...]], period: int) -> Decimal:
     if len(ohlcv) < max(2, period + 1):
         return dec("0")
-    trs: list[Decimal] = []
-    prev_close = dec(str(ohlcv[0][4]))
+    # считаем во float (строки OHLCV уже float), в Decimal переводим только результат
+    trs: list[float] = []
+    prev_close = float(ohlcv[0][4])
     for _, o, h, l, c, _ in ohlcv[1:]:
-        h_d = dec(str(h))
-        l_d = dec(str(l))
-        c_d = dec(str(c))
-        tr = max(h_d - l_d, abs(h_d - prev_close), abs(l_d - prev_close))
-        trs.append(tr)
-        prev_close = c_d
+        h_f = float(h)
+        l_f = float(l)
+        trs.append(max(h_f - l_f, abs(h_f - prev_close), abs(l_f - prev_close)))
+        prev_close = float(c)
     if len(trs) < period:
         period = len(trs)
-    return sum(trs[-period:]) / dec(str(period))
+    return dec(sum(trs[-period:]) / period)
 
 
 class SupertrendStrategy(BaseStrategy):
@@ -42,7 +41,7 @@ class SupertrendStrategy(BaseStrategy):
             return Decision(action="hold", reason="not_enough_bars")
 
         atr = _atr(ohlcv, self.atr_period)
-        last_o, last_h, last_l, last_c = map(lambda x: dec(str(x)), ohlcv[-1][1:5])
+        last_c = dec(float(ohlcv[-1][4]))
 
         basic_upper = last_c + self.multiplier * atr
         basic_lower = last_c - self.multiplier * atr
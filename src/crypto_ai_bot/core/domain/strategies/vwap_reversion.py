@@ -7,30 +7,30 @@ from crypto_ai_bot.utils.decimal import dec
 from .base import BaseStrategy, Decision, MarketData, StrategyContext
 
 
-def _session_vwap(ohlcv: Sequence[tuple[Any, ...]]) -> Decimal:
+def _session_vwap(ohlcv: Sequence[tuple[Any, ...]]) -> float:
     """
     Простой якорный VWAP от начала дня по доступным барам.
     Берём баров ~ N, достаточных для текущей сессии (допущение).
     """
     if not ohlcv:
-        return dec("0")
-    num = dec("0")
-    den = dec("0")
+        return 0.0
+    num = 0.0
+    den = 0.0
     for _, o, h, l, c, v in ohlcv:
-        price = (dec(str(h)) + dec(str(l)) + dec(str(c))) / dec("3")
-        vol = dec(str(v)) if v is not None else dec("0")
+        price = (float(h) + float(l) + float(c)) / 3.0
+        vol = float(v) if v is not None else 0.0
         num += price * vol
         den += vol
     if den == 0:
         # fallback: среднее цены, если объём отсутствует/недоступен
-        return sum((dec(str(x[4])) for x in ohlcv)) / dec(str(len(ohlcv)))
+        return sum(float(x[4]) for x in ohlcv) / len(ohlcv)
     return num / den
 
 
-def _zscore(price: Decimal, mean: Decimal, std: Decimal) -> Decimal:
+def _zscore(price: float, mean: float, std: float) -> Decimal:
     if std == 0:
         return dec("0")
-    return (price - mean) / std
+    return dec((price - mean) / std)
 
 
 class VWAPReversionStrategy(BaseStrategy):
@@ -48,15 +48,16 @@ class VWAPReversionStrategy(BaseStrategy):
         if len(ohlcv) < self.window:
             return Decision(action="hold", reason="not_enough_bars")
 
-        closes = [dec(str(x[4])) for x in ohlcv]
+        # float-арифметика по окну; в Decimal переводим только z-score
+        closes = [float(x[4]) for x in ohlcv]
         last = closes[-1]
         vwap = _session_vwap(ohlcv[-self.window:])
 
         # отклонение и его «нормальность» по окну
         w = closes[-self.window:]
-        mean = sum(w) / dec(str(len(w)))
-        var = sum((p - mean) * (p - mean) for p in w) / dec(str(len(w)))
-        std = dec(str(float(var) ** 0.5))
+        mean = sum(w) / len(w)
+        var = sum((p - mean) * (p - mean) for p in w) / len(w)
+        std = var ** 0.5
         z = _zscore(last, vwap, std)
 
         # Триггеры: сильное отклонение + возврат к VWAP-уровню
@@ -10,6 +10,7 @@ from crypto_ai_bot.utils.circuit_breaker import CircuitBreaker
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
 from crypto_ai_bot.utils.metrics import inc, observe
+from crypto_ai_bot.utils.singleflight import SingleFlight
 
 _log = get_logger("broker.ccxt")
 
@@ -81,6 +82,9 @@ class CcxtBroker:
         # hard timeout for any single exchange call
         self._timeout_sec = float(getattr(self.settings, "BROKER_REQ_TIMEOUT_SEC", 15.0))
 
+        # identical concurrent read-only calls share one request (and one token)
+        self._flight = SingleFlight("broker")
+
     # ---------------- symbol mapping helpers ----------------
     @staticmethod
     def _to_gate(sym: str) -> str:
@@ -169,8 +173,19 @@ class CcxtBroker:
         breaker: CircuitBreaker,
         op: Callable[[], Awaitable[Any]],
         bucket_cost: float = 1.0,
+        coalesce_key: tuple[Any, ...] | None = None,
     ) -> Any:
-        """Rate-limit + breaker + timeout + metrics wrapper for single CCXT call."""
+        """
+        Rate-limit + breaker + timeout + metrics wrapper for single CCXT call.
+
+        `coalesce_key` - только для read-only вызовов: одинаковые конкурентные
+        запросы ждут один общий. Создание ордеров никогда не коалесцируется.
+        """
+        if coalesce_key is not None:
+            return await self._flight.do(
+                coalesce_key,
+                lambda: self._call_exchange(name=name, breaker=breaker, op=op, bucket_cost=bucket_cost),
+            )
         await self._bucket.acquire(bucket_cost)
         t0 = asyncio.get_event_loop().time()
         try:
@@ -205,6 +220,7 @@ class CcxtBroker:
             name="load_markets",
             breaker=self._cb_markets,
             op=lambda: self.exchange.load_markets(),
+            coalesce_key=("load_markets",),
         )
         self._markets = mk or {}
         for k in self._markets.keys():
@@ -225,16 +241,45 @@ class CcxtBroker:
             name="fetch_ticker",
             breaker=self._cb_ticker,
             op=lambda: self.exchange.fetch_ticker(ex_sym),
+            coalesce_key=("fetch_ticker", ex_sym),
         )
 
-    async def fetch_balance(self, symbol: str) -> dict[str, Decimal]:
+    async def fetch_tickers(self, symbols: list[str]) -> dict[str, dict[str, Any]]:
+        """Тикеры нескольких символов одним запросом; ключи — канонические символы."""
         await self._ensure_markets()
-        base, quote = symbol.split("/")
-        bal = await self._call_exchange(
+        ex_syms = {s: self._sym_to_ex.get(s) or s for s in symbols}
+        if not hasattr(self.exchange, "fetch_tickers"):
+            # биржа без batch-метода: один конкурентный раунд fetch_ticker
+            res = await asyncio.gather(*(self.fetch_ticker(s) for s in symbols), return_exceptions=True)
+            return {s: t for s, t in zip(symbols, res, strict=False) if t is not None and not isinstance(t, BaseException)}
+        ids = sorted(set(ex_syms.values()))
+        raw = await self._call_exchange(
+            name="fetch_tickers",
+            breaker=self._cb_ticker,
+            op=lambda: self.exchange.fetch_tickers(ids),
+            coalesce_key=("fetch_tickers", tuple(ids)),
+        )
+        raw = raw or {}
+        out: dict[str, dict[str, Any]] = {}
+        for s, ex_sym in ex_syms.items():
+            t = raw.get(ex_sym, raw.get(s))
+            if t is not None:
+                out[s] = t
+        return out
+
+    async def fetch_balances(self) -> dict[str, Any]:
+        """Баланс всего аккаунта (ccxt-словарь {currency: {free, used, total}})."""
+        await self._ensure_markets()
+        return await self._call_exchange(
             name="fetch_balance",
             breaker=self._cb_balance,
             op=lambda: self.exchange.fetch_balance(),
+            coalesce_key=("fetch_balance",),
         )
+
+    async def fetch_balance(self, symbol: str) -> dict[str, Decimal]:
+        base, quote = symbol.split("/")
+        bal = await self.fetch_balances()
         acct_base = bal.get(base, {}) or {}
         acct_quote = bal.get(quote, {}) or {}
         return {
@@ -249,6 +294,7 @@ class CcxtBroker:
             name="fetch_open_orders",
             breaker=self._cb_order,
             op=lambda: self.exchange.fetch_open_orders(ex_sym),
+            coalesce_key=("fetch_open_orders", ex_sym),
         )
         if not isinstance(orders, list):
             return []
@@ -330,6 +376,7 @@ class CcxtBroker:
             name="fetch_order",
             breaker=self._cb_order,
             op=lambda: self.exchange.fetch_order(broker_order_id, ex_sym),
+            coalesce_key=("fetch_order", ex_sym, broker_order_id),
         )
 
 
@@ -0,0 +1,224 @@
+"""
+Expiring LRU cache shared by infrastructure adapters.
+
+Features:
+- O(1) get/put/evict (OrderedDict in LRU order)
+- Per-entry TTL on a monotonic clock
+- Optional stale-while-revalidate window (`get_entry` returns stale values)
+- Hit/miss/eviction stats, published as Prometheus gauges
+
+Single event loop usage: no locks, no background threads. Expired entries are
+dropped lazily on access and pushed out by LRU eviction at capacity.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+from crypto_ai_bot.utils.metrics import gauge
+
+T = TypeVar("T")
+
+_INF = float("inf")
+
+# как часто (в операциях) сбрасывать счётчики в Prometheus
+_PUBLISH_EVERY = 256
+
+
+class TTLCache(Generic[T]):
+    """
+    LRU cache with per-entry TTL and optional stale-while-revalidate.
+
+    An entry is fresh for `ttl_sec` after put(); for the next `stale_ttl_sec`
+    it is stale - `get()` treats it as a miss, `get_entry()` still returns it
+    so the caller can serve it while refreshing in the background.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float | None = 30.0,
+        max_size: int | None = None,
+        *,
+        stale_ttl_sec: float = 0.0,
+        name: str = "default",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttl_sec: Default time to live in seconds (None = never expires)
+            max_size: Maximum number of entries (None = unlimited)
+            stale_ttl_sec: How long an expired entry may still be served stale
+            name: Label for exported metrics
+            clock: Monotonic clock in seconds (injectable for tests)
+        """
+        self._ttl = float(ttl_sec) if ttl_sec is not None else None
+        self._stale = max(0.0, float(stale_ttl_sec))
+        self._max_size = max_size if (max_size is None or max_size > 0) else None
+        self._name = name
+        self._clock = clock
+
+        # key -> (value, born, fresh_until, stale_until); порядок = LRU (первый - самый старый)
+        self._data: OrderedDict[Any, tuple[T, float, float, float]] = OrderedDict()
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._ops = 0
+
+    @property
+    def ttl_sec(self) -> float | None:
+        return self._ttl
+
+    @property
+    def max_size(self) -> int | None:
+        return self._max_size
+
+    # ------------- core API -------------
+
+    def get(self, key: Any) -> T | None:
+        """Fresh value or None (stale entries count as a miss but are kept)."""
+        entry = self._lookup(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: Any) -> tuple[T, bool] | None:
+        """
+        (value, is_fresh) while the entry is fresh or within the stale window.
+
+        Returns:
+            None if the key is absent or expired past the stale window
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: Any, *, allow_stale: bool) -> tuple[T, bool] | None:
+        self._tick()
+        rec = self._data.get(key)
+        if rec is None:
+            self._misses += 1
+            return None
+        value, _, fresh_until, stale_until = rec
+        now = self._clock()
+        if now < fresh_until:
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value, True
+        if now < stale_until:
+            if not allow_stale:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stale_hits += 1
+            return value, False
+        del self._data[key]
+        self._expirations += 1
+        self._misses += 1
+        return None
+
+    def put(self, key: Any, value: T, ttl_sec: float | None = None) -> None:
+        """Store value; `ttl_sec` overrides the cache default for this entry."""
+        self._tick()
+        ttl = self._ttl if ttl_sec is None else float(ttl_sec)
+        born = self._clock()
+        if ttl is None:
+            fresh_until = stale_until = _INF
+        else:
+            fresh_until = born + ttl
+            stale_until = fresh_until + self._stale
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        data[key] = (value, born, fresh_until, stale_until)
+        if self._max_size is not None:
+            while len(data) > self._max_size:
+                data.popitem(last=False)
+                self._evictions += 1
+
+    def age_sec(self, key: Any) -> float | None:
+        """Seconds since the entry was stored (no stats / LRU side-effects)."""
+        rec = self._data.get(key)
+        return None if rec is None else self._clock() - rec[1]
+
+    def delete(self, key: Any) -> bool:
+        """Delete key; True if it was present."""
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all entries and reset stats."""
+        self._data.clear()
+        self._hits = self._stale_hits = self._misses = 0
+        self._evictions = self._expirations = 0
+        self.publish_stats()
+
+    def size(self) -> int:
+        return len(self._data)
+
+    def cleanup(self) -> int:
+        """Remove entries past their stale window (O(n), for explicit maintenance)."""
+        now = self._clock()
+        dead = [k for k, (_, _, _, stale_until) in self._data.items() if now >= stale_until]
+        for k in dead:
+            del self._data[k]
+        self._expirations += len(dead)
+        return len(dead)
+
+    # ------------- stats -------------
+
+    def _tick(self) -> None:
+        self._ops += 1
+        if self._ops >= _PUBLISH_EVERY:
+            self.publish_stats()
+
+    def publish_stats(self) -> None:
+        """Export counters as `cache_*` gauges labelled by cache name."""
+        self._ops = 0
+        for metric, value in (
+            ("cache_hits", self._hits),
+            ("cache_stale_hits", self._stale_hits),
+            ("cache_misses", self._misses),
+            ("cache_evictions", self._evictions),
+            ("cache_expirations", self._expirations),
+            ("cache_size", len(self._data)),
+        ):
+            g = gauge(metric, cache=self._name)
+            if g is not None:
+                g.set(value)
+
+    def get_stats(self) -> dict[str, Any]:
+        total = self._hits + self._stale_hits + self._misses
+        return {
+            "size": len(self._data),
+            "max_size": self._max_size,
+            "ttl_sec": self._ttl,
+            "stale_ttl_sec": self._stale,
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "hit_rate": self._hits / total if total else 0.0,
+            "total_requests": total,
+        }
+
+    # ------------- dunders -------------
+
+    def __contains__(self, key: Any) -> bool:
+        """Key present and fresh (no stats / LRU side-effects)."""
+        rec = self._data.get(key)
+        return rec is not None and self._clock() < rec[2]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LRUCache(TTLCache[T]):
+    """Size-bounded LRU; TTL is optional (no expiry by default)."""
+
+    def __init__(self, max_size: int = 100, ttl_sec: float | None = None, *, name: str = "lru") -> None:
+        super().__init__(ttl_sec=ttl_sec, max_size=max_size, name=name)
+
+
+__all__ = ["LRUCache", "TTLCache"]
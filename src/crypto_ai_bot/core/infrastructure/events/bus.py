@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import time
 from collections import defaultdict, deque
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
 from dataclasses import dataclass
-import random
 from typing import Any
 
+from crypto_ai_bot.core.infrastructure.events.conflation import VOLATILE_FIELDS, Conflator
 from crypto_ai_bot.utils.logging import get_logger
-from crypto_ai_bot.utils.metrics import inc
+from crypto_ai_bot.utils.metrics import gauge, inc, observe
 from crypto_ai_bot.utils.time import now_ms
 
 _log = get_logger("events.bus")
@@ -16,6 +19,16 @@ _log = get_logger("events.bus")
 Handler = Callable[["Event"], Awaitable[None]]
 
 
+async def _replay(failure: Exception) -> None:
+    """Ошибка уже выполненной попытки как awaitable — чтобы цикл ретраев обработал её единообразно."""
+    raise failure
+
+_MAX_ROUTES = 4096
+
+DELIVERY_MODES = ("inline", "queue")
+OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+
+
 @dataclass(frozen=True)
 class Event:
     """
@@ -32,6 +45,81 @@ class Event:
     ts_ms: int = 0
 
 
+class _QueuedSubscriber:
+    """
+    Подписчик с собственной ограниченной очередью и воркером.
+    Для publish это обычный обработчик, который только кладёт событие в очередь;
+    сам обработчик (с ретраями и DLQ шины) выполняет воркер — вне пути публикации.
+    """
+
+    def __init__(self, bus: AsyncEventBus, handler: Handler, *, maxsize: int, overflow: str) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.handler = handler
+        self.__name__ = getattr(handler, "__name__", "handler")
+        self._bus = bus
+        self._maxsize = max(1, int(maxsize))
+        self._overflow = overflow
+        self._queue: asyncio.Queue[tuple[Event, float]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+    def _ensure_worker(self) -> asyncio.Queue[tuple[Event, float]]:
+        worker = self._worker
+        if worker is None or worker.done() or worker.get_loop() is not asyncio.get_running_loop():
+            self._queue = asyncio.Queue(maxsize=self._maxsize)
+            self._worker = asyncio.create_task(self._run(self._queue), name=f"bus-subscriber-{self.__name__}")
+        assert self._queue is not None
+        return self._queue
+
+    async def __call__(self, evt: Event) -> None:
+        q = self._ensure_worker()
+        item = (evt, time.monotonic())
+        if q.full():
+            inc("bus_queue_overflow_total", handler=self.__name__, policy=self._overflow)
+            if self._overflow == "drop_new":
+                return
+            if self._overflow == "drop_oldest":
+                q.get_nowait()
+                q.task_done()
+            else:  # block: издатель ждёт места (осознанный backpressure)
+                await q.put(item)
+                self._set_depth(q)
+                return
+        q.put_nowait(item)
+        self._set_depth(q)
+
+    def _set_depth(self, q: asyncio.Queue[Any]) -> None:
+        g = gauge("bus_queue_depth", handler=self.__name__)
+        if g is not None:
+            g.set(q.qsize())
+
+    async def _run(self, q: asyncio.Queue[tuple[Event, float]]) -> None:
+        while True:
+            evt, queued_at = await q.get()
+            try:
+                observe("bus_queue_lag_ms", (time.monotonic() - queued_at) * 1000.0, {"handler": self.__name__})
+                await self._bus._deliver_with_retry(self.handler, evt)
+            except Exception:  # noqa: BLE001  # pragma: no cover - _deliver_with_retry сам ловит ошибки обработчика
+                _log.error("bus_subscriber_worker_error", extra={"handler": self.__name__}, exc_info=True)
+            finally:
+                q.task_done()
+                self._set_depth(q)
+
+    async def flush(self, timeout_sec: float) -> None:
+        """Дождаться доставки уже поставленных событий (не дольше timeout_sec) и остановить воркер."""
+        worker, q = self._worker, self._queue
+        if worker is None or q is None or worker.done():
+            return
+        try:
+            await asyncio.wait_for(q.join(), timeout=timeout_sec)
+        except TimeoutError:
+            _log.warning("bus_subscriber_flush_timeout", extra={"handler": self.__name__, "pending": q.qsize()})
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+        self._worker = None
+
+
 class AsyncEventBus:
     """
     Лёгкая асинхронная шина событий без внешних брокеров.
@@ -42,6 +130,20 @@ class AsyncEventBus:
       - subscribe_dlq(handler) — обработчик недоставленных событий
       - publish(topic, payload, key=None) — публикация с ретраями и бэкоффом
 
+    Маршрутизация: topic -> кортеж обработчиков (точные + wildcard) вычисляется один раз
+    и кэшируется; кэш сбрасывается при любой подписке. Единственный обработчик
+    вызывается напрямую, без gather/семафора (ретраи — только если первая попытка упала).
+
+    Доставка: "inline" — publish ждёт обработчики; "queue" — у подписчика своя ограниченная
+    очередь и воркер, publish только ставит событие в очередь (переполнение: drop_oldest |
+    drop_new | block). Режим задаётся для шины и может быть переопределён в subscribe().
+    По умолчанию переполнение — block (без потерь: ордера, сделки, DMS, риск); терять старые
+    события (drop_oldest) можно только на явно перечисленных lossy_topics ("topic" или "prefix.*").
+    close()/stop() дожидаются доставки поставленных в очереди событий.
+
+    Конфляция (opt-in на топик, conflate()): для топиков-состояний publish пропускает только
+    значимые изменения — "latest" (последнее значение в окне) или "changed" (payload изменился).
+
     Гарантии: at-most-once (in-process). При включённой дедупликации — best-effort идемпотентность по key.
     """
 
@@ -54,15 +156,32 @@ class AsyncEventBus:
         topic_concurrency: int = 32,
         enable_dedupe: bool = False,
         dedupe_size: int = 2048,
+        delivery: str = "inline",
+        queue_size: int = 1000,
+        overflow: str = "block",
+        lossy_topics: Iterable[str] = (),
+        flush_timeout_sec: float = 5.0,
     ) -> None:
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(f"delivery must be one of {DELIVERY_MODES}, got {delivery!r}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.delivery = delivery
+        self.queue_size = max(1, int(queue_size))
+        self.overflow = overflow
+        self.lossy_topics = frozenset(t.strip() for t in lossy_topics if t.strip())
+        self.flush_timeout_sec = float(flush_timeout_sec)
+        self._queued: list[_QueuedSubscriber] = []
         self.max_attempts = int(max_attempts)
         self.backoff_base_ms = int(backoff_base_ms)
         self.backoff_factor = float(backoff_factor)
         self._subs: defaultdict[str, list[Handler]] = defaultdict(list)
         self._wildcard: list[tuple[str, Handler]] = []  # ('orders.' префикс, handler)
+        self._routes: dict[str, tuple[Handler, ...]] = {}  # topic -> обработчики (кэш)
         self._dlq: list[Handler] = []
         self._sem = asyncio.Semaphore(max(1, int(topic_concurrency)))
         self._started = False
+        self._conflator = Conflator(self._publish)
 
         # optional idempotency (simple LRU by key)
         self._dedupe_enabled = bool(enable_dedupe)
@@ -73,38 +192,115 @@ class AsyncEventBus:
     # -------------------------
     # Подписки
     # -------------------------
-    def subscribe(self, topic: str, handler: Handler) -> None:
-        """Подписка на конкретный topic (точное совпадение)."""
-        self._subs[topic].append(handler)
+    def is_lossy(self, topic: str) -> bool:
+        """Можно ли при переполнении очереди терять старые события топика."""
+        if topic in self.lossy_topics:
+            return True
+        return any(p.endswith("*") and topic.startswith(p.rstrip("*")) for p in self.lossy_topics)
+
+    def _wrap(
+        self,
+        handler: Handler,
+        delivery: str | None,
+        queue_size: int | None,
+        overflow: str | None,
+        topic: str | None = None,
+    ) -> Handler:
+        mode = delivery or self.delivery
+        if mode not in DELIVERY_MODES:
+            raise ValueError(f"delivery must be one of {DELIVERY_MODES}, got {mode!r}")
+        if mode == "inline":
+            return handler
+        if overflow is None:
+            overflow = "drop_oldest" if topic is not None and self.is_lossy(topic) else self.overflow
+        sub = _QueuedSubscriber(self, handler, maxsize=queue_size or self.queue_size, overflow=overflow)
+        self._queued.append(sub)
+        return sub
+
+    def subscribe(
+        self,
+        topic: str,
+        handler: Handler,
+        *,
+        delivery: str | None = None,
+        queue_size: int | None = None,
+        overflow: str | None = None,
+    ) -> None:
+        """Подписка на конкретный topic (точное совпадение). delivery/queue_size/overflow — см. класс."""
+        self._subs[topic].append(self._wrap(handler, delivery, queue_size, overflow, topic))
+        self._routes.clear()
         _log.info(
             "bus_subscribed", extra={"topic": topic, "handler": getattr(handler, "__name__", "handler")}
         )
 
     # Алиас для совместимости
-    def on(self, topic: str, handler: Handler) -> None:
-        self.subscribe(topic, handler)
+    def on(self, topic: str, handler: Handler, **options: Any) -> None:
+        self.subscribe(topic, handler, **options)
 
-    def subscribe_wildcard(self, pattern: str, handler: Handler) -> None:
+    def subscribe_wildcard(
+        self,
+        pattern: str,
+        handler: Handler,
+        *,
+        delivery: str | None = None,
+        queue_size: int | None = None,
+        overflow: str | None = None,
+    ) -> None:
         """
         Префиксная подписка: 'orders.*' → все топики, начинающиеся с 'orders.'.
         Простой и быстрый матч без регулярок.
         """
         pat = pattern.rstrip("*")
-        self._wildcard.append((pat, handler))
+        self._wildcard.append((pat, self._wrap(handler, delivery, queue_size, overflow, pattern)))
+        self._routes.clear()
         _log.info(
             "bus_subscribed_wildcard",
             extra={"pattern": pattern, "handler": getattr(handler, "__name__", "handler")},
         )
 
     # Алиас
-    def on_wildcard(self, pattern: str, handler: Handler) -> None:
-        self.subscribe_wildcard(pattern, handler)
+    def on_wildcard(self, pattern: str, handler: Handler, **options: Any) -> None:
+        self.subscribe_wildcard(pattern, handler, **options)
 
     def subscribe_dlq(self, handler: Handler) -> None:
         """Подписка на DLQ — получает события, не доставленные обработчикам после ретраев."""
         self._dlq.append(handler)
         _log.info("bus_subscribed_dlq", extra={"handler": getattr(handler, "__name__", "handler")})
 
+    def conflate(
+        self,
+        topic: str,
+        mode: str,
+        *,
+        window_ms: int = 0,
+        partition_by: str | None = "symbol",
+        ignore_fields: tuple[str, ...] = VOLATILE_FIELDS,
+    ) -> None:
+        """
+        Включить конфляцию топика (см. events.conflation):
+        "latest" — из событий в окне window_ms доставляется последнее; "changed" — только
+        изменившийся payload (window_ms > 0 — повтор не реже раза в окно). Раздельно по partition_by.
+        """
+        policy = self._conflator.set_policy(
+            topic, mode, window_ms=window_ms, partition_by=partition_by, ignore_fields=ignore_fields
+        )
+        _log.info(
+            "bus_conflation_enabled", extra={"topic": topic, "mode": policy.mode, "window_ms": policy.window_ms}
+        )
+
+    def _route(self, topic: str) -> tuple[Handler, ...]:
+        """Обработчики топика: точные подписки, затем префиксные (в порядке подписки)."""
+        handlers = self._routes.get(topic)
+        if handlers is None:
+            handlers = (
+                *self._subs.get(topic, ()),
+                *(h for (pref, h) in self._wildcard if topic.startswith(pref)),
+            )
+            if len(self._routes) >= _MAX_ROUTES:  # защита от неограниченных динамических топиков
+                self._routes.clear()
+            self._routes[topic] = handlers
+        return handlers
+
     # -------------------------
     # Жизненный цикл
     # -------------------------
@@ -113,9 +309,17 @@ class AsyncEventBus:
         _log.info("bus_started")
 
     async def close(self) -> None:
+        """Остановить шину: очереди подписчиков дочищаются (не дольше flush_timeout_sec)."""
         self._started = False
+        await self._conflator.flush()
+        if self._queued:
+            await asyncio.gather(*(sub.flush(self.flush_timeout_sec) for sub in self._queued))
         _log.info("bus_closed")
 
+    # Алиас: AppContainer/сервер останавливают шину через stop()
+    async def stop(self) -> None:
+        await self.close()
+
     # -------------------------
     # Публикация
     # -------------------------
@@ -124,32 +328,32 @@ class AsyncEventBus:
         Публикация события локальным подписчикам.
         Если обработчик падает — N ретраев с экспоненциальным бэкоффом и джиттером,
         после чего событие отправляется в DLQ.
+        Событие топика с конфляцией может быть поглощено: {"delivered": 0, "conflated": True}.
         """
+        if self._conflator.offer(topic, payload, key):
+            return {"ok": True, "delivered": 0, "topic": topic, "conflated": True}
+        return await self._publish(topic, payload, key=key)
+
+    async def _publish(self, topic: str, payload: dict[str, Any], *, key: str | None = None) -> dict[str, Any]:
         evt = Event(topic=topic, payload=payload, key=key, ts_ms=now_ms())
 
-        # Дедупликация по ключу (опционально)
-        if self._dedupe_enabled and evt.key:
-            if evt.key in self._dedupe_set:
-                inc("bus_publish_deduped_total", topic=topic)
-                _log.debug("bus_publish_deduped", extra={"topic": topic, "key": evt.key})
-                return {"ok": True, "delivered": 0, "topic": topic, "deduped": True}
-            self._dedupe_q.append(evt.key)
-            self._dedupe_set.add(evt.key)
-            # выталкиваем вышедшие за LRU
-            while len(self._dedupe_set) > self._dedupe_max:
-                old = self._dedupe_q.popleft()
-                self._dedupe_set.discard(old)
-
-        handlers = list(self._subs.get(topic, []))
-        if self._wildcard:
-            prefix_matches = [h for (pref, h) in self._wildcard if topic.startswith(pref)]
-            handlers.extend(prefix_matches)
+        if self._is_duplicate(evt):
+            return {"ok": True, "delivered": 0, "topic": topic, "deduped": True}
+
+        handlers = self._route(topic)
 
         if not handlers:
             inc("bus_publish_no_subscribers_total", topic=topic)
             _log.info("bus_published_no_subscribers", extra={"topic": topic})
             return {"ok": True, "delivered": 0, "topic": topic}
 
+        if len(handlers) == 1:
+            # быстрый путь: один обработчик — прямой await без gather/семафора
+            ok = await self._deliver_one(handlers[0], evt)
+            inc("bus_publish_ok_total", topic=topic, delivered=int(ok))
+            _log.info("bus_published", extra={"topic": topic, "delivered": int(ok), "key": key})
+            return {"ok": True, "delivered": int(ok), "topic": topic}
+
         # Доставляем обработчикам с ограничением параллелизма
         delivered = 0
 
@@ -182,6 +386,31 @@ class AsyncEventBus:
     # -------------------------
     # Внутренние утилиты
     # -------------------------
+    def _is_duplicate(self, evt: Event) -> bool:
+        """Дедупликация по ключу (опционально): LRU последних dedupe_max ключей."""
+        if not (self._dedupe_enabled and evt.key):
+            return False
+        if evt.key in self._dedupe_set:
+            inc("bus_publish_deduped_total", topic=evt.topic)
+            _log.debug("bus_publish_deduped", extra={"topic": evt.topic, "key": evt.key})
+            return True
+        self._dedupe_q.append(evt.key)
+        self._dedupe_set.add(evt.key)
+        # выталкиваем вышедшие за LRU
+        while len(self._dedupe_set) > self._dedupe_max:
+            old = self._dedupe_q.popleft()
+            self._dedupe_set.discard(old)
+        return False
+
+    async def _deliver_one(self, handler: Handler, evt: Event) -> bool:
+        """Быстрый путь: прямой await; ретраи начинаются только после первой ошибки."""
+        try:
+            await handler(evt)
+        except Exception as e:  # noqa: BLE001
+            return await self._deliver_with_retry(handler, evt, failure=e)
+        inc("bus_handler_ok_total", topic=evt.topic, handler=getattr(handler, "__name__", "handler"))
+        return True
+
     async def _emit_to_dlq(self, evt: Event, *, failed_handler: str) -> None:
         if not self._dlq:
             return
@@ -198,7 +427,10 @@ class AsyncEventBus:
             except Exception:
                 _log.debug("bus_dlq_handler_failed", extra={"original_topic": evt.topic}, exc_info=True)
 
-    async def _deliver_with_retry(self, handler: Handler, evt: Event) -> bool:
+    async def _deliver_with_retry(
+        self, handler: Handler, evt: Event, *, failure: Exception | None = None
+    ) -> bool:
+        """failure — ошибка уже выполненной первой попытки (быстрый путь publish)."""
         attempt = 1
         delay_ms = self.backoff_base_ms
         name = getattr(handler, "__name__", "handler")
@@ -206,10 +438,11 @@ class AsyncEventBus:
 
         while True:
             try:
-                await handler(evt)
+                await (handler(evt) if failure is None else _replay(failure))
                 inc("bus_handler_ok_total", topic=topic, handler=name)
                 return True
             except Exception:
+                failure = None
                 if attempt >= self.max_attempts:
                     _log.error(
                         "bus_handler_failed",
@@ -74,6 +74,10 @@ class UnifiedEventBus(EventBusPort):
         impl2: _RedisBusLike = self._impl  # type: ignore[assignment]
         await impl2.publish(topic, payload, key=key)
 
+    def conflate(self, topic: str, mode: str, **options: Any) -> None:
+        # обе реализации поддерживают конфляцию топиков-состояний
+        self._impl.conflate(topic, mode, **options)
+
     def on(self, topic: str, handler: Callable[[dict[str, Any]], Awaitable[None]]) -> None:
         if self._is_async:
             impl: _AsyncBusLike = self._impl  # type: ignore[assignment]
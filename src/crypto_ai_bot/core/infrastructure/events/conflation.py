@@ -0,0 +1,167 @@
+"""
+Конфляция событий-состояний (балансы, позиции, health): подписчикам доходят только значимые изменения.
+
+Политика включается на конкретный топик (opt-in):
+  - "latest"  — последнее значение в окне window_ms: первое событие уходит сразу,
+                следующие в окне копятся, по его окончании публикуется только последнее;
+  - "changed" — событие подавляется, если payload (без служебных trace_id/timestamp/ts)
+                не изменился; window_ms > 0 — повторить не реже раза в окно (keepalive).
+Состояние ведётся отдельно по значению partition_by из payload (по умолчанию "symbol").
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import inc
+
+_log = get_logger("events.conflation")
+
+MODES = ("latest", "changed")
+VOLATILE_FIELDS = ("trace_id", "timestamp", "ts", "ts_ms")
+
+_MAX_SLOTS = 4096
+
+# Отправка мимо конфлятора: send(topic, payload, key=key)
+Send = Callable[..., Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ConflationPolicy:
+    mode: str
+    window_ms: int = 0
+    partition_by: str | None = "symbol"
+    ignore_fields: frozenset[str] = frozenset(VOLATILE_FIELDS)
+
+
+@dataclass
+class _Slot:
+    sent_at: float = float("-inf")
+    digest: int | None = None
+    pending: tuple[dict[str, Any], str | None] | None = None
+    timer: asyncio.Task[None] | None = None
+
+
+def _digest(payload: dict[str, Any], ignore: frozenset[str]) -> int:
+    body = {k: v for k, v in payload.items() if k not in ignore}
+    return hash(json.dumps(body, sort_keys=True, default=str, separators=(",", ":")))
+
+
+def parse_policies(spec: str) -> list[tuple[str, str, int]]:
+    """'topic=mode[:window_ms],...' -> [(topic, mode, window_ms)] (формат EVENT_BUS_CONFLATE)."""
+    out: list[tuple[str, str, int]] = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        topic, sep, rule = item.partition("=")
+        mode, _, window = rule.strip().partition(":")
+        mode = mode.strip().lower()
+        if not sep or not topic.strip() or mode not in MODES:
+            raise ValueError(
+                f"bad conflation policy {item!r}: expected topic=latest:<ms> | topic=changed[:<ms>]"
+            )
+        out.append((topic.strip(), mode, int(window or 0)))
+    return out
+
+
+class Conflator:
+    """
+    Фильтр перед публикацией: offer() решает, уходит ли событие сейчас.
+    Отложенные ("latest") события отправляются через send по таймеру или при flush().
+    """
+
+    def __init__(self, send: Send) -> None:
+        self._send = send
+        self._policies: dict[str, ConflationPolicy] = {}
+        self._slots: dict[tuple[str, str], _Slot] = {}
+
+    def set_policy(
+        self,
+        topic: str,
+        mode: str,
+        *,
+        window_ms: int = 0,
+        partition_by: str | None = "symbol",
+        ignore_fields: Iterable[str] = VOLATILE_FIELDS,
+    ) -> ConflationPolicy:
+        if mode not in MODES:
+            raise ValueError(f"conflation mode must be one of {MODES}, got {mode!r}")
+        if mode == "latest" and int(window_ms) <= 0:
+            raise ValueError("conflation mode 'latest' requires window_ms > 0")
+        policy = ConflationPolicy(mode, max(0, int(window_ms)), partition_by, frozenset(ignore_fields))
+        self._policies[topic] = policy
+        return policy
+
+    def offer(self, topic: str, payload: dict[str, Any], key: str | None = None) -> bool:
+        """True — событие поглощено (подавлено или отложено) и публиковать его сейчас не нужно."""
+        policy = self._policies.get(topic)
+        if policy is None:
+            return False
+        part = str(payload.get(policy.partition_by, "")) if policy.partition_by else ""
+        slot = self._slot(topic, part)
+        now = time.monotonic()
+        window = policy.window_ms / 1000.0
+
+        if policy.mode == "changed":
+            digest = _digest(payload, policy.ignore_fields)
+            if digest == slot.digest and not (window and now - slot.sent_at >= window):
+                inc("bus_publish_conflated_total", topic=topic, mode=policy.mode)
+                return True
+            slot.digest = digest
+            slot.sent_at = now
+            return False
+
+        # latest: ведущее событие окна — сразу, остальные — только последнее по окончании окна
+        if slot.timer is None and now - slot.sent_at >= window:
+            slot.sent_at = now
+            return False
+        slot.pending = (payload, key)
+        if slot.timer is None:
+            slot.timer = asyncio.create_task(
+                self._trail(topic, slot, slot.sent_at + window - now), name=f"bus-conflate-{topic}"
+            )
+        inc("bus_publish_conflated_total", topic=topic, mode=policy.mode)
+        return True
+
+    async def flush(self) -> None:
+        """Отправить отложенные значения немедленно (остановка шины)."""
+        for (topic, _), slot in list(self._slots.items()):
+            timer, slot.timer = slot.timer, None
+            if timer is not None and not timer.done():
+                timer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await timer
+            await self._release(topic, slot)
+
+    def _slot(self, topic: str, part: str) -> _Slot:
+        slot = self._slots.get((topic, part))
+        if slot is None:
+            if len(self._slots) >= _MAX_SLOTS:  # защита от неограниченного числа партиций
+                for k in [k for k, s in self._slots.items() if s.timer is None and s.pending is None]:
+                    del self._slots[k]
+            slot = self._slots[(topic, part)] = _Slot()
+        return slot
+
+    async def _trail(self, topic: str, slot: _Slot, delay: float) -> None:
+        await asyncio.sleep(max(0.0, delay))
+        slot.timer = None
+        await self._release(topic, slot)
+
+    async def _release(self, topic: str, slot: _Slot) -> None:
+        pending, slot.pending = slot.pending, None
+        if pending is None:
+            return
+        payload, key = pending
+        slot.sent_at = time.monotonic()
+        try:
+            await self._send(topic, payload, key=key)
+        except Exception:  # noqa: BLE001
+            _log.error("bus_conflated_publish_failed", extra={"topic": topic}, exc_info=True)
@@ -4,31 +4,77 @@ import asyncio
 from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from contextlib import suppress
-import json
+from fnmatch import fnmatchcase
+import os
+import socket
+import time
 from typing import Any, Dict, List, Optional
 
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
+from redis.exceptions import ResponseError
 
+from crypto_ai_bot.core.infrastructure.events.conflation import VOLATILE_FIELDS, Conflator
+from crypto_ai_bot.utils.codec import Codec, get_codec
 from crypto_ai_bot.utils.logging import get_logger
-from crypto_ai_bot.utils.metrics import inc
+from crypto_ai_bot.utils.metrics import inc, observe
 
 # Тип обработчика: получает payload (dict)
 Handler = Callable[[dict[str, Any]], Awaitable[None]]
 
 _log = get_logger("events.redis_bus")
 
+MODES = ("pubsub", "streams")
+
+
+def _text(value: Any) -> str:
+    """Имя канала/stream'а: bytes при бинарном кодеке (decode_responses=False)."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8")
+    return str(value or "")
+
+
+def _data_field(fields: dict[Any, Any]) -> Any:
+    return fields.get("data", fields.get(b"data", b""))
+
+
+def _stream_entries(resp: Any) -> list[tuple[str, list[Any]]]:
+    """Ответ XREADGROUP (RESP2 — список пар, RESP3 — dict) -> [(stream, [(id, fields), ...])]."""
+    if not resp:
+        return []
+    if isinstance(resp, dict):
+        return [(_text(stream), list(entries)) for stream, entries in resp.items()]
+    return [(_text(stream), list(entries)) for stream, entries in resp]
+
 
 class RedisEventBus:
     """
-    Простая асинхронная шина событий поверх Redis Pub/Sub.
+    Асинхронная шина событий поверх Redis: Pub/Sub (по умолчанию) или Streams.
 
     Особенности:
       - start()/stop() идемпотентные;
       - publish можно вызывать до start() — клиент создастся лениво;
       - on/on_wildcard регистрируют корутины-обработчики (topic → dict payload);
       - слушающий цикл: читает PubSub и диспатчит в соответствующие хэндлеры;
-      - JSON-пакет: {"key": <опц. ключ>, "payload": <данные>}.
+      - пакет {"key": <опц. ключ>, "payload": <данные>} кодируется `codec`
+        (utils.codec: "json" — orjson/stdlib, "msgpack" — бинарный, Decimal/datetime
+        восстанавливаются при чтении);
+      - conflate(topic, mode) — конфляция топика-состояния на стороне издателя
+        (events.conflation): в Redis уходят только значимые изменения.
+
+    mode="streams" — топик = stream, доставка переживает отсутствие подписчиков:
+      - publish() копит XADD и отправляет их пачкой одним pipeline (окно batch_ms,
+        не больше batch_size), MAXLEN ~ maxlen; publish возвращается после записи пачки,
+        ошибка записи (или таймаут) пробрасывается вызывающему;
+      - чтение — XREADGROUP в группе `group` (несколько процессов с одной группой
+        делят поток), XACK после успешной обработки всеми обработчиками;
+      - упавшие/брошенные сообщения забираются XAUTOCLAIM после claim_idle_ms;
+        после max_deliveries доставок (счётчик XPENDING) сообщение переносится
+        в stream dead-letter (`<prefix>:__dlq__`) и подтверждается;
+      - доставка at-least-once: повтор уходит всем обработчикам stream'а, в том числе
+        уже успешно отработавшим, поэтому обработчики должны быть идемпотентны;
+      - wildcard — glob по именам stream'ов (SCAN), список обновляется раз в ping_interval;
+      - replay(topic, from_id) — повторная доставка из истории stream'а.
     """
 
     def __init__(
@@ -38,8 +84,34 @@ class RedisEventBus:
         ping_interval: float = 15.0,
         hard_timeout: float = 10.0,
         channel_prefix: str = "",
+        mode: str = "pubsub",
+        group: str = "crypto-ai-bot",
+        consumer: str | None = None,
+        maxlen: int = 100_000,
+        batch_size: int = 100,
+        batch_ms: float = 2.0,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 60_000,
+        max_deliveries: int = 5,
+        start_id: str = "$",
+        codec: str | Codec = "json",
     ) -> None:
+        """
+        codec: кодек пакета (имя для utils.codec.get_codec или экземпляр)
+
+        Streams-параметры (для mode="streams"):
+            group/consumer: группа потребителей и имя этого потребителя (по умолчанию host-pid)
+            maxlen: приблизительная длина stream'а (MAXLEN ~)
+            batch_size/batch_ms: пачка XADD и окно ожидания попутных publish()
+            block_ms: BLOCK для XREADGROUP
+            claim_idle_ms: через сколько неподтверждённое сообщение забирается (0 — не забирать)
+            max_deliveries: после стольких доставок сообщение уходит в dead-letter stream
+            start_id: с какого ID читает новая группа ("$" — только новые, "0" — вся история)
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
         self._url = url
+        self._codec = get_codec(codec)
         self._ping_interval = float(ping_interval)
         self._hard_timeout = float(hard_timeout)
         self._prefix = channel_prefix.rstrip(":")
@@ -54,6 +126,30 @@ class RedisEventBus:
         self._handlers: Dict[str, List[Handler]] = defaultdict(list)
         self._p_handlers: Dict[str, List[Handler]] = defaultdict(list)
 
+        # Streams
+        self._mode = mode
+        self._group = group
+        self._consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._maxlen = max(1, int(maxlen))
+        self._batch_size = max(1, int(batch_size))
+        self._batch_ms = max(0.0, float(batch_ms))
+        self._block_ms = max(1, int(block_ms))
+        self._claim_idle_ms = max(0, int(claim_idle_ms))
+        self._max_deliveries = max(1, int(max_deliveries))
+        self._dlq_stream = self._full_topic("__dlq__")
+        self._start_id = start_id
+        self._outbox: list[tuple[str, str, asyncio.Future[Any]]] = []
+        self._flusher: asyncio.Task[None] | None = None
+        self._streams: list[str] = []
+        self._groups: set[str] = set()
+        self._streams_dirty = True
+
+        self._conflator = Conflator(self._publish)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
     # ------------------------------------------------------------------ #
     # lifecycle
     # ------------------------------------------------------------------ #
@@ -61,10 +157,18 @@ class RedisEventBus:
     async def start(self) -> None:
         if self._started:
             return
-        self._r = Redis.from_url(self._url, decode_responses=True)
-        self._ps = self._r.pubsub(ignore_subscribe_messages=True)
+        if self._r is None:  # мог быть создан ленивым publish()
+            self._r = self._client()
         self._started = True
 
+        if self._mode == "streams":
+            self._streams_dirty = True
+            self._listen_task = asyncio.create_task(self._stream_loop(), name="redis-bus-streams")
+            _log.info("redis_bus_started", extra={"url": self._url, "mode": self._mode, "group": self._group})
+            return
+
+        self._ps = self._r.pubsub(ignore_subscribe_messages=True)
+
         # Подписываем уже зарегистрированные обработчики
         if self._handlers and self._ps:
             topics = list(self._handlers.keys())
@@ -85,11 +189,19 @@ class RedisEventBus:
         _log.info("redis_bus_started", extra={"url": self._url})
 
     async def stop(self) -> None:
+        # отложенные конфляцией значения дописываем и при publish без start()
+        await self._conflator.flush()
         if not self._started:
             return
 
         self._started = False
 
+        # Дописываем накопленные XADD
+        flusher = self._flusher
+        if flusher is not None and not flusher.done():
+            with suppress(Exception):
+                await flusher
+
         # Останавливаем слушатель
         t = self._listen_task
         self._listen_task = None
@@ -111,7 +223,8 @@ class RedisEventBus:
         # Закрываем Redis
         if self._r is not None:
             with suppress(Exception):
-                await self._r.close()
+                # redis-py >= 5: aclose(), close() устарел
+                await (getattr(self._r, "aclose", None) or self._r.close)()
             self._r = None
 
         _log.info("redis_bus_stopped")
@@ -124,6 +237,10 @@ class RedisEventBus:
     # helpers
     # ------------------------------------------------------------------ #
 
+    def _client(self) -> Redis:
+        # бинарному кодеку нужны сырые bytes из Redis
+        return Redis.from_url(self._url, decode_responses=not self._codec.binary)
+
     def _full_topic(self, topic: str) -> str:
         if not self._prefix:
             return topic
@@ -141,15 +258,26 @@ class RedisEventBus:
             topic: имя канала
             payload: данные события (dict)
             key: опциональный ключ (для идемпотентности/группировки)
+
+        Событие топика с конфляцией (conflate()) может быть подавлено или отложено.
+        В режиме streams ошибка записи в Redis пробрасывается (событие не сохранено).
         """
+        if self._conflator.offer(topic, payload, key):
+            return
+        await self._publish(topic, payload, key=key)
+
+    async def _publish(self, topic: str, payload: dict[str, Any], *, key: str | None = None) -> None:
         if self._r is None:
             # ленивое подключение, если publish вызвали до start()
-            self._r = Redis.from_url(self._url, decode_responses=True)
+            self._r = self._client()
 
         topic = self._full_topic(topic)
 
-        msg = {"key": key, "payload": payload}
-        data = json.dumps(msg, ensure_ascii=False)
+        data = self._codec.dumps({"key": key, "payload": payload})
+
+        if self._mode == "streams":
+            await self._xadd(topic, data)
+            return
 
         try:
             async with asyncio.timeout(self._hard_timeout):
@@ -158,9 +286,28 @@ class RedisEventBus:
         except Exception:
             _log.error("redis_publish_failed", extra={"topic": topic}, exc_info=True)
 
+    def conflate(
+        self,
+        topic: str,
+        mode: str,
+        *,
+        window_ms: int = 0,
+        partition_by: str | None = "symbol",
+        ignore_fields: tuple[str, ...] = VOLATILE_FIELDS,
+    ) -> None:
+        """Конфляция топика: "latest" — последнее значение в окне window_ms, "changed" — только изменения."""
+        policy = self._conflator.set_policy(
+            topic, mode, window_ms=window_ms, partition_by=partition_by, ignore_fields=ignore_fields
+        )
+        _log.info(
+            "redis_bus_conflation_enabled",
+            extra={"topic": topic, "mode": policy.mode, "window_ms": policy.window_ms},
+        )
+
     def on(self, topic: str, handler: Handler) -> None:
-        """Подписка на конкретный топик (обработчик — корутина)."""
+        """Подписка на конкретный топик (обработчик — корутина; в streams — идемпотентная)."""
         self._handlers[self._full_topic(topic)].append(handler)
+        self._streams_dirty = True
         # Если уже запущены — фоновой таской подписываемся
         if self._started and self._ps:
             asyncio.create_task(self._safe_subscribe(self._full_topic(topic)))
@@ -170,6 +317,7 @@ class RedisEventBus:
         # Префикс добавляем как namespace
         patt = self._full_topic(pattern)
         self._p_handlers[patt].append(handler)
+        self._streams_dirty = True
         if self._started and self._ps:
             asyncio.create_task(self._safe_psubscribe(patt))
 
@@ -191,6 +339,236 @@ class RedisEventBus:
         except Exception:
             _log.error("redis_psubscribe_failed", extra={"pattern": pattern}, exc_info=True)
 
+    # ------------------------------------------------------------------ #
+    # streams: publish (batched XADD)
+    # ------------------------------------------------------------------ #
+
+    async def _xadd(self, stream: str, data: str) -> None:
+        """Поставить XADD в текущую пачку и дождаться её записи; ошибка записи — вызывающему."""
+        fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._outbox.append((stream, data, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_outbox(), name="redis-bus-xadd")
+        try:
+            async with asyncio.timeout(self._hard_timeout):
+                await asyncio.shield(fut)
+        except Exception:
+            inc("bus_publish_errors_total", topic=stream)
+            _log.error("redis_publish_failed", extra={"topic": stream}, exc_info=True)
+            raise
+        inc("bus_publish_total", topic=stream)
+
+    async def _flush_outbox(self) -> None:
+        # окно пачки: попутные publish() успевают присоединиться
+        if self._batch_ms > 0:
+            await asyncio.sleep(self._batch_ms / 1000.0)
+        while self._outbox:
+            batch = self._outbox[: self._batch_size]
+            del self._outbox[: self._batch_size]
+            t0 = time.perf_counter()
+            try:
+                assert self._r is not None
+                async with self._r.pipeline(transaction=False) as pipe:
+                    for stream, data, _ in batch:
+                        pipe.xadd(stream, {"data": data}, maxlen=self._maxlen, approximate=True)
+                    ids = await pipe.execute()
+            except Exception as e:  # noqa: BLE001
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            observe("redis_bus_xadd_batch_ms", (time.perf_counter() - t0) * 1000.0, {"size": str(len(batch))})
+            inc("bus_xadd_batches_total")
+            for (_, _, fut), msg_id in zip(batch, ids, strict=False):
+                if not fut.done():
+                    fut.set_result(msg_id)
+
+    # ------------------------------------------------------------------ #
+    # streams: consume (XREADGROUP / XACK / XAUTOCLAIM)
+    # ------------------------------------------------------------------ #
+
+    def _stream_handlers(self, stream: str) -> list[Handler]:
+        handlers = list(self._handlers.get(stream, []))
+        for pattern, p_handlers in self._p_handlers.items():
+            if fnmatchcase(stream, pattern):
+                handlers.extend(p_handlers)
+        return handlers
+
+    async def _refresh_streams(self) -> None:
+        """Точные топики + stream'ы под wildcard-паттерны; группа создаётся для каждого."""
+        assert self._r is not None
+        streams = set(self._handlers)
+        for pattern in self._p_handlers:
+            async for key in self._r.scan_iter(match=pattern, _type="STREAM"):
+                streams.add(_text(key))
+        streams.discard(self._dlq_stream)  # dead-letter не потребляется обработчиками
+        for stream in streams - self._groups:
+            try:
+                await self._r.xgroup_create(stream, self._group, id=self._start_id, mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._groups.add(stream)
+        self._streams = sorted(streams)
+        self._streams_dirty = False
+
+    async def _stream_loop(self) -> None:
+        assert self._r is not None
+        loop = asyncio.get_running_loop()
+        last_refresh = last_claim = loop.time()
+        claim_sec = self._claim_idle_ms / 1000.0
+
+        try:
+            while self._started:
+                now = loop.time()
+                try:
+                    if self._streams_dirty or now - last_refresh > self._ping_interval:
+                        await self._refresh_streams()
+                        last_refresh = now
+                    if not self._streams:
+                        await asyncio.sleep(self._block_ms / 1000.0)
+                        continue
+                    if claim_sec > 0 and now - last_claim > claim_sec:
+                        await self._reclaim()
+                        last_claim = now
+                    await self._read_and_consume()
+                except Exception as e:  # noqa: BLE001 - CancelledError (BaseException) проходит мимо
+                    # ошибка XREADGROUP/XACK: неподтверждённое останется в PEL и будет забрано _reclaim
+                    if "NOGROUP" in str(e):  # stream/группу удалили — пересоздадим
+                        self._groups.clear()
+                        self._streams_dirty = True
+                    _log.error("redis_stream_io_failed", exc_info=True)
+                    await asyncio.sleep(1.0)
+                    continue
+        except asyncio.CancelledError:
+            # штатное завершение
+            pass
+        except Exception:  # noqa: BLE001
+            _log.error("redis_stream_loop_crashed", exc_info=True)
+
+    async def _read_and_consume(self) -> None:
+        assert self._r is not None
+        resp = await self._r.xreadgroup(
+            self._group,
+            self._consumer,
+            {stream: ">" for stream in self._streams},
+            count=self._batch_size,
+            block=self._block_ms,
+        )
+        for stream, entries in _stream_entries(resp):
+            await self._consume(stream, entries)
+
+    async def _reclaim(self) -> None:
+        """Забрать сообщения, зависшие без ACK дольше claim_idle_ms (упавший обработчик/потребитель)."""
+        assert self._r is not None
+        for stream in self._streams:
+            resp = await self._r.xautoclaim(
+                stream, self._group, self._consumer, self._claim_idle_ms, start_id="0-0", count=self._batch_size
+            )
+            entries = resp[1] if resp and len(resp) > 1 else []
+            if entries:
+                inc("bus_reclaimed_total", topic=stream)
+                entries = await self._dead_letter(stream, entries)
+                await self._consume(stream, entries)
+
+    async def _dead_letter(self, stream: str, entries: list[Any]) -> list[Any]:
+        """
+        Сообщения, доставленные больше max_deliveries раз (XPENDING), переносятся
+        в dead-letter stream и подтверждаются. Возвращает оставшиеся для доставки.
+        """
+        assert self._r is not None
+        # счётчик доставок — точечно по каждому ID: диапазон [min, max] по строкам
+        # неверен ("1700-10" < "1700-9") и может захватить чужие pending-записи
+        async with self._r.pipeline(transaction=False) as pipe:
+            for msg_id, _ in entries:
+                pipe.xpending_range(stream, self._group, min=msg_id, max=msg_id, count=1)
+            pending = [p for rows in await pipe.execute() for p in rows]
+        deliveries = {_text(p["message_id"]): int(p["times_delivered"]) for p in pending}
+        keep: list[Any] = []
+        dead: list[Any] = []
+        for msg_id, fields in entries:
+            if fields is not None and deliveries.get(_text(msg_id), 0) > self._max_deliveries:
+                dead.append((msg_id, fields))
+            else:
+                keep.append((msg_id, fields))
+        if dead:
+            async with self._r.pipeline(transaction=False) as pipe:
+                for msg_id, fields in dead:
+                    pipe.xadd(
+                        self._dlq_stream,
+                        {
+                            "data": _data_field(fields),
+                            "stream": stream,
+                            "id": msg_id,
+                            "deliveries": deliveries[_text(msg_id)],
+                        },
+                        maxlen=self._maxlen,
+                        approximate=True,
+                    )
+                pipe.xack(stream, self._group, *[msg_id for msg_id, _ in dead])
+                await pipe.execute()
+            for _ in dead:
+                inc("bus_dead_lettered_total", topic=stream)
+            _log.error("redis_bus_dead_lettered", extra={"topic": stream, "count": len(dead)})
+        return keep
+
+    async def _consume(self, stream: str, entries: list[Any]) -> None:
+        """Доставить пачку сообщений stream'а; ACK — только полностью обработанным."""
+        assert self._r is not None
+        handlers = self._stream_handlers(stream)
+        acks: list[str] = []
+        for msg_id, fields in entries:
+            if fields is None:  # запись уже обрезана MAXLEN
+                acks.append(msg_id)
+                continue
+            inc("bus_received_total", topic=stream)
+            if await self._dispatch(handlers, self._decode(_data_field(fields), stream), topic=stream):
+                acks.append(msg_id)
+        if acks:
+            await self._r.xack(stream, self._group, *acks)
+
+    async def replay(self, topic: str, from_id: str = "0", *, count: int | None = None) -> int:
+        """
+        Повторно доставить локальным обработчикам события topic начиная с from_id (включительно).
+        Группа и ACK не затрагиваются. Возвращает число прочитанных сообщений.
+        """
+        if self._mode != "streams":
+            raise RuntimeError("replay() requires mode='streams'")
+        if self._r is None:
+            self._r = self._client()
+        stream = self._full_topic(topic)
+        entries = await self._r.xrange(stream, min=from_id, max="+", count=count)
+        handlers = self._stream_handlers(stream)
+        for _, fields in entries:
+            await self._dispatch(handlers, self._decode(_data_field(fields), stream), topic=stream)
+        inc("bus_replayed_total", topic=stream)
+        return len(entries)
+
+    # ------------------------------------------------------------------ #
+    # decode / dispatch
+    # ------------------------------------------------------------------ #
+
+    def _decode(self, raw: Any, topic: str) -> dict[str, Any]:
+        try:
+            decoded = self._codec.loads(raw)
+            return decoded.get("payload", {}) if isinstance(decoded, dict) else {}
+        except Exception:  # noqa: BLE001
+            _log.error("redis_message_decode_failed", extra={"topic": topic}, exc_info=True)
+            return {}
+
+    @staticmethod
+    async def _dispatch(handlers: list[Handler], payload: dict[str, Any], **labels: str) -> bool:
+        """Вызвать обработчики по очереди; True — если ни один не упал."""
+        ok = True
+        for handler in handlers:
+            try:
+                await handler(payload)
+            except Exception:  # noqa: BLE001
+                ok = False
+                _log.error("handler_failed", extra=labels, exc_info=True)
+                inc("bus_handler_errors_total", **labels)
+        return ok
+
     # ------------------------------------------------------------------ #
     # listen loop
     # ------------------------------------------------------------------ #
@@ -230,17 +608,11 @@ class RedisEventBus:
                     continue
 
                 # typ = msg.get("type")  # можно раскомментировать для отладки
-                topic = str(msg.get("channel", "") or "")
-                pattern = str(msg.get("pattern", "") or "")
+                topic = _text(msg.get("channel"))
+                pattern = _text(msg.get("pattern"))
                 raw = msg.get("data", "")
 
-                payload: dict[str, Any]
-                try:
-                    decoded = json.loads(raw)
-                    payload = decoded.get("payload", {}) if isinstance(decoded, dict) else {}
-                except Exception:
-                    payload = {}
-                    _log.error("redis_message_decode_failed", extra={"topic": topic}, exc_info=True)
+                payload = self._decode(raw, topic)
 
                 # метрики получения
                 if topic:
@@ -250,21 +622,11 @@ class RedisEventBus:
 
                 # Диспатчим: точное совпадение канала
                 if topic:
-                    for handler in list(self._handlers.get(topic, [])):
-                        try:
-                            await handler(payload)
-                        except Exception:
-                            _log.error("handler_failed", extra={"topic": topic}, exc_info=True)
-                            inc("bus_handler_errors_total", topic=topic)
+                    await self._dispatch(list(self._handlers.get(topic, [])), payload, topic=topic)
 
                 # И по паттерну (если есть)
                 if pattern:
-                    for handler in list(self._p_handlers.get(pattern, [])):
-                        try:
-                            await handler(payload)
-                        except Exception:
-                            _log.error("handler_failed", extra={"pattern": pattern}, exc_info=True)
-                            inc("bus_handler_errors_total", pattern=pattern)
+                    await self._dispatch(list(self._p_handlers.get(pattern, [])), payload, pattern=pattern)
 
         except asyncio.CancelledError:
             # штатное завершение
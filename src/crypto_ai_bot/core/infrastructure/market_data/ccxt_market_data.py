@@ -9,15 +9,22 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-from collections.abc import Iterable, Sequence
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Optional, Union
 
 from crypto_ai_bot.core.application.ports import BrokerPort, TickerDTO
 from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle
+from crypto_ai_bot.core.domain.signals.indicator_engine import timeframe_to_ms
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+from crypto_ai_bot.core.infrastructure.cache import TTLCache
+from crypto_ai_bot.core.infrastructure.market_data.ohlcv_buffer import OHLCVRingBuffer
 from crypto_ai_bot.utils.decimal import dec
 from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import inc
+from crypto_ai_bot.utils.singleflight import SingleFlight
+from crypto_ai_bot.utils.time import monotonic_ms, now_ms
 
 _log = get_logger(__name__)
 
@@ -26,51 +33,6 @@ _OHLCV = list[list[Any]]  # [[timestamp(ms), open, high, low, close, volume], ..
 _TICKER = dict[str, Any]  # {'bid': ..., 'ask': ..., 'last': ..., ...}
 
 
-# ---------------- TTL cache ----------------
-
-class TTLCache:
-    """Simple TTL cache for market data."""
-
-    def __init__(self, ttl_sec: float = 30.0, max_size: int = 1000):
-        """
-        Args:
-            ttl_sec: Time to live in seconds
-            max_size: Max number of entries to keep
-        """
-        self.ttl_sec = float(ttl_sec)
-        self.max_size = int(max_size)
-        self._cache: dict[Any, tuple[Any, float]] = {}
-
-    def get(self, key: Any) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        row = self._cache.get(key)
-        if not row:
-            return None
-        value, ts = row
-        age = datetime.now(timezone.utc).timestamp() - ts
-        if age < self.ttl_sec:
-            return value
-        # expired
-        self._cache.pop(key, None)
-        return None
-
-    def put(self, key: Any, value: Any) -> None:
-        """Put value in cache with current timestamp."""
-        # basic LRU-ish cap: drop oldest one if at capacity
-        if len(self._cache) >= self.max_size:
-            oldest_key = min(self._cache.items(), key=lambda kv: kv[1][1])[0]
-            self._cache.pop(oldest_key, None)
-        self._cache[key] = (value, datetime.now(timezone.utc).timestamp())
-
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        self._cache.clear()
-
-    def size(self) -> int:
-        """Get number of cached entries."""
-        return len(self._cache)
-
-
 # --------------- utils ---------------
 
 async def _maybe_await(fn_or_coro: Any, *args: Any, **kwargs: Any) -> Any:
@@ -116,6 +78,16 @@ class CCXTMarketData:
 
     Fetches OHLCV and ticker data from exchanges via CCXT
     with TTL caching to optimize API usage.
+
+    OHLCV is kept in a per-(symbol, timeframe) ring buffer of closed candles:
+    after the initial backfill only bars newer than the last stored one are
+    fetched (`since`), and any `limit` up to the buffer capacity is served
+    from memory.
+
+    Ticker and order book support stale-while-revalidate: within
+    `stale_grace_sec` after expiry the cached value is returned at once and a
+    single background refresh is started. `*_with_age` variants report how old
+    the returned value is.
     """
 
     def __init__(
@@ -123,6 +95,8 @@ class CCXTMarketData:
         broker: BrokerPort,
         cache_ttl_sec: float = 30.0,
         max_cache_size: int = 1000,
+        ohlcv_capacity: int = 1000,
+        stale_grace_sec: float = 0.0,
     ):
         """
         Initialize market data provider.
@@ -131,9 +105,20 @@ class CCXTMarketData:
             broker: Broker instance (must have CCXT exchange)
             cache_ttl_sec: Cache time to live in seconds
             max_cache_size: Maximum cache entries
+            ohlcv_capacity: Closed candles kept per (symbol, timeframe)
+            stale_grace_sec: How long expired ticker/order book may be served while refreshing (0 = off)
         """
         self._broker = broker
-        self._cache = TTLCache(ttl_sec=cache_ttl_sec, max_size=max_cache_size)
+        self._cache_ttl_ms = int(float(cache_ttl_sec) * 1000)
+        self._cache: TTLCache[Any] = TTLCache(
+            ttl_sec=cache_ttl_sec, max_size=max_cache_size, stale_ttl_sec=stale_grace_sec, name="market_data"
+        )
+        self._ohlcv_capacity = int(ohlcv_capacity)
+        self._ohlcv: dict[tuple[str, str], OHLCVRingBuffer] = {}
+        # identical concurrent fetches share one in-flight request
+        self._flight = SingleFlight("market_data")
+        # background SWR refreshes by cache key (strong refs until done)
+        self._revalidating: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
 
         # Extract CCXT exchange from broker (sync or async supported)
         self._exchange = self._get_exchange(broker)
@@ -143,6 +128,7 @@ class CCXTMarketData:
             extra={
                 "cache_ttl": cache_ttl_sec,
                 "max_cache_size": max_cache_size,
+                "stale_grace_sec": stale_grace_sec,
                 "has_exchange": self._exchange is not None,
             },
         )
@@ -166,7 +152,7 @@ class CCXTMarketData:
         symbol: str,
         timeframe: str = "15m",
         limit: int = 100,
-    ) -> list[Candle]:
+    ) -> OHLCVFrame:
         """
         Get OHLCV candles.
 
@@ -176,8 +162,64 @@ class CCXTMarketData:
             limit: Number of candles to fetch
 
         Returns:
-            List of Candle objects
+            Columnar OHLCV frame (empty on failure)
         """
+        limit = int(limit)
+        if limit <= 0:
+            return OHLCVFrame.empty()
+        tf_ms = timeframe_to_ms(timeframe)
+        if tf_ms <= 0 or limit > self._ohlcv_capacity:
+            return await self._get_ohlcv_uncached(symbol, timeframe, limit)
+
+        key = (symbol, timeframe)
+        buf = self._ohlcv.get(key)
+        if buf is None:
+            buf = self._ohlcv[key] = OHLCVRingBuffer(tf_ms, self._ohlcv_capacity)
+
+        enough = len(buf) >= limit or buf.history_complete
+        if enough and buf.refreshed_ms is not None and monotonic_ms() - buf.refreshed_ms < self._cache_ttl_ms:
+            _log.debug("ohlcv_buffer_hit", extra={"symbol": symbol, "timeframe": timeframe, "limit": limit})
+            return buf.frame(limit)
+
+        try:
+            # concurrent callers share one refresh per stream; a follower that
+            # needs more history than the shared refresh brought runs its own
+            for _ in range(2):
+                await self._flight.do(
+                    ("ohlcv", symbol, timeframe),
+                    lambda: self._refresh_ohlcv(buf, symbol, timeframe, limit),
+                )
+                if len(buf) >= limit or buf.history_complete:
+                    break
+            return buf.frame(limit)
+        except Exception as e:  # noqa: BLE001
+            _log.error("ohlcv_fetch_failed", extra={"symbol": symbol, "timeframe": timeframe, "error": str(e)}, exc_info=True)
+            return OHLCVFrame.empty()
+
+    async def _refresh_ohlcv(self, buf: OHLCVRingBuffer, symbol: str, timeframe: str, limit: int) -> None:
+        """Backfill or delta-update one stream buffer."""
+        tf_ms = buf.timeframe_ms
+        now = now_ms()
+        last_closed = buf.last_closed_ts
+        enough = len(buf) >= limit or buf.history_complete
+        if not enough or last_closed is None or (now - last_closed) // tf_ms + 2 > buf.capacity:
+            # backfill: history is missing or the gap is wider than the buffer
+            raw = await self._fetch_ohlcv_raw(symbol, timeframe, limit)
+            frame = self._parse_ohlcv(raw)
+            buf.reset()
+            buf.merge(frame, now)
+            buf.history_complete = len(frame) < limit
+            _log.debug("ohlcv_backfilled", extra={"symbol": symbol, "timeframe": timeframe, "count": len(frame)})
+        else:
+            # delta: last closed bar onwards (it is skipped on merge), plus the forming one
+            delta_limit = int((now - last_closed) // tf_ms) + 2
+            raw = await self._fetch_ohlcv_raw(symbol, timeframe, delta_limit, since=last_closed)
+            added = buf.merge(self._parse_ohlcv(raw), now)
+            _log.debug("ohlcv_delta_fetched", extra={"symbol": symbol, "timeframe": timeframe, "added": added})
+        buf.refreshed_ms = monotonic_ms()
+
+    async def _get_ohlcv_uncached(self, symbol: str, timeframe: str, limit: int) -> OHLCVFrame:
+        """Full fetch with response-level TTL caching (unknown timeframes / limit above capacity)."""
         cache_key = ("ohlcv", symbol, timeframe, int(limit))
         cached = self._cache.get(cache_key)
         if cached is not None:
@@ -185,27 +227,30 @@ class CCXTMarketData:
             return cached  # type: ignore[return-value]
 
         try:
-            raw = await self._fetch_ohlcv_raw(symbol, timeframe, limit)
+            raw = await self._flight.do(cache_key, lambda: self._fetch_ohlcv_raw(symbol, timeframe, limit))
             candles = self._parse_ohlcv(raw)
             self._cache.put(cache_key, candles)
             _log.debug("ohlcv_fetched", extra={"symbol": symbol, "timeframe": timeframe, "count": len(candles)})
             return candles
         except Exception as e:
             _log.error("ohlcv_fetch_failed", extra={"symbol": symbol, "timeframe": timeframe, "error": str(e)}, exc_info=True)
-            return []
+            return OHLCVFrame.empty()
 
     async def _fetch_ohlcv_raw(
         self,
         symbol: str,
         timeframe: str,
         limit: int,
+        since: int | None = None,
     ) -> _OHLCV:
-        """Fetch raw OHLCV data from exchange or broker."""
+        """Fetch raw OHLCV data from exchange or broker (`since` is honoured by exchanges only)."""
         # Prefer exchange if present
         if self._exchange and hasattr(self._exchange, "fetch_ohlcv"):
+            if since is not None:
+                return await _maybe_await(self._exchange.fetch_ohlcv, symbol, timeframe=timeframe, since=since, limit=limit)  # type: ignore[misc]
             return await _maybe_await(self._exchange.fetch_ohlcv, symbol, timeframe=timeframe, limit=limit)  # type: ignore[misc]
 
-        # Fallback: through broker
+        # Fallback: through broker (latest `limit` bars; overlap is dropped on merge)
         if hasattr(self._broker, "fetch_ohlcv"):
             data = await _maybe_await(self._broker.fetch_ohlcv, symbol, timeframe, limit)
             # Support both CCXT-style rows and Candle objects
@@ -229,29 +274,9 @@ class CCXTMarketData:
 
         return []
 
-    def _parse_ohlcv(self, raw_data: _OHLCV) -> list[Candle]:
-        """Parse raw CCXT OHLCV data to Candle objects."""
-        candles: list[Candle] = []
-        for row in raw_data:
-            if not row or len(row) < 6:
-                continue
-            try:
-                ts_ms = int(row[0])
-                ts = datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc)
-                candles.append(
-                    Candle(
-                        timestamp=ts,
-                        open=dec(str(row[1])),
-                        high=dec(str(row[2])),
-                        low=dec(str(row[3])),
-                        close=dec(str(row[4])),
-                        volume=dec(str(row[5])),
-                    )
-                )
-            except Exception:
-                # skip malformed rows
-                continue
-        return candles
+    def _parse_ohlcv(self, raw_data: _OHLCV) -> OHLCVFrame:
+        """Parse raw CCXT OHLCV rows into a columnar frame (malformed rows are skipped)."""
+        return OHLCVFrame.from_rows(raw_data)
 
     # -------- ticker --------
 
@@ -265,26 +290,42 @@ class CCXTMarketData:
         Returns:
             TickerDTO or None if failed
         """
+        ticker, _ = await self.get_ticker_with_age(symbol)
+        return ticker
+
+    async def get_ticker_with_age(self, symbol: str) -> tuple[TickerDTO | None, int | None]:
+        """
+        Ticker plus its age in ms (0 for a value fetched by this call).
+
+        A stale value within the grace window is returned immediately while a
+        refresh runs in the background.
+
+        Returns:
+            (TickerDTO, age_ms), or (None, None) if failed
+        """
         cache_key = ("ticker", symbol)
-        cached = self._cache.get(cache_key)
+        cached = self._cached_with_age(cache_key, lambda: self._load_ticker(symbol))
         if cached is not None:
-            _log.debug("ticker_cache_hit", extra={"symbol": symbol})
-            return cached  # type: ignore[return-value]
+            _log.debug("ticker_cache_hit", extra={"symbol": symbol, "age_ms": cached[1]})
+            return cached
 
         try:
-            raw_ticker = await self._fetch_ticker_raw(symbol)
-            if not raw_ticker:
-                return None
-
-            ticker = self._parse_ticker(symbol, raw_ticker)
-            if ticker:
-                self._cache.put(cache_key, ticker)
-
-            _log.debug("ticker_fetched", extra={"symbol": symbol, "last": str(ticker.last) if ticker else None})
-            return ticker
+            ticker = await self._flight.do(cache_key, lambda: self._load_ticker(symbol))
         except Exception as e:
             _log.error("ticker_fetch_failed", extra={"symbol": symbol, "error": str(e)}, exc_info=True)
+            return None, None
+        return (ticker, 0) if ticker else (None, None)
+
+    async def _load_ticker(self, symbol: str) -> TickerDTO | None:
+        """Fetch, parse and cache one ticker."""
+        raw_ticker = await self._fetch_ticker_raw(symbol)
+        if not raw_ticker:
             return None
+        ticker = self._parse_ticker(symbol, raw_ticker)
+        if ticker:
+            self._cache.put(("ticker", symbol), ticker)
+        _log.debug("ticker_fetched", extra={"symbol": symbol, "last": str(ticker.last) if ticker else None})
+        return ticker
 
     async def _fetch_ticker_raw(self, symbol: str) -> _TICKER:
         """Fetch raw ticker data from exchange or broker."""
@@ -362,26 +403,71 @@ class CCXTMarketData:
         Returns:
             Order book dict with 'bids' and 'asks'
         """
+        orderbook, _ = await self.get_orderbook_with_age(symbol, limit)
+        return orderbook
+
+    async def get_orderbook_with_age(self, symbol: str, limit: int = 20) -> tuple[dict[str, Any], int | None]:
+        """
+        Order book plus its age in ms (same SWR policy as the ticker).
+
+        Returns:
+            (orderbook, age_ms), or an empty book with None age if failed
+        """
         cache_key = ("orderbook", symbol, int(limit))
-        cached = self._cache.get(cache_key)
+        cached = self._cached_with_age(cache_key, lambda: self._load_orderbook(symbol, limit))
         if cached is not None:
             return cached
 
         try:
             if self._exchange and hasattr(self._exchange, "fetch_order_book"):
-                orderbook = await _maybe_await(self._exchange.fetch_order_book, symbol, limit)
-                self._cache.put(cache_key, orderbook)
-                return orderbook
+                orderbook = await self._flight.do(cache_key, lambda: self._load_orderbook(symbol, limit))
+                return orderbook, 0
         except Exception as e:
             _log.error("orderbook_fetch_failed", extra={"symbol": symbol, "error": str(e)}, exc_info=True)
 
-        return {"bids": [], "asks": []}
+        return {"bids": [], "asks": []}, None
+
+    async def _load_orderbook(self, symbol: str, limit: int) -> dict[str, Any]:
+        """Fetch and cache one order book."""
+        orderbook = await _maybe_await(self._exchange.fetch_order_book, symbol, limit)
+        self._cache.put(("orderbook", symbol, int(limit)), orderbook)
+        return orderbook
+
+    # -------- stale-while-revalidate --------
+
+    def _cached_with_age(self, key: tuple[Any, ...], load: Callable[[], Awaitable[Any]]) -> tuple[Any, int] | None:
+        """
+        Cached (value, age_ms) if fresh or within the stale grace window.
+
+        A stale hit starts a background refresh (one per key, shared through
+        single-flight with foreground fetches).
+        """
+        entry = self._cache.get_entry(key)
+        if entry is None:
+            return None
+        value, fresh = entry
+        age_ms = int((self._cache.age_sec(key) or 0.0) * 1000)
+        if not fresh:
+            inc("market_data_stale_served_total", kind=str(key[0]))
+            if key not in self._revalidating and not self._flight.inflight(key):
+                task = asyncio.get_running_loop().create_task(self._revalidate(key, load))
+                self._revalidating[key] = task
+                task.add_done_callback(lambda _t, k=key: self._revalidating.pop(k, None))
+        return value, age_ms
+
+    async def _revalidate(self, key: tuple[Any, ...], load: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._flight.do(key, load)
+        except Exception as e:  # noqa: BLE001
+            # stale value stays until the grace window ends
+            _log.warning("market_data_revalidate_failed", extra={"key": str(key), "error": str(e)})
 
     # -------- cache utils --------
 
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self._cache.clear()
+        self._ohlcv.clear()
         _log.info("market_data_cache_cleared")
 
 
@@ -0,0 +1,271 @@
+"""
+Shared market-data hub: one poller per exchange for all symbols.
+
+Instead of every per-symbol orchestrator polling tickers and balances on its
+own, the hub polls once per interval:
+- tickers for all symbols with a single broker `fetch_tickers` call (falls
+  back to concurrent per-symbol `fetch_ticker` when the broker lacks it);
+- the account balance with a single `fetch_balances` / `fetch_balance` call;
+and publishes an immutable MarketSnapshot to subscribers. Calls go through
+the broker, so its rate limiter, circuit breakers and symbol mapping apply.
+The balance is normalized to {currency: BalanceDTO} whatever the broker returns.
+
+`HubBroker` is a broker view that serves `fetch_ticker` / `fetch_balance` from
+the latest snapshot (while it is fresh) and passes everything else through,
+so the orchestrators share one broker instance and stop polling on their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from crypto_ai_bot.core.application.ports import BalanceDTO
+from crypto_ai_bot.utils.decimal import dec
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import inc, observe
+from crypto_ai_bot.utils.time import monotonic_ms
+
+_log = get_logger(__name__)
+
+SnapshotListener = Callable[["MarketSnapshot"], None | Awaitable[None]]
+
+# top-level keys of a ccxt balance that are not currencies
+_CCXT_BALANCE_META = frozenset({"info", "free", "used", "total", "timestamp", "datetime"})
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """One poll round: tickers by symbol (as returned by the source) and the account balance."""
+
+    taken_ms: int  # monotonic ms
+    tickers: dict[str, Any] = field(default_factory=dict)
+    balance: dict[str, BalanceDTO] | None = None
+
+
+class MarketDataHub:
+    """Single scheduler that batches ticker/balance reads for many symbols."""
+
+    def __init__(
+        self,
+        broker: Any,
+        symbols: Iterable[str],
+        *,
+        interval_sec: float = 2.0,
+        max_age_sec: float | None = None,
+        poll_balance: bool = True,
+    ) -> None:
+        """
+        Args:
+            broker: Underlying broker (its `fetch_tickers` / `fetch_balances` are used if present)
+            symbols: Symbols to poll
+            interval_sec: Poll interval
+            max_age_sec: Snapshot older than this is not served (default 2 x interval)
+            poll_balance: Also poll the account balance
+        """
+        self._broker = broker
+        self._symbols: list[str] = list(dict.fromkeys(symbols))
+        self._interval = float(interval_sec)
+        self._max_age_ms = int(float(max_age_sec if max_age_sec is not None else 2 * self._interval) * 1000)
+        self._poll_balance = bool(poll_balance)
+
+        self._snapshot: MarketSnapshot | None = None
+        self._listeners: list[SnapshotListener] = []
+        self._task: asyncio.Task[None] | None = None
+        self._started = False
+
+    # ---------------- lifecycle ----------------
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._symbols)
+
+    def add_symbol(self, symbol: str) -> None:
+        if symbol not in self._symbols:
+            self._symbols.append(symbol)
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        # первый снимок до старта оркестраторов
+        with suppress(Exception):
+            await self.poll_once()
+        self._task = asyncio.create_task(self._loop(), name="market-data-hub")
+        _log.info("market_hub_started", extra={"symbols": len(self._symbols), "interval_sec": self._interval})
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        t = self._task
+        self._task = None
+        if t:
+            t.cancel()
+            with suppress(BaseException):
+                await t
+        _log.info("market_hub_stopped")
+
+    async def _loop(self) -> None:
+        while self._started:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                inc("market_hub_poll_errors_total")
+                _log.warning("market_hub_poll_failed", extra={"error": str(e)})
+
+    # ---------------- subscriptions ----------------
+
+    def subscribe(self, listener: SnapshotListener) -> Callable[[], None]:
+        """Register a snapshot listener (sync or async); returns an unsubscribe callback."""
+        self._listeners.append(listener)
+
+        def _unsubscribe() -> None:
+            with suppress(ValueError):
+                self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    async def _notify(self, snap: MarketSnapshot) -> None:
+        for listener in list(self._listeners):
+            try:
+                res = listener(snap)
+                if inspect.isawaitable(res):
+                    await res
+            except Exception as e:  # noqa: BLE001
+                _log.warning("market_hub_listener_failed", extra={"error": str(e)})
+
+    # ---------------- polling ----------------
+
+    async def poll_once(self) -> MarketSnapshot:
+        """Run one batched poll round and publish the snapshot."""
+        t0 = monotonic_ms()
+        tickers_coro = self._fetch_tickers()
+        if self._poll_balance:
+            tickers, balance = await asyncio.gather(tickers_coro, self._fetch_balance())
+        else:
+            tickers, balance = await tickers_coro, None
+        snap = MarketSnapshot(taken_ms=monotonic_ms(), tickers=tickers, balance=balance)
+        self._snapshot = snap
+        observe("market_hub.poll.ms", float(snap.taken_ms - t0), {})
+        await self._notify(snap)
+        return snap
+
+    async def _fetch_tickers(self) -> dict[str, Any]:
+        if not self._symbols:
+            return {}
+        if hasattr(self._broker, "fetch_tickers"):
+            raw = await self._broker.fetch_tickers(list(self._symbols))
+            inc("market_hub_requests_total", fn="fetch_tickers")
+            return {s: raw[s] for s in self._symbols if raw and s in raw}
+
+        # брокер без batch-метода: один конкурентный раунд на все символы
+        results = await asyncio.gather(
+            *(self._broker.fetch_ticker(s) for s in self._symbols), return_exceptions=True
+        )
+        inc("market_hub_requests_total", fn="fetch_ticker")
+        out: dict[str, Any] = {}
+        for s, r in zip(self._symbols, results, strict=False):
+            if isinstance(r, BaseException):
+                _log.warning("market_hub_ticker_failed", extra={"symbol": s, "error": str(r)})
+            elif r is not None:
+                out[s] = r
+        return out
+
+    async def _fetch_balance(self) -> dict[str, BalanceDTO] | None:
+        try:
+            # CcxtBroker.fetch_balance(symbol) is per-symbol; fetch_balances() is the whole account
+            fetch_all = getattr(self._broker, "fetch_balances", None)
+            res = await (fetch_all() if fetch_all is not None else self._broker.fetch_balance())
+            inc("market_hub_requests_total", fn="fetch_balance")
+            return _normalize_balance(res)
+        except Exception as e:  # noqa: BLE001
+            _log.warning("market_hub_balance_failed", extra={"error": str(e)})
+            return None
+
+    # ---------------- reads ----------------
+
+    def snapshot(self) -> MarketSnapshot | None:
+        """Latest snapshot if still fresh."""
+        snap = self._snapshot
+        if snap is None or monotonic_ms() - snap.taken_ms > self._max_age_ms:
+            return None
+        return snap
+
+    def ticker(self, symbol: str) -> Any | None:
+        snap = self.snapshot()
+        return snap.tickers.get(symbol) if snap is not None else None
+
+    def balance(self) -> dict[str, BalanceDTO] | None:
+        snap = self.snapshot()
+        return snap.balance if snap is not None else None
+
+    def broker_view(self) -> HubBroker:
+        return HubBroker(self._broker, self)
+
+
+class HubBroker:
+    """Broker view: ticker/balance reads from the hub snapshot, everything else from the inner broker."""
+
+    def __init__(self, inner: Any, hub: MarketDataHub) -> None:
+        self._inner = inner
+        self._hub = hub
+
+    @property
+    def hub(self) -> MarketDataHub:
+        return self._hub
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def fetch_ticker(self, symbol: str) -> Any:
+        t = self._hub.ticker(symbol)
+        if t is not None:
+            return t
+        inc("market_hub_fallback_total", fn="fetch_ticker")
+        return await self._inner.fetch_ticker(symbol)
+
+    async def fetch_balance(self, *args: Any, **kwargs: Any) -> Any:
+        bal = self._hub.balance()
+        if bal is not None:
+            if not args and not kwargs:
+                return bal
+            # CcxtBroker-style fetch_balance(symbol) -> free_base / free_quote
+            symbol = args[0] if args else kwargs.get("symbol")
+            if isinstance(symbol, str) and "/" in symbol:
+                base, quote = symbol.split("/", 1)
+                acct_base, acct_quote = bal.get(base), bal.get(quote)
+                return {
+                    "free_base": acct_base.free if acct_base is not None else dec("0"),
+                    "free_quote": acct_quote.free if acct_quote is not None else dec("0"),
+                }
+        inc("market_hub_fallback_total", fn="fetch_balance")
+        return await self._inner.fetch_balance(*args, **kwargs)
+
+
+def _normalize_balance(raw: Any) -> dict[str, BalanceDTO]:
+    """ccxt balance ({currency: {free, used, total}, ...}) or {currency: BalanceDTO} -> {currency: BalanceDTO}."""
+    out: dict[str, BalanceDTO] = {}
+    for cur, acct in (raw or {}).items():
+        if isinstance(acct, BalanceDTO):
+            out[cur] = acct
+            continue
+        if cur in _CCXT_BALANCE_META or not isinstance(acct, dict):
+            continue
+        free = dec(str(acct.get("free", 0) or 0))
+        used = dec(str(acct.get("used", 0) or 0))
+        total = acct.get("total")
+        out[cur] = BalanceDTO(
+            currency=cur, free=free, used=used, total=dec(str(total)) if total is not None else free + used
+        )
+    return out
+
+
+__all__ = ["HubBroker", "MarketDataHub", "MarketSnapshot"]
@@ -0,0 +1,173 @@
+"""
+Append-only OHLCV ring buffer.
+
+One buffer per (symbol, timeframe) keeps up to `capacity` closed candles plus the
+still-forming bar. Closed candles are written once into preallocated typed arrays
+(2 x capacity) and never modified, so frames handed out earlier stay valid:
+when the write position reaches the end, the newest `capacity` rows are copied
+into fresh arrays instead of being moved in place.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+
+# A bar is treated as closed only after this margin past its end, so late
+# exchange-side updates of the just-finished bar are still picked up.
+_CLOSE_GRACE_MS = 5_000
+
+_Row = tuple[int, float, float, float, float, float]
+
+
+class OHLCVRingBuffer:
+    """Closed candles of one (symbol, timeframe) stream + the forming bar."""
+
+    __slots__ = (
+        "timeframe_ms",
+        "capacity",
+        "_ts",
+        "_o",
+        "_h",
+        "_l",
+        "_c",
+        "_v",
+        "_begin",
+        "_end",
+        "_forming",
+        "refreshed_ms",
+        "history_complete",
+    )
+
+    def __init__(self, timeframe_ms: int, capacity: int = 1000):
+        if timeframe_ms <= 0:
+            raise ValueError("timeframe_ms must be > 0")
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.timeframe_ms = int(timeframe_ms)
+        self.capacity = int(capacity)
+        self._alloc()
+        self._begin = 0
+        self._end = 0
+        self._forming: _Row | None = None
+        self.refreshed_ms: int | None = None  # monotonic ms of the last successful refresh
+        self.history_complete = False  # exchange returned less history than asked for
+
+    def _alloc(self) -> None:
+        size = 2 * self.capacity
+        self._ts = array("q", bytes(8 * size))
+        self._o = array("d", bytes(8 * size))
+        self._h = array("d", bytes(8 * size))
+        self._l = array("d", bytes(8 * size))
+        self._c = array("d", bytes(8 * size))
+        self._v = array("d", bytes(8 * size))
+
+    # ---- state ----
+
+    @property
+    def closed_count(self) -> int:
+        return self._end - self._begin
+
+    @property
+    def last_closed_ts(self) -> int | None:
+        return self._ts[self._end - 1] if self._end > self._begin else None
+
+    @property
+    def forming(self) -> _Row | None:
+        return self._forming
+
+    def __len__(self) -> int:
+        return self.closed_count + (1 if self._forming is not None else 0)
+
+    def reset(self) -> None:
+        self._alloc()
+        self._begin = self._end = 0
+        self._forming = None
+        self.refreshed_ms = None
+        self.history_complete = False
+
+    # ---- write ----
+
+    def _compact(self) -> None:
+        """Move the newest `capacity` rows into fresh arrays (old frames keep the old ones)."""
+        keep_from = max(self._begin, self._end - self.capacity)
+        cols = [col[keep_from : self._end] for col in (self._ts, self._o, self._h, self._l, self._c, self._v)]
+        self._alloc()
+        n = len(cols[0])
+        for dst, src in zip((self._ts, self._o, self._h, self._l, self._c, self._v), cols, strict=False):
+            dst[0:n] = src
+        self._begin, self._end = 0, n
+
+    def _append_closed(self, row: _Row) -> None:
+        if self._end >= len(self._ts):
+            self._compact()
+        i = self._end
+        self._ts[i], self._o[i], self._h[i], self._l[i], self._c[i], self._v[i] = row
+        self._end = i + 1
+        if self._end - self._begin > self.capacity:
+            self._begin = self._end - self.capacity
+
+    def merge(self, frame: OHLCVFrame, now_ms: int) -> int:
+        """
+        Merge fetched candles (oldest first).
+
+        Rows at or before the last closed candle are ignored, finished bars are
+        appended, and the newest unfinished bar replaces the forming one. A bar
+        followed by a newer one is finished regardless of the grace margin, so
+        a push that carries only the next bar closes the bar that was forming.
+
+        Returns:
+            Number of closed candles appended
+        """
+        last = self.last_closed_ts
+        closed_before = int(now_ms) - self.timeframe_ms - _CLOSE_GRACE_MS
+        rows = {row[0]: row for row in frame.to_rows()}
+        if not rows:
+            return 0
+        newest = max(rows)
+        if self._forming is not None and self._forming[0] < newest:
+            rows.setdefault(self._forming[0], self._forming)
+        added = 0
+        forming: _Row | None = None
+        for ts, row in sorted(rows.items()):
+            if last is not None and ts <= last:
+                continue
+            if ts <= closed_before or ts < newest:
+                self._append_closed(row)
+                last = ts
+                added += 1
+            elif forming is None or ts >= forming[0]:
+                forming = row
+        if forming is not None:
+            self._forming = forming
+        elif self._forming is not None and last is not None and self._forming[0] <= last:
+            self._forming = None
+        return added
+
+    # ---- read ----
+
+    def frame(self, limit: int) -> OHLCVFrame:
+        """Last `limit` candles (forming bar included); zero-copy when no bar is forming."""
+        limit = max(0, int(limit))
+        if limit == 0:
+            return OHLCVFrame.empty()
+        if self._forming is None:
+            start = max(self._begin, self._end - limit)
+            return OHLCVFrame(
+                self._ts, self._o, self._h, self._l, self._c, self._v, start=start, stop=self._end
+            )
+
+        start = max(self._begin, self._end - (limit - 1))
+        ts, o, h, lo, c, v = self._forming
+        return OHLCVFrame(
+            self._ts[start : self._end] + array("q", [ts]),
+            self._o[start : self._end] + array("d", [o]),
+            self._h[start : self._end] + array("d", [h]),
+            self._l[start : self._end] + array("d", [lo]),
+            self._c[start : self._end] + array("d", [c]),
+            self._v[start : self._end] + array("d", [v]),
+        )
+
+
+__all__ = ["OHLCVRingBuffer"]
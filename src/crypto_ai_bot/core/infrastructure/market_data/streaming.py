@@ -0,0 +1,305 @@
+"""
+Streaming market data (ccxt.pro-style `watch_*` subscriptions).
+
+Implements the same read API as CCXTMarketData (`get_ticker`, `get_ohlcv`,
+`get_orderbook`), but reads are served from in-memory state that background
+watch loops keep up to date - no I/O on the decision path.
+
+- Candles live in per-(symbol, timeframe) OHLCVRingBuffer, seeded by a REST
+  backfill; a gap in pushed candles or a reconnect triggers a REST delta fetch
+  (`since` = last closed bar).
+- Ticker / order book keep the latest pushed value.
+- A stream that is not subscribed, not yet warmed up, or silent for longer
+  than `max_stale_sec` falls back to the REST provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from typing import Any
+
+from crypto_ai_bot.core.application.ports import TickerDTO
+from crypto_ai_bot.core.domain.signals.indicator_engine import timeframe_to_ms
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+from crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data import CCXTMarketData
+from crypto_ai_bot.core.infrastructure.market_data.ohlcv_buffer import OHLCVRingBuffer
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import inc
+from crypto_ai_bot.utils.time import monotonic_ms, now_ms
+
+_log = get_logger(__name__)
+
+_StreamKey = tuple[str, ...]
+
+
+class StreamingMarketData:
+    """
+    Push-fed market data with REST backfill / fallback.
+
+    Usage:
+        md = StreamingMarketData(pro_exchange, rest=CCXTMarketData(broker))
+        md.subscribe("BTC/USDT", timeframes=("15m", "1h"))
+        await md.start()
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        rest: CCXTMarketData,
+        *,
+        ohlcv_capacity: int = 1000,
+        orderbook_depth: int = 50,
+        max_stale_sec: float = 10.0,
+        reconnect_min_sec: float = 0.5,
+        reconnect_max_sec: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            exchange: Exchange with watch_ticker / watch_ohlcv / watch_order_book
+            rest: REST provider used for backfill and as fallback for reads
+            ohlcv_capacity: Closed candles kept per (symbol, timeframe)
+            orderbook_depth: Levels kept per side
+            max_stale_sec: Stream state older than this is not served
+            reconnect_min_sec: Initial reconnect backoff
+            reconnect_max_sec: Backoff cap
+        """
+        self._exchange = exchange
+        self._rest = rest
+        self._capacity = int(ohlcv_capacity)
+        self._depth = int(orderbook_depth)
+        self._max_stale_ms = int(float(max_stale_sec) * 1000)
+        self._backoff_min = float(reconnect_min_sec)
+        self._backoff_max = float(reconnect_max_sec)
+
+        self._streams: set[_StreamKey] = set()
+        self._tasks: dict[_StreamKey, asyncio.Task[None]] = {}
+        self._started = False
+
+        # последнее состояние: значение + monotonic ms получения
+        self._tickers: dict[str, tuple[TickerDTO, int]] = {}
+        self._books: dict[str, tuple[dict[str, Any], int]] = {}
+        self._candles: dict[tuple[str, str], OHLCVRingBuffer] = {}
+
+    # ------------------------------------------------------------------ #
+    # lifecycle
+    # ------------------------------------------------------------------ #
+
+    def subscribe(
+        self,
+        symbol: str,
+        *,
+        timeframes: Iterable[str] = ("15m",),
+        ticker: bool = True,
+        orderbook: bool = True,
+    ) -> None:
+        """Register streams for a symbol (started immediately if already running)."""
+        keys: list[_StreamKey] = []
+        if ticker:
+            keys.append(("ticker", symbol))
+        if orderbook:
+            keys.append(("orderbook", symbol))
+        for tf in timeframes:
+            tf_ms = timeframe_to_ms(tf)
+            if tf_ms <= 0:
+                raise ValueError(f"unsupported timeframe: {tf}")
+            self._candles.setdefault((symbol, tf), OHLCVRingBuffer(tf_ms, self._capacity))
+            keys.append(("ohlcv", symbol, tf))
+        for key in keys:
+            self._streams.add(key)
+            if self._started:
+                self._spawn(key)
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for key in sorted(self._streams):
+            self._spawn(key)
+        _log.info("market_data_stream_started", extra={"streams": len(self._streams)})
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for t in tasks:
+            t.cancel()
+        for t in tasks:
+            with suppress(BaseException):
+                await t
+        _log.info("market_data_stream_stopped")
+
+    async def close(self) -> None:
+        await self.stop()
+
+    def _spawn(self, key: _StreamKey) -> None:
+        if key in self._tasks:
+            return
+        self._tasks[key] = asyncio.create_task(self._run(key), name="md-stream-" + ":".join(key))
+
+    # ------------------------------------------------------------------ #
+    # watch loops
+    # ------------------------------------------------------------------ #
+
+    async def _run(self, key: _StreamKey) -> None:
+        """Watch one stream forever; reconnect with backoff, resync via REST."""
+        kind = key[0]
+        watch, on_message, resync = self._handlers(key)
+        backoff = self._backoff_min
+        while self._started:
+            try:
+                await resync()
+                while self._started:
+                    msg = await watch()
+                    try:
+                        on_message(msg)
+                    except _StreamGapError:
+                        inc("market_data_stream_gap_total", stream=kind)
+                        await resync()
+                        try:
+                            on_message(msg)
+                        except _StreamGapError as e:
+                            # REST ещё не отдаёт недостающие бары: ждём следующего сообщения, а не переподключаемся
+                            inc("market_data_stream_gap_unresolved_total", stream=kind)
+                            _log.warning(
+                                "market_data_stream_gap_unresolved",
+                                extra={"stream": ":".join(key), "error": str(e)},
+                            )
+                    backoff = self._backoff_min
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                inc("market_data_stream_reconnect_total", stream=kind)
+                _log.warning(
+                    "market_data_stream_disconnected",
+                    extra={"stream": ":".join(key), "error": str(e), "retry_sec": backoff},
+                )
+                self._invalidate(key)
+                await asyncio.sleep(backoff)
+                backoff = min(self._backoff_max, max(backoff * 2, self._backoff_min))
+
+    def _handlers(
+        self, key: _StreamKey
+    ) -> tuple[Callable[[], Awaitable[Any]], Callable[[Any], None], Callable[[], Awaitable[None]]]:
+        kind, symbol = key[0], key[1]
+        ex = self._exchange
+        if kind == "ticker":
+            return (lambda: ex.watch_ticker(symbol)), (lambda m: self._on_ticker(symbol, m)), _noop
+        if kind == "orderbook":
+            return (
+                (lambda: ex.watch_order_book(symbol, self._depth)),
+                (lambda m: self._on_orderbook(symbol, m)),
+                _noop,
+            )
+        tf = key[2]
+        return (
+            (lambda: ex.watch_ohlcv(symbol, tf)),
+            (lambda m: self._on_ohlcv(symbol, tf, m)),
+            (lambda: self._backfill(symbol, tf)),
+        )
+
+    def _invalidate(self, key: _StreamKey) -> None:
+        """After a disconnect the last value is no longer live: reads go to REST until resync."""
+        kind, symbol = key[0], key[1]
+        if kind == "ticker":
+            self._tickers.pop(symbol, None)
+        elif kind == "orderbook":
+            self._books.pop(symbol, None)
+        else:
+            buf = self._candles.get((symbol, key[2]))
+            if buf is not None:
+                buf.refreshed_ms = None
+
+    # ---- messages ----
+
+    def _on_ticker(self, symbol: str, raw: dict[str, Any]) -> None:
+        ticker = self._rest._parse_ticker(symbol, raw)
+        if ticker is not None:
+            self._tickers[symbol] = (ticker, monotonic_ms())
+
+    def _on_orderbook(self, symbol: str, raw: dict[str, Any]) -> None:
+        depth = self._depth
+        book = {
+            "bids": [list(x[:2]) for x in (raw.get("bids") or [])[:depth]],
+            "asks": [list(x[:2]) for x in (raw.get("asks") or [])[:depth]],
+            "timestamp": raw.get("timestamp"),
+        }
+        self._books[symbol] = (book, monotonic_ms())
+
+    def _on_ohlcv(self, symbol: str, timeframe: str, rows: list[list[Any]]) -> None:
+        buf = self._candles[(symbol, timeframe)]
+        frame = OHLCVFrame.from_rows(rows)
+        # закрытые бары + формирующийся непрерывны: следующий за ним бар — не дырка
+        last = buf.forming[0] if buf.forming is not None else buf.last_closed_ts
+        if len(frame) and last is not None and frame.first_ts_ms > last + buf.timeframe_ms:
+            # пропущены бары между last и первым пришедшим: досинхронизируем через REST
+            raise _StreamGapError(f"gap after {last}")
+        buf.merge(frame, now_ms())
+        buf.refreshed_ms = monotonic_ms()
+
+    # ---- REST backfill ----
+
+    async def _backfill(self, symbol: str, timeframe: str) -> None:
+        buf = self._candles[(symbol, timeframe)]
+        tf_ms = buf.timeframe_ms
+        now = now_ms()
+        last = buf.last_closed_ts
+        if last is None or (now - last) // tf_ms + 2 > buf.capacity:
+            raw = await self._rest._fetch_ohlcv_raw(symbol, timeframe, buf.capacity)
+            frame = OHLCVFrame.from_rows(raw)
+            buf.reset()
+            buf.merge(frame, now)
+            buf.history_complete = len(frame) < buf.capacity
+        else:
+            limit = int((now - last) // tf_ms) + 2
+            raw = await self._rest._fetch_ohlcv_raw(symbol, timeframe, limit, since=last)
+            buf.merge(OHLCVFrame.from_rows(raw), now)
+        buf.refreshed_ms = monotonic_ms()
+        inc("market_data_stream_backfill_total", timeframe=timeframe)
+
+    # ------------------------------------------------------------------ #
+    # reads (MarketDataPort)
+    # ------------------------------------------------------------------ #
+
+    def _live(self, received_ms: int | None) -> bool:
+        return received_ms is not None and monotonic_ms() - received_ms <= self._max_stale_ms
+
+    async def get_ticker(self, symbol: str) -> TickerDTO | None:
+        rec = self._tickers.get(symbol)
+        if rec is not None and self._live(rec[1]):
+            return rec[0]
+        inc("market_data_stream_fallback_total", kind="ticker")
+        return await self._rest.get_ticker(symbol)
+
+    async def get_orderbook(self, symbol: str, limit: int = 20) -> dict[str, Any]:
+        rec = self._books.get(symbol)
+        if rec is not None and self._live(rec[1]) and int(limit) <= self._depth:
+            book = rec[0]
+            return {
+                "bids": book["bids"][:limit],
+                "asks": book["asks"][:limit],
+                "timestamp": book["timestamp"],
+            }
+        inc("market_data_stream_fallback_total", kind="orderbook")
+        return await self._rest.get_orderbook(symbol, limit)
+
+    async def get_ohlcv(self, symbol: str, timeframe: str = "15m", limit: int = 100) -> OHLCVFrame:
+        buf = self._candles.get((symbol, timeframe))
+        if buf is not None and self._live(buf.refreshed_ms) and (len(buf) >= limit or buf.history_complete):
+            return buf.frame(limit)
+        inc("market_data_stream_fallback_total", kind="ohlcv")
+        return await self._rest.get_ohlcv(symbol, timeframe, limit)
+
+
+class _StreamGapError(Exception):
+    """Pushed candles are not contiguous with the buffer."""
+
+
+async def _noop() -> None:
+    return None
+
+
+__all__ = ["StreamingMarketData"]
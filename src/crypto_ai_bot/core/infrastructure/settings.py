@@ -29,6 +29,7 @@ class BackgroundIntervals:
     SETTLEMENT: int = 30       # Обработка частичных исполнений
     WATCHDOG: int = 3          # Мониторинг здоровья
     HEALTH_CHECK: int = 10     # HTTP health endpoint
+    MARKET_HUB: int = 2        # Общий опрос тикеров/баланса по всем символам
 
 
 @dataclass
@@ -51,6 +52,21 @@ class TechnicalDefaults:
     IDEMPOTENCY_BUCKET_MS: int = 60000
     IDEMPOTENCY_TTL_SEC: int = 3600
     BACKUP_RETENTION_DAYS: int = 30
+    INDICATOR_BACKEND: str = "scalar"  # scalar | numpy | incremental
+    DB_READ_POOL_SIZE: int = 2  # read-only подключения SQLite (записи — один поток-писатель)
+    DB_REPORT_POOL_SIZE: int = 1  # отдельные read-only подключения для отчётов/API
+    DB_GROUP_COMMIT_MS: float = 5.0  # окно группового коммита писателя (мс)
+    DB_GROUP_COMMIT_ROWS: int = 256  # максимум записей в одной транзакции
+    EVENT_BUS_DELIVERY: str = "queue"  # inline | queue (очередь и воркер на подписчика)
+    EVENT_BUS_QUEUE_SIZE: int = 1000  # глубина очереди подписчика
+    EVENT_BUS_OVERFLOW: str = "block"  # drop_oldest | drop_new | block
+    # топики-состояния и телеметрия: при переполнении очереди можно терять старые события
+    EVENT_BUS_LOSSY_TOPICS: str = (
+        "balances.updated,position.updated,health.report,metrics.updated,pnl.updated,"
+        "watchdog.heartbeat,dms.ping,orch.cycle.*"
+    )
+    # конфляция топиков-состояний: "topic=latest:<ms>" | "topic=changed[:<keepalive ms>]", через запятую
+    EVENT_BUS_CONFLATE: str = "balances.updated=changed,position.updated=changed,health.report=changed:300000"
     
     # Dead Man's Switch
     DMS_TIMEOUT_MS: int = 120000  # 2 минуты
@@ -328,6 +344,7 @@ class Settings:
         self.intervals.RECONCILE = _get_config_value("RECONCILE_INTERVAL_SEC", self.intervals.RECONCILE)
         self.intervals.SETTLEMENT = _get_config_value("SETTLEMENT_INTERVAL_SEC", self.intervals.SETTLEMENT)
         self.intervals.WATCHDOG = _get_config_value("WATCHDOG_INTERVAL_SEC", self.intervals.WATCHDOG)
+        self.intervals.MARKET_HUB = _get_config_value("MARKET_HUB_INTERVAL_SEC", self.intervals.MARKET_HUB)
         
         # Override мягких правил если заданы
         self.soft_risk.COOLDOWN_SEC = _get_config_value("RISK_COOLDOWN_SEC", self.soft_risk.COOLDOWN_SEC)
@@ -355,6 +372,22 @@ class Settings:
         self.technical.DMS_RECHECKS = _get_config_value("DMS_RECHECKS", self.technical.DMS_RECHECKS)
         self.technical.DMS_RECHECK_DELAY_SEC = _get_config_value("DMS_RECHECK_DELAY_SEC", self.technical.DMS_RECHECK_DELAY_SEC)
         
+        # Бэкенд индикаторов
+        self.technical.INDICATOR_BACKEND = _get_config_value("INDICATOR_BACKEND", self.technical.INDICATOR_BACKEND).lower()
+
+        # Пул read-only подключений к БД
+        self.technical.DB_READ_POOL_SIZE = _get_config_value("DB_READ_POOL_SIZE", self.technical.DB_READ_POOL_SIZE)
+        self.technical.DB_REPORT_POOL_SIZE = _get_config_value("DB_REPORT_POOL_SIZE", self.technical.DB_REPORT_POOL_SIZE)
+        self.technical.DB_GROUP_COMMIT_MS = _get_config_value("DB_GROUP_COMMIT_MS", self.technical.DB_GROUP_COMMIT_MS)
+        self.technical.DB_GROUP_COMMIT_ROWS = _get_config_value("DB_GROUP_COMMIT_ROWS", self.technical.DB_GROUP_COMMIT_ROWS)
+
+        # Доставка событий шины
+        self.technical.EVENT_BUS_DELIVERY = _get_config_value("EVENT_BUS_DELIVERY", self.technical.EVENT_BUS_DELIVERY).lower()
+        self.technical.EVENT_BUS_QUEUE_SIZE = _get_config_value("EVENT_BUS_QUEUE_SIZE", self.technical.EVENT_BUS_QUEUE_SIZE)
+        self.technical.EVENT_BUS_OVERFLOW = _get_config_value("EVENT_BUS_OVERFLOW", self.technical.EVENT_BUS_OVERFLOW).lower()
+        self.technical.EVENT_BUS_LOSSY_TOPICS = _get_config_value("EVENT_BUS_LOSSY_TOPICS", self.technical.EVENT_BUS_LOSSY_TOPICS)
+        self.technical.EVENT_BUS_CONFLATE = _get_config_value("EVENT_BUS_CONFLATE", self.technical.EVENT_BUS_CONFLATE)
+
         # Валидация
         self._validate()
     
@@ -393,6 +426,22 @@ class Settings:
         assert self.intervals.EVAL > 0, "EVAL_INTERVAL_SEC должен быть > 0"
         assert self.intervals.EXITS > 0, "EXITS_INTERVAL_SEC должен быть > 0"
         assert self.intervals.RECONCILE > 0, "RECONCILE_INTERVAL_SEC должен быть > 0"
+        assert self.intervals.MARKET_HUB > 0, "MARKET_HUB_INTERVAL_SEC должен быть > 0"
+
+        # Индикаторы
+        assert self.technical.INDICATOR_BACKEND in ("scalar", "numpy", "incremental"), \
+            f"INDICATOR_BACKEND должен быть scalar|numpy|incremental, получен {self.technical.INDICATOR_BACKEND}"
+
+        # Хранилище
+        assert self.technical.DB_READ_POOL_SIZE >= 0, "DB_READ_POOL_SIZE должен быть >= 0"
+        assert self.technical.DB_REPORT_POOL_SIZE >= 0, "DB_REPORT_POOL_SIZE должен быть >= 0"
+        assert self.technical.DB_GROUP_COMMIT_MS >= 0, "DB_GROUP_COMMIT_MS должен быть >= 0"
+        assert self.technical.DB_GROUP_COMMIT_ROWS >= 1, "DB_GROUP_COMMIT_ROWS должен быть >= 1"
+        assert self.technical.EVENT_BUS_DELIVERY in ("inline", "queue"), \
+            f"EVENT_BUS_DELIVERY должен быть inline|queue, получен {self.technical.EVENT_BUS_DELIVERY}"
+        assert self.technical.EVENT_BUS_QUEUE_SIZE >= 1, "EVENT_BUS_QUEUE_SIZE должен быть >= 1"
+        assert self.technical.EVENT_BUS_OVERFLOW in ("drop_oldest", "drop_new", "block"), \
+            f"EVENT_BUS_OVERFLOW должен быть drop_oldest|drop_new|block, получен {self.technical.EVENT_BUS_OVERFLOW}"
     
     @classmethod
     def load(cls) -> "Settings":
@@ -0,0 +1,602 @@
+"""
+Async storage facade: SQLite off the event loop.
+
+Repositories stay synchronous, but nothing touches sqlite from the loop thread:
+- a single writer thread owns the read-write connection and executes writes
+  from a FIFO queue (so their order is preserved and transactions never
+  interleave);
+- a small pool of read-only connections (WAL readers do not block the writer)
+  serves reads concurrently;
+- writes are group-committed: the writer collects queued writes for up to
+  `group_commit_ms` or `group_commit_rows`, runs them in one BEGIN IMMEDIATE
+  transaction (plain inserts - ticker snapshots, audit events - go through
+  `executemany`) and resolves every caller's future only after COMMIT;
+  order/idempotency writes are "flush-now" and close the batch immediately;
+- `storage.<repo>.<method>(...)` returns an awaitable:
+
+      storage = AsyncStorageFacade.open(settings.DB_PATH)
+      await storage.trades.add_from_order(order)
+      pos = await storage.positions.get_position("BTC/USDT")
+
+- reporting (API, Telegram, CLI reports) goes through `storage.reporting`: the
+  same read methods on a separate read-only pool (query_only), each call in
+  one snapshot-consistent read transaction, so a slow /pnl or performance
+  report never occupies the trading readers or the writer:
+
+      totals = await storage.reporting.rollups.get_totals(None, start_ms, end_ms)
+
+Busy-timeout waits and WAL checkpoints stall only the storage threads, never
+the exits/eval loops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any
+
+from crypto_ai_bot.core.infrastructure.storage.migrations.runner import run_migrations
+from crypto_ai_bot.core.infrastructure.storage.repositories import (
+    AuditRepo,
+    IdempotencyRepository,
+    LotsRepository,
+    MarketDataRepository,
+    OrdersRepository,
+    PositionsRepository,
+    RollupsRepository,
+    TradesRepository,
+)
+from crypto_ai_bot.core.infrastructure.storage.sqlite_adapter import connect, connect_readonly, read_only
+from crypto_ai_bot.utils.logging import get_logger
+from crypto_ai_bot.utils.metrics import inc, observe
+from crypto_ai_bot.utils.time import monotonic_ms, now_ms
+
+_log = get_logger(__name__)
+
+_REPOSITORIES: dict[str, type] = {
+    "trades": TradesRepository,
+    "positions": PositionsRepository,
+    "orders": OrdersRepository,
+    "idempotency": IdempotencyRepository,
+    "audit": AuditRepo,
+    "market_data": MarketDataRepository,
+    "lots": LotsRepository,
+    "rollups": RollupsRepository,
+}
+
+# методы-чтения уходят в пул read-only подключений, всё остальное — писателю
+_READ_PREFIXES = ("get_", "list_", "last_", "count_", "find_", "has", "exists")
+
+# durability «flush-now»: запись коммитится сразу, не дожидаясь окна группового коммита
+_FLUSH_NOW_REPOS = frozenset({"orders"})
+_FLUSH_NOW_METHODS = frozenset({("idempotency", "check_and_store")})
+
+# простые INSERT'ы: вместо задания в очередь кладётся строка параметров -> executemany
+_ROW_WRITES: dict[tuple[str, str], tuple[str, Callable[..., tuple[Any, ...]]]] = {
+    ("market_data", "store_ticker"): (MarketDataRepository.INSERT_SQL, MarketDataRepository.ticker_row),
+    ("audit", "write"): (AuditRepo.INSERT_SQL, AuditRepo.row),
+    ("audit", "add"): (AuditRepo.INSERT_SQL, AuditRepo.row),
+}
+
+_Job = Callable[[dict[str, Any]], Any]  # job(repos) -> result
+
+
+class _Repos(dict):  # type: ignore[type-arg]
+    """Ленивые экземпляры репозиториев поверх одного подключения."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        super().__init__()
+        self.conn = conn
+
+    def __missing__(self, name: str) -> Any:
+        repo = _REPOSITORIES[name](self.conn)
+        self[name] = repo
+        return repo
+
+
+def _resolve(fut: asyncio.Future[Any], result: Any, error: BaseException | None) -> None:
+    if fut.done():  # вызывающий уже отменён
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+class _TxCursor:
+    """Курсор писателя: BEGIN репозиториев внутри групповой транзакции игнорируется."""
+
+    def __init__(self, cur: sqlite3.Cursor) -> None:
+        self._cur = cur
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cur, name)
+
+    def __iter__(self) -> Any:
+        return iter(self._cur)
+
+    def execute(self, sql: str, *params: Any) -> _TxCursor:
+        if not _is_begin(sql):
+            self._cur.execute(sql, *params)
+        return self
+
+
+class _TxConnection:
+    """
+    Подключение, которое видят репозитории писателя.
+    Транзакцией управляет групповой коммит: commit() — no-op,
+    rollback() откатывает только текущее задание (до его SAVEPOINT).
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> _TxConnection:
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def cursor(self) -> _TxCursor:
+        return _TxCursor(self._conn.cursor())
+
+    def execute(self, sql: str, *params: Any) -> Any:
+        return self.cursor().execute(sql, *params)
+
+    def commit(self) -> None:
+        if not self._conn.in_transaction:  # вне пакета (создание схемы) — обычный автокоммит
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK TO job")
+
+
+def _is_begin(sql: str) -> bool:
+    return sql.lstrip()[:5].upper() == "BEGIN"
+
+
+class _Write:
+    """Элемент очереди писателя: задание job(repos) или строка для executemany."""
+
+    __slots__ = ("job", "sql", "params", "flush", "loop", "fut", "queued_ms")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        job: _Job | None = None,
+        sql: str | None = None,
+        params: tuple[Any, ...] = (),
+        flush: bool = False,
+    ) -> None:
+        self.job = job
+        self.sql = sql
+        self.params = params
+        self.flush = flush
+        self.loop = loop
+        self.fut: asyncio.Future[Any] = loop.create_future()
+        self.queued_ms = monotonic_ms()
+
+
+class _WriterThread(threading.Thread):
+    """Единственный владелец read-write подключения; пишет пакетами с групповым коммитом."""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        group_commit_ms: float,
+        group_commit_rows: int,
+        backup_retention_days: int | None = None,
+    ) -> None:
+        super().__init__(name="sqlite-writer", daemon=True)
+        self._db_path = db_path
+        self._backup_retention_days = backup_retention_days
+        self._window_sec = max(0.0, float(group_commit_ms)) / 1000.0
+        self._max_rows = max(1, int(group_commit_rows))
+        self.jobs: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self.ready = threading.Event()
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        try:
+            conn = connect(self._db_path)
+            conn.row_factory = sqlite3.Row
+            # схема — только миграции; проверка один раз при старте, до того как пойдут читатели
+            run_migrations(
+                conn,
+                now_ms=now_ms(),
+                db_path=self._db_path if self._db_path != ":memory:" else "",
+                do_backup=self._backup_retention_days is not None,
+                backup_retention_days=int(self._backup_retention_days or 0),
+            )
+            repos = _Repos(_TxConnection(conn))  # type: ignore[arg-type]
+        except BaseException as e:  # noqa: BLE001  # pragma: no cover - ошибка открытия БД
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+
+        try:
+            stopping = False
+            while not stopping:
+                first = self.jobs.get()
+                if first is self._STOP:
+                    break
+                batch, stopping = self._collect(first)
+                self._commit(conn, repos, batch)
+        finally:
+            conn.close()
+
+    def _collect(self, first: _Write) -> tuple[list[_Write], bool]:
+        """Добираем пакет: до окна group_commit_ms, лимита строк или flush-now записи."""
+        batch = [first]
+        deadline = time.monotonic() + self._window_sec
+        while not batch[-1].flush and len(batch) < self._max_rows:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self.jobs.get(timeout=timeout) if timeout > 0 else self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, conn: sqlite3.Connection, repos: _Repos, batch: list[_Write]) -> None:
+        t0 = monotonic_ms()
+        for w in batch:
+            observe("storage.write.queue.ms", float(t0 - w.queued_ms), {})
+        results: list[tuple[Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            i = 0
+            while i < len(batch):
+                w = batch[i]
+                if w.sql is None:
+                    results.append(self._run_job(conn, repos, w))
+                    i += 1
+                    continue
+                j = i
+                while j < len(batch) and batch[j].sql == w.sql:
+                    j += 1
+                results.extend(self._run_rows(conn, w.sql, batch[i:j]))
+                i = j
+            conn.execute("COMMIT")
+        except BaseException as e:  # noqa: BLE001
+            # не удалось начать/закоммитить транзакцию — весь пакет не записан
+            if conn.in_transaction:
+                conn.rollback()
+            results = [(None, e)] * len(batch)
+            inc("storage_group_commit_failed_total")
+            _log.error("storage_group_commit_failed", extra={"writes": len(batch), "error": str(e)})
+
+        observe("storage.group_commit.ms", float(monotonic_ms() - t0), {})
+        inc("storage_group_commits_total", flush=str(batch[-1].flush).lower())
+        for w, (res, err) in zip(batch, results, strict=False):
+            with suppress(RuntimeError):  # loop уже закрыт
+                w.loop.call_soon_threadsafe(_resolve, w.fut, res, err)
+
+    @staticmethod
+    def _run_job(conn: sqlite3.Connection, repos: _Repos, w: _Write) -> tuple[Any, BaseException | None]:
+        # SAVEPOINT на задание: ошибка одного не откатывает весь пакет
+        conn.execute("SAVEPOINT job")
+        try:
+            res = w.job(repos)  # type: ignore[misc]
+        except Exception as e:  # noqa: BLE001
+            conn.execute("ROLLBACK TO job")
+            conn.execute("RELEASE job")
+            return None, e
+        conn.execute("RELEASE job")
+        return res, None
+
+    @staticmethod
+    def _run_rows(
+        conn: sqlite3.Connection, sql: str, rows: list[_Write]
+    ) -> list[tuple[Any, BaseException | None]]:
+        conn.execute("SAVEPOINT job")
+        try:
+            conn.executemany(sql, [w.params for w in rows])
+            conn.execute("RELEASE job")
+            return [(None, None)] * len(rows)
+        except Exception:  # noqa: BLE001
+            conn.execute("ROLLBACK TO job")
+            conn.execute("RELEASE job")
+        # пакет упал — повторяем построчно, чтобы ошибку получила только «плохая» строка
+        out: list[tuple[Any, BaseException | None]] = []
+        for w in rows:
+            conn.execute("SAVEPOINT job")
+            try:
+                conn.execute(sql, w.params)
+                conn.execute("RELEASE job")
+                out.append((None, None))
+            except Exception as e:  # noqa: BLE001
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                out.append((None, e))
+        return out
+
+    def submit(self, w: _Write) -> asyncio.Future[Any]:
+        self.jobs.put(w)
+        return w.fut
+
+    def stop(self) -> None:
+        self.jobs.put(self._STOP)
+
+
+class _ReadPool:
+    """Пул read-only подключений: у каждого потока пула своё подключение и репозитории."""
+
+    def __init__(self, db_path: str, size: int, *, prefix: str, snapshot: bool = False) -> None:
+        self._db_path = db_path
+        self._snapshot = snapshot
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=prefix)
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def run(self, job: _Job) -> Any:
+        repos = getattr(self._local, "repos", None)
+        if repos is None:
+            conn = connect_readonly(self._db_path)
+            conn.row_factory = sqlite3.Row
+            with self._lock:
+                self._conns.append(conn)
+            repos = self._local.repos = _Repos(conn)
+        if not self._snapshot:
+            return job(repos)
+        # весь job видит один снимок БД: записи, закоммиченные по ходу отчёта, в него не попадут
+        with read_only(repos.conn):
+            return job(repos)
+
+    def close(self) -> None:
+        self.executor.shutdown(True)
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+
+
+class AsyncRepository:
+    """Awaitable-прокси репозитория: каждый публичный метод выполняется в потоке хранилища."""
+
+    def __init__(self, storage: AsyncStorageFacade, name: str, *, reporting: bool = False) -> None:
+        self._storage = storage
+        self._name = name
+        self._cls = _REPOSITORIES[name]
+        self._reporting = reporting
+
+    def __repr__(self) -> str:
+        return f"AsyncRepository({self._name}{', reporting' if self._reporting else ''})"
+
+    def __getattr__(self, method: str) -> Any:
+        target = getattr(self._cls, method, None)
+        if method.startswith("_") or not callable(target):
+            raise AttributeError(method)
+        if self._reporting and not method.startswith(_READ_PREFIXES):
+            raise AttributeError(f"{method} is not a read method (reporting storage is read-only)")
+        name, storage = self._name, self._storage
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            def job(repos: dict[str, Any]) -> Any:
+                return getattr(repos[name], method)(*args, **kwargs)
+
+            op = f"{name}.{method}"
+            if self._reporting:
+                return await storage.run_report(job, op=op)
+            row_write = _ROW_WRITES.get((name, method))
+            if row_write is not None:
+                sql, build = row_write
+                return await storage.write_row(sql, build(*args, **kwargs), op=op)
+            if storage._is_read(name, method):
+                return await storage.run_read(job, op=op)
+            # чтение через писателя (пул выключен/метод пишет) не ждёт окна группового коммита
+            flush = (
+                name in _FLUSH_NOW_REPOS
+                or (name, method) in _FLUSH_NOW_METHODS
+                or method.startswith(_READ_PREFIXES)
+            )
+            return await storage.run_write(job, op=op, flush=flush)
+
+        call.__name__ = method
+        call.__doc__ = target.__doc__
+        return call
+
+
+class ReportingStorage:
+    """
+    Read-only вид хранилища для отчётов и API: те же репозитории, только методы-чтения,
+    выполняются на отдельном пуле (см. AsyncStorageFacade.run_report).
+    """
+
+    def __init__(self, storage: AsyncStorageFacade) -> None:
+        self._storage = storage
+        for name in _REPOSITORIES:
+            setattr(self, name, AsyncRepository(storage, name, reporting=True))
+
+    async def run_report(self, job: _Job, *, op: str = "report") -> Any:
+        return await self._storage.run_report(job, op=op)
+
+    async def ping(self) -> bool:
+        def job(repos: dict[str, Any]) -> bool:
+            repos.conn.execute("SELECT 1;").fetchone()  # type: ignore[attr-defined]
+            return True
+
+        return bool(await self._storage.run_report(job, op="ping"))
+
+
+class AsyncStorageFacade:
+    """
+    Async-аналог StorageFacade: те же репозитории (trades, positions, orders, ...),
+    но методы awaitable и выполняются вне event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        read_pool_size: int = 2,
+        report_pool_size: int = 1,
+        group_commit_ms: float = 5.0,
+        group_commit_rows: int = 256,
+        backup_retention_days: int | None = None,
+    ) -> None:
+        """
+        Args:
+            db_path: Путь к SQLite БД
+            read_pool_size: Число read-only подключений (0 — все операции через писателя;
+                для ":memory:" пул всегда выключен)
+            report_pool_size: Число read-only подключений для отчётов (storage.reporting);
+                0 — отчёты идут через пул торговых читателей
+            group_commit_ms: Сколько писатель ждёт попутные записи после первой в пакете
+            group_commit_rows: Максимум записей в одной транзакции
+            backup_retention_days: Если задано — бэкап БД перед применением миграций
+                (и чистка старых бэкапов); None — без бэкапа
+        """
+        self._db_path = str(db_path)
+        self._writer = _WriterThread(
+            self._db_path,
+            group_commit_ms=group_commit_ms,
+            group_commit_rows=group_commit_rows,
+            backup_retention_days=backup_retention_days,
+        )
+        self._writer.start()
+        self._writer.ready.wait()
+        if self._writer.error is not None:
+            raise self._writer.error
+
+        on_disk = self._db_path != ":memory:"
+        pool, report_pool = (int(read_pool_size), int(report_pool_size)) if on_disk else (0, 0)
+        self._readers: _ReadPool | None = (
+            _ReadPool(self._db_path, pool, prefix="sqlite-reader") if pool > 0 else None
+        )
+        self._reporters: _ReadPool | None = (
+            _ReadPool(self._db_path, report_pool, prefix="sqlite-report", snapshot=True)
+            if report_pool > 0
+            else None
+        )
+        self._write_only: set[tuple[str, str]] = set()
+        self._closed = False
+
+        self.trades = AsyncRepository(self, "trades")
+        self.positions = AsyncRepository(self, "positions")
+        self.orders = AsyncRepository(self, "orders")
+        self.idempotency = AsyncRepository(self, "idempotency")
+        self.audit = AsyncRepository(self, "audit")
+        self.market_data = AsyncRepository(self, "market_data")
+        self.lots = AsyncRepository(self, "lots")
+        self.rollups = AsyncRepository(self, "rollups")
+        self.reporting = ReportingStorage(self)
+
+    @classmethod
+    def open(cls, db_path: str, **kwargs: Any) -> AsyncStorageFacade:
+        return cls(db_path, **kwargs)
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    # ---------------- execution ----------------
+
+    async def run_write(self, job: _Job, *, op: str = "write", flush: bool = False) -> Any:
+        """
+        Выполнить job(repos) в потоке-писателе (FIFO с остальными записями).
+        Результат возвращается после COMMIT пакета; flush=True коммитит пакет сразу.
+        """
+        return await self._submit(_Write(asyncio.get_running_loop(), job=job, flush=flush), op)
+
+    async def write_row(
+        self, sql: str, params: tuple[Any, ...], *, op: str = "write", flush: bool = False
+    ) -> None:
+        """Поставить одну строку INSERT в групповой коммит (соседние строки с тем же SQL — executemany)."""
+        await self._submit(_Write(asyncio.get_running_loop(), sql=sql, params=params, flush=flush), op)
+
+    async def _submit(self, w: _Write, op: str) -> Any:
+        if self._closed:
+            raise RuntimeError("storage is closed")
+        t0 = monotonic_ms()
+        try:
+            return await self._writer.submit(w)
+        finally:
+            observe("storage.op.ms", float(monotonic_ms() - t0), {"op": op, "kind": "write"})
+
+    async def run_read(self, job: _Job, *, op: str = "read") -> Any:
+        """Выполнить job(repos) на одном из read-only подключений."""
+        if self._readers is None:
+            return await self.run_write(job, op=op, flush=True)
+        if self._closed:
+            raise RuntimeError("storage is closed")
+        t0 = monotonic_ms()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._readers.executor, self._readers.run, job
+            )
+        except sqlite3.OperationalError as e:
+            if "readonly" not in str(e):
+                raise
+            # метод-«чтение» на деле пишет (ленивая схема/пересборка) — впредь только через писателя
+            inc("storage_read_rerouted_total", op=op)
+            self._write_only.add(tuple(op.split(".", 1)))  # type: ignore[arg-type]
+            return await self.run_write(job, op=op, flush=True)
+        finally:
+            observe("storage.op.ms", float(monotonic_ms() - t0), {"op": op, "kind": "read"})
+
+    async def run_report(self, job: _Job, *, op: str = "report") -> Any:
+        """
+        Выполнить job(repos) на пуле отчётов в одной read-транзакции (согласованный снимок).
+        Писатель и торговые читатели отчёт не ждут; без пула отчётов — обычный run_read.
+        """
+        if self._reporters is None:
+            return await self.run_read(job, op=op)
+        if self._closed:
+            raise RuntimeError("storage is closed")
+        t0 = monotonic_ms()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._reporters.executor, self._reporters.run, job
+            )
+        finally:
+            observe("storage.op.ms", float(monotonic_ms() - t0), {"op": op, "kind": "report"})
+
+    def _is_read(self, name: str, method: str) -> bool:
+        return (
+            self._readers is not None
+            and method.startswith(_READ_PREFIXES)
+            and (name, method) not in self._write_only
+        )
+
+    # ---------------- health / lifecycle ----------------
+
+    async def ping(self) -> bool:
+        def job(repos: dict[str, Any]) -> bool:
+            repos.conn.execute("SELECT 1;").fetchone()  # type: ignore[attr-defined]
+            return True
+
+        return bool(await self.run_write(job, op="ping", flush=True))
+
+    async def close(self) -> None:
+        """Дождаться уже поставленных записей и закрыть подключения."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.stop()
+        await asyncio.to_thread(self._writer.join)
+        for pool in (self._readers, self._reporters):
+            if pool is not None:
+                await asyncio.to_thread(pool.close)
+        _log.info("async_storage_closed", extra={"db_path": self._db_path})
+
+
+__all__ = ["AsyncRepository", "AsyncStorageFacade", "ReportingStorage"]
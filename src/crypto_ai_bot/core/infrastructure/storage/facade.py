@@ -7,9 +7,11 @@ import sqlite3
 try:
     from .repositories.audit import AuditRepo as _AuditRepository  # type: ignore
     from .repositories.idempotency import IdempotencyRepository as _IdempotencyRepository  # type: ignore
+    from .repositories.lots import LotsRepository as _LotsRepository  # type: ignore
     from .repositories.market_data import MarketDataRepository as _MarketDataRepository  # type: ignore
     from .repositories.orders import OrdersRepository as _OrdersRepository  # type: ignore
     from .repositories.positions import PositionsRepository as _PositionsRepository  # type: ignore
+    from .repositories.rollups import RollupsRepository as _RollupsRepository  # type: ignore
     from .repositories.trades import TradesRepository as _TradesRepository  # type: ignore
 except Exception:  # pragma: no cover
     # …иначе — минимальные совместимые заглушки/альтернативы
@@ -21,9 +23,11 @@ except Exception:  # pragma: no cover
         def __init__(self, _conn: sqlite3.Connection) -> None: ...
 
     _AuditRepository = _StubRepo  # type: ignore
+    _LotsRepository = _StubRepo  # type: ignore
     _MarketDataRepository = _StubRepo  # type: ignore
     _OrdersRepository = _StubRepo  # type: ignore
     _PositionsRepository = _StubRepo  # type: ignore
+    _RollupsRepository = _StubRepo  # type: ignore
     _TradesRepository = _StubRepo  # type: ignore
 
 
@@ -41,6 +45,8 @@ class StorageFacade:
     idempotency: _IdempotencyRepository
     audit: _AuditRepository
     market_data: _MarketDataRepository
+    lots: _LotsRepository
+    rollups: _RollupsRepository
 
     @classmethod
     def from_connection(cls, conn: sqlite3.Connection) -> StorageFacade:
@@ -52,6 +58,8 @@ class StorageFacade:
             audit=_AuditRepository(conn),  # type: ignore[call-arg]
             market_data=_MarketDataRepository(conn),  # type: ignore[call-arg]
             orders=_OrdersRepository(conn),  # type: ignore[call-arg]
+            lots=_LotsRepository(conn),  # type: ignore[call-arg]
+            rollups=_RollupsRepository(conn),  # type: ignore[call-arg]
         )
 
     # честный health-ping для /health
@@ -11,10 +11,12 @@ import shutil
 import sqlite3
 import tempfile
 from collections.abc import Callable
+from decimal import Decimal
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Iterable
 
+from crypto_ai_bot.utils.decimal import to_units
 from crypto_ai_bot.utils.logging import get_logger
 
 _log = get_logger(__name__)
@@ -331,6 +333,8 @@ def _pymigrations() -> list[PyMigration]:
 
     # V0007 - Idempotency improvements
     def _v7(conn: sqlite3.Connection) -> None:
+        # таблица могла быть создана ранним IdempotencyRepository без ts_ms
+        _add_column_if_missing(conn, "idempotency", "ts_ms", "INTEGER NOT NULL DEFAULT 0")
         _apply_sql(
             conn,
             """
@@ -412,6 +416,12 @@ def _pymigrations() -> list[PyMigration]:
 
     # V0012 - Orders table
     def _v12(conn: sqlite3.Connection) -> None:
+        # таблица могла быть создана ранним OrdersRepository в урезанном виде
+        if _table_exists(conn, "orders"):
+            _add_column_if_missing(conn, "orders", "type", "TEXT NOT NULL DEFAULT 'market'")
+            _add_column_if_missing(conn, "orders", "price", "TEXT")
+            _add_column_if_missing(conn, "orders", "trace_id", "TEXT")
+            _add_column_if_missing(conn, "orders", "metadata_json", "TEXT")
         _apply_sql(
             conn,
             """
@@ -482,6 +492,153 @@ def _pymigrations() -> list[PyMigration]:
 
     migs.append(PyMigration(14, "protective_exits", _v14))
 
+    # V0015 - FIFO lot ledger (incremental realized PnL)
+    def _v15(conn: sqlite3.Connection) -> None:
+        _apply_sql(
+            conn,
+            """
+            CREATE TABLE IF NOT EXISTS position_lots (
+                id                INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol            TEXT NOT NULL,
+                qty               TEXT NOT NULL,
+                unit_cost         TEXT NOT NULL,
+                ts_ms             INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_position_lots_symbol
+                ON position_lots(symbol, id);
+            CREATE TABLE IF NOT EXISTS lot_totals (
+                symbol            TEXT PRIMARY KEY,
+                base_qty          TEXT NOT NULL DEFAULT '0',
+                cost_quote        TEXT NOT NULL DEFAULT '0',
+                realized_quote    TEXT NOT NULL DEFAULT '0',
+                fills             INTEGER NOT NULL DEFAULT 0,
+                last_ts_ms        INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS realized_pnl_daily (
+                symbol            TEXT NOT NULL,
+                day               TEXT NOT NULL,
+                realized_quote    TEXT NOT NULL DEFAULT '0',
+                PRIMARY KEY (symbol, day)
+            );
+            """
+        )
+
+    migs.append(PyMigration(15, "position_lots", _v15))
+
+    # V0016 - Schema owned by migrations only (repositories do no DDL)
+    def _v16(conn: sqlite3.Connection) -> None:
+        # legacy-колонки V0001 без DEFAULT мешают вставкам PositionsRepository
+        for column in ("avg_price", "updated_ms"):
+            if _column_exists(conn, "positions", column):
+                with conn:
+                    conn.execute(f"ALTER TABLE positions DROP COLUMN {column};")
+        # индексы, которые раньше создавали сами репозитории
+        _apply_sql(
+            conn,
+            """
+            CREATE INDEX IF NOT EXISTS idx_trades_symbol_side_ts
+                ON trades(symbol, side, ts_ms);
+            CREATE INDEX IF NOT EXISTS idx_md_symbol_ts
+                ON market_data(symbol, ts_ms);
+            """
+        )
+
+    migs.append(PyMigration(16, "repository_schema", _v16))
+
+    # V0017 - Quote money as scaled integers (1e-8 units) for native SUM()
+    def _v17(conn: sqlite3.Connection) -> None:
+        _add_column_if_missing(conn, "trades", "cost_e8", "INTEGER NOT NULL DEFAULT 0")
+        _add_column_if_missing(conn, "trades", "fee_quote_e8", "INTEGER NOT NULL DEFAULT 0")
+        # backfill из TEXT-колонок через Decimal (точно, без CAST AS REAL)
+        rows = conn.execute("SELECT id, cost, fee_quote FROM trades;").fetchall()
+        with conn:
+            conn.executemany(
+                "UPDATE trades SET cost_e8 = ?, fee_quote_e8 = ? WHERE id = ?;",
+                [(to_units(r[1]), to_units(r[2]), r[0]) for r in rows],
+            )
+
+    migs.append(PyMigration(17, "trades_scaled_money", _v17))
+
+    # V0018 - Materialized trade rollups (1m/5m/1h/1d buckets)
+    def _v18(conn: sqlite3.Connection) -> None:
+        _apply_sql(
+            conn,
+            """
+            CREATE TABLE IF NOT EXISTS trade_rollups (
+                symbol            TEXT NOT NULL,
+                granularity       TEXT NOT NULL,
+                bucket_start      INTEGER NOT NULL,
+                count             INTEGER NOT NULL DEFAULT 0,
+                turnover_e8       INTEGER NOT NULL DEFAULT 0,
+                fees_e8           INTEGER NOT NULL DEFAULT 0,
+                realized_e8       INTEGER NOT NULL DEFAULT 0,
+                wins              INTEGER NOT NULL DEFAULT 0,
+                losses            INTEGER NOT NULL DEFAULT 0,
+                gross_profit_e8   INTEGER NOT NULL DEFAULT 0,
+                gross_loss_e8     INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (symbol, granularity, bucket_start)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_trade_rollups_granularity
+                ON trade_rollups(granularity, bucket_start);
+            """
+        )
+        # backfill из существующих сделок. SQL зафиксирован здесь, а не берётся из RollupsRepository:
+        # миграция не должна меняться вместе с кодом репозиториев. Мелкие корзины за сроком
+        # хранения потом удалит RollupsRepository.prune().
+        grans = (("1d", 86_400_000), ("1h", 3_600_000), ("5m", 300_000), ("1m", 60_000))
+        with conn:
+            for name, g in grans:
+                conn.execute(
+                    """
+                    INSERT INTO trade_rollups (symbol, granularity, bucket_start, count, turnover_e8, fees_e8)
+                    SELECT symbol, ?, (ts_ms / ?) * ?, COUNT(*), SUM(cost_e8), SUM(fee_quote_e8)
+                    FROM trades
+                    GROUP BY symbol, (ts_ms / ?) * ?;
+                    """,
+                    (name, g, g, g, g),
+                )
+            # realized по продажам — FIFO по исполненному объёму (комиссия покупки — в цене лота)
+            realized: dict[tuple[str, str, int], list[int]] = {}
+            lots: dict[str, list[list[Decimal]]] = {}
+            rows = conn.execute(
+                "SELECT symbol, side, filled, price, cost, fee_quote, ts_ms FROM trades ORDER BY symbol, ts_ms, id;"
+            ).fetchall()
+            for symbol, side, filled, price, cost, fee, ts_ms in rows:
+                side = str(side or "").lower().strip()
+                qty, px, cost_q, fee_q = (Decimal(str(v or "0")) for v in (filled, price, cost, fee))
+                book = lots.setdefault(symbol, [])
+                if side not in ("buy", "sell") or qty <= 0:
+                    continue
+                if side == "buy":
+                    book.append([qty, (cost_q + fee_q) / qty if cost_q > 0 else px + fee_q / qty])
+                    continue
+                left, pnl = qty, -fee_q
+                while left > 0 and book:
+                    take = min(book[0][0], left)
+                    pnl += take * (px - book[0][1])
+                    left -= take
+                    book[0][0] -= take
+                    if book[0][0] <= 0:
+                        book.pop(0)
+                units = to_units(pnl)
+                for name, g in grans:
+                    acc = realized.setdefault((symbol, name, int(ts_ms) // g * g), [0, 0, 0, 0, 0])
+                    acc[0] += units
+                    acc[1] += 1 if pnl > 0 else 0
+                    acc[2] += 1 if pnl < 0 else 0
+                    acc[3] += max(units, 0)
+                    acc[4] += min(units, 0)
+            conn.executemany(
+                """
+                UPDATE trade_rollups
+                SET realized_e8 = ?, wins = ?, losses = ?, gross_profit_e8 = ?, gross_loss_e8 = ?
+                WHERE symbol = ? AND granularity = ? AND bucket_start = ?;
+                """,
+                [(*acc, *key) for key, acc in realized.items()],
+            )
+
+    migs.append(PyMigration(18, "trade_rollups", _v18))
+
     return migs
 
 
@@ -509,6 +666,14 @@ def run_migrations(
 
     _init_schema_table(conn)
 
+    # Single startup check: schema is current -> no backup, no DDL
+    current = _current_version(conn)
+    pending = [m for m in sorted(_pymigrations(), key=lambda m: m.version) if m.version > current]
+    if not pending:
+        _log.info("Schema is up to date", extra={"version": current})
+        return
+    _log.info("Current schema version", extra={"version": current, "pending": len(pending)})
+
     # Create backup if requested
     if do_backup and db_path:
         dest = os.path.join(os.path.dirname(db_path) or ".", "backups")
@@ -516,25 +681,15 @@ def run_migrations(
         if backup_path:
             _log.info("Created backup", extra={"path": backup_path})
 
-    # Get current version
-    current = _current_version(conn)
-    _log.info("Current schema version", extra={"version": current})
-
     # Apply pending migrations
     applied = 0
-    for mig in sorted(_pymigrations(), key=lambda m: m.version):
-        if mig.version <= current:
-            continue
-
-        _log.info("Applying migration", extra={"version": mig.version, "name": mig.name})
+    for mig in pending:
+        _log.info("Applying migration", extra={"version": mig.version, "migration": mig.name})
         mig.up(conn)
         _mark_applied(conn, mig.version, mig.name, now_ms)
         applied += 1
 
-    if applied > 0:
-        _log.info("Migrations applied", extra={"count": applied})
-    else:
-        _log.info("No pending migrations")
+    _log.info("Migrations applied", extra={"count": applied})
 
     # Cleanup old backups
     if do_backup and db_path and backup_retention_days >= 0:
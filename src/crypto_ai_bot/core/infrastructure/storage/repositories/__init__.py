@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from .audit import AuditRepo
 from .idempotency import IdempotencyRepository
+from .lots import LotsRepository
 from .market_data import MarketDataRepository
 from .orders import OrdersRepository
 from .positions import PositionsRepository
+from .rollups import RollupsRepository, RollupTotals
 from .trades import TradesRepository
 
 __all__ = [
@@ -12,6 +14,9 @@ __all__ = [
     "TradesRepository",
     "OrdersRepository",
     "PositionsRepository",
+    "LotsRepository",
     "MarketDataRepository",
     "IdempotencyRepository",
+    "RollupsRepository",
+    "RollupTotals",
 ]
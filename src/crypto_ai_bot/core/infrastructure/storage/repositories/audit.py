@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import json
 import sqlite3
 from typing import Any
 
+from crypto_ai_bot.utils.codec import JsonCodec
+
+_JSON = JsonCodec()
+
 
 def _json_dumps_safe(obj: Any) -> str:
+    # Decimal/datetime/Enum кодирует сам кодек; "{}" — только для неподдающихся (циклы и т.п.)
     try:
-        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return _JSON.dumps_text(obj)
     except Exception:
         return "{}"
 
@@ -17,18 +21,25 @@ class AuditRepo:
     Репозиторий для записи событий в таблицу `audit`.
     Основной метод: write(event, payload). Алиас: add(event, payload).
     Ожидает действительный SQLite-connection (conn.cursor().execute(...)).
+    Событие пишется в колонку `topic` (схема — миграции V0001/V0010).
     """
 
+    INSERT_SQL = (
+        "INSERT INTO audit (topic, payload_json, ts_ms) "
+        "VALUES (?, json(?), CAST(STRFTIME('%s','now') AS INTEGER)*1000)"
+    )
+
     def __init__(self, conn: sqlite3.Connection) -> None:
         self._conn = conn
 
+    @staticmethod
+    def row(event: str, payload: dict[str, Any]) -> tuple[Any, ...]:
+        """Параметры INSERT_SQL для одного события (для пакетной записи через executemany)."""
+        return (event, _json_dumps_safe(payload))
+
     def write(self, event: str, payload: dict[str, Any]) -> None:
         cur = self._conn.cursor()
-        cur.execute(
-            "INSERT INTO audit (event, payload_json, ts_ms) "
-            "VALUES (?, json(?), CAST(STRFTIME('%s','now') AS INTEGER)*1000)",
-            (event, _json_dumps_safe(payload)),
-        )
+        cur.execute(self.INSERT_SQL, self.row(event, payload))
         self._conn.commit()
 
     # Для обратной совместимости со старым именем:
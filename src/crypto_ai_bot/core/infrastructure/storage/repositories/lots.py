@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+from crypto_ai_bot.utils.decimal import dec
+
+_ZERO = dec("0")
+
+# (ts_ms, realized_quote) для каждой продажи при полном прогоне
+FillCallback = Callable[[int, Decimal], None]
+
+
+@dataclass(frozen=True)
+class LotTotals:
+    """Агрегаты FIFO-книги по символу (остаток, его стоимость и накопленный realized)."""
+
+    symbol: str
+    base_qty: Decimal
+    cost_quote: Decimal
+    realized_quote: Decimal
+    fills: int
+    last_ts_ms: int
+
+    @property
+    def avg_entry_price(self) -> Decimal:
+        return self.cost_quote / self.base_qty if self.base_qty > 0 else _ZERO
+
+
+def utc_day(ts_ms: int) -> str:
+    """UTC-день сделки в формате YYYY-MM-DD (ключ realized_pnl_daily)."""
+    return datetime.fromtimestamp(int(ts_ms) / 1000, UTC).strftime("%Y-%m-%d")
+
+
+def _unit_cost(qty: Decimal, price: Decimal, cost: Decimal, fee_quote: Decimal) -> Decimal:
+    # комиссия покупки капитализируется в цену лота
+    if cost > 0:
+        return (cost + fee_quote) / qty
+    return price + fee_quote / qty
+
+
+def _row_fill(r: Any) -> tuple[str, Decimal, Decimal, Decimal, Decimal, int]:
+    d = (
+        dict(r)
+        if hasattr(r, "keys")
+        else dict(zip(("side", "amount", "filled", "price", "cost", "fee_quote", "ts_ms"), r, strict=False))
+    )
+    # в книгу идёт только исполненный объём: filled <= 0 (не исполнен/отменён) — не сделка
+    return (
+        str(d.get("side") or "").lower().strip(),
+        dec(str(d.get("filled") or "0")),
+        dec(str(d.get("price") or "0")),
+        dec(str(d.get("cost") or "0")),
+        dec(str(d.get("fee_quote") or "0")),
+        int(d.get("ts_ms") or 0),
+    )
+
+
+@dataclass
+class LotsRepository:
+    """
+    Персистентная FIFO-книга лотов.
+
+    Каждое исполнение обновляет книгу за O(затронутых лотов): покупка добавляет лот,
+    продажа списывает лоты с головы очереди. Realized PnL копится по UTC-дням
+    (`realized_pnl_daily`), агрегаты символа — в `lot_totals`.
+    Таблица `trades` остаётся источником истины: `rebuild()` пересобирает книгу из неё.
+    Таблицы создаёт миграция V0015.
+    """
+
+    conn: Any  # sqlite3.Connection
+
+    # ---------- reads ----------
+    def totals(self, symbol: str) -> LotTotals | None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT base_qty, cost_quote, realized_quote, fills, last_ts_ms FROM lot_totals WHERE symbol = ?",
+            (symbol,),
+        )
+        r = cur.fetchone()
+        if not r:
+            return None
+        return LotTotals(
+            symbol=symbol,
+            base_qty=dec(str(r[0] or "0")),
+            cost_quote=dec(str(r[1] or "0")),
+            realized_quote=dec(str(r[2] or "0")),
+            fills=int(r[3] or 0),
+            last_ts_ms=int(r[4] or 0),
+        )
+
+    def ensure(self, symbol: str) -> LotTotals:
+        """Агрегаты символа; при отсутствии книги (старая БД) — собираем её из `trades`."""
+        t = self.totals(symbol)
+        if t is None:
+            self.rebuild(symbol)
+            t = self.totals(symbol)
+        assert t is not None
+        return t
+
+    def open_lots(self, symbol: str) -> list[tuple[Decimal, Decimal]]:
+        """Открытые лоты (qty_base, unit_cost) в порядке FIFO."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT qty, unit_cost FROM position_lots WHERE symbol = ? ORDER BY id", (symbol,))
+        return [(dec(str(r[0])), dec(str(r[1]))) for r in cur.fetchall() or []]
+
+    def realized_for_day(self, symbol: str, day: str) -> Decimal:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT realized_quote FROM realized_pnl_daily WHERE symbol = ? AND day = ?",
+            (symbol, day),
+        )
+        r = cur.fetchone()
+        return dec(str(r[0])) if r else _ZERO
+
+    # ---------- incremental update ----------
+    def apply_fill(
+        self,
+        *,
+        symbol: str,
+        side: str,
+        qty: Decimal,
+        price: Decimal,
+        cost: Decimal = _ZERO,
+        fee_quote: Decimal = _ZERO,
+        ts_ms: int,
+        commit: bool = True,
+    ) -> Decimal | None:
+        """
+        Применяет одно исполнение к книге и возвращает его realized PnL (для покупки — 0).
+
+        Исполнение «из прошлого» (ts_ms раньше последнего учтённого) ломает FIFO-порядок —
+        в этом случае книга символа пересобирается из `trades` и возвращается None
+        (realized этой и последующих продаж пересчитан).
+        """
+        side = (side or "").lower().strip()
+        t = self.totals(symbol)
+        if t is None or int(ts_ms) < t.last_ts_ms:
+            self.rebuild(symbol, commit=commit)
+            return None
+        if side not in ("buy", "sell") or qty <= 0:
+            return _ZERO
+
+        base, cost_total, realized = t.base_qty, t.cost_quote, t.realized_quote
+        pnl = _ZERO
+        cur = self.conn.cursor()
+
+        if side == "buy":
+            uc = _unit_cost(qty, price, cost, fee_quote)
+            cur.execute(
+                "INSERT INTO position_lots (symbol, qty, unit_cost, ts_ms) VALUES (?, ?, ?, ?)",
+                (symbol, str(qty), str(uc), int(ts_ms)),
+            )
+            base += qty
+            cost_total += qty * uc
+        else:
+            # читаем лоты с головы очереди ровно столько, сколько нужно списать
+            left = qty
+            updates: list[tuple[int, Decimal]] = []
+            cur.execute(
+                "SELECT id, qty, unit_cost FROM position_lots WHERE symbol = ? ORDER BY id", (symbol,)
+            )
+            while left > 0:
+                r = cur.fetchone()
+                if r is None:
+                    break  # продаём больше, чем есть в книге: шортов нет, остаток игнорируем
+                lot_id, lot_qty, lot_uc = int(r[0]), dec(str(r[1])), dec(str(r[2]))
+                take = min(lot_qty, left)
+                pnl += take * (price - lot_uc)
+                base -= take
+                cost_total -= take * lot_uc
+                left -= take
+                updates.append((lot_id, lot_qty - take))
+            for lot_id, rest in updates:
+                if rest > 0:
+                    cur.execute("UPDATE position_lots SET qty = ? WHERE id = ?", (str(rest), lot_id))
+                else:
+                    cur.execute("DELETE FROM position_lots WHERE id = ?", (lot_id,))
+            pnl -= fee_quote  # комиссия продажи относится к продаже
+            realized += pnl
+            self._add_daily(symbol, utc_day(ts_ms), pnl)
+
+        if base <= 0:
+            base, cost_total = _ZERO, _ZERO
+        self._write_totals(symbol, base, cost_total, realized, t.fills + 1, int(ts_ms))
+        if commit:
+            self.conn.commit()
+        return pnl
+
+    # ---------- rebuild / verify ----------
+    def replay(
+        self, symbol: str, on_sell: FillCallback | None = None
+    ) -> tuple[LotTotals, list[tuple[Decimal, Decimal, int]], dict[str, Decimal]]:
+        """
+        Полный FIFO-прогон по `trades` в памяти: (агрегаты, лоты, realized по дням).
+        on_sell(ts_ms, realized) вызывается для каждой продажи (пересборка роллапов).
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT side, amount, filled, price, cost, fee_quote, ts_ms
+            FROM trades
+            WHERE symbol = ?
+            ORDER BY ts_ms ASC, id ASC
+            """,
+            (symbol,),
+        )
+        lots: deque[tuple[Decimal, Decimal, int]] = deque()
+        daily: dict[str, Decimal] = {}
+        realized = _ZERO
+        fills = 0
+        last_ts = 0
+        for r in cur.fetchall() or []:
+            side, qty, price, cost, fee_q, ts_ms = _row_fill(r)
+            if side not in ("buy", "sell") or qty <= 0:
+                continue
+            fills += 1
+            last_ts = max(last_ts, ts_ms)
+            if side == "buy":
+                lots.append((qty, _unit_cost(qty, price, cost, fee_q), ts_ms))
+                continue
+            left = qty
+            pnl = _ZERO
+            while left > 0 and lots:
+                lot_qty, lot_uc, lot_ts = lots[0]
+                take = min(lot_qty, left)
+                pnl += take * (price - lot_uc)
+                left -= take
+                if lot_qty - take > 0:
+                    lots[0] = (lot_qty - take, lot_uc, lot_ts)
+                else:
+                    lots.popleft()
+            pnl -= fee_q
+            realized += pnl
+            day = utc_day(ts_ms)
+            daily[day] = daily.get(day, _ZERO) + pnl
+            if on_sell is not None:
+                on_sell(ts_ms, pnl)
+
+        base = sum((q for q, _, _ in lots), _ZERO)
+        cost_total = sum((q * uc for q, uc, _ in lots), _ZERO)
+        totals = LotTotals(
+            symbol=symbol,
+            base_qty=base,
+            cost_quote=cost_total,
+            realized_quote=realized,
+            fills=fills,
+            last_ts_ms=last_ts,
+        )
+        return totals, list(lots), daily
+
+    def rebuild(self, symbol: str | None = None, *, commit: bool = True) -> list[str]:
+        """Пересобирает книгу символа (или всех символов из `trades`) полным прогоном."""
+        symbols = [symbol] if symbol else self._trade_symbols()
+        cur = self.conn.cursor()
+        for s in symbols:
+            totals, lots, daily = self.replay(s)
+            cur.execute("DELETE FROM position_lots WHERE symbol = ?", (s,))
+            cur.execute("DELETE FROM realized_pnl_daily WHERE symbol = ?", (s,))
+            cur.executemany(
+                "INSERT INTO position_lots (symbol, qty, unit_cost, ts_ms) VALUES (?, ?, ?, ?)",
+                [(s, str(q), str(uc), ts) for q, uc, ts in lots],
+            )
+            cur.executemany(
+                "INSERT INTO realized_pnl_daily (symbol, day, realized_quote) VALUES (?, ?, ?)",
+                [(s, day, str(v)) for day, v in daily.items()],
+            )
+            self._write_totals(
+                s, totals.base_qty, totals.cost_quote, totals.realized_quote, totals.fills, totals.last_ts_ms
+            )
+        if commit:
+            self.conn.commit()
+        return symbols
+
+    def verify(self, symbol: str | None = None) -> dict[str, str]:
+        """Сверяет инкрементальную книгу с полным прогоном; возвращает {symbol: причина} расхождений."""
+        out: dict[str, str] = {}
+        for s in [symbol] if symbol else self._trade_symbols():
+            stored = self.totals(s)
+            if stored is None:
+                out[s] = "no ledger"
+                continue
+            expected, lots, daily = self.replay(s)
+            if stored.base_qty != expected.base_qty or stored.realized_quote != expected.realized_quote:
+                out[s] = (
+                    f"base {stored.base_qty} != {expected.base_qty} "
+                    f"or realized {stored.realized_quote} != {expected.realized_quote}"
+                )
+            elif self.open_lots(s) != [(q, uc) for q, uc, _ in lots]:
+                out[s] = "open lots differ"
+            elif any(self.realized_for_day(s, day) != v for day, v in daily.items()):
+                out[s] = "daily realized differs"
+        return out
+
+    # ---------- internals ----------
+    def _trade_symbols(self) -> list[str]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT DISTINCT symbol FROM trades ORDER BY symbol")
+        return [str(r[0]) for r in cur.fetchall() or []]
+
+    def _add_daily(self, symbol: str, day: str, pnl: Decimal) -> None:
+        total = self.realized_for_day(symbol, day) + pnl
+        self.conn.execute(
+            """
+            INSERT INTO realized_pnl_daily (symbol, day, realized_quote) VALUES (?, ?, ?)
+            ON CONFLICT(symbol, day) DO UPDATE SET realized_quote = excluded.realized_quote
+            """,
+            (symbol, day, str(total)),
+        )
+
+    def _write_totals(
+        self, symbol: str, base: Decimal, cost: Decimal, realized: Decimal, fills: int, last_ts_ms: int
+    ) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO lot_totals (symbol, base_qty, cost_quote, realized_quote, fills, last_ts_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                base_qty = excluded.base_qty,
+                cost_quote = excluded.cost_quote,
+                realized_quote = excluded.realized_quote,
+                fills = excluded.fills,
+                last_ts_ms = excluded.last_ts_ms
+            """,
+            (symbol, str(base), str(cost), str(realized), int(fills), int(last_ts_ms)),
+        )
@@ -6,26 +6,9 @@ from typing import Any
 
 @dataclass
 class OrdersRepository:
-    conn: Any  # sqlite3.Connection
+    """Открытые ордера. Таблица создаётся миграцией V0012."""
 
-    def ensure_schema(self) -> None:
-        cur = self.conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS orders ("
-            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
-            " broker_order_id TEXT,"
-            " client_order_id TEXT,"
-            " symbol TEXT NOT NULL,"
-            " side TEXT NOT NULL,"
-            " amount TEXT NOT NULL,"
-            " filled TEXT NOT NULL DEFAULT '0',"
-            " status TEXT NOT NULL DEFAULT 'open',"
-            " ts_ms INTEGER NOT NULL"
-            ")"
-        )
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders(symbol)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
-        self.conn.commit()
+    conn: Any  # sqlite3.Connection
 
     # ---------- helpers ----------
 
@@ -47,7 +30,6 @@ class OrdersRepository:
 
     def upsert_open(self, order: Any) -> None:
         """Вставляет открытый ордер, если такого нет (по broker_id или client_id)."""
-        self.ensure_schema()
         broker_id = getattr(order, "id", None) or getattr(order, "order_id", None)
         client_id = getattr(order, "client_order_id", None)
         if self._exists_by_broker_id(broker_id) or self._exists_by_client_id(client_id):
@@ -71,7 +53,6 @@ class OrdersRepository:
 
     def list_open(self, symbol: str) -> list[dict[str, Any]]:
         """Открытые (или частично исполненные) ордера по символу, старые — первыми."""
-        self.ensure_schema()
         cur = self.conn.cursor()
         cur.execute(
             "SELECT id, broker_order_id, client_order_id, symbol, side, amount, filled, status, ts_ms "
@@ -103,7 +84,6 @@ class OrdersRepository:
         """Обновляет filled, не меняя статус."""
         if not broker_order_id:
             return
-        self.ensure_schema()
         cur = self.conn.cursor()
         cur.execute(
             "UPDATE orders SET filled=? WHERE broker_order_id=? AND status!='closed'",
@@ -115,7 +95,6 @@ class OrdersRepository:
         """Помечает ордер закрытым и фиксирует итоговый filled."""
         if not broker_order_id:
             return
-        self.ensure_schema()
         cur = self.conn.cursor()
         cur.execute(
             "UPDATE orders SET status='closed', filled=? WHERE broker_order_id=?",
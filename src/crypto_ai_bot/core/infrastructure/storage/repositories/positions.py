@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
+from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository
 from crypto_ai_bot.utils.decimal import dec
 
 # Constant for default B008 value
@@ -30,31 +30,10 @@ class Position:
 @dataclass
 class PositionsRepository:
     conn: Any
+    _lots: LotsRepository = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        try:
-            self.ensure_schema()
-        except Exception:
-            pass
-
-    # ---------- schema ----------
-    def ensure_schema(self) -> None:
-        """Создаёт таблицу positions, если её нет."""
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS positions (
-                symbol TEXT PRIMARY KEY,
-                base_qty NUMERIC NOT NULL DEFAULT 0,
-                avg_entry_price NUMERIC NOT NULL DEFAULT 0,
-                realized_pnl NUMERIC NOT NULL DEFAULT 0,
-                unrealized_pnl NUMERIC NOT NULL DEFAULT 0,
-                updated_ts_ms INTEGER NOT NULL DEFAULT 0,
-                version INTEGER NOT NULL DEFAULT 0
-            )
-            """
-        )
-        self.conn.commit()
+        self._lots = LotsRepository(self.conn)
 
     # ---------- getters ----------
     def get_position(self, symbol: str) -> Position:
@@ -179,15 +158,12 @@ class PositionsRepository:
         """
         Обновляет позицию по символу.
 
-        ⚠️ ВАЖНО: Реализованный PnL и остаток/средняя цена считаются по FIFO
-        на основе фактических сделок из таблицы `trades`.
-        Комиссия покупок капитализируется в цену лота (см. pnl.fifo_detail),
-        комиссия продаж вычитается из realized.
+        ⚠️ ВАЖНО: Реализованный PnL и остаток/средняя цена берутся из FIFO-книги лотов
+        (LotsRepository), которая ведётся инкрементально по фактическим сделкам из `trades`.
+        Комиссия покупок капитализируется в цену лота, комиссия продаж вычитается из realized.
 
-        Если таблицы `trades` нет/ошибка — мягкий откат к «усреднённой» формуле (как раньше).
+        Если сделок нет/ошибка — мягкий откат к «усреднённой» формуле (как раньше).
         """
-        from importlib import import_module
-
         if fee_quote is None:
             fee_quote = _DEFAULT_FEE_ZERO
 
@@ -195,29 +171,14 @@ class PositionsRepository:
         if side not in ("buy", "sell"):
             return
 
-        # --- 1) Попытка FIFO по историческим сделкам из БД ---
+        # --- 1) FIFO-книга лотов (O(1): агрегаты уже посчитаны при записи сделок) ---
         try:
-            trades = list(self._load_trades_for_symbol(symbol))
+            totals = self._lots.ensure(symbol)
             # fallback: если в БД нет сделок — считаем «как раньше»
-            if trades:
-                fifo_mod = None
-                for mod_name in (
-                    "crypto_ai_bot.core.domain.pnl",
-                    "crypto_ai_bot.pnl",
-                    "pnl",
-                ):
-                    try:
-                        fifo_mod = import_module(mod_name)
-                        break
-                    except Exception:
-                        continue
-                if fifo_mod is None:
-                    raise ImportError("pnl module not found")
-
-                detail = fifo_mod.fifo_detail(trades)  # type: ignore[attr-defined]
-                rem_base = detail.get("remaining_base", dec("0"))
-                avg_entry = detail.get("avg_entry_price", dec("0"))
-                realized = detail.get("realized_quote", dec("0"))
+            if totals.fills > 0:
+                rem_base = totals.base_qty
+                avg_entry = totals.avg_entry_price
+                realized = totals.realized_quote
 
                 # unrealized от last_price (если есть), иначе от price
                 ref_price = last_price if last_price is not None else price
@@ -273,54 +234,6 @@ class PositionsRepository:
         )
 
     # ---------- internals ----------
-    def _load_trades_for_symbol(self, symbol: str) -> Iterable[dict[str, Any]]:
-        """
-        Забираем сделки символа из таблицы `trades` (максимально совместимо с разными схемами).
-        Ожидаемые поля: side, amount/base_amount/filled, price, cost, fee|fees|fee_quote, ts_ms.
-        """
-        cur = self.conn.cursor()
-        try:
-            cur.execute(
-                """
-                SELECT symbol, side, amount, filled, price, cost, fee_quote, ts_ms,
-                       client_order_id, broker_order_id
-                FROM trades
-                WHERE symbol = ?
-                ORDER BY COALESCE(ts_ms, 0) ASC, id ASC
-                """,
-                (symbol,),
-            )
-        except Exception:
-            # если схема другая — пробуем минимальный набор
-            cur.execute(
-                """
-                SELECT symbol, side, amount, price, ts_ms
-                FROM trades
-                WHERE symbol = ?
-                ORDER BY COALESCE(ts_ms, 0) ASC
-                """,
-                (symbol,),
-            )
-
-        rows = cur.fetchall() or []
-        out: list[dict[str, Any]] = []
-        for r in rows:
-            if hasattr(r, "keys"):
-                d = dict(r)  # type: ignore[arg-type]
-            else:
-                # совместимость с tuple — бежим по известным индексам
-                d = {}
-                try:
-                    d["symbol"] = r[0]
-                    d["side"] = r[1]
-                    d["amount"] = r[2]
-                    d["price"] = r[4] if len(r) > 4 else r[2]
-                    d["ts_ms"] = r[7] if len(r) > 7 else (r[4] if len(r) > 4 else None)
-                except Exception:
-                    pass
-            out.append(d)
-        return out
-
     def _upsert_position_fifo(
         self,
         *,
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository
+from crypto_ai_bot.utils.decimal import from_units, to_units
+from crypto_ai_bot.utils.time import now_ms as _now_ms
+
+_ZERO = Decimal("0")
+
+# гранулярность -> длина корзины (мс); от крупной к мелкой
+GRANULARITIES: dict[str, int] = {
+    "1d": 86_400_000,
+    "1h": 3_600_000,
+    "5m": 300_000,
+    "1m": 60_000,
+}
+
+# сколько хранить мелкие корзины (мс); 1h/1d хранятся всегда.
+# Окна старше срока хранения добираются корзинами 1h/1d и краями из `trades`.
+RETENTION_MS: dict[str, int] = {
+    "5m": 30 * 86_400_000,
+    "1m": 2 * 86_400_000,
+}
+
+_PRUNE_EVERY_MS = 3_600_000
+
+_UPSERT_SQL = """
+    INSERT INTO trade_rollups
+        (symbol, granularity, bucket_start, count, turnover_e8, fees_e8,
+         realized_e8, wins, losses, gross_profit_e8, gross_loss_e8)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(symbol, granularity, bucket_start) DO UPDATE SET
+        count = count + excluded.count,
+        turnover_e8 = turnover_e8 + excluded.turnover_e8,
+        fees_e8 = fees_e8 + excluded.fees_e8,
+        realized_e8 = realized_e8 + excluded.realized_e8,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        gross_profit_e8 = gross_profit_e8 + excluded.gross_profit_e8,
+        gross_loss_e8 = gross_loss_e8 + excluded.gross_loss_e8
+"""
+
+
+@dataclass(frozen=True)
+class RollupTotals:
+    """Сводка по сделкам за период (из корзин `trade_rollups`)."""
+
+    count: int = 0
+    turnover_quote: Decimal = _ZERO
+    fees_quote: Decimal = _ZERO
+    realized_quote: Decimal = _ZERO
+    wins: int = 0
+    losses: int = 0
+    gross_profit_quote: Decimal = _ZERO
+    gross_loss_quote: Decimal = _ZERO
+
+
+def covering_buckets(
+    start_ms: int, end_ms: int, *, now_ms: int | None = None
+) -> tuple[list[tuple[str, int, int]], list[tuple[int, int]]]:
+    """
+    Покрытие [start_ms, end_ms) корзинами: середина — самыми крупными целыми корзинами,
+    края — всё более мелкими. Корзина берётся, только если целиком лежит внутри диапазона.
+    Возвращает (spans, edges): spans — (granularity, lo, hi) для `bucket_start ∈ [lo, hi)`,
+    edges — остатки [lo, hi), которые корзинами не покрыть (неполная минута на краю окна,
+    мелкие корзины старше RETENTION_MS при заданном now_ms) — их читают из `trades`.
+    """
+    grans = list(GRANULARITIES.items())
+
+    def horizon(name: str, g: int) -> int | None:
+        keep = RETENTION_MS.get(name)
+        if keep is None or now_ms is None:
+            return None
+        # корзины с bucket_start >= now - keep гарантированно не удалены prune()
+        return -(-(int(now_ms) - keep) // g) * g
+
+    def cover(lo: int, hi: int, i: int) -> tuple[list[tuple[str, int, int]], list[tuple[int, int]]]:
+        if lo >= hi:
+            return [], []
+        if i == len(grans):
+            return [], [(lo, hi)]
+        name, g = grans[i]
+        a = -(-lo // g) * g
+        b = hi // g * g
+        h = horizon(name, g)
+        if h is not None:
+            a = max(a, h)
+        if a >= b:
+            return cover(lo, hi, i + 1)
+        left, right = cover(lo, a, i + 1), cover(b, hi, i + 1)
+        return left[0] + [(name, a, b)] + right[0], left[1] + right[1]
+
+    return cover(int(start_ms), int(end_ms), 0)
+
+
+def _retained_since(name: str, now_ms: int) -> int | None:
+    """Минимальный bucket_start, который ещё хранится для гранулярности (None — хранится всё)."""
+    keep = RETENTION_MS.get(name)
+    return None if keep is None else now_ms - keep
+
+
+def _fill_rows(symbol: str, ts_ms: int, values: tuple[int, ...], now_ms: int) -> list[tuple[Any, ...]]:
+    rows: list[tuple[Any, ...]] = []
+    for name, g in GRANULARITIES.items():
+        since = _retained_since(name, now_ms)
+        if since is None or ts_ms // g * g >= since:  # мелкие корзины за сроком хранения не пишем
+            rows.append((symbol, name, ts_ms // g * g, *values))
+    return rows
+
+
+def _realized_values(realized: Decimal) -> tuple[int, int, int, int, int]:
+    units = to_units(realized)
+    return (
+        units,
+        1 if realized > 0 else 0,
+        1 if realized < 0 else 0,
+        units if units > 0 else 0,
+        units if units < 0 else 0,
+    )
+
+
+@dataclass
+class RollupsRepository:
+    """
+    Материализованные агрегаты сделок по корзинам 1m/5m/1h/1d (`trade_rollups`).
+
+    Обновляются в той же транзакции, что и вставка сделки (TradesRepository.add_from_order),
+    поэтому риск-правила и отчёты читают O(корзин), а не O(сделок).
+    Суммы — целые единицы 1e-8 quote (см. utils.decimal.to_units).
+    Таблица создаётся миграцией V0018; `rebuild()` пересобирает её из `trades`.
+    Корзины 1m/5m старше RETENTION_MS удаляет `prune()` (не чаще раза в час из add_fill).
+    """
+
+    conn: Any  # sqlite3.Connection
+    _next_prune_ms: int = field(default=0, init=False, repr=False)
+
+    # ---------- writes ----------
+    def add_fill(
+        self,
+        *,
+        symbol: str,
+        ts_ms: int,
+        cost_e8: int,
+        fee_e8: int,
+        realized: Decimal = _ZERO,
+    ) -> None:
+        """Учитывает одну сделку во всех гранулярностях (без commit — коммитит вызывающий)."""
+        now = _now_ms()
+        values = (1, int(cost_e8), int(fee_e8), *_realized_values(realized))
+        self.conn.executemany(_UPSERT_SQL, _fill_rows(symbol, int(ts_ms), values, now))
+        if now >= self._next_prune_ms:
+            self.prune(now, commit=False)
+
+    def prune(self, now_ms: int | None = None, *, commit: bool = True) -> int:
+        """Удалить корзины мелких гранулярностей старше RETENTION_MS. Возвращает число удалённых строк."""
+        now = _now_ms() if now_ms is None else int(now_ms)
+        removed = 0
+        for name in RETENTION_MS:
+            cur = self.conn.execute(
+                "DELETE FROM trade_rollups WHERE granularity = ? AND bucket_start < ?",
+                (name, _retained_since(name, now)),
+            )
+            removed += max(0, int(cur.rowcount or 0))
+        self._next_prune_ms = now + _PRUNE_EVERY_MS
+        if commit:
+            self.conn.commit()
+        return removed
+
+    def rebuild(self, symbol: str | None = None, *, commit: bool = True) -> list[str]:
+        """
+        Пересобирает корзины символа (или всех символов) из `trades`:
+        count/turnover/fees — GROUP BY по целым колонкам, realized — полным FIFO-прогоном.
+        Мелкие корзины старше RETENTION_MS не восстанавливаются.
+        """
+        lots = LotsRepository(self.conn)
+        if symbol:
+            symbols = [symbol]
+        else:
+            symbols = [
+                str(r[0]) for r in self.conn.execute("SELECT DISTINCT symbol FROM trades ORDER BY symbol")
+            ]
+        now = _now_ms()
+        for s in symbols:
+            self.conn.execute("DELETE FROM trade_rollups WHERE symbol = ?", (s,))
+            for name, g in GRANULARITIES.items():
+                since = _retained_since(name, now)
+                self.conn.execute(
+                    """
+                    INSERT INTO trade_rollups (symbol, granularity, bucket_start, count, turnover_e8, fees_e8)
+                    SELECT symbol, ?, (ts_ms / ?) * ?, COUNT(*), SUM(cost_e8), SUM(fee_quote_e8)
+                    FROM trades
+                    WHERE symbol = ? AND ts_ms >= ?
+                    GROUP BY (ts_ms / ?) * ?
+                    """,
+                    (name, g, g, s, 0 if since is None else -(-since // g) * g, g, g),
+                )
+            rows: list[tuple[Any, ...]] = []
+
+            def on_sell(
+                ts_ms: int, realized: Decimal, s: str = s, rows: list[tuple[Any, ...]] = rows
+            ) -> None:
+                rows.extend(_fill_rows(s, ts_ms, (0, 0, 0, *_realized_values(realized)), now))
+
+            lots.replay(s, on_sell)
+            self.conn.executemany(_UPSERT_SQL, rows)
+        if commit:
+            self.conn.commit()
+        return symbols
+
+    # ---------- reads ----------
+    def list_buckets(
+        self, symbol: str, granularity: str, start_ms: int, end_ms: int
+    ) -> list[tuple[int, int, Decimal]]:
+        """Корзины символа с bucket_start ∈ [start_ms, end_ms): (bucket_start, count, turnover_quote)."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"unknown granularity: {granularity}")
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT bucket_start, count, turnover_e8
+            FROM trade_rollups
+            WHERE symbol = ? AND granularity = ? AND bucket_start >= ? AND bucket_start < ?
+            ORDER BY bucket_start
+            """,
+            (symbol, granularity, int(start_ms), int(end_ms)),
+        )
+        return [(int(r[0]), int(r[1]), from_units(r[2])) for r in cur.fetchall()]
+
+    def get_totals(
+        self, symbol: str | None, start_ms: int, end_ms: int, *, now_ms: int | None = None
+    ) -> RollupTotals:
+        """
+        Сводка за [start_ms, end_ms) точно по границам; symbol=None — по всем символам.
+        Середина окна — из целых корзин, неполные края — диапазоном по `trades`
+        (`ts_ms >= ? AND ts_ms < ?`, индекс idx_trades_symbol_ts) в том же запросе.
+        realized/wins/losses есть только в корзинах: продажи на краях окна в них не попадают.
+        """
+        spans, edges = covering_buckets(start_ms, end_ms, now_ms=_now_ms() if now_ms is None else now_ms)
+        if not spans and not edges:
+            return RollupTotals()
+        # SQL собирается только из констант этого метода; значения — параметрами
+        by_symbol = "symbol = ? AND " if symbol is not None else ""
+        parts: list[str] = []
+        params: list[Any] = []
+        if spans:
+            where = " OR ".join(["(granularity = ? AND bucket_start >= ? AND bucket_start < ?)"] * len(spans))
+            parts.append(
+                "SELECT count AS n, turnover_e8 AS turnover, fees_e8 AS fees, realized_e8 AS realized,"  # noqa: S608
+                " wins, losses, gross_profit_e8 AS gross_profit, gross_loss_e8 AS gross_loss"
+                f" FROM trade_rollups WHERE {by_symbol}({where})"
+            )
+            params += ([symbol] if symbol is not None else []) + [v for span in spans for v in span]
+        if edges:
+            where = " OR ".join(["(ts_ms >= ? AND ts_ms < ?)"] * len(edges))
+            parts.append(
+                "SELECT 1 AS n, cost_e8 AS turnover, fee_quote_e8 AS fees, 0 AS realized,"  # noqa: S608
+                " 0 AS wins, 0 AS losses, 0 AS gross_profit, 0 AS gross_loss"
+                f" FROM trades WHERE {by_symbol}({where})"
+            )
+            params += ([symbol] if symbol is not None else []) + [v for edge in edges for v in edge]
+        cur = self.conn.cursor()
+        cur.execute(
+            f"""
+            SELECT COALESCE(SUM(n), 0), COALESCE(SUM(turnover), 0), COALESCE(SUM(fees), 0),
+                   COALESCE(SUM(realized), 0), COALESCE(SUM(wins), 0), COALESCE(SUM(losses), 0),
+                   COALESCE(SUM(gross_profit), 0), COALESCE(SUM(gross_loss), 0)
+            FROM ({" UNION ALL ".join(parts)})
+            """,  # noqa: S608
+            params,
+        )
+        r = cur.fetchone()
+        return RollupTotals(
+            count=int(r[0]),
+            turnover_quote=from_units(r[1]),
+            fees_quote=from_units(r[2]),
+            realized_quote=from_units(r[3]),
+            wins=int(r[4]),
+            losses=int(r[5]),
+            gross_profit_quote=from_units(r[6]),
+            gross_loss_quote=from_units(r[7]),
+        )
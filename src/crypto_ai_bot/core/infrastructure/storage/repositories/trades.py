@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any, cast
 
+from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository, utc_day
+from crypto_ai_bot.core.infrastructure.storage.repositories.rollups import RollupsRepository
+from crypto_ai_bot.utils.decimal import to_units
+from crypto_ai_bot.utils.time import now_ms, utc_day_bounds_ms
+
 
 def _get(obj: Any, attr: str, key: str | None = None, default: Any = None) -> Any:
     """
@@ -25,87 +30,102 @@ def _get(obj: Any, attr: str, key: str | None = None, default: Any = None) -> An
 
 @dataclass
 class TradesRepository:
+    """
+    Сделки (исполненные ордера). Схема таблиц — только в migrations/runner.py.
+
+    Quote-суммы (cost, fee_quote) пишутся дважды: точной строкой и целым числом
+    единиц 1e-8 (cost_e8, fee_quote_e8) — агрегаты считаются по целым колонкам.
+    Счётчики и обороты за периоды (риск-правила, отчёты) читаются из `trade_rollups`.
+    """
+
+    INSERT_SQL = (
+        "INSERT INTO trades (broker_order_id, client_order_id, symbol, side, amount, filled, price, cost, fee_quote, "
+        "cost_e8, fee_quote_e8, ts_ms) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
     conn: Any  # sqlite3.Connection с row_factory=sqlite3.Row
+    _lots: LotsRepository = field(init=False, repr=False)
+    _rollups: RollupsRepository = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        try:
-            self.ensure_schema()
-        except Exception:
-            pass
-
-    def ensure_schema(self) -> None:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                broker_order_id TEXT,
-                client_order_id TEXT,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,
-                amount TEXT NOT NULL,
-                filled TEXT NOT NULL,
-                price TEXT NOT NULL,
-                cost TEXT NOT NULL,
-                fee_quote TEXT NOT NULL,
-                ts_ms INTEGER NOT NULL
-            )
-            """
-        )
-        # на случай старой схемы — гарантируем наличие broker_order_id
-        cur.execute("PRAGMA table_info(trades)")
-        cols = [r[1] for r in cur.fetchall()]
-        if "broker_order_id" not in cols:
-            cur.execute("ALTER TABLE trades ADD COLUMN broker_order_id TEXT")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol_ts ON trades(symbol, ts_ms)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol_side_ts ON trades(symbol, side, ts_ms)")
-        self.conn.commit()
+        self._lots = LotsRepository(self.conn)
+        self._rollups = RollupsRepository(self.conn)
 
     # ---------- INSERTS / LISTS ----------
 
     def add_from_order(self, order: Any) -> None:
         """
         Сохраняем исполненный ордер в trades. Поддерживаются объекты и dict-ответы CCXT.
+        Тем же коммитом исполнение проводится по FIFO-книге лотов (см. LotsRepository)
+        и по корзинам `trade_rollups` (см. RollupsRepository).
         """
-        self.ensure_schema()
         cur = self.conn.cursor()
+        symbol = _get(order, "symbol", "symbol")
+        side = _get(order, "side", "side")
+        amount = _get(order, "amount", "amount", Decimal("0"))
+        filled = _get(order, "filled", "filled", amount)
+        price = _get(order, "price", "price", Decimal("0"))
+        cost = _get(order, "cost", "cost", Decimal("0"))
+        # fee может быть dict: {"cost": ..., "currency": "..."}
+        fee = _get(order, "fee_quote", "fee_quote")
+        if fee is None:
+            fee_obj = _get(order, "fee", "fee")
+            fee = (fee_obj or {}).get("cost", "0") if isinstance(fee_obj, dict) else "0"
+        ts_ms = int(_get(order, "ts_ms", "timestamp", 0))
         cur.execute(
-            "INSERT INTO trades (broker_order_id, client_order_id, symbol, side, amount, filled, price, cost, fee_quote, ts_ms) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self.INSERT_SQL,
             (
                 _get(order, "id", "id"),
                 _get(order, "client_order_id", "clientOrderId"),
-                _get(order, "symbol", "symbol"),
-                _get(order, "side", "side"),
-                str(_get(order, "amount", "amount", Decimal("0"))),
-                str(_get(order, "filled", "filled", _get(order, "amount", "amount", Decimal("0")))),
-                str(_get(order, "price", "price", Decimal("0"))),
-                str(_get(order, "cost", "cost", Decimal("0"))),
-                # fee может быть dict: {"cost": ..., "currency": "..."}
-                str(
-                    _get(order, "fee_quote", "fee_quote")
-                    if _get(order, "fee_quote", "fee_quote") is not None
-                    else (
-                        (_get(order, "fee", "fee") or {}).get("cost", "0")
-                        if isinstance(_get(order, "fee", "fee"), dict)
-                        else "0"
-                    )
-                ),
-                int(_get(order, "ts_ms", "timestamp", 0)),
+                symbol,
+                side,
+                str(amount),
+                str(filled),
+                str(price),
+                str(cost),
+                str(fee),
+                to_units(cost),
+                to_units(fee),
+                ts_ms,
             ),
         )
+        realized = self._lots.apply_fill(
+            symbol=symbol,
+            side=str(side or ""),
+            qty=Decimal(str(filled or "0")),  # filled <= 0 — книгу не трогаем
+            price=Decimal(str(price or "0")),
+            cost=Decimal(str(cost or "0")),
+            fee_quote=Decimal(str(fee or "0")),
+            ts_ms=ts_ms,
+            commit=False,
+        )
+        if realized is None:
+            # книга пересобрана (исполнение «из прошлого») — realized корзин тоже пересчитываем
+            self._rollups.rebuild(symbol, commit=False)
+        else:
+            self._rollups.add_fill(
+                symbol=symbol, ts_ms=ts_ms, cost_e8=to_units(cost), fee_e8=to_units(fee), realized=realized
+            )
         self.conn.commit()
 
+    # Периоды считаются в Python и передаются границами ts_ms:
+    # `symbol = ? AND ts_ms BETWEEN ? AND ?` — диапазон по индексу idx_trades_symbol_ts,
+    # а не скан всей истории символа, как с DATE(ts_ms/1000, 'unixepoch') = DATE('now').
+    # Агрегаты за период (счётчики, оборот) читаются из корзин trade_rollups, а неполные
+    # края окна — тем же диапазоном `symbol = ? AND ts_ms >= ? AND ts_ms < ?` по trades
+    # (RollupsRepository.get_totals): корзины надстроены над этими запросами, а не заменяют их.
+
     def list_today(self, symbol: str) -> list[Any]:
         cur = self.conn.cursor()
         cur.execute(
             """
             SELECT * FROM trades
             WHERE symbol = ?
-              AND DATE(ts_ms/1000, 'unixepoch') = DATE('now')
+              AND ts_ms BETWEEN ? AND ?
             ORDER BY ts_ms DESC
             """,
-            (symbol,),
+            (symbol, *utc_day_bounds_ms(now_ms())),
         )
         return cast(list[Any], cur.fetchall())
 
@@ -124,124 +144,53 @@ class TradesRepository:
         return cast(list[Any], cur.fetchall())
 
     def daily_turnover_quote(self, symbol: str) -> Decimal:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT COALESCE(SUM(CAST(cost AS REAL)), 0) as turnover
-            FROM trades
-            WHERE symbol = ?
-              AND DATE(ts_ms/1000, 'unixepoch') = DATE('now')
-            """,
-            (symbol,),
-        )
-        result = cur.fetchone()
-        return Decimal(str(result[0] if result else 0))
+        start, end = utc_day_bounds_ms(now_ms())
+        return self._rollups.get_totals(symbol, start, end + 1).turnover_quote
+
+    def get_totals(self, symbol: str, start_ms: int, end_ms: int) -> dict[str, Any]:
+        """
+        Агрегаты за [start_ms, end_ms) одним запросом по корзинам trade_rollups
+        (RollupsRepository.get_totals) — O(корзин), без FIFO-прогона истории символа.
+        Число сделок, оборот и комиссии точны по границам окна; realized PnL и
+        прибыльные/убыточные продажи — по целым корзинам (разрешение — минута).
+        """
+        totals = self._rollups.get_totals(symbol, int(start_ms), int(end_ms))
+        return {
+            "count": totals.count,
+            "turnover_quote": totals.turnover_quote,
+            "fees_quote": totals.fees_quote,
+            "realized_pnl": totals.realized_quote,
+            "wins": totals.wins,
+            "losses": totals.losses,
+            "gross_profit_quote": totals.gross_profit_quote,
+            "gross_loss_quote": totals.gross_loss_quote,  # <= 0
+        }
 
     def count_orders_last_minutes(self, symbol: str, minutes: int) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT COUNT(*) as cnt
-            FROM trades
-            WHERE symbol = ?
-              AND ts_ms > (CAST(STRFTIME('%s', 'now') AS INTEGER) * 1000 - ? * 60 * 1000)
-            """,
-            (symbol, minutes),
-        )
-        result = cur.fetchone()
-        return int(result[0] if result else 0)
+        """Число сделок за последние N минут (корзины trade_rollups + неполные края из trades)."""
+        now = now_ms()
+        return self._rollups.get_totals(symbol, now - int(minutes) * 60_000, now + 1).count
+
+    def turnover_quote_last_minutes(self, symbol: str, minutes: int) -> Decimal:
+        """Оборот в quote за последние N минут (то же точное окно)."""
+        now = now_ms()
+        return self._rollups.get_totals(symbol, now - int(minutes) * 60_000, now + 1).turnover_quote
 
     def count_orders_today(self, symbol: str) -> int:
         """Сколько исполнений по символу за сегодня (UTC)."""
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT COUNT(*) FROM trades
-            WHERE symbol = ?
-              AND DATE(ts_ms/1000, 'unixepoch') = DATE('now')
-            """,
-            (symbol,),
-        )
-        row = cur.fetchone()
-        return int(row[0] if row else 0)
+        start, end = utc_day_bounds_ms(now_ms())
+        return self._rollups.get_totals(symbol, start, end + 1).count
 
     # ---------- FIFO PnL (с учётом fee_quote) ----------
 
-    def _iter_all_asc(self, symbol: str) -> list[Any]:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT side, amount, filled, price, cost, fee_quote, ts_ms
-            FROM trades
-            WHERE symbol = ?
-            ORDER BY ts_ms ASC
-            """,
-            (symbol,),
-        )
-        return cast(list[Any], cur.fetchall())
-
-    @staticmethod
-    def _to_dec(x: Any) -> Decimal:
-        return Decimal(str(x if x is not None else "0"))
-
     def pnl_today_quote(self, symbol: str) -> Decimal:
         """Реализованный PnL за сегодня (UTC, quote), метод FIFO, с учётом fee_quote."""
-        return self._pnl_today_fifo_quote(symbol)
+        self._lots.ensure(symbol)
+        return self._lots.realized_for_day(symbol, utc_day(now_ms()))
 
-    # Алиас для совместимости:
+    # Алиасы для совместимости (get_daily_pnl — протокол риск-менеджера):
     def daily_pnl_quote(self, symbol: str) -> Decimal:
         return self.pnl_today_quote(symbol)
 
-    def _pnl_today_fifo_quote(self, symbol: str) -> Decimal:
-        rows = self._iter_all_asc(symbol)
-
-        # FIFO-очередь покупок: элементы (qty_left, unit_cost_quote)
-        # unit_cost_quote = (cost + fee_quote) / filled
-        buy_lots: list[tuple[Decimal, Decimal]] = []
-
-        pnl_today = Decimal("0")
-
-        import datetime as _dt
-
-        today_utc = _dt.datetime.utcnow().date()
-
-        for r in rows:
-            side = (r["side"] or "").lower() if hasattr(r, "__getitem__") else str(r[0]).lower()
-            filled = self._to_dec(r["filled"] if hasattr(r, "__getitem__") else r[2])
-            price = self._to_dec(r["price"] if hasattr(r, "__getitem__") else r[3])
-            cost = self._to_dec(r["cost"] if hasattr(r, "__getitem__") else r[4])
-            fee_q = self._to_dec(r["fee_quote"] if hasattr(r, "__getitem__") else r[5])
-            ts_ms = int(r["ts_ms"] if hasattr(r, "__getitem__") else r[6] or 0)
-            ts_day = _dt.datetime.utcfromtimestamp(ts_ms / 1000).date()
-
-            if filled <= 0:
-                continue
-
-            if side == "buy":
-                unit_cost = (cost + fee_q) / filled if filled > 0 else Decimal("0")
-                buy_lots.append((filled, unit_cost))
-                continue
-
-            if side == "sell":
-                qty_to_consume = filled
-                unit_sell = price  # выручка до комиссии
-                realized = Decimal("0")
-
-                i = 0
-                while qty_to_consume > 0 and i < len(buy_lots):
-                    lot_qty, lot_uc = buy_lots[i]
-                    take = min(lot_qty, qty_to_consume)
-                    realized += take * (unit_sell - lot_uc)
-                    new_qty = lot_qty - take
-                    qty_to_consume -= take
-                    if new_qty > 0:
-                        buy_lots[i] = (new_qty, lot_uc)
-                        i += 1
-                    else:
-                        buy_lots.pop(i)
-
-                # комиссия продажи относится к продаже
-                if ts_day == today_utc:
-                    pnl_today += realized - fee_q
-
-        return pnl_today
+    def get_daily_pnl(self, symbol: str) -> Decimal:
+        return self.pnl_today_quote(symbol)
@@ -10,6 +10,7 @@ DEFAULT_PAGE_SIZE = int(os.getenv("SQLITE_PAGE_SIZE", "4096"))
 
 __all__ = [
     "connect",
+    "connect_readonly",
     "transaction",
     "read_only",
     "exec_script",
@@ -48,6 +49,28 @@ def connect(db_path: str) -> sqlite3.Connection:
     return conn
 
 
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    """
+    Read-only подключение (mode=ro + query_only) для пулов читателей.
+    В WAL читатели не блокируют писателя и видят последний закоммиченный снимок.
+    """
+    conn = sqlite3.connect(
+        f"file:{db_path}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None,
+        timeout=DEFAULT_BUSY_TIMEOUT_MS / 1000.0,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+    )
+    with suppress(Exception):
+        conn.execute("PRAGMA query_only=ON;")
+    with suppress(Exception):
+        conn.execute("PRAGMA temp_store=MEMORY;")
+    with suppress(Exception):
+        conn.execute(f"PRAGMA busy_timeout={DEFAULT_BUSY_TIMEOUT_MS};")
+    return conn
+
+
 @contextmanager
 def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Cursor]:
     """
@@ -0,0 +1,179 @@
+"""
+Кодеки сериализации: события шины, аудит, структурные логи.
+
+Один слой вместо разрозненных json.dumps(...): Decimal, datetime/date, Enum,
+dataclass, set/tuple кодируются одинаково везде, а payload'ы из events_topics
+можно публиковать без ручного str()/isoformat().
+
+- "json"    — orjson, если установлен, иначе stdlib json. Decimal -> строка
+              (как в схемах events_topics: «Decimal as string»), datetime -> ISO-8601;
+- "msgpack" — бинарный формат (нужен пакет msgpack). Decimal и datetime —
+              extension-типы: после loads() это снова Decimal/datetime без потери
+              точности и таймзоны.
+
+orjson и msgpack перечислены в requirements.txt, но импортируются опционально:
+без orjson "json" работает на stdlib json (тот же формат, медленнее), без msgpack
+get_codec("msgpack") падает с ошибкой, а available_codecs() его не возвращает.
+
+    codec = get_codec("json")
+    data = codec.dumps({"price": Decimal("0.1")})   # b'{"price":"0.1"}'
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+try:  # опционально: быстрый JSON
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None  # type: ignore[assignment]
+
+try:  # опционально: бинарный формат
+    import msgpack as _msgpack
+except ImportError:  # pragma: no cover
+    _msgpack = None  # type: ignore[assignment]
+
+_EXT_DECIMAL = 1
+_EXT_DATETIME = 2
+
+
+def _default(obj: Any) -> Any:
+    """Типы, которых нет в JSON: канонические строки/списки; неизвестное — str()."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return bytes(obj).decode("utf-8", "replace")
+    return str(obj)
+
+
+class Codec:
+    """Базовый кодек: dumps() -> bytes, loads(bytes | str)."""
+
+    name = "codec"
+    binary = False  # True — результат не является UTF-8 текстом
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes | str) -> Any:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name})"
+
+
+class JsonCodec(Codec):
+    """JSON через orjson (если есть) или stdlib; компактный, UTF-8 без \\u-экранирования."""
+
+    binary = False
+
+    def __init__(self, *, use_orjson: bool | None = None) -> None:
+        if use_orjson and _orjson is None:
+            raise RuntimeError("orjson is not installed")
+        self._orjson = _orjson if use_orjson is not False else None
+        self.name = "json" if self._orjson is None else "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        if self._orjson is not None:
+            return self._orjson.dumps(
+                obj,
+                default=_default,
+                option=self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_SERIALIZE_NUMPY,
+            )
+        return self.dumps_text(obj).encode("utf-8")
+
+    def dumps_text(self, obj: Any) -> str:
+        """То же, что dumps(), но str (колонки TEXT, строки логов)."""
+        if self._orjson is not None:
+            return self.dumps(obj).decode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    def loads(self, data: bytes | str) -> Any:
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """msgpack с extension-типами для Decimal и datetime (восстанавливаются при loads)."""
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self) -> None:
+        if _msgpack is None:
+            raise RuntimeError("msgpack codec requires the msgpack package")
+
+    @staticmethod
+    def _ext_default(obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            return _msgpack.ExtType(_EXT_DECIMAL, str(obj).encode("ascii"))
+        if isinstance(obj, datetime):
+            return _msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode("ascii"))
+        return _default(obj)
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == _EXT_DECIMAL:
+            return Decimal(data.decode("ascii"))
+        if code == _EXT_DATETIME:
+            return datetime.fromisoformat(data.decode("ascii"))
+        return _msgpack.ExtType(code, data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return _msgpack.packb(obj, default=self._ext_default, use_bin_type=True, datetime=False)
+
+    def loads(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        return _msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+_CODECS: dict[str, Codec] = {}
+
+
+def get_codec(name: str | Codec = "json") -> Codec:
+    """Кодек по имени: "json" (orjson, если установлен), "stdlib-json", "msgpack"."""
+    if isinstance(name, Codec):
+        return name
+    key = str(name).lower()
+    codec = _CODECS.get(key)
+    if codec is None:
+        if key == "json":
+            codec = JsonCodec()
+        elif key == "stdlib-json":
+            codec = JsonCodec(use_orjson=False)
+        elif key == "orjson":
+            codec = JsonCodec(use_orjson=True)
+        elif key == "msgpack":
+            codec = MsgpackCodec()
+        else:
+            raise ValueError(f"unknown codec {name!r} (json | stdlib-json | orjson | msgpack)")
+        _CODECS[key] = codec
+    return codec
+
+
+def available_codecs() -> list[str]:
+    """Имена кодеков, доступных в текущем окружении."""
+    names = ["stdlib-json"]
+    if _orjson is not None:
+        names.append("orjson")
+    if _msgpack is not None:
+        names.append("msgpack")
+    return names
+
+
+__all__ = ["Codec", "JsonCodec", "MsgpackCodec", "available_codecs", "get_codec"]
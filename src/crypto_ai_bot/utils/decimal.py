@@ -9,7 +9,7 @@ Critical for trading system accuracy:
 """
 from __future__ import annotations
 
-from decimal import ROUND_DOWN, ROUND_UP, ROUND_HALF_UP, Decimal, InvalidOperation
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, InvalidOperation
 from typing import Union, overload
 
 # Public alias
@@ -138,6 +138,41 @@ def round_amount(amount: NumberLike, lot_size: NumberLike) -> Decimal:
     return round_to_step(amount, lot_size, rounding=ROUND_DOWN)
 
 
+# ============= FIXED-POINT (SCALED INTEGER) =============
+
+# Денежные суммы в quote хранятся в БД как INTEGER в единицах 1e-8:
+# SUM() в SQLite считается точно, а чтение не проходит через строки.
+MONEY_SCALE = 8
+
+# SQLite INTEGER — знаковое 64-битное
+_INT64_MAX = 2**63 - 1
+
+
+def to_units(x: NumberLike, scale: int = MONEY_SCALE) -> int:
+    """
+    Decimal -> целое число единиц 10**-scale (банковское округление).
+
+    Examples:
+        to_units("1.5") -> 150000000
+        to_units("0.000000015") -> 2
+
+    Raises:
+        ValueError: значение не конечно или не помещается в INTEGER SQLite при этом масштабе
+    """
+    d = dec(x)
+    if not d.is_finite():
+        raise ValueError(f"to_units: non-finite value {x!r}")
+    units = int(d.scaleb(scale).to_integral_value(rounding=ROUND_HALF_EVEN))
+    if abs(units) > _INT64_MAX:
+        raise ValueError(f"to_units: {x!r} is too large for a 64-bit integer at scale 1e-{scale}")
+    return units
+
+
+def from_units(units: int | None, scale: int = MONEY_SCALE) -> Decimal:
+    """Целые единицы 10**-scale -> Decimal (точно, без float)."""
+    return Decimal(int(units or 0)).scaleb(-scale)
+
+
 # ============= ARITHMETIC OPERATIONS =============
 
 def safe_div(a: NumberLike, b: NumberLike, *, default: NumberLike = ZERO) -> Decimal:
@@ -471,6 +506,11 @@ __all__ = [
     "round_price",
     "round_amount",
     
+    # Fixed-point
+    "MONEY_SCALE",
+    "to_units",
+    "from_units",
+
     # Arithmetic
     "safe_div",
     "clamp",
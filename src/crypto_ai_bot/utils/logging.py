@@ -18,6 +18,10 @@ from contextvars import ContextVar
 from datetime import datetime, timezone
 from typing import Any, Final, Optional
 
+from crypto_ai_bot.utils.codec import JsonCodec
+
+_JSON = JsonCodec()
+
 # ============= CORRELATION ID (async-safe) =============
 
 _CORRELATION_ID: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
@@ -139,7 +143,7 @@ class JsonFormatter(logging.Formatter):
             payload["exc_info"] = self.formatException(record.exc_info)
             payload["exc_type"] = record.exc_info[0].__name__ if record.exc_info[0] else None
 
-        return json.dumps(payload, ensure_ascii=False, default=str)
+        return _JSON.dumps_text(payload)
 
     def _make_json_safe(self, value: Any) -> Any:
         """Convert value to JSON-serializable format (with recursive masking for dicts)"""
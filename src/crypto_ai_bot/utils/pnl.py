@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any
 
-from crypto_ai_bot.utils.decimal import dec
+from crypto_ai_bot.utils.decimal import ZERO, dec
 
 
 @dataclass
@@ -219,5 +219,40 @@ def fifo_detail(trades: Iterable[dict[str, Any]]) -> dict[str, Any]:
     }
 
 
+class FIFOCalculator:
+    """
+    Инкрементальный FIFO с теми же правилами, что fifo_pnl: комиссия buy капитализируется
+    в цене лота, комиссия sell вычитается из realized. Для кривых equity по сделкам.
+    """
+
+    def __init__(self) -> None:
+        self._lots: list[tuple[Decimal, Decimal]] = []
+
+    def add_buy(self, amount: Decimal, price: Decimal, fee: Decimal = ZERO) -> None:
+        if amount <= 0:
+            return
+        eff_price = price + (fee / amount if fee > 0 else dec("0"))
+        self._lots.append((amount, eff_price))
+
+    def process_sell(self, amount: Decimal, price: Decimal, fee: Decimal = ZERO) -> Decimal:
+        """Списывает лоты FIFO; возвращает реализованный PnL продажи (короткий остаток игнорируется)."""
+        realized = -fee if fee > 0 else dec("0")
+        qty = amount
+        while qty > 0 and self._lots:
+            lot_qty, lot_price = self._lots[0]
+            matched = min(qty, lot_qty)
+            realized += (price - lot_price) * matched
+            qty -= matched
+            if lot_qty - matched <= 0:
+                self._lots.pop(0)
+            else:
+                self._lots[0] = (lot_qty - matched, lot_price)
+        return realized
+
+    @property
+    def remaining_base(self) -> Decimal:
+        return sum((q for q, _ in self._lots), dec("0"))
+
+
 # Backward-compatible alias expected by some callers/tests
 calculate_fifo_pnl = fifo_pnl
@@ -0,0 +1,54 @@
+"""
+Single-flight: коалесцирование одинаковых конкурентных async-вызовов.
+
+Пока вызов с ключом K выполняется, остальные вызовы с тем же K не запускают
+свой запрос, а ждут результат (или исключение) уже летящего. После завершения
+ключ освобождается — следующий вызов снова идёт в источник.
+
+Отмена одного из ожидающих не отменяет общий запрос (asyncio.shield).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from crypto_ai_bot.utils.metrics import inc
+
+T = TypeVar("T")
+
+__all__ = ["SingleFlight"]
+
+
+class SingleFlight:
+    """Dedup concurrent identical calls by key (per event loop usage)."""
+
+    def __init__(self, name: str = "default") -> None:
+        self._name = name
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` once per key at a time; concurrent callers share its outcome."""
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            inc("singleflight_shared_total", flight=self._name)
+            return await asyncio.shield(task)
+
+        task = asyncio.get_running_loop().create_task(fn())  # type: ignore[arg-type]
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._release(k, t))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # забираем исключение, даже если все ожидающие отменились
+        if not task.cancelled():
+            task.exception()
@@ -13,10 +13,12 @@ __all__ = [
     "now_ms",
     "sleep_ms",
     "async_sleep_ms",
+    "utc_day_bounds_ms",
     "utc_now",
 ]
 
 _MS = 1000
+_DAY_MS = 86_400_000
 
 
 def now_ms() -> int:
@@ -66,6 +68,14 @@ def bucket_ms(ts_ms: int | None, window_ms: int) -> int:
     return (ts_ms // window_ms) * window_ms
 
 
+def utc_day_bounds_ms(ts_ms: int | None = None) -> tuple[int, int]:
+    """Границы UTC-суток [start, end] (включительно, мс) для момента ts_ms (или «сейчас»).
+    Для запросов вида `ts_ms BETWEEN ? AND ?` — такой предикат использует индекс по ts_ms.
+    """
+    start = bucket_ms(ts_ms, _DAY_MS)
+    return start, start + _DAY_MS - 1
+
+
 def check_sync(remote_now_ms: Callable[[], int] | None = None) -> int | None:
     """Вернуть дрейф часов (local_now_ms - remote_now_ms), если есть провайдер.
     Положительное значение = локальные часы спешат.
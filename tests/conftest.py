@@ -4,6 +4,8 @@ from __future__ import annotations
 import asyncio
 import os
 import random
+import sqlite3
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -70,6 +72,11 @@ create_broker = _try_import("crypto_ai_bot.core.infrastructure.brokers.factory",
 Candle = _try_import("crypto_ai_bot.core.domain.signals.feature_pipeline", "Candle")
 CCXTMarketData = _try_import("crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data", "CCXTMarketData")
 
+run_migrations = _try_import("crypto_ai_bot.core.infrastructure.storage.migrations.runner", "run_migrations")
+TradesRepository = _try_import(
+    "crypto_ai_bot.core.infrastructure.storage.repositories.trades", "TradesRepository"
+)
+
 
 # ---------- Env helper ----------
 
@@ -184,6 +191,58 @@ def market_data(paper_broker: Any) -> Any:
     return _StubData()
 
 
+# ---------- SQLite storage ----------
+
+def _order(side: str, qty: Any, price: Any, fee: Any, ts: int, symbol: str = "BTC/USDT") -> dict[str, Any]:
+    """Исполненный ордер в формате TradesRepository.add_from_order (id — по ts)."""
+    q, p = Decimal(str(qty)), Decimal(str(price))
+    return {
+        "id": f"o{ts}",
+        "symbol": symbol,
+        "side": side,
+        "amount": q,
+        "filled": q,
+        "price": p,
+        "cost": q * p,
+        "fee_quote": Decimal(str(fee)),
+        "timestamp": ts,
+    }
+
+
+@pytest.fixture
+def make_order() -> Callable[..., dict[str, Any]]:
+    """
+    Фабрика ордеров: make_order(side, qty, price, fee, ts, symbol="BTC/USDT").
+    """
+    return _order
+
+
+@pytest.fixture
+def conn() -> Iterator[sqlite3.Connection]:
+    """
+    In-memory SQLite со всеми миграциями (row_factory = sqlite3.Row).
+    """
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    run_migrations(c, now_ms=1, db_path="", do_backup=False)
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def fill_trades(conn: sqlite3.Connection) -> Callable[[Iterable[tuple[Any, ...]]], Any]:
+    """
+    Записывает сделки через TradesRepository(conn):
+        trades = fill_trades([(side, qty, price, fee, ts[, symbol]), ...])
+    """
+    def _fill(fills: Iterable[tuple[Any, ...]]) -> Any:
+        trades = TradesRepository(conn)
+        for f in fills:
+            trades.add_from_order(_order(*f))
+        return trades
+    return _fill
+
+
 # ---------- Event bus / metrics stubs ----------
 
 @pytest.fixture
@@ -7,3 +7,40 @@ def test_ttlcache_put_get_and_expire():
     assert c.get("k") == 123
     time.sleep(0.03)
     assert c.get("k") is None  # истёк
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_ttlcache_lru_eviction_and_per_entry_ttl():
+    clk = _Clock()
+    c = TTLCache(ttl_sec=10, max_size=2, clock=clk)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # "a" теперь самый свежий по LRU
+    c.put("c", 3)
+    assert c.get("b") is None and c.get("a") == 1 and c.get("c") == 3
+    assert c.get_stats()["evictions"] == 1
+
+    c.put("short", 4, ttl_sec=1)
+    clk.t = 2
+    assert c.get("short") is None and c.get("c") == 3
+
+
+def test_ttlcache_stale_while_revalidate_window():
+    clk = _Clock()
+    c = TTLCache(ttl_sec=1, stale_ttl_sec=5, clock=clk)
+    c.put("k", "v")
+    assert c.get_entry("k") == ("v", True)
+    clk.t = 3
+    assert c.get("k") is None  # для обычного get — промах
+    assert c.get_entry("k") == ("v", False)
+    clk.t = 7
+    assert c.get_entry("k") is None and len(c) == 0
+    stats = c.get_stats()
+    assert (stats["hits"], stats["stale_hits"], stats["expirations"]) == (1, 1, 1)
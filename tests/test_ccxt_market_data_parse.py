@@ -1,5 +1,7 @@
 import pytest
 
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+
 @pytest.mark.asyncio
 async def test_market_data_ticker_and_ohlcv_parsing(market_data, paper_broker, symbol):
     # тикер
@@ -9,4 +11,4 @@ async def test_market_data_ticker_and_ohlcv_parsing(market_data, paper_broker, s
     assert t.bid <= t.ask
     # ohlcv (стаб может вернуть пусто — это допустимо)
     candles = await market_data.get_ohlcv(symbol, timeframe="15m", limit=10)
-    assert isinstance(candles, list)
+    assert isinstance(candles, OHLCVFrame)
@@ -0,0 +1,47 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+from crypto_ai_bot.core.application.events_topics import build_trade_event
+from crypto_ai_bot.core.infrastructure.storage.repositories.audit import AuditRepo
+from crypto_ai_bot.utils.codec import available_codecs, get_codec
+
+
+class _Side(Enum):
+    BUY = "buy"
+
+
+_TS = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=UTC)
+_RAW = {"price": Decimal("0.10000001"), "ts": _TS, "side": _Side.BUY, "tags": {"a"}}
+
+
+@pytest.mark.parametrize("name", [n for n in available_codecs() if n != "msgpack"])
+def test_json_codecs_agree_on_decimal_datetime_enum(name):
+    codec = get_codec(name)
+    decoded = codec.loads(codec.dumps(_RAW))
+    assert decoded == {"price": "0.10000001", "ts": _TS.isoformat(), "side": "buy", "tags": ["a"]}
+    # schema-payload из events_topics кодируется без изменений
+    _, payload = build_trade_event("trade.completed", "BTC/USDT", "t1", "o1", "buy",
+                                   Decimal("1"), Decimal("100.5"), Decimal("0.1"), "USDT", "tr")
+    assert codec.loads(codec.dumps(payload)) == json.loads(json.dumps(payload))
+
+
+def test_msgpack_restores_decimal_and_datetime():
+    pytest.importorskip("msgpack")
+    codec = get_codec("msgpack")
+    decoded = codec.loads(codec.dumps(_RAW))
+    assert decoded["price"] == Decimal("0.10000001") and isinstance(decoded["price"], Decimal)
+    assert decoded["ts"] == _TS and decoded["side"] == "buy" and decoded["tags"] == ["a"]
+
+
+def test_audit_row_keeps_decimal_payload():
+    _, payload_json = AuditRepo.row("trade.completed", {"pnl": Decimal("-1.5"), "ts": _TS})
+    assert json.loads(payload_json) == {"pnl": "-1.5", "ts": _TS.isoformat()}
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        get_codec("xml")
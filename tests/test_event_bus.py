@@ -0,0 +1,181 @@
+import asyncio
+
+from crypto_ai_bot.core.infrastructure.events.bus import AsyncEventBus
+
+
+def test_routes_are_cached_and_invalidated_on_subscribe(run_async):
+    bus = AsyncEventBus()
+    seen = []
+
+    async def exact(evt):
+        seen.append(("exact", evt.topic))
+
+    async def wild(evt):
+        seen.append(("wild", evt.topic))
+
+    async def main():
+        bus.subscribe("orders.executed", exact)
+        first = await bus.publish("orders.executed", {})
+        assert bus._routes["orders.executed"] == (exact,)
+        # новая подписка сбрасывает кэш маршрутов
+        bus.subscribe_wildcard("orders.*", wild)
+        second = await bus.publish("orders.executed", {})
+        other = await bus.publish("orders.failed", {})
+        none = await bus.publish("trade.completed", {})
+        return first, second, other, none
+
+    first, second, other, none = run_async(main())
+    assert [r["delivered"] for r in (first, second, other, none)] == [1, 2, 1, 0]
+    assert seen == [
+        ("exact", "orders.executed"),
+        ("exact", "orders.executed"),
+        ("wild", "orders.executed"),
+        ("wild", "orders.failed"),
+    ]
+
+
+def test_single_handler_fast_path_keeps_retries_and_dlq(run_async):
+    bus = AsyncEventBus(max_attempts=2, backoff_base_ms=1)
+    calls, dead = [], []
+
+    async def flaky(evt):
+        calls.append(evt.payload["n"])
+        if evt.payload["n"] == 1 and calls.count(1) == 1:
+            raise RuntimeError("once")
+        if evt.payload["n"] == 2:
+            raise RuntimeError("always")
+
+    async def dlq(evt):
+        dead.append(evt.payload["original_topic"])
+
+    async def main():
+        bus.subscribe("t", flaky)
+        bus.subscribe_dlq(dlq)
+        ok = await bus.publish("t", {"n": 0})
+        retried = await bus.publish("t", {"n": 1})
+        failed = await bus.publish("t", {"n": 2})
+        await asyncio.sleep(0)
+        return ok, retried, failed
+
+    ok, retried, failed = run_async(main())
+    assert (ok["delivered"], retried["delivered"], failed["delivered"]) == (1, 1, 0)
+    assert calls == [0, 1, 1, 2, 2]
+    assert dead == ["t"]
+
+
+def test_queued_subscriber_does_not_delay_publisher_and_flushes_on_close(run_async):
+    bus = AsyncEventBus(delivery="queue")
+    got = []
+
+    async def slow(evt):
+        await asyncio.sleep(0.05)
+        got.append(evt.payload["n"])
+
+    async def main():
+        bus.subscribe("orders.executed", slow)
+        t0 = asyncio.get_running_loop().time()
+        for n in range(3):
+            await bus.publish("orders.executed", {"n": n})
+        elapsed = asyncio.get_running_loop().time() - t0
+        before_close = list(got)
+        await bus.stop()
+        return elapsed, before_close
+
+    elapsed, before_close = run_async(main())
+    assert elapsed < 0.05 and before_close == []
+    assert got == [0, 1, 2]
+
+
+def test_queue_overflow_policies(run_async):
+    bus = AsyncEventBus()
+    seen = {"drop_oldest": [], "drop_new": [], "block": []}
+
+    def collector(policy):
+        async def handler(evt):
+            seen[policy].append(evt.payload["n"])
+
+        handler.__name__ = policy
+        return handler
+
+    async def main():
+        for policy in seen:
+            bus.subscribe(policy, collector(policy), delivery="queue", queue_size=2, overflow=policy)
+        # воркеры не получают управление, пока издатель не уступит цикл — а block уступает
+        for policy in seen:
+            for n in range(4):
+                await bus.publish(policy, {"n": n})
+        await bus.close()
+
+    run_async(main())
+    assert seen["drop_oldest"] == [2, 3]
+    assert seen["drop_new"] == [0, 1]
+    assert seen["block"] == [0, 1, 2, 3]
+
+
+def test_default_overflow_is_lossless_except_lossy_topics(run_async):
+    bus = AsyncEventBus(delivery="queue", queue_size=2, lossy_topics=["balances.updated", "orch.cycle.*"])
+    seen = {"order.executed": [], "balances.updated": [], "orch.cycle.completed": []}
+
+    def collector(topic):
+        async def handler(evt):
+            seen[topic].append(evt.payload["n"])
+
+        return handler
+
+    async def main():
+        for topic in seen:
+            bus.subscribe(topic, collector(topic))
+        for topic in seen:
+            for n in range(4):
+                await bus.publish(topic, {"n": n})
+        await bus.close()
+
+    run_async(main())
+    assert seen["order.executed"] == [0, 1, 2, 3]
+    assert seen["balances.updated"] == [2, 3]
+    assert seen["orch.cycle.completed"] == [2, 3]
+
+
+def test_conflation_changed_suppresses_unchanged_state(run_async):
+    bus = AsyncEventBus()
+    got = []
+
+    async def handler(evt):
+        got.append((evt.payload["symbol"], evt.payload["free"]))
+
+    async def main():
+        bus.subscribe("balances.updated", handler)
+        bus.conflate("balances.updated", "changed")
+        return [
+            await bus.publish("balances.updated", {"symbol": s, "free": f, "trace_id": t})
+            for s, f, t in [("BTC", 1, "a"), ("BTC", 1, "b"), ("ETH", 1, "c"), ("BTC", 2, "d"), ("BTC", 2, "e")]
+        ]
+
+    results = run_async(main())
+    assert [bool(r.get("conflated")) for r in results] == [False, True, False, False, True]
+    assert got == [("BTC", 1), ("ETH", 1), ("BTC", 2)]
+
+
+def test_conflation_latest_delivers_last_value_of_window(run_async):
+    bus = AsyncEventBus()
+    got = []
+
+    async def handler(evt):
+        got.append(evt.payload["n"])
+
+    async def main():
+        bus.subscribe("position.updated", handler)
+        bus.conflate("position.updated", "latest", window_ms=30)
+        for n in range(4):
+            await bus.publish("position.updated", {"symbol": "BTC", "n": n})
+        await asyncio.sleep(0.15)  # с запасом: таймер окна может сработать позже под нагрузкой
+        after_window = list(got)
+        # окно истекло — следующее событие снова ведущее, а 5 ждёт конца нового окна
+        await bus.publish("position.updated", {"symbol": "BTC", "n": 4})
+        held = await bus.publish("position.updated", {"symbol": "BTC", "n": 5})
+        await bus.close()  # отложенное значение дописывается при остановке
+        return after_window, held
+
+    after_window, held = run_async(main())
+    assert after_window == [0, 3] and held["conflated"]
+    assert got == [0, 3, 4, 5]
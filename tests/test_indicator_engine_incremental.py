@@ -0,0 +1,133 @@
+import math
+import random
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle, FeaturePipeline
+from crypto_ai_bot.core.domain.signals.indicator_engine import IncrementalIndicatorEngine
+
+_TF_MS = 15 * 60_000
+
+
+def _series(n: int, seed: int = 7) -> list[Candle]:
+    rnd = random.Random(seed)
+    t0 = datetime(2024, 1, 1, tzinfo=UTC)
+    price = 100.0
+    out = []
+    for i in range(n):
+        o = price
+        c = max(1.0, o + rnd.uniform(-1.5, 1.6))
+        h = max(o, c) + rnd.uniform(0, 0.8)
+        lo = min(o, c) - rnd.uniform(0, 0.8)
+        out.append(Candle(
+            timestamp=t0 + timedelta(minutes=15 * i),
+            open=Decimal(str(round(o, 4))),
+            high=Decimal(str(round(h, 4))),
+            low=Decimal(str(round(lo, 4))),
+            close=Decimal(str(round(c, 4))),
+            volume=Decimal("10"),
+        ))
+        price = c
+    return out
+
+
+def _assert_same(a: dict, b: dict) -> None:
+    assert a.keys() == b.keys()
+    for k in a:
+        assert math.isclose(a[k], b[k], rel_tol=1e-9, abs_tol=1e-9), k
+
+
+@pytest.mark.parametrize("n", [1, 15, 36, 60, 250])
+def test_incremental_matches_full_recompute(n):
+    candles = _series(n)
+    closed_now = candles[-1].t_ms + _TF_MS  # все свечи закрыты
+
+    scalar = FeaturePipeline()._extract_timeframe_features(candles, "15m")
+    engine = IncrementalIndicatorEngine()
+    snap = engine.update("BTC/USDT", "15m", candles, now_ms=closed_now)
+    _assert_same(FeaturePipeline._features_from_snapshot(snap, "15m"), scalar)
+
+
+def test_incremental_streaming_with_forming_candle():
+    candles = _series(260)
+    engine = IncrementalIndicatorEngine()
+    fp = FeaturePipeline(engine=engine)
+
+    # история растёт по одной свече; последняя — формирующаяся
+    for end in range(220, 261):
+        window = candles[:end]
+        now = window[-1].t_ms + _TF_MS // 2
+        snap = engine.update("BTC/USDT", "15m", window, now_ms=now)
+        expected = fp._scalar_snapshot(window)
+        _assert_same(
+            FeaturePipeline._features_from_snapshot(snap, "15m"),
+            FeaturePipeline._features_from_snapshot(expected, "15m"),
+        )
+
+    # формирующаяся свеча не коммитится в состояние
+    state = engine._states[("BTC/USDT", "15m")]
+    assert state.last_ts_ms == candles[-2].t_ms
+
+
+def test_forming_candle_revision_does_not_leak():
+    candles = _series(80)
+    engine = IncrementalIndicatorEngine()
+    now = candles[-1].t_ms + 1
+
+    engine.update("ETH/USDT", "15m", candles, now_ms=now)
+    last = candles[-1]
+    revised = Candle(last.timestamp, last.open, last.high + 5, last.low, last.close + 3, last.volume)
+    snap = engine.update("ETH/USDT", "15m", [*candles[:-1], revised], now_ms=now)
+
+    expected = FeaturePipeline()._scalar_snapshot([*candles[:-1], revised])
+    _assert_same(
+        FeaturePipeline._features_from_snapshot(snap, "15m"),
+        FeaturePipeline._features_from_snapshot(expected, "15m"),
+    )
+
+
+def test_gap_triggers_rebuild_and_reset():
+    candles = _series(120)
+    engine = IncrementalIndicatorEngine()
+    far = candles[-1].t_ms + 10 * _TF_MS
+
+    engine.update("BTC/USDT", "15m", candles[:60], now_ms=far)
+    # разрыв: новые свечи не стыкуются с состоянием -> пересчёт с нуля
+    snap = engine.update("BTC/USDT", "15m", candles[80:], now_ms=far)
+    expected = FeaturePipeline()._scalar_snapshot(candles[80:])
+    _assert_same(
+        FeaturePipeline._features_from_snapshot(snap, "15m"),
+        FeaturePipeline._features_from_snapshot(expected, "15m"),
+    )
+
+    engine.update("ETH/USDT", "15m", candles, now_ms=far)
+    engine.reset(symbol="BTC/USDT")
+    assert len(engine) == 1
+
+
+def test_pipeline_uses_engine_only_with_symbol(ohlcv_15m):
+    engine = IncrementalIndicatorEngine()
+    fp = FeaturePipeline(engine=engine)
+
+    plain = fp.extract_features(ohlcv_15m=ohlcv_15m)
+    assert len(engine) == 0
+
+    fp.extract_features(ohlcv_15m=ohlcv_15m, symbol="BTC/USDT")
+    assert len(engine) == 1
+    assert "rsi14_15m" in plain
+
+
+def test_pipeline_from_settings_backend():
+    def _settings(backend):
+        return SimpleNamespace(technical=SimpleNamespace(INDICATOR_BACKEND=backend))
+
+    assert FeaturePipeline.from_settings(_settings("incremental")).engine is not None
+
+    fp = FeaturePipeline.from_settings(_settings("scalar"))
+    assert fp.engine is None and fp.backend == "scalar"
+
+    with pytest.raises(ValueError):
+        FeaturePipeline(backend="gpu")
@@ -0,0 +1,97 @@
+import math
+import random
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle, FeaturePipeline, TechnicalIndicators
+
+np = pytest.importorskip("numpy")
+
+from crypto_ai_bot.core.domain.signals.indicators_vectorized import (  # noqa: E402
+    VectorizedIndicators,
+    candles_to_columns,
+)
+
+
+def _series(n: int, seed: int = 11, flat: bool = False) -> list[Candle]:
+    rnd = random.Random(seed)
+    t0 = datetime(2024, 1, 1, tzinfo=UTC)
+    price = 250.0
+    out = []
+    for i in range(n):
+        o = price
+        c = o if flat else max(1.0, o + rnd.uniform(-3.0, 3.1))
+        h = max(o, c) + (0.0 if flat else rnd.uniform(0, 1.5))
+        lo = min(o, c) - (0.0 if flat else rnd.uniform(0, 1.5))
+        out.append(Candle(
+            timestamp=t0 + timedelta(hours=i),
+            open=Decimal(str(round(o, 4))),
+            high=Decimal(str(round(h, 4))),
+            low=Decimal(str(round(lo, 4))),
+            close=Decimal(str(round(c, 4))),
+            volume=Decimal("1"),
+        ))
+        price = c
+    return out
+
+
+def _close(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("n", [1, 14, 15, 20, 34, 35, 36, 60, 200, 257, 2000])
+def test_each_indicator_matches_scalar(n):
+    candles = _series(n)
+    high, low, close = candles_to_columns(candles)
+    closes = [c.c for c in candles]
+    ti, vi = TechnicalIndicators, VectorizedIndicators
+
+    for p in (1, 2, 20, 50):
+        assert _close(vi.ema(close, p), ti.ema(closes, p))
+    assert _close(vi.sma(close, 200), ti.sma(closes, 200))
+    assert _close(vi.rsi(close, 14), ti.rsi(closes, 14))
+    assert _close(vi.atr(high, low, close, 14), ti.atr(candles, 14))
+    for a, b in zip(vi.macd(close), ti.macd(closes), strict=False):
+        assert _close(a, b)
+    for a, b in zip(vi.bollinger_bands(close), ti.bollinger_bands(closes), strict=False):
+        assert _close(a, b)
+    for a, b in zip(vi.stochastic(high, low, close), ti.stochastic(candles), strict=False):
+        assert _close(a, b)
+
+
+def test_flat_market_edge_cases():
+    # нулевой диапазон: RSI=50, %K=50, ATR=0
+    candles = _series(80, flat=True)
+    high, low, close = candles_to_columns(candles)
+    assert VectorizedIndicators.rsi(close) == TechnicalIndicators.rsi([c.c for c in candles]) == 50.0
+    assert VectorizedIndicators.stochastic(high, low, close) == (50.0, 50.0)
+    assert VectorizedIndicators.atr(high, low, close) == 0.0
+
+
+def test_pipeline_numpy_backend_features_match_scalar(ohlcv_15m, ohlcv_1h):
+    scalar = FeaturePipeline().extract_features(ohlcv_15m=ohlcv_15m, ohlcv_1h=ohlcv_1h)
+    vector = FeaturePipeline(backend="numpy").extract_features(ohlcv_15m=ohlcv_15m, ohlcv_1h=ohlcv_1h)
+    assert scalar.keys() == vector.keys()
+    for k in scalar:
+        assert math.isclose(scalar[k], vector[k], rel_tol=1e-9, abs_tol=1e-9), k
+
+
+def test_snapshot_many_per_timeframe():
+    blocks = {"15m": candles_to_columns(_series(120, seed=1)), "1h": candles_to_columns(_series(40, seed=2))}
+    snaps = VectorizedIndicators.snapshot_many(blocks)
+    assert set(snaps) == {"15m", "1h"}
+    assert snaps["1h"].sma200 is None and snaps["15m"].ema50 is not None
+
+
+def test_frame_columns_are_zero_copy():
+    from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+
+    frame = OHLCVFrame.from_candles(_series(300))
+    high, low, close = candles_to_columns(frame[-250:])
+    assert not close.flags.owndata and len(close) == 250
+    assert _close(VectorizedIndicators.snapshot(high, low, close).rsi14,
+                  TechnicalIndicators.rsi(frame[-250:].closes(), 14))
@@ -0,0 +1,113 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from crypto_ai_bot.core.application.ports import BalanceDTO
+from crypto_ai_bot.core.infrastructure.brokers.paper import PaperBroker
+from crypto_ai_bot.core.infrastructure.market_data import hub as hub_mod
+from crypto_ai_bot.core.infrastructure.market_data.hub import MarketDataHub
+
+_SYMBOLS = [f"C{i}/USDT" for i in range(30)]
+
+
+class _Broker:
+    """Брокер без batch-методов: только fetch_ticker."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def fetch_ticker(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "last": 9.0}
+
+    async def fetch_open_orders(self, symbol):
+        return ["passthrough"]
+
+
+class _BatchBroker(_Broker):
+    """CcxtBroker-style: batch-тикеры и баланс аккаунта (ccxt-словарь) через брокера."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_calls: dict[str, int] = {}
+
+    def _hit(self, name: str) -> None:
+        self.batch_calls[name] = self.batch_calls.get(name, 0) + 1
+
+    async def fetch_tickers(self, symbols):
+        self._hit("fetch_tickers")
+        return {s: {"symbol": s, "bid": 1.0, "ask": 1.1, "last": 1.05} for s in symbols}
+
+    async def fetch_balances(self):
+        self._hit("fetch_balances")
+        return {"info": {}, "free": {"C1": 2}, "C1": {"free": 2, "used": 1}, "USDT": {"free": 100}}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.mono = 0
+
+    def __call__(self) -> int:
+        return self.mono
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(hub_mod, "monotonic_ms", c)
+    return c
+
+
+def test_one_batched_round_serves_all_symbols(clock, run_async):
+    broker = _BatchBroker()
+    hub = MarketDataHub(broker, _SYMBOLS, interval_sec=1.0)
+    view = hub.broker_view()
+    seen = []
+    hub.subscribe(seen.append)
+
+    async def main():
+        await hub.poll_once()
+        tickers = await asyncio.gather(*(view.fetch_ticker(s) for s in _SYMBOLS))
+        bal = await view.fetch_balance("C1/USDT")
+        orders = await view.fetch_open_orders("C1/USDT")
+        return tickers, bal, orders
+
+    tickers, bal, orders = run_async(main())
+    assert broker.batch_calls == {"fetch_tickers": 1, "fetch_balances": 1}
+    assert broker.calls == 0
+    assert [t["symbol"] for t in tickers] == _SYMBOLS
+    assert bal == {"free_base": Decimal("2"), "free_quote": Decimal("100")}
+    assert orders == ["passthrough"]
+    assert len(seen) == 1 and set(seen[0].tickers) == set(_SYMBOLS)
+    assert set(seen[0].balance) == {"C1", "USDT"}
+    assert seen[0].balance["C1"] == BalanceDTO("C1", Decimal("2"), Decimal("1"), Decimal("3"))
+
+
+def test_stale_snapshot_falls_back_to_broker(clock, run_async):
+    hub = MarketDataHub(_BatchBroker(), ["C1/USDT"], interval_sec=1.0)
+    view = hub.broker_view()
+    run_async(hub.poll_once())
+    clock.mono += 2_001  # старше 2 x interval
+    assert run_async(view.fetch_ticker("C1/USDT")) == {"symbol": "C1/USDT", "last": 9.0}
+
+
+def test_without_batch_method_polls_concurrently(clock, run_async):
+    broker = _Broker()
+    hub = MarketDataHub(broker, ["A/USDT", "B/USDT"], poll_balance=False)
+    snap = run_async(hub.poll_once())
+    assert broker.calls == 2 and set(snap.tickers) == {"A/USDT", "B/USDT"}
+
+
+def test_paper_broker_balance_dtos_are_served(clock, run_async):
+    broker = PaperBroker(initial_assets={"BTC": Decimal("0.5")})
+    hub = MarketDataHub(broker, ["BTC/USDT"])
+    view = hub.broker_view()
+
+    async def main():
+        await hub.poll_once()
+        return await view.fetch_balance(), await view.fetch_balance("BTC/USDT")
+
+    full, per_symbol = run_async(main())
+    assert full["BTC"].free == Decimal("0.5")
+    assert per_symbol == {"free_base": Decimal("0.5"), "free_quote": Decimal("10000.0")}
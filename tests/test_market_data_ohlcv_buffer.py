@@ -0,0 +1,131 @@
+from typing import Any
+
+import pytest
+
+from crypto_ai_bot.core.infrastructure.market_data import ccxt_market_data as cmd
+from crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data import CCXTMarketData
+
+_TF = 15 * 60_000
+_T0 = 1_700_000_100_000 // _TF * _TF
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = _T0 + 300 * _TF + 60_000  # внутри 301-го бара
+        self.mono = 0
+
+    def now_ms(self) -> int:
+        return self.now
+
+    def monotonic_ms(self) -> int:
+        return self.mono
+
+
+class _FakeExchange:
+    """Биржа со свечами до текущего (формирующегося) бара включительно."""
+
+    def __init__(self, clock: _Clock) -> None:
+        self.clock = clock
+        self.calls: list[dict[str, Any]] = []
+        self.bump = 0.0  # меняет close формирующегося бара
+
+    def _bars(self) -> list[list[float]]:
+        last = self.clock.now // _TF * _TF
+        out = []
+        t = _T0
+        while t <= last:
+            i = (t - _T0) // _TF
+            close = 100.0 + i + (self.bump if t == last else 0.0)
+            out.append([t, 100.0 + i, close + 1, 99.0 + i, close, 1.0])
+            t += _TF
+        return out
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "15m", since: int | None = None, limit: int | None = None):
+        self.calls.append({"since": since, "limit": limit})
+        bars = self._bars()
+        if since is not None:
+            bars = [b for b in bars if b[0] >= since]
+            return bars[:limit] if limit else bars
+        return bars[-limit:] if limit else bars
+
+
+class _Broker:
+    def __init__(self, ex: _FakeExchange) -> None:
+        self.exchange = ex
+
+
+@pytest.fixture
+def env(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cmd, "now_ms", clock.now_ms)
+    monkeypatch.setattr(cmd, "monotonic_ms", clock.monotonic_ms)
+    ex = _FakeExchange(clock)
+    md = CCXTMarketData(_Broker(ex), cache_ttl_sec=30, ohlcv_capacity=500)
+    return clock, ex, md
+
+
+def test_backfill_then_serve_any_limit_from_buffer(env, run_async):
+    clock, ex, md = env
+    f200 = run_async(md.get_ohlcv("BTC/USDT", "15m", limit=200))
+    assert len(f200) == 200 and len(ex.calls) == 1
+
+    # меньший limit — из буфера, без запроса
+    f50 = run_async(md.get_ohlcv("BTC/USDT", "15m", limit=50))
+    assert len(ex.calls) == 1
+    assert f50.to_rows() == f200[-50:].to_rows()
+    assert f50.last_ts_ms == clock.now // _TF * _TF  # формирующийся бар в конце
+
+
+def test_delta_fetch_uses_since_and_replaces_forming_bar(env, run_async):
+    clock, ex, md = env
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=100))
+    last_closed_before = md._ohlcv[("BTC/USDT", "15m")].last_closed_ts
+
+    # TTL истёк, прошло 2 бара; формирующийся бар изменился
+    clock.mono += 31_000
+    clock.now += 2 * _TF
+    ex.bump = 0.5
+    frame = run_async(md.get_ohlcv("BTC/USDT", "15m", limit=100))
+
+    call = ex.calls[-1]
+    assert call["since"] == last_closed_before
+    assert call["limit"] <= 5
+    assert frame.to_rows() == [tuple(b) for b in ex._bars()[-100:]]
+
+
+def test_larger_limit_triggers_backfill_once(env, run_async):
+    clock, ex, md = env
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=50))
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=150))
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=120))
+    assert len(ex.calls) == 2
+    assert ex.calls[-1]["since"] is None and ex.calls[-1]["limit"] == 150
+
+
+def test_short_history_and_limit_above_capacity(env, run_async):
+    clock, ex, md = env
+    # на бирже всего 301 бар: история полная, повторно не дозапрашиваем
+    f = run_async(md.get_ohlcv("BTC/USDT", "15m", limit=400))
+    assert len(f) == 301
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=400))
+    assert len(ex.calls) == 1
+
+    # больше ёмкости буфера — прямой запрос
+    run_async(md.get_ohlcv("BTC/USDT", "15m", limit=600))
+    assert ex.calls[-1]["limit"] == 600
+
+
+def test_ring_buffer_keeps_old_frames_intact():
+    from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+    from crypto_ai_bot.core.infrastructure.market_data.ohlcv_buffer import OHLCVRingBuffer
+
+    buf = OHLCVRingBuffer(_TF, capacity=10)
+    rows = [[_T0 + i * _TF, 1.0, 2.0, 0.5, float(i), 1.0] for i in range(40)]
+    buf.merge(OHLCVFrame.from_rows(rows[:10]), now_ms=_T0 + 100 * _TF)
+    old = buf.frame(10)
+    snapshot = old.to_rows()
+    for i in range(10, 40):
+        buf.merge(OHLCVFrame.from_rows(rows[i:i + 1]), now_ms=_T0 + 100 * _TF)
+    assert old.to_rows() == snapshot
+    assert buf.closed_count == 10
+    assert buf.frame(3).closes() == [37.0, 38.0, 39.0]
@@ -0,0 +1,183 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from crypto_ai_bot.core.infrastructure.market_data import ccxt_market_data as cmd, streaming as smd
+from crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data import CCXTMarketData
+from crypto_ai_bot.core.infrastructure.market_data.streaming import StreamingMarketData
+
+_TF = 60_000
+_T0 = 1_700_000_000_000 // _TF * _TF
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = _T0 + 50 * _TF + 10_000  # внутри 51-го бара
+        self.mono = 0
+
+    def now_ms(self) -> int:
+        return self.now
+
+    def monotonic_ms(self) -> int:
+        return self.mono
+
+
+def _bar(i: int, close: float | None = None) -> list[float]:
+    c = 100.0 + i if close is None else close
+    return [_T0 + i * _TF, 100.0 + i, c + 1, c - 1, c, 1.0]
+
+
+class _FakeServer:
+    """Локальный push-сервер в стиле ccxt.pro: watch_* ждёт следующее сообщение канала."""
+
+    def __init__(self, clock: _Clock) -> None:
+        self.clock = clock
+        self.channels: dict[str, asyncio.Queue] = {}
+        self.rest_calls: list[dict[str, Any]] = []
+
+    def _q(self, ch: str) -> asyncio.Queue:
+        return self.channels.setdefault(ch, asyncio.Queue())
+
+    def push(self, ch: str, msg: Any) -> None:
+        self._q(ch).put_nowait(msg)
+
+    def drop(self, ch: str) -> None:
+        self._q(ch).put_nowait(ConnectionError("socket closed"))
+
+    async def _next(self, ch: str) -> Any:
+        msg = await self._q(ch).get()
+        if isinstance(msg, Exception):
+            raise msg
+        return msg
+
+    # ---- ws ----
+    async def watch_ticker(self, symbol):
+        return await self._next("ticker")
+
+    async def watch_order_book(self, symbol, limit=None):
+        return await self._next("book")
+
+    async def watch_ohlcv(self, symbol, timeframe="1m"):
+        return await self._next("ohlcv")
+
+    # ---- rest ----
+    async def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None):
+        self.rest_calls.append({"fn": "ohlcv", "since": since, "limit": limit})
+        last = self.clock.now // _TF * _TF
+        bars = [_bar(i) for i in range((last - _T0) // _TF + 1)]
+        if since is not None:
+            bars = [b for b in bars if b[0] >= since]
+            return bars[:limit]
+        return bars[-limit:]
+
+    async def fetch_ticker(self, symbol):
+        self.rest_calls.append({"fn": "ticker"})
+        return {"bid": 1.0, "ask": 2.0, "last": 1.5}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    clock = _Clock()
+    for mod in (cmd, smd):
+        monkeypatch.setattr(mod, "now_ms", clock.now_ms)
+        monkeypatch.setattr(mod, "monotonic_ms", clock.monotonic_ms)
+    server = _FakeServer(clock)
+    rest = CCXTMarketData(SimpleNamespace(exchange=server))
+    md = StreamingMarketData(server, rest, ohlcv_capacity=200, max_stale_sec=5, reconnect_min_sec=0)
+    md.subscribe("BTC/USDT", timeframes=("1m",))
+    return clock, server, md
+
+
+async def _settle() -> None:
+    await asyncio.sleep(0.01)
+
+
+def test_reads_are_served_from_pushed_state(env, run_async):
+    clock, server, md = env
+
+    async def main():
+        await md.start()
+        await _settle()
+        server.push("ticker", {"bid": 99.0, "ask": 101.0, "last": 100.0})
+        server.push("book", {"bids": [[99.0, 1.0], [98.0, 2.0]], "asks": [[101.0, 1.0]], "timestamp": 1})
+        server.push("ohlcv", [_bar(50, close=155.0)])
+        await _settle()
+        res = (
+            await md.get_ticker("BTC/USDT"),
+            await md.get_orderbook("BTC/USDT", limit=1),
+            await md.get_ohlcv("BTC/USDT", "1m", limit=30),
+        )
+        await md.stop()
+        return res
+
+    ticker, book, frame = run_async(main())
+    assert ticker.last == 100
+    assert book["bids"] == [[99.0, 1.0]]
+    assert len(frame) == 30 and frame.closes()[-1] == 155.0
+    # REST: только начальный backfill свечей
+    assert server.rest_calls == [{"fn": "ohlcv", "since": None, "limit": 200}]
+
+
+def test_gap_and_reconnect_resync_via_rest_delta(env, run_async):
+    clock, server, md = env
+
+    async def main():
+        await md.start()
+        await _settle()
+        # прошло 3 бара, стрим прислал только формирующийся — дырка
+        clock.now += 3 * _TF
+        server.push("ohlcv", [_bar(53)])
+        await _settle()
+        gap_call = server.rest_calls[-1]
+        frame = await md.get_ohlcv("BTC/USDT", "1m", limit=5)
+
+        server.drop("ohlcv")
+        await _settle()
+        reconnect_call = server.rest_calls[-1]
+        await md.stop()
+        return gap_call, reconnect_call, frame
+
+    gap_call, reconnect_call, frame = run_async(main())
+    assert gap_call["since"] == _T0 + 49 * _TF
+    assert reconnect_call["since"] is not None and len(server.rest_calls) == 3
+    assert [r[0] for r in frame.to_rows()] == [_T0 + i * _TF for i in range(49, 54)]
+
+
+def test_silent_stream_falls_back_to_rest(env, run_async):
+    clock, server, md = env
+
+    async def main():
+        await md.start()
+        server.push("ticker", {"bid": 99.0, "ask": 101.0, "last": 100.0})
+        await _settle()
+        clock.mono += 6_000  # дольше max_stale_sec
+        t = await md.get_ticker("BTC/USDT")
+        await md.stop()
+        return t
+
+    t = run_async(main())
+    assert t.last == 1.5 and {"fn": "ticker"} in server.rest_calls
+
+
+def test_single_bar_push_after_rollover_closes_forming_bar(env, run_async):
+    clock, server, md = env
+
+    async def main():
+        await md.start()
+        await _settle()
+        calls = len(server.rest_calls)
+        # новый бар начался 1 с назад (внутри grace): стрим прислал только его
+        clock.now = _T0 + 51 * _TF + 1_000
+        server.push("ohlcv", [_bar(51)])
+        await _settle()
+        buf = md._candles[("BTC/USDT", "1m")]
+        frame = await md.get_ohlcv("BTC/USDT", "1m", limit=3)
+        await md.stop()
+        return calls, buf.last_closed_ts, frame
+
+    calls, last_closed, frame = run_async(main())
+    assert len(server.rest_calls) == calls  # ни resync, ни переподключения
+    assert last_closed == _T0 + 50 * _TF
+    assert [r[0] for r in frame.to_rows()] == [_T0 + i * _TF for i in range(49, 52)]
@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+from crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data import CCXTMarketData
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 100.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _Exchange:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.last = 100.0
+        self.release = asyncio.Event()
+
+    async def fetch_ticker(self, symbol):
+        self.calls += 1
+        if self.calls > 1:
+            await self.release.wait()  # «тормозящая» биржа
+        return {"bid": self.last - 0.5, "ask": self.last + 0.5, "last": self.last}
+
+    async def fetch_order_book(self, symbol, limit=20):
+        self.calls += 1
+        return {"bids": [[self.last, 1.0]], "asks": [[self.last + 1, 1.0]]}
+
+
+def _md(ex, grace):
+    md = CCXTMarketData(SimpleNamespace(exchange=ex), cache_ttl_sec=1.0, stale_grace_sec=grace)
+    clock = _Clock()
+    md._cache._clock = clock
+    return md, clock
+
+
+def test_stale_ticker_served_immediately_and_refreshed_in_background(run_async):
+    ex = _Exchange()
+    md, clock = _md(ex, grace=5.0)
+
+    async def main():
+        t0, age0 = await md.get_ticker_with_age("BTC/USDT")
+        assert age0 == 0 and t0.last == 100
+
+        clock.t += 1.5  # истёк, но в пределах grace
+        ex.last = 101.0
+        t1, age1 = await md.get_ticker_with_age("BTC/USDT")
+        t2, _ = await md.get_ticker_with_age("BTC/USDT")
+        assert t1.last == t2.last == 100 and age1 == 1500
+        await asyncio.sleep(0.005)
+        assert ex.calls == 2  # один фоновый refresh на оба чтения
+
+        ex.release.set()
+        await asyncio.sleep(0.01)
+        t3, age3 = await md.get_ticker_with_age("BTC/USDT")
+        return t3, age3
+
+    t3, age3 = run_async(main())
+    assert t3.last == 101 and age3 == 0
+
+
+def test_past_grace_window_blocks_on_fetch(run_async):
+    ex = _Exchange()
+    md, clock = _md(ex, grace=0.5)
+
+    async def main():
+        await md.get_orderbook("BTC/USDT")
+        clock.t += 2.0
+        ex.last = 105.0
+        return await md.get_orderbook_with_age("BTC/USDT")
+
+    book, age = run_async(main())
+    assert book["bids"][0][0] == 105.0 and age == 0 and ex.calls == 2
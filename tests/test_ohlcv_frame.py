@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from crypto_ai_bot.core.domain.signals.feature_pipeline import Candle, FeaturePipeline
+from crypto_ai_bot.core.domain.signals.ohlcv import OHLCVFrame
+
+_ROWS = [
+    [1_700_000_000_000 + i * 900_000, 100.0 + i, 101.5 + i, 99.0 + i, 100.5 + i, 10.0 + i]
+    for i in range(50)
+]
+
+
+def test_from_rows_skips_malformed():
+    rows = [*_ROWS[:3], None, [1, 2, 3], ["x", 1, 1, 1, 1, 1], [_ROWS[3][0], "1.5", 2, 1, 1.5, None]]
+    f = OHLCVFrame.from_rows(rows)
+    assert len(f) == 4
+    assert f[-1].v == 0.0 and f[-1].o == 1.5
+
+
+def test_row_view_is_candle_and_tuple_compatible():
+    f = OHLCVFrame.from_rows(_ROWS)
+    row = f[5]
+    # Candle API
+    assert row.c == 105.5 and row.h == 106.5 and row.t_ms == _ROWS[5][0]
+    assert str(row.close) == "105.5"
+    assert row.timestamp.tzinfo is not None
+    assert isinstance(row.to_candle(), Candle)
+    # CCXT-строка: распаковка как в стратегиях
+    ts, o, h, lo, c, v = row
+    assert (ts, o, h, lo, c, v) == tuple(_ROWS[5])
+    assert row[1:5] == (105.0, 106.5, 104.0, 105.5)
+
+
+def test_slicing_is_zero_copy():
+    f = OHLCVFrame.from_rows(_ROWS)
+    tail = f[-10:]
+    assert len(tail) == 10
+    assert tail._c is f._c  # общие массивы
+    assert tail[0].c == f[40].c
+    assert list(tail.close) == f.closes()[-10:]
+    assert len(f[10:5]) == 0
+    assert len(f[::2]) == 25
+    with pytest.raises(IndexError):
+        f[50]
+
+
+def test_memory_footprint_and_roundtrip():
+    f = OHLCVFrame.from_rows(_ROWS)
+    assert f.nbytes == 50 * 48
+    assert f.to_rows() == [tuple(r) for r in _ROWS]
+    again = OHLCVFrame.from_candles(f.to_candles())
+    assert again.to_rows() == f.to_rows()
+
+
+def test_feature_pipeline_accepts_frame(ohlcv_15m):
+    frame = OHLCVFrame.from_candles(ohlcv_15m)
+    a = FeaturePipeline().extract_features(ohlcv_15m=ohlcv_15m)
+    b = FeaturePipeline().extract_features(ohlcv_15m=frame)
+    assert a.keys() == b.keys()
+    for k in a:
+        assert math.isclose(a[k], b[k], rel_tol=1e-12), k
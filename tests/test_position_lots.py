@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from crypto_ai_bot.core.infrastructure.storage.repositories import trades as trades_mod
+from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository
+from crypto_ai_bot.core.infrastructure.storage.repositories.positions import PositionsRepository
+from crypto_ai_bot.utils.pnl import fifo_detail
+
+_DAY = 86_400_000
+_D1 = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+_D2 = _D1 + _DAY
+
+_FILLS = [
+    ("buy", "1.0", "100", "0.1", _D1 + 1_000),
+    ("buy", "2.0", "110", "0.2", _D1 + 2_000),
+    ("sell", "1.5", "120", "0.15", _D1 + 3_000),  # целиком 1-й лот + половина 2-го
+    ("buy", "0.5", "90", "0", _D2 + 1_000),
+    ("sell", "1.2", "130", "0.12", _D2 + 2_000),
+]
+
+
+def test_incremental_ledger_matches_full_fifo_replay(conn, fill_trades):
+    fill_trades(_FILLS)
+    lots = LotsRepository(conn)
+
+    expected = fifo_detail(
+        [{"side": s, "amount": q, "price": p, "fee_quote": f, "ts_ms": ts} for s, q, p, f, ts in _FILLS]
+    )
+    t = lots.totals("BTC/USDT")
+    assert t.base_qty == expected["remaining_base"] == Decimal("0.8")
+    assert t.realized_quote == expected["realized_quote"]
+    assert lots.open_lots("BTC/USDT") == [(q, p) for q, p in expected["lots"]]
+    assert lots.verify() == {}
+
+
+def test_realized_pnl_is_bucketed_by_utc_day(conn, monkeypatch, fill_trades):
+    trades = fill_trades(_FILLS)
+    # день 1: 1.0*(120-100.1) + 0.5*(120-110.1) - 0.15
+    assert LotsRepository(conn).realized_for_day("BTC/USDT", "2023-11-15") == Decimal("24.70")
+    monkeypatch.setattr(trades_mod, "now_ms", lambda: _D2 + 5_000)
+    # день 2: 1.2 из остатка 2-го лота: 1.2*(130-110.1) - 0.12
+    assert trades.pnl_today_quote("BTC/USDT") == Decimal("23.760")
+
+
+def test_positions_read_ledger_and_out_of_order_fill_rebuilds(conn, fill_trades):
+    fill_trades(_FILLS[:2] + _FILLS[3:])
+    # опоздавшее исполнение из прошлого: книга символа пересобирается из trades
+    fill_trades([_FILLS[2]])
+    lots = LotsRepository(conn)
+    assert lots.verify("BTC/USDT") == {}
+
+    positions = PositionsRepository(conn)
+    positions.apply_trade(
+        symbol="BTC/USDT", side="buy", base_amount=Decimal("0"), price=Decimal("140"), last_price=Decimal("140")
+    )
+    pos = positions.get_position("BTC/USDT")
+    t = lots.totals("BTC/USDT")
+    assert pos.base_qty == Decimal("0.8") and pos.realized_pnl == t.realized_quote
+    assert pos.unrealized_pnl == (Decimal("140") - t.avg_entry_price) * Decimal("0.8")
+
+
+def test_ledger_is_built_lazily_for_existing_trades(conn, fill_trades):
+    fill_trades(_FILLS)
+    conn.execute("DELETE FROM lot_totals")
+    conn.execute("DELETE FROM position_lots")
+    lots = LotsRepository(conn)
+    assert lots.verify() == {"BTC/USDT": "no ledger"}
+    assert lots.ensure("BTC/USDT").base_qty == Decimal("0.8")
+    assert lots.verify() == {}
+
+
+def test_unfilled_orders_do_not_touch_the_book(conn, fill_trades, make_order):
+    trades = fill_trades(_FILLS[:2])
+    for side in ("buy", "sell"):
+        cancelled = make_order(side, "5.0", "100", "0", _D1 + 2_500)
+        cancelled["filled"] = Decimal("0")
+        trades.add_from_order(cancelled)
+    lots = LotsRepository(conn)
+    t = lots.totals("BTC/USDT")
+    assert t.base_qty == Decimal("3.0") and t.realized_quote == 0
+    replayed, _, _ = lots.replay("BTC/USDT")
+    assert replayed.base_qty == Decimal("3.0") and replayed.realized_quote == 0
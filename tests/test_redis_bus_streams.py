@@ -0,0 +1,224 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("redis")
+
+from crypto_ai_bot.core.infrastructure.events import redis_bus as rb
+from crypto_ai_bot.core.infrastructure.events.redis_bus import RedisEventBus
+
+_URL = os.getenv("TEST_REDIS_URL", "")
+
+
+@pytest.fixture
+def redis_url(monkeypatch):
+    """Локальный Redis из TEST_REDIS_URL, иначе fakeredis (один сервер на тест)."""
+    if _URL:
+        return _URL
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        rb.Redis,
+        "from_url",
+        classmethod(lambda cls, url, **kw: fakeredis.aioredis.FakeRedis(server=server, **kw)),
+    )
+    return "redis://fake"
+
+
+def _bus(url, **kw):
+    kw.setdefault("channel_prefix", f"test-{uuid.uuid4().hex[:8]}")
+    return RedisEventBus(url, mode="streams", block_ms=50, batch_ms=1, **kw)
+
+
+async def _wait_for(cond, within_s=3.0):
+    deadline = asyncio.get_running_loop().time() + within_s
+    while not cond():
+        assert asyncio.get_running_loop().time() < deadline, "timeout"
+        await asyncio.sleep(0.02)
+
+
+def test_events_published_before_consumer_are_delivered_and_acked(redis_url, run_async):
+    async def main():
+        producer = _bus(redis_url)
+        await asyncio.gather(*(producer.publish("orders.executed", {"n": n}) for n in range(5)))
+
+        got = []
+        consumer = _bus(redis_url, channel_prefix=producer._prefix, start_id="0")
+
+        async def handler(payload):
+            got.append(payload["n"])
+
+        consumer.on("orders.executed", handler)
+        await consumer.start()
+        await _wait_for(lambda: len(got) == 5)
+        stream = consumer._full_topic("orders.executed")
+        pending = await consumer._r.xpending(stream, consumer._group)
+        await consumer.stop()
+        await producer.stop()
+        return got, pending
+
+    got, pending = run_async(main())
+    assert got == [0, 1, 2, 3, 4]
+    assert pending["pending"] == 0
+
+
+def test_failed_message_is_reclaimed_and_replay_reads_history(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url, start_id="0", claim_idle_ms=50)
+        attempts, replayed = [], []
+
+        async def flaky(payload):
+            attempts.append(payload["n"])
+            if len(attempts) == 1:
+                raise RuntimeError("first delivery fails")
+
+        bus.on_wildcard("orders.*", flaky)
+        await bus.publish("orders.executed", {"n": 1})
+        await bus.start()
+        await _wait_for(lambda: len(attempts) >= 2)
+        await bus.stop()
+
+        async def collect(payload):
+            replayed.append(payload["n"])
+
+        history = _bus(redis_url, channel_prefix=bus._prefix)
+        history.on("orders.executed", collect)
+        count = await history.replay("orders.executed", "0")
+        await history.stop()
+        return attempts, count, replayed
+
+    attempts, count, replayed = run_async(main())
+    assert attempts[:2] == [1, 1]
+    assert count == 1 and replayed == [1]
+
+
+def test_poison_message_moves_to_dead_letter_after_max_deliveries(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url, start_id="0", claim_idle_ms=30, max_deliveries=2)
+        attempts = []
+
+        async def broken(payload):
+            attempts.append(payload["n"])
+            raise RuntimeError("always fails")
+
+        bus.on("orders.executed", broken)
+        await bus.publish("orders.executed", {"n": 7})
+        await bus.start()
+        dlq = bus._full_topic("__dlq__")
+
+        async def dead_lettered():
+            return await bus._r.xlen(dlq)
+
+        deadline = asyncio.get_running_loop().time() + 3.0
+        while not await dead_lettered():
+            assert asyncio.get_running_loop().time() < deadline, "timeout"
+            await asyncio.sleep(0.02)
+        pending = await bus._r.xpending(bus._full_topic("orders.executed"), bus._group)
+        entry = (await bus._r.xrange(dlq))[0][1]
+        await bus.stop()
+        return attempts, pending, entry
+
+    attempts, pending, entry = run_async(main())
+    assert attempts == [7, 7]
+    assert pending["pending"] == 0
+    assert entry["stream"].endswith("orders.executed") and entry["deliveries"] == "3"
+
+
+def test_dead_letter_counts_every_reclaimed_id(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url, start_id="0", claim_idle_ms=30, max_deliveries=1)
+        bus._r = bus._client()
+        stream = bus._full_topic("orders.executed")
+        # одна миллисекунда, 12 последовательностей: "1700-10" < "1700-9" как строки
+        for n in range(12):
+            await bus._r.xadd(stream, {"data": bus._codec.dumps({"key": None, "payload": {"n": n}})}, id=f"1700-{n}")
+
+        attempts = []
+
+        async def broken(payload):
+            attempts.append(payload["n"])
+            raise RuntimeError("always fails")
+
+        bus.on("orders.executed", broken)
+        await bus.start()
+        dlq = bus._full_topic("__dlq__")
+        deadline = asyncio.get_running_loop().time() + 3.0
+        while await bus._r.xlen(dlq) < 12:
+            assert asyncio.get_running_loop().time() < deadline, "timeout"
+            await asyncio.sleep(0.02)
+        pending = await bus._r.xpending(stream, bus._group)
+        ids = sorted(entry[1]["id"] for entry in await bus._r.xrange(dlq))
+        await bus.stop()
+        return attempts, pending, ids
+
+    attempts, pending, ids = run_async(main())
+    # max_deliveries=1: первая доставка — обработчику, первый reclaim — сразу в dead-letter
+    assert sorted(attempts) == list(range(12))
+    assert pending["pending"] == 0
+    assert ids == sorted(f"1700-{n}" for n in range(12))
+
+
+def test_consumer_survives_xack_failure(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url)
+        got = []
+
+        async def handler(payload):
+            got.append(payload["n"])
+
+        bus.on("orders.executed", handler)
+        await bus.start()
+        xack = bus._r.xack
+        failures = []
+
+        async def flaky_xack(*args):
+            if not failures:
+                failures.append(args)
+                raise ConnectionError("redis blip")
+            return await xack(*args)
+
+        bus._r.xack = flaky_xack
+        await bus.publish("orders.executed", {"n": 1})
+        await _wait_for(lambda: got == [1] and failures)
+        await bus.publish("orders.executed", {"n": 2})
+        await _wait_for(lambda: 2 in got, within_s=5.0)  # после ошибки цикл ждёт 1 с
+        alive = not bus._listen_task.done()
+        await bus.stop()
+        return got, alive
+
+    got, alive = run_async(main())
+    assert got[:2] == [1, 2]
+    assert alive
+
+
+def test_stream_publish_failure_is_raised(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url)
+        bus._r = bus._client()
+
+        def broken_pipeline(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        bus._r.pipeline = broken_pipeline
+        with pytest.raises(ConnectionError):
+            await bus.publish("orders.executed", {"n": 1})
+        await bus.stop()
+
+    run_async(main())
+
+
+def test_conflated_topic_writes_only_changes(redis_url, run_async):
+    async def main():
+        bus = _bus(redis_url)
+        bus.conflate("balances.updated", "changed")
+        for free in (1, 1, 2, 2):
+            await bus.publish("balances.updated", {"symbol": "BTC", "free": free})
+        r = bus._client()
+        length = await r.xlen(bus._full_topic("balances.updated"))
+        await r.aclose()
+        await bus.stop()
+        return length
+
+    assert run_async(main()) == 2
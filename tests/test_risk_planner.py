@@ -0,0 +1,119 @@
+import asyncio
+import time
+from datetime import UTC
+from decimal import Decimal
+
+from crypto_ai_bot.core.domain.risk.manager import (
+    CooldownRule,
+    DailyLossRule,
+    LossStreakRule,
+    RiskAction,
+    RiskConfig,
+    RiskManager,
+    RiskRuleType,
+)
+from crypto_ai_bot.core.domain.risk.planner import RulePlanner
+from crypto_ai_bot.core.domain.risk.windows import RiskWindows
+
+_SYM = "BTC/USDT"
+
+
+def test_planner_orders_by_cost_over_block_probability():
+    planner = RulePlanner()
+    slow, cheap, never = DailyLossRule(Decimal("1")), LossStreakRule(1), CooldownRule(1)
+    assert planner.order([slow, cheap, never]) == [slow, cheap, never]  # без наблюдений — заявленный порядок
+
+    for _ in range(10):
+        planner.record(slow, 50.0, blocked=True)
+        planner.record(cheap, 1.0, blocked=True)
+        planner.record(never, 1.0, blocked=False)
+    assert planner.order([slow, never, cheap]) == [cheap, never, slow]
+
+
+class _Trades:
+    def __init__(self):
+        self.cancelled = []
+
+    async def _slow(self, name):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        return Decimal("0")
+
+    async def get_loss_streak(self, symbol):
+        await asyncio.sleep(0.01)
+        return 5
+
+    def get_daily_pnl(self, symbol):
+        return self._slow("daily_pnl")
+
+    def calculate_drawdown_pct(self, symbol):
+        return self._slow("drawdown_pct")
+
+    async def list_today(self, symbol):
+        self.listed = True
+        return []
+
+
+def test_assess_returns_on_first_block_and_cancels_outstanding(run_async):
+    manager = RiskManager(RiskConfig())
+    trades = _Trades()
+
+    async def go():
+        t0 = time.perf_counter()
+        result = await manager.assess(_SYM, "buy", Decimal("10"), "t", trades_repo=trades)
+        elapsed = time.perf_counter() - t0
+        await asyncio.sleep(0)  # отмена доставляется на следующем шаге цикла
+        return result, elapsed
+
+    result, elapsed = run_async(go())
+    assert result.action == RiskAction.BLOCK
+    assert result.triggered_rule == RiskRuleType.LOSS_STREAK
+    assert elapsed < 0.5
+    assert sorted(trades.cancelled) == ["daily_pnl", "drawdown_pct"]
+    assert manager.planner.stats(manager.critical_rules[0]).blocks == 1
+    # отменённые правила получают оценку стоимости снизу, исход не засчитывается
+    daily = manager.planner.stats(DailyLossRule(Decimal("1")))
+    assert daily.cost_ms >= 10.0 and daily.runs == 0
+    # soft/monitoring правила после BLOCK не запускаются
+    assert not getattr(trades, "listed", False)
+
+
+def test_assess_blocks_from_windows_without_io(run_async):
+    class _NoRepo:
+        def __getattr__(self, name):
+            def call(*args, **kwargs):
+                raise AssertionError(f"repo called: {name}")
+
+            return call
+
+    windows = RiskWindows()
+    windows.hydrate(_SYM, [(int(time.time() * 1000) - 60_000, 3, Decimal("100"))])
+    manager = RiskManager(RiskConfig(max_orders_per_day=3), windows=windows)
+    result = run_async(manager.assess(_SYM, "buy", Decimal("10"), "t", trades_repo=_NoRepo()))
+    assert result.action == RiskAction.BLOCK
+    assert result.triggered_rule == RiskRuleType.BUDGET_ORDERS
+
+
+def test_assess_matches_check_trade_without_block(run_async):
+    now_ms = int(time.time() * 1000)
+
+    class _SyncTrades:
+        def list_today(self, symbol):
+            return [{"symbol": symbol, "side": "buy", "ts_ms": now_ms - 5_000}]
+
+        def get_last_trade_time(self, symbol):
+            from datetime import datetime
+
+            return datetime.fromtimestamp((now_ms - 5_000) / 1000, tz=UTC)
+
+        def get_loss_streak(self, symbol):
+            return 0
+
+    manager = RiskManager(RiskConfig())
+    by_assess = run_async(manager.assess(_SYM, "buy", Decimal("10"), "t", trades_repo=_SyncTrades()))
+    by_check = manager.check_trade(_SYM, "buy", Decimal("10"), "t", trades_repo=_SyncTrades())
+    assert by_assess.action == by_check.action == RiskAction.REDUCE
+    assert by_assess.metadata["reduction_pct"] == by_check.metadata["reduction_pct"]
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from decimal import Decimal
+
+from crypto_ai_bot.core.domain.risk import snapshot as snapshot_mod
+from crypto_ai_bot.core.domain.risk.manager import RiskAction, RiskConfig, RiskManager, RiskRuleType
+from crypto_ai_bot.core.domain.risk.rules.cooldown import CooldownConfig, CooldownRule
+from crypto_ai_bot.core.domain.risk.rules.correlation import (
+    CorrelationConfig,
+    CorrelationGroup,
+    CorrelationManager,
+    CorrelationStrength,
+    CorrelationType,
+)
+from crypto_ai_bot.core.domain.risk.rules.daily_loss import DailyLossConfig, DailyLossRule
+from crypto_ai_bot.core.domain.risk.rules.spread_cap import SpreadCapConfig, SpreadCapRule
+from crypto_ai_bot.core.domain.risk.snapshot import RiskSnapshot, evaluate_rules, gather_risk_snapshot
+
+_SYM = "BTC/USDT"
+
+
+class _SlowTrades:
+    def __init__(self, trades, delay=0.05):
+        self.trades, self.delay = trades, delay
+
+    async def list_today(self, symbol):
+        await asyncio.sleep(self.delay)
+        return list(reversed(self.trades))  # как репозиторий: свежие первыми
+
+    async def get_daily_pnl(self, symbol):
+        await asyncio.sleep(self.delay)
+        return Decimal("-150")
+
+    async def get_loss_streak(self, symbol):
+        raise RuntimeError("db is down")
+
+
+class _SlowPositions:
+    async def get_position(self, symbol):
+        await asyncio.sleep(0.05)
+        return {"symbol": symbol, "base_qty": Decimal("0.1")}
+
+    async def get_positions_many(self, symbols):
+        await asyncio.sleep(0.05)
+        return {s: {"symbol": s, "base_qty": Decimal("1") if s == "ETH/USDT" else Decimal("0")} for s in symbols}
+
+
+class _Broker:
+    async def fetch_ticker(self, symbol):
+        await asyncio.sleep(0.05)
+        return {"bid": Decimal("99"), "ask": Decimal("101"), "last": Decimal("100")}
+
+    async def fetch_balance(self):
+        return {"USDT": {"free": Decimal("1000")}}
+
+
+def _trade(ts_ms, **kw):
+    return {"symbol": _SYM, "side": "buy", "ts_ms": ts_ms, **kw}
+
+
+def test_gather_fetches_sources_concurrently_and_records_failures(run_async):
+    now = int(time.time() * 1000)
+    trades = [_trade(now - 2_000, pnl="-10"), _trade(now - 1_000, pnl="5")]
+
+    t0 = time.perf_counter()
+    snap = run_async(
+        gather_risk_snapshot(
+            _SYM,
+            side="buy",
+            amount=Decimal("50"),
+            trades_repo=_SlowTrades(trades),
+            positions_repo=_SlowPositions(),
+            broker=_Broker(),
+            related_symbols=["ETH/USDT"],
+        )
+    )
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.2  # пять источников по 50мс — не последовательно
+    assert snap.errors == ("loss_streak",)
+    assert snap.loss_streak is None
+    assert snap.daily_pnl == Decimal("-150")
+    assert [t["ts_ms"] for t in snap.trades_today] == [now - 2_000, now - 1_000]
+    assert snap.open_symbols == frozenset({"ETH/USDT"})
+    assert snap.spread_pct == Decimal("2")
+    assert snap.balance_quote == Decimal("1000")  # fetch_balance без аргумента — fallback
+    assert snap.amount_quote == Decimal("50")
+
+
+def test_manager_evaluate_reads_only_the_snapshot():
+    class _NoRepo:
+        def __getattr__(self, name):
+            raise AssertionError(f"repo accessed: {name}")
+
+    manager = RiskManager(RiskConfig(daily_loss_limit_quote=Decimal("100")))
+    snap = RiskSnapshot(symbol=_SYM, amount=Decimal("10"), daily_pnl=Decimal("-150"))
+    result = manager.check_trade(_SYM, "buy", Decimal("10"), "t", trades_repo=_NoRepo(), snapshot=snap)
+    assert result.action == RiskAction.BLOCK
+    assert result.triggered_rule == RiskRuleType.DAILY_LOSS
+
+    recent = RiskSnapshot(symbol=_SYM, trades_today=(_trade(int(time.time() * 1000) - 5_000),))
+    result = manager.evaluate(recent, "t")
+    assert result.action == RiskAction.REDUCE
+    assert "Cooldown" in result.reason
+    assert manager.evaluate(RiskSnapshot(symbol=_SYM), "t").action == RiskAction.ALLOW
+
+
+def test_standalone_rules_evaluate_matches_check(run_async):
+    now = int(time.time() * 1000)
+    trades = [_trade(now - 3_000, pnl="-80", fee="1"), _trade(now - 1_000, pnl="-30", fee="1")]
+    snap = run_async(gather_risk_snapshot(_SYM, trades_repo=_SlowTrades(trades, delay=0), broker=_Broker()))
+
+    daily = DailyLossRule(DailyLossConfig(limit_quote=Decimal("100")))
+    by_check = run_async(daily.check(_SYM, _SlowTrades(trades, delay=0)))
+    by_snapshot = daily.evaluate(snap)
+    assert by_snapshot.action == by_check.action
+    assert by_snapshot.metrics.total_pnl == by_check.metrics.total_pnl == Decimal("-112")
+
+    cooldown = CooldownRule(CooldownConfig(cooldown_sec=60))
+    assert cooldown.evaluate(snap).action == run_async(cooldown.check(_SYM, _SlowTrades(trades, delay=0))).action
+
+    spread = SpreadCapRule(SpreadCapConfig(max_spread_pct=1.0))
+    assert spread.evaluate(snap).action == run_async(spread.check(_SYM, broker=_Broker())).action
+    assert spread.evaluate(snap).is_blocked
+
+    corr = CorrelationManager(
+        CorrelationConfig(
+            groups=[
+                CorrelationGroup(
+                    symbols=[_SYM, "ETH/USDT"],
+                    correlation_type=CorrelationType.POSITIVE,
+                    strength=CorrelationStrength.STRONG,
+                )
+            ]
+        )
+    )
+    positions = [{"symbol": "ETH/USDT", "size": Decimal("1")}]
+
+    class _Positions:
+        def list_open(self):
+            return positions
+
+    corr_snap = RiskSnapshot(symbol=_SYM, open_positions=tuple(positions))
+    assert corr.evaluate(corr_snap).action == run_async(corr.check(_SYM, _Positions())).action
+    assert corr.evaluate(corr_snap).is_blocked
+
+
+def test_evaluate_rules_times_each_rule(monkeypatch):
+    seen = []
+    monkeypatch.setattr(snapshot_mod, "observe", lambda name, value, labels=None: seen.append((name, labels)))
+    rule = CooldownRule(CooldownConfig(cooldown_sec=60))
+    results = evaluate_rules(RiskSnapshot(symbol=_SYM), [rule])
+    assert set(results) == {"CooldownRule"}
+    assert seen == [("risk_rule_eval_ms", {"rule": "CooldownRule"})]
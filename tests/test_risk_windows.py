@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+from crypto_ai_bot.core.application import events_topics
+from crypto_ai_bot.core.application.risk_windows import attach_risk_windows, hydrate_risk_windows
+from crypto_ai_bot.core.domain.risk import windows as windows_mod
+from crypto_ai_bot.core.domain.risk.manager import RiskAction, RiskConfig, RiskManager, RiskRuleType
+from crypto_ai_bot.core.domain.risk.windows import RiskWindows, SlidingWindow
+from crypto_ai_bot.core.infrastructure.events import bus as bus_mod
+from crypto_ai_bot.core.infrastructure.events.bus import AsyncEventBus
+from crypto_ai_bot.core.infrastructure.storage.async_facade import AsyncStorageFacade
+from crypto_ai_bot.core.infrastructure.storage.repositories import rollups as rollups_mod
+
+_MIN = 60_000
+_T0 = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+
+
+def test_sliding_window_expires_buckets_incrementally():
+    w = SlidingWindow(5 * _MIN)
+    for i in range(10):
+        w.add(_T0 + i * _MIN, 1, Decimal("10"))
+    # окно 5 минут от T0+9m: корзины 4..9 (корзина края учитывается целиком)
+    assert w.totals(_T0 + 9 * _MIN + 30_000) == (6, Decimal("60"))
+    w.add(_T0, 1, Decimal("10"))  # старше окна — игнорируется
+    assert w.totals(_T0 + 12 * _MIN) == (3, Decimal("30"))
+    assert w.totals(_T0 + 60 * _MIN) == (0, Decimal("0"))
+
+
+def test_daily_turnover_resets_at_utc_midnight():
+    windows = RiskWindows()
+    windows.hydrate("BTC/USDT", [(_T0 - _MIN, 1, Decimal("500"))])
+    windows.record("BTC/USDT", Decimal("100"), ts_ms=_T0 + _MIN)
+    assert windows.turnover_today("BTC/USDT", ts_ms=_T0 + 2 * _MIN) == Decimal("100")
+    assert windows.orders_last_24h("BTC/USDT", ts_ms=_T0 + 2 * _MIN) == 2
+    windows.record("ETH/USDT", Decimal("1"), ts_ms=_T0)  # не гидрирован — не отслеживается
+    assert not windows.tracks("ETH/USDT")
+
+
+def test_risk_manager_reads_windows_without_storage(monkeypatch):
+    monkeypatch.setattr(windows_mod, "now_ms", lambda: _T0 + 10 * _MIN)
+    windows = RiskWindows()
+    windows.hydrate("BTC/USDT", [(_T0 + i * _MIN, 1, Decimal("100")) for i in range(3)])
+    risk = RiskManager(RiskConfig(max_orders_per_day=4, max_turnover_quote_per_day=Decimal("1000")), windows)
+
+    assert risk.check_trade("BTC/USDT", "buy", Decimal("1"), "t1").allowed
+    windows.record("BTC/USDT", Decimal("100"))
+    result = risk.check_trade("BTC/USDT", "buy", Decimal("1"), "t2")
+    assert result.action == RiskAction.BLOCK and result.triggered_rule == RiskRuleType.BUDGET_ORDERS
+    # символ без окон и без trades_repo — бюджетные правила пропускают
+    assert risk.can_execute("ETH/USDT")
+
+
+def test_windows_are_hydrated_from_rollups_and_follow_order_events(tmp_path, run_async, monkeypatch):
+    now = _T0 + 30 * _MIN
+    monkeypatch.setattr(windows_mod, "now_ms", lambda: now)
+    monkeypatch.setattr(bus_mod, "now_ms", lambda: now)
+    monkeypatch.setattr(rollups_mod, "_now_ms", lambda: now)  # минутные корзины «сегодня» в сроке хранения
+    storage = AsyncStorageFacade.open(str(tmp_path / "trader.sqlite3"), read_pool_size=1)
+    bus = AsyncEventBus()
+    windows = RiskWindows()
+
+    async def main():
+        for i in range(4):
+            await storage.trades.add_from_order(
+                {"id": f"o{i}", "symbol": "BTC/USDT", "side": "buy", "amount": "1", "price": "100",
+                 "cost": "100", "fee_quote": "0", "timestamp": now - i * 3 * _MIN}
+            )
+        attach_risk_windows(windows, bus)
+        hydrated = await hydrate_risk_windows(windows, storage, ["BTC/USDT"], now=now)
+        await bus.publish(
+            events_topics.ORDER_EXECUTED, {"symbol": "BTC/USDT", "amount": "2", "filled": "2", "price": "50"}
+        )
+        await storage.close()
+        return hydrated
+
+    assert run_async(main()) == ["BTC/USDT"]
+    assert windows.orders_last_24h("BTC/USDT", ts_ms=now) == 5
+    assert windows.orders_last_5m("BTC/USDT", ts_ms=now) == 3  # now, now-3m + событие
+    assert windows.turnover_last_5m("BTC/USDT", ts_ms=now) == Decimal("300")
+    assert windows.turnover_today("BTC/USDT", ts_ms=now) == Decimal("500")
+
+
+def test_market_order_turnover_uses_cost_then_average_then_last_price(run_async):
+    bus = AsyncEventBus()
+    windows = RiskWindows()
+    windows.hydrate("BTC/USDT", [])
+    attach_risk_windows(windows, bus, last_price=lambda symbol: Decimal("40"))
+
+    async def main():
+        base = {"symbol": "BTC/USDT", "amount": "2", "filled": "2", "price": None}
+        await bus.publish(events_topics.ORDER_EXECUTED, {**base, "cost": "110", "average": "55"})
+        await bus.publish(events_topics.ORDER_EXECUTED, {**base, "average": "50"})
+        await bus.publish(events_topics.ORDER_EXECUTED, base)
+        await bus.close()
+
+    run_async(main())
+    # 110 (cost) + 2 * 50 (average) + 2 * 40 (последняя цена)
+    assert windows.turnover_last_5m("BTC/USDT") == Decimal("290")
@@ -0,0 +1,108 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crypto_ai_bot.core.infrastructure.market_data.ccxt_market_data import CCXTMarketData
+from crypto_ai_bot.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution(run_async):
+    sf = SingleFlight("t")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def main():
+        res = await asyncio.gather(*(sf.do("k", fetch) for _ in range(10)))
+        assert len(sf) == 0
+        again = await sf.do("k", fetch)  # ключ освобождён — новый запрос
+        return res, again
+
+    res, again = run_async(main())
+    assert res == [1] * 10 and again == 2
+
+
+def test_exception_is_shared_and_waiter_cancel_is_isolated(run_async):
+    sf = SingleFlight("t")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def main():
+        errs = await asyncio.gather(sf.do("e", boom), sf.do("e", boom), return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in errs)
+
+        first = asyncio.ensure_future(sf.do("s", slow))
+        second = asyncio.ensure_future(sf.do("s", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run_async(main()) == "ok"
+
+
+class _SlowExchange:
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = {}
+
+    async def _hit(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(0.01)
+
+    async def fetch_ticker(self, symbol):
+        await self._hit("ticker")
+        return {"symbol": symbol, "last": 100.0, "bid": 99.5, "ask": 100.5}
+
+    async def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=None):
+        await self._hit("ohlcv")
+        return [[1_700_000_000_000 + i * 900_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit or 100)]
+
+    async def fetch_order_book(self, symbol, limit=20):
+        await self._hit("orderbook")
+        return {"bids": [[99.5, 1.0]], "asks": [[100.5, 1.0]]}
+
+
+def test_market_data_coalesces_cold_fetches(run_async):
+    ex = _SlowExchange()
+    md = CCXTMarketData(SimpleNamespace(exchange=ex), cache_ttl_sec=30)
+
+    async def main():
+        return await asyncio.gather(
+            *(md.get_ohlcv("BTC/USDT", "15m", limit=100) for _ in range(5)),
+            *(md.get_ticker("BTC/USDT") for _ in range(5)),
+            *(md.get_orderbook("BTC/USDT") for _ in range(5)),
+        )
+
+    res = run_async(main())
+    assert ex.calls == {"ohlcv": 1, "ticker": 1, "orderbook": 1}
+    assert all(len(f) == 100 for f in res[:5])
+
+
+@pytest.mark.parametrize("n", [1, 3])
+def test_singleflight_len_tracks_inflight(run_async, n):
+    sf = SingleFlight()
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def wait():
+            await gate.wait()
+
+        tasks = [asyncio.ensure_future(sf.do(i, wait)) for i in range(n)]
+        await asyncio.sleep(0)
+        size = len(sf)
+        gate.set()
+        await asyncio.gather(*tasks)
+        return size, len(sf)
+
+    assert run_async(main()) == (n, 0)
@@ -0,0 +1,175 @@
+import asyncio
+import sqlite3
+import threading
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from crypto_ai_bot.core.infrastructure.storage import async_facade as af
+from crypto_ai_bot.core.infrastructure.storage.async_facade import AsyncStorageFacade
+
+_T0 = 1_700_000_000_000
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "trader.sqlite3")
+
+
+def test_writes_are_ordered_and_reads_use_readonly_pool(db_path, make_order, run_async):
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=2)
+    threads: set[str] = set()
+
+    async def main():
+        loop_thread = threading.current_thread().name
+        # 20 записей без ожидания друг друга: порядок сохраняется одним писателем
+        await asyncio.gather(
+            *(storage.trades.add_from_order(make_order("buy", "1", "100", "0", _T0 + i)) for i in range(20))
+        )
+        await storage.trades.add_from_order(make_order("sell", "1", "100", "0", _T0 + 20))
+
+        def probe(repos):
+            threads.add(threading.current_thread().name)
+            return repos["trades"].last_trades("BTC/USDT", 100)
+
+        rows = await storage.run_read(probe)
+        recent = await storage.trades.last_trades("BTC/USDT", 3)
+        lots = await storage.lots.open_lots("BTC/USDT")
+        ok = await storage.ping()
+        await storage.close()
+        return loop_thread, rows, recent, lots, ok
+
+    loop_thread, rows, recent, lots, ok = run_async(main())
+    assert ok and len(rows) == 21
+    assert [r["id"] for r in sorted(rows, key=lambda r: r["ts_ms"])] == list(range(1, 22))
+    assert [r["side"] for r in recent][:1] == ["sell"]
+    assert len(lots) == 19 and lots[0][1] == Decimal("100")
+    assert threads and loop_thread not in threads and all(t.startswith("sqlite-reader") for t in threads)
+
+
+def test_read_method_that_writes_is_rerouted_to_writer(db_path, run_async):
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=1)
+
+    async def main():
+        # «чтение», которое на деле пишет -> на read-only подключении ошибка, повтор через писателя
+        def write_on_read(repos):
+            repos.conn.execute("CREATE TABLE IF NOT EXISTS probe_rw (x INTEGER)")
+            return True
+
+        await storage.idempotency.check_and_store("k1", 60)
+        seen = await storage.idempotency.has("k1")
+        rerouted = await storage.run_read(write_on_read, op="probe.get_x")
+        await storage.close()
+        return seen, rerouted
+
+    seen, rerouted = run_async(main())
+    assert seen is True and rerouted is True
+
+
+def test_proxy_exposes_only_real_repository_methods(db_path, run_async):
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=0)
+    assert hasattr(storage.positions, "get_position")
+    assert not hasattr(storage.trades, "record_partial_fill")
+    assert not hasattr(storage.positions, "_lots")
+    run_async(storage.close())
+
+
+def _ticker(i: int) -> SimpleNamespace:
+    return SimpleNamespace(symbol="BTC/USDT", last=100 + i, bid=99 + i, ask=101 + i, timestamp=1_700_000_000_000 + i)
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    seen: list[str] = []
+
+    def _inc(name, **labels):
+        if name == "storage_group_commits_total":
+            seen.append(labels.get("flush", ""))
+
+    monkeypatch.setattr(af, "inc", _inc)
+    return seen
+
+
+def test_burst_of_inserts_is_group_committed(db_path, commits, run_async):
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=0, group_commit_ms=50, group_commit_rows=1000)
+
+    async def main():
+        await asyncio.gather(
+            *(storage.market_data.store_ticker(_ticker(i)) for i in range(300)),
+            storage.idempotency.check_and_store("k1", 60),
+        )
+        rows = await storage.market_data.list_recent("BTC/USDT", 1000)
+        await storage.close()
+        return rows
+
+    rows = run_async(main())
+    assert len(rows) == 300
+    # 300 вставок + flush-now задание -> один групповой коммит, затем чтение list_recent
+    assert commits == ["true", "true"]
+
+
+def test_order_writes_flush_now_and_failures_are_isolated(db_path, commits, run_async):
+    # огромное окно: без flush-now тикер ждал бы 10 с
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=0, group_commit_ms=10_000)
+
+    def boom(repos):
+        raise ValueError("bad job")
+
+    async def main():
+        t_ticker = asyncio.ensure_future(storage.market_data.store_ticker(_ticker(1)))
+        t_boom = asyncio.ensure_future(storage.run_write(boom))
+        order = SimpleNamespace(id="b1", client_order_id="c1", symbol="BTC/USDT", side="buy", amount="1", ts_ms=1)
+        await asyncio.wait_for(storage.orders.upsert_open(order), timeout=2)
+        await t_ticker
+        with pytest.raises(ValueError):
+            await t_boom
+        open_orders = await storage.orders.list_open("BTC/USDT")
+        recent = await storage.market_data.list_recent("BTC/USDT")
+        await storage.close()
+        return open_orders, recent
+
+    open_orders, recent = run_async(main())
+    assert [o["broker_order_id"] for o in open_orders] == ["b1"] and len(recent) == 1
+    assert commits[0] == "true"
+
+
+def test_reporting_runs_on_own_pool_in_one_snapshot(db_path, make_order, run_async):
+    storage = AsyncStorageFacade.open(db_path, read_pool_size=1, report_pool_size=1)
+    threads: set[str] = set()
+
+    async def main():
+        await storage.trades.add_from_order(make_order("buy", "1", "100", "0", _T0 + 1))
+        started, release = threading.Event(), threading.Event()
+
+        def report(repos):
+            threads.add(threading.current_thread().name)
+            first = len(repos["trades"].last_trades("BTC/USDT", 100))
+            started.set()
+            release.wait(5)
+            # запись, закоммиченная посреди отчёта, в его снимок не попадает
+            return first, len(repos["trades"].last_trades("BTC/USDT", 100))
+
+        task = asyncio.ensure_future(storage.reporting.run_report(report))
+        await asyncio.to_thread(started.wait, 5)
+        # долгий отчёт не задерживает ни запись, ни торговое чтение
+        late = make_order("buy", "1", "100", "0", _T0 + 2)
+        await asyncio.wait_for(storage.trades.add_from_order(late), timeout=2)
+        live = await asyncio.wait_for(storage.trades.last_trades("BTC/USDT", 100), timeout=2)
+        release.set()
+        seen = await task
+        after = await storage.reporting.trades.last_trades("BTC/USDT", 100)
+
+        def write(repos):
+            repos.conn.execute("CREATE TABLE probe_ro (x INTEGER)")
+
+        with pytest.raises(sqlite3.OperationalError):
+            await storage.reporting.run_report(write)
+        await storage.close()
+        return seen, len(live), len(after)
+
+    seen, live, after = run_async(main())
+    assert seen == (1, 1) and live == 2 and after == 2
+    assert threads and all(t.startswith("sqlite-report") for t in threads)
+    assert hasattr(storage.reporting.trades, "last_trades")
+    assert not hasattr(storage.reporting.trades, "add_from_order")
@@ -0,0 +1,67 @@
+import sqlite3
+from decimal import Decimal
+from types import SimpleNamespace
+
+from crypto_ai_bot.core.infrastructure.storage.migrations.runner import run_migrations
+from crypto_ai_bot.core.infrastructure.storage.repositories import (
+    AuditRepo,
+    IdempotencyRepository,
+    OrdersRepository,
+    PositionsRepository,
+)
+
+
+def test_repositories_write_into_migrated_schema(conn):
+    AuditRepo(conn).write("orders.placed", {"id": 1})
+    assert IdempotencyRepository(conn).check_and_store("k1", 60) is True
+    OrdersRepository(conn).upsert_open(SimpleNamespace(id="b1", symbol="BTC/USDT", side="buy", amount="1", ts_ms=1))
+    positions = PositionsRepository(conn)
+    positions.set_base_qty("BTC/USDT", Decimal("0.5"))
+    assert positions.get_base_qty("BTC/USDT") == Decimal("0.5")
+    assert conn.execute("SELECT topic FROM audit").fetchone()[0] == "orders.placed"
+
+
+def test_trade_insert_path_issues_no_ddl(conn, fill_trades, make_order):
+    trades = fill_trades([("buy", "1", "100", "0", 1_700_000_000_000)])  # первая сделка строит книгу лотов
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    trades.add_from_order(make_order("buy", "1", "100", "0", 1_700_000_000_001))
+    conn.set_trace_callback(None)
+
+    ddl = [s for s in statements if s.lstrip().upper().startswith(("CREATE", "ALTER", "PRAGMA"))]
+    assert ddl == []
+    assert any(s.lstrip().startswith("INSERT INTO trades") for s in statements)
+
+
+def test_startup_check_is_a_noop_on_current_schema(tmp_path):
+    path = str(tmp_path / "trader.sqlite3")
+    conn = sqlite3.connect(path)
+    run_migrations(conn, now_ms=1, db_path=path, do_backup=False)
+    version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+    run_migrations(conn, now_ms=2, db_path=path, do_backup=True)
+    # схема актуальна: ни новых версий, ни бэкапа
+    assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == version
+    assert not (tmp_path / "backups").exists()
+    conn.close()
+
+
+def test_legacy_repository_created_tables_are_upgraded(tmp_path):
+    path = str(tmp_path / "legacy.sqlite3")
+    conn = sqlite3.connect(path)
+    # так таблицы создавали сами репозитории до переноса схемы в миграции
+    conn.executescript(
+        """
+        CREATE TABLE idempotency (key TEXT PRIMARY KEY, expire_at INTEGER NOT NULL);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, broker_order_id TEXT, client_order_id TEXT,
+            symbol TEXT NOT NULL, side TEXT NOT NULL, amount TEXT NOT NULL,
+            filled TEXT NOT NULL DEFAULT '0', status TEXT NOT NULL DEFAULT 'open', ts_ms INTEGER NOT NULL
+        );
+        """
+    )
+    run_migrations(conn, now_ms=1, db_path=path, do_backup=False)
+    assert IdempotencyRepository(conn).check_and_store("k1", 60) is True
+    OrdersRepository(conn).upsert_open(SimpleNamespace(id="b1", symbol="BTC/USDT", side="buy", amount="1", ts_ms=1))
+    assert [o["broker_order_id"] for o in OrdersRepository(conn).list_open("BTC/USDT")] == ["b1"]
+    conn.close()
@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+from crypto_ai_bot.core.infrastructure.storage.migrations.runner import _pymigrations
+from crypto_ai_bot.core.infrastructure.storage.repositories.lots import LotsRepository
+from crypto_ai_bot.core.infrastructure.storage.repositories.rollups import (
+    RETENTION_MS,
+    RollupsRepository,
+    covering_buckets,
+)
+from crypto_ai_bot.utils.time import now_ms
+
+_DAY = 86_400_000
+_D1 = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+
+_FILLS = [
+    ("buy", "1.0", "100", "0.1", _D1 + 1_000, "BTC/USDT"),
+    ("buy", "2.0", "110", "0.2", _D1 + 61_000, "BTC/USDT"),
+    ("buy", "3.0", "10", "0.01", _D1 + 3_700_000, "ETH/USDT"),
+    ("sell", "1.5", "120", "0.15", _D1 + 3_900_000, "BTC/USDT"),
+    ("sell", "1.0", "90", "0.09", _D1 + _DAY + 5_000, "BTC/USDT"),
+]
+
+
+def _snapshot(conn):
+    return conn.execute("SELECT * FROM trade_rollups ORDER BY symbol, granularity, bucket_start").fetchall()
+
+
+def _minutes(spans, edges):
+    minutes = []
+    for name, lo, hi in spans:
+        g = {"1d": _DAY, "1h": 3_600_000, "5m": 300_000, "1m": 60_000}[name]
+        for b in range(lo, hi, g):
+            minutes += range(b, b + g, 60_000)
+    for lo, hi in edges:
+        minutes += range(lo, hi, 60_000)
+    assert len(minutes) == len(set(minutes)), "overlap"
+    return set(minutes)
+
+
+def test_covering_buckets_tile_the_range_without_overlap():
+    start, end = _D1 - 7 * 60_000, _D1 + _DAY + 3_600_000 + 10 * 60_000
+    spans, edges = covering_buckets(start, end)
+    assert ("1d", _D1, _D1 + _DAY) in spans
+    assert ("1h", _D1 + _DAY, _D1 + _DAY + 3_600_000) in spans
+    assert edges == []
+    assert _minutes(spans, edges) == set(range(start, end, 60_000))
+
+
+def test_covering_buckets_leave_partial_minutes_to_trades():
+    start, end = _D1 + 30_000, _D1 + 10 * 60_000 + 15_000
+    spans, edges = covering_buckets(start, end)
+    assert edges == [(start, _D1 + 60_000), (_D1 + 10 * 60_000, end)]
+    assert all(lo >= start and hi <= end for _, lo, hi in spans)
+
+
+def test_covering_buckets_skip_pruned_granularities():
+    now = _D1 + 40 * _DAY
+    start, end = _D1 - 7 * 60_000, now
+    spans, edges = covering_buckets(start, end, now_ms=now)
+    # 1m/5m за сроком хранения не читаются: край до ближайшего часа — из trades
+    assert not any(name in RETENTION_MS and lo < now - RETENTION_MS[name] for name, lo, _ in spans)
+    assert edges == [(start, _D1)]
+    assert _minutes(spans, edges) == set(range(start, end, 60_000))
+
+
+def test_incremental_rollups_match_rebuild(conn, fill_trades):
+    fill_trades(_FILLS)
+    incremental = [tuple(r) for r in _snapshot(conn)]
+    RollupsRepository(conn).rebuild()
+    assert [tuple(r) for r in _snapshot(conn)] == incremental
+
+
+def test_totals_match_trades_and_lots_ledger(conn, fill_trades):
+    trades = fill_trades(_FILLS)
+    rollups = RollupsRepository(conn)
+
+    day1 = rollups.get_totals("BTC/USDT", _D1, _D1 + _DAY)
+    exact = trades.get_totals("BTC/USDT", _D1, _D1 + _DAY)
+    assert day1.count == exact["count"] == 3
+    assert day1.turnover_quote == exact["turnover_quote"] == Decimal("500")
+    assert day1.fees_quote == exact["fees_quote"]
+    lots = LotsRepository(conn)
+    assert day1.realized_quote == lots.realized_for_day("BTC/USDT", "2023-11-15")
+    assert (day1.wins, day1.losses) == (1, 0)
+
+    day2 = rollups.get_totals("BTC/USDT", _D1 + _DAY, _D1 + 2 * _DAY)
+    assert (day2.wins, day2.losses) == (0, 1) and day2.gross_loss_quote == day2.realized_quote < 0
+
+    everything = rollups.get_totals(None, 0, _D1 + 2 * _DAY)
+    assert everything.count == len(_FILLS)
+    assert everything.realized_quote == lots.totals("BTC/USDT").realized_quote
+    # границы окна точные: неполные минуты на краях добираются из trades
+    assert rollups.get_totals("BTC/USDT", _D1 + 60_000, _D1 + 120_000).count == 1
+    assert rollups.get_totals("BTC/USDT", _D1 + 1_001, _D1 + 61_001).count == 1
+    assert rollups.get_totals("BTC/USDT", _D1 + 1_001, _D1 + 61_000).count == 0
+    assert rollups.get_totals("BTC/USDT", _D1 + 30_000, _D1 + 3_900_001).turnover_quote == Decimal("400")
+
+
+def test_out_of_order_fill_rebuilds_symbol_rollups(conn, fill_trades):
+    fill_trades([f for f in _FILLS if f[0] != "sell"] + [_FILLS[4]])
+    # опоздавшая продажа меняет FIFO-результат последующей: корзины пересобираются
+    fill_trades([_FILLS[3]])
+    after_late = [tuple(r) for r in _snapshot(conn)]
+    RollupsRepository(conn).rebuild()
+    assert [tuple(r) for r in _snapshot(conn)] == after_late
+    assert RollupsRepository(conn).get_totals(None, 0, _D1 + 2 * _DAY).count == len(_FILLS)
+
+
+def test_fine_buckets_are_pruned_and_windows_stay_exact(conn, fill_trades):
+    fill_trades(_FILLS)
+    rollups = RollupsRepository(conn)
+    # корзины 2023 года давно за сроком хранения: 1m/5m не пишутся, 1h/1d остаются
+    grans = {r[0] for r in conn.execute("SELECT DISTINCT granularity FROM trade_rollups")}
+    assert grans == {"1h", "1d"}
+    assert rollups.get_totals("BTC/USDT", _D1 + 30_000, _D1 + 3_900_001).count == 2
+
+    ts = now_ms() - 60_000
+    fill_trades([("buy", "1.0", "100", "0", ts)])
+    assert rollups.prune(ts + RETENTION_MS["1m"] + 60_000) == 1
+    grans = {r[0] for r in conn.execute("SELECT DISTINCT granularity FROM trade_rollups")}
+    assert grans == {"1h", "1d", "5m"}
+
+
+def test_migration_backfill_matches_rebuild(conn, fill_trades):
+    fill_trades(_FILLS)
+    rollups = RollupsRepository(conn)
+    rollups.rebuild()
+    rebuilt = [tuple(r) for r in _snapshot(conn)]
+
+    conn.execute("DROP TABLE trade_rollups")
+    conn.commit()
+    next(m for m in _pymigrations() if m.version == 18).up(conn)
+    rollups.prune()
+    assert [tuple(r) for r in _snapshot(conn)] == rebuilt
@@ -0,0 +1,91 @@
+import pytest
+
+from crypto_ai_bot.core.infrastructure.storage.repositories.trades import TradesRepository
+from crypto_ai_bot.utils.time import now_ms
+
+# запросы, которые риск-правила дёргают на каждом тике
+_PERIOD_QUERIES = [
+    ("list_today", ()),
+]
+# агрегаты за период читаются из корзин trade_rollups
+_ROLLUP_QUERIES = [
+    ("daily_turnover_quote", ()),
+    ("count_orders_today", ()),
+    ("count_orders_last_minutes", (5,)),
+    ("turnover_quote_last_minutes", (5,)),
+]
+
+
+@pytest.fixture
+def repo(fill_trades):
+    ts = now_ms()
+    return fill_trades(
+        ("buy", "1", "100", "0", ts - i * 3_600_000, "ETH/USDT" if i % 2 else "BTC/USDT") for i in range(50)
+    )
+
+
+def _captured_selects(repo: TradesRepository, method: str, args: tuple) -> list[str]:
+    statements: list[str] = []
+    repo.conn.set_trace_callback(statements.append)
+    try:
+        getattr(repo, method)("BTC/USDT", *args)
+    finally:
+        repo.conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def _captured_select(repo: TradesRepository, method: str, args: tuple) -> str:
+    selects = _captured_selects(repo, method, args)
+    assert len(selects) == 1, selects
+    return selects[0]
+
+
+def _plan(repo: TradesRepository, sql: str) -> list[str]:
+    return [r[3] for r in repo.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+
+@pytest.mark.parametrize(("method", "args"), _PERIOD_QUERIES)
+def test_period_queries_are_index_range_scans(repo, method, args):
+    selects = _captured_selects(repo, method, args)
+    # запрос за период — ровно один, остальные (FIFO-прогон) не сканируют всю таблицу
+    period = [s for s in selects if "ts_ms >=" in s or "ts_ms BETWEEN" in s]
+    assert len(period) == 1, selects
+    sql = period[0]
+    assert "DATE(" not in sql.upper() and "STRFTIME" not in sql.upper()
+
+    assert any("idx_trades_symbol_ts (symbol=? AND ts_ms>" in d for d in _plan(repo, sql)), _plan(repo, sql)
+    for s in selects:
+        assert not any(d.startswith("SCAN trades") for d in _plan(repo, s)), s
+
+
+@pytest.mark.parametrize(("method", "args"), _ROLLUP_QUERIES)
+def test_rollup_queries_use_bucket_primary_key(repo, method, args):
+    sql = _captured_select(repo, method, args)
+    assert "FROM trade_rollups" in sql
+
+    plan = _plan(repo, sql)
+    assert any("USING PRIMARY KEY (symbol=? AND granularity=?" in d for d in plan), plan
+    # неполные края окна — тем же запросом, диапазоном по индексу trades
+    if "FROM trades" in sql:
+        assert any("idx_trades_symbol_ts (symbol=? AND ts_ms>" in d for d in plan), plan
+    assert not any(d.startswith("SCAN") and "subquery" not in d for d in plan), plan
+
+
+def test_get_totals_reads_buckets_without_replaying_history(repo):
+    # окно на много дней: корзины всех гранулярностей, поиск по ключу символа — без FIFO-прогона
+    sql = _captured_select(repo, "get_totals", (0, 10**13))
+    assert "FROM trade_rollups" in sql
+
+    plan = _plan(repo, sql)
+    assert any(d.startswith("SEARCH trade_rollups USING PRIMARY KEY (symbol=?") for d in plan), plan
+    assert not any(d.startswith("SCAN") and "subquery" not in d for d in plan), plan
+    assert repo.get_totals("BTC/USDT", 0, 10**13)["count"] == 25
+
+
+def test_period_queries_still_filter_by_day(repo):
+    # BTC — каждые 2 часа, последняя «сейчас»: сегодня от 1 до 12 сделок
+    today = repo.count_orders_today("BTC/USDT")
+    assert 1 <= today <= 12
+    assert len(repo.list_today("BTC/USDT")) == today
+    assert repo.count_orders_last_minutes("BTC/USDT", 5) == 1
+    assert repo.daily_turnover_quote("BTC/USDT") == 100 * today
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+import pytest
+
+from crypto_ai_bot.core.infrastructure.storage.migrations.runner import run_migrations
+from crypto_ai_bot.core.infrastructure.storage.repositories.trades import TradesRepository
+from crypto_ai_bot.utils.decimal import from_units, to_units
+from crypto_ai_bot.utils.time import now_ms
+
+
+def test_units_round_trip():
+    assert to_units("1.5") == 150_000_000
+    assert to_units("0.000000025") == 2  # банковское округление
+    assert from_units(to_units("123.45678901")) == Decimal("123.45678901").quantize(Decimal("1e-8"))
+
+
+def test_units_reject_values_that_do_not_fit_integer():
+    with pytest.raises(ValueError, match="too large"):
+        to_units(Decimal("1e12"))
+    with pytest.raises(ValueError, match="non-finite"):
+        to_units(Decimal("Infinity"))
+
+
+def test_totals_include_realized_pnl_wins_and_losses(fill_trades):
+    ts = now_ms() // 60_000 * 60_000  # realized PnL — по целым минутным корзинам
+    trades = fill_trades(
+        [("buy", "2", "100", "0", ts), ("sell", "1", "110", "0", ts + 1), ("sell", "1", "90", "0", ts + 2)]
+    )
+
+    totals = trades.get_totals("BTC/USDT", ts, ts + 60_000)
+    assert totals["count"] == 3
+    assert totals["realized_pnl"] == Decimal("0")
+    assert (totals["wins"], totals["losses"]) == (1, 1)
+    assert (totals["gross_profit_quote"], totals["gross_loss_quote"]) == (Decimal("10"), Decimal("-10"))
+
+
+def test_turnover_and_totals_are_exact_integer_sums(fill_trades):
+    ts = now_ms()
+    trades = fill_trades(("buy", "1", "0.1", "0.0001", ts - i) for i in range(10))
+
+    # CAST(... AS REAL) дал бы 0.9999999999999999
+    assert trades.daily_turnover_quote("BTC/USDT") == Decimal("1")
+    totals = trades.get_totals("BTC/USDT", ts - 100, ts + 1)
+    assert (totals["count"], totals["turnover_quote"], totals["fees_quote"]) == (10, Decimal("1"), Decimal("0.001"))
+    assert (totals["realized_pnl"], totals["wins"], totals["losses"]) == (0, 0, 0)
+    assert trades.get_totals("BTC/USDT", ts + 1, ts + 2)["count"] == 0
+
+
+def test_migration_backfills_existing_rows(conn):
+    conn.execute(
+        "INSERT INTO trades (symbol, side, amount, filled, price, cost, fee_quote, ts_ms) "
+        "VALUES ('BTC/USDT', 'buy', '1', '1', '100', '100.12345678', '0.1', 1)"
+    )
+    conn.execute("ALTER TABLE trades DROP COLUMN cost_e8")
+    conn.execute("ALTER TABLE trades DROP COLUMN fee_quote_e8")
+    conn.execute("DELETE FROM schema_version WHERE version >= 17")
+    run_migrations(conn, now_ms=2, db_path="", do_backup=False)
+
+    totals = TradesRepository(conn).get_totals("BTC/USDT", 0, 10)
+    assert (totals["count"], totals["turnover_quote"], totals["fees_quote"]) == (
+        1,
+        Decimal("100.12345678"),
+        Decimal("0.1"),
+    )